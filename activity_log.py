@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Activity Log - 사용자 활동 이벤트 로그 (SQLite WAL, 추가 전용)
+클릭마다 JSON 파일 전체를 읽고 다시 쓰는 대신, 이벤트를 큐에 넣기만 하고
+백그라운드 작성 스레드가 모아서 한 트랜잭션으로 추가 (여러 Streamlit 세션이 동시에 써도 안전)
+보관 기간이 지난 날짜의 이벤트는 하루 단위 JSON Lines 파일로 옮겨 DB 크기를 일정하게 유지
+대시보드 통계는 원본 이벤트를 다시 훑지 않고, 기록 시 트리거로 함께 갱신되는
+시간별(활동) / 일별(사용자, IP) 집계 테이블에서 조회
+"""
+
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_LOG_PATH = "user_logs.sqlite3"
+DEFAULT_ARCHIVE_DIR = "user_logs_archive"
+
+# 기존 user_logs.json 섹션 <-> 활동 유형
+LEGACY_SECTIONS = {"search_logs": "search", "usage_logs": "usage", "admin_logs": "admin"}
+
+# 사용자/IP 집계 차원 (counts_<차원>_daily, counts_<차원>_hourly 테이블)
+AGGREGATE_DIMENSIONS = ("user_id", "ip")
+
+
+class ActivityLog:
+    """
+    추가 전용 활동 로그
+
+    - log(): 큐에 넣고 바로 반환 (호출 스레드는 파일 I/O를 기다리지 않음)
+    - 작성 스레드: batch_size개 또는 flush_interval초마다 executemany 한 번으로 기록
+    - 통계: 시간별·일별 집계 테이블 조회 (원본 이벤트 수와 무관하게 일정한 비용)
+    - 최근 이벤트: (activity, timestamp) 인덱스
+    - 하루 한 번 retention_days보다 오래된 날짜를 archive_dir/activity_YYYY-MM-DD.jsonl로 이동
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_LOG_PATH,
+        archive_dir: str = DEFAULT_ARCHIVE_DIR,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        retention_days: int = 90,
+    ):
+        """
+        Args:
+            path: 로그 DB 파일 경로
+            archive_dir: 보관 기간이 지난 이벤트를 옮길 폴더
+            batch_size: 한 트랜잭션에 기록할 최대 이벤트 수
+            flush_interval: 이벤트가 적을 때 기록 전 최대 대기(초)
+            retention_days: DB에 남길 일수 (None이면 옮기지 않음)
+        """
+        self.path = Path(path)
+        self.archive_dir = Path(archive_dir)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+
+        self._queue = queue.Queue()
+        self._read_lock = threading.Lock()
+        self._last_rotation = None
+        self.stats = {'written': 0, 'batches': 0, 'archived': 0, 'errors': 0}
+
+        writer_conn = self._connect()
+        self._create_schema(writer_conn)
+        self._read_conn = self._connect()
+
+        self._writer = threading.Thread(target=self._run, args=(writer_conn,),
+                                        name="activity-log-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " id INTEGER PRIMARY KEY,"
+            " timestamp TEXT NOT NULL,"
+            " day TEXT NOT NULL,"
+            " user_id TEXT,"
+            " ip TEXT,"
+            " activity TEXT NOT NULL,"
+            " details TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_activity_ts ON events(activity, timestamp)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_day ON events(day)")
+        # 백업 복원 시 같은 이벤트 중복 방지
+        conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_events_unique"
+            " ON events(timestamp, user_id, ip, activity, details)"
+        )
+
+        # 사전 집계: 시간(YYYY-MM-DDTHH)별 활동 수, 일별·시간별 사용자/IP별 활동 수
+        # (사용자/IP 통계는 기간 양 끝 날짜만 시간별, 사이의 온전한 날짜는 일별 집계로 조회)
+        # 원본 이벤트를 보관 파일로 옮겨도 집계는 남아 장기 통계 유지
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS counts_hourly ("
+            " activity TEXT NOT NULL, hour TEXT NOT NULL, n INTEGER NOT NULL,"
+            " PRIMARY KEY (activity, hour)) WITHOUT ROWID"
+        )
+        for dimension in AGGREGATE_DIMENSIONS:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS counts_{dimension}_daily ("
+                f" activity TEXT NOT NULL, day TEXT NOT NULL, {dimension} TEXT NOT NULL, n INTEGER NOT NULL,"
+                f" PRIMARY KEY (activity, day, {dimension})) WITHOUT ROWID"
+            )
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS counts_{dimension}_hourly ("
+                f" activity TEXT NOT NULL, hour TEXT NOT NULL, {dimension} TEXT NOT NULL, n INTEGER NOT NULL,"
+                f" PRIMARY KEY (activity, hour, {dimension})) WITHOUT ROWID"
+            )
+
+        # 실제로 추가된 행(INSERT OR IGNORE로 건너뛴 중복 제외)만 집계에 반영
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS events_rollup AFTER INSERT ON events BEGIN"
+            " INSERT INTO counts_hourly (activity, hour, n)"
+            "  VALUES (NEW.activity, substr(NEW.timestamp, 1, 13), 1)"
+            "  ON CONFLICT (activity, hour) DO UPDATE SET n = n + 1;"
+            " INSERT INTO counts_user_id_daily (activity, day, user_id, n)"
+            "  VALUES (NEW.activity, NEW.day, COALESCE(NEW.user_id, 'unknown'), 1)"
+            "  ON CONFLICT (activity, day, user_id) DO UPDATE SET n = n + 1;"
+            " INSERT INTO counts_ip_daily (activity, day, ip, n)"
+            "  VALUES (NEW.activity, NEW.day, COALESCE(NEW.ip, 'unknown'), 1)"
+            "  ON CONFLICT (activity, day, ip) DO UPDATE SET n = n + 1;"
+            " INSERT INTO counts_user_id_hourly (activity, hour, user_id, n)"
+            "  VALUES (NEW.activity, substr(NEW.timestamp, 1, 13), COALESCE(NEW.user_id, 'unknown'), 1)"
+            "  ON CONFLICT (activity, hour, user_id) DO UPDATE SET n = n + 1;"
+            " INSERT INTO counts_ip_hourly (activity, hour, ip, n)"
+            "  VALUES (NEW.activity, substr(NEW.timestamp, 1, 13), COALESCE(NEW.ip, 'unknown'), 1)"
+            "  ON CONFLICT (activity, hour, ip) DO UPDATE SET n = n + 1;"
+            " END"
+        )
+
+        # 한 번만 하는 작업 기록 (기존 JSON 가져오기 등)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID")
+
+        # 집계 도입 전에 쌓인 이벤트는 한 번만 채움
+        if conn.execute("SELECT 1 FROM events LIMIT 1").fetchone() and \
+                not conn.execute("SELECT 1 FROM counts_hourly LIMIT 1").fetchone():
+            conn.execute(
+                "INSERT INTO counts_hourly (activity, hour, n)"
+                " SELECT activity, substr(timestamp, 1, 13), COUNT(*) FROM events GROUP BY 1, 2"
+            )
+            for dimension in AGGREGATE_DIMENSIONS:
+                conn.execute(
+                    f"INSERT INTO counts_{dimension}_daily (activity, day, {dimension}, n)"
+                    f" SELECT activity, day, COALESCE({dimension}, 'unknown'), COUNT(*)"
+                    f" FROM events GROUP BY 1, 2, 3"
+                )
+                conn.execute(
+                    f"INSERT INTO counts_{dimension}_hourly (activity, hour, {dimension}, n)"
+                    f" SELECT activity, substr(timestamp, 1, 13), COALESCE({dimension}, 'unknown'), COUNT(*)"
+                    f" FROM events GROUP BY 1, 2, 3"
+                )
+
+        conn.commit()
+
+    # ------------------------------------------------------------------ 기록
+
+    def log(self, user_id: str, activity: str, details: str = "", ip: str = "unknown",
+            timestamp: Optional[str] = None):
+        """이벤트 기록 요청 (비차단)"""
+        timestamp = timestamp or datetime.now().isoformat()
+        # 고유 인덱스는 NULL끼리 다르다고 보므로 빈 값을 채워 둬야 복원 시 중복이 걸러짐
+        self._queue.put((timestamp, timestamp[:10], user_id or "unknown", ip or "unknown", activity, details or ""))
+
+    def flush(self, timeout: float = 10.0):
+        """지금까지 넣은 이벤트가 모두 기록될 때까지 대기"""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _run(self, conn: sqlite3.Connection):
+        while True:
+            item = self._queue.get()
+            batch, waiters = [], []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break  # flush 요청은 모인 것까지 즉시 기록
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            try:
+                if batch:
+                    self._write(conn, batch)
+                self._rotate_if_due(conn)
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"활동 로그 기록 실패: {e}")
+            for waiter in waiters:
+                waiter.set()
+
+    def _write(self, conn: sqlite3.Connection, rows: List[Tuple]):
+        with conn:
+            cursor = conn.executemany(
+                "INSERT OR IGNORE INTO events (timestamp, day, user_id, ip, activity, details)"
+                " VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+        self.stats['written'] += cursor.rowcount
+        self.stats['batches'] += 1
+
+    def _rotate_if_due(self, conn: sqlite3.Connection):
+        """하루 한 번 보관 기간이 지난 날짜를 JSON Lines 파일로 이동"""
+        today = date.today()
+        if self.retention_days is None or self._last_rotation == today:
+            return
+        self._last_rotation = today
+
+        cutoff = (today - timedelta(days=self.retention_days)).isoformat()
+        days = [row[0] for row in conn.execute(
+            "SELECT DISTINCT day FROM events WHERE day < ? ORDER BY day", (cutoff,))]
+        for day in days:
+            rows = conn.execute(
+                "SELECT timestamp, user_id, ip, activity, details FROM events WHERE day = ? ORDER BY id",
+                (day,)
+            ).fetchall()
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.archive_dir / f"activity_{day}.jsonl", 'a', encoding='utf-8') as f:
+                for timestamp, user_id, ip, activity, details in rows:
+                    f.write(json.dumps({"timestamp": timestamp, "user_id": user_id, "ip": ip,
+                                        "activity": activity, "details": details},
+                                       ensure_ascii=False) + "\n")
+            with conn:
+                conn.execute("DELETE FROM events WHERE day = ?", (day,))
+            self.stats['archived'] += len(rows)
+
+    # ------------------------------------------------------------------ 조회
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[Tuple]:
+        with self._read_lock:
+            return self._read_conn.execute(sql, tuple(params)).fetchall()
+
+    @staticmethod
+    def _period(column: str, width: int, since: Optional[str], until: Optional[str]) -> Tuple[str, List]:
+        """기간 조건 (since 이상 until 미만, ISO 시각 문자열을 집계 단위 길이로 잘라 비교)"""
+        sql, params = "", []
+        if since:
+            sql += f" AND {column} >= ?"
+            params.append(since[:width])
+        if until:
+            sql += f" AND {column} < ?"
+            params.append(until[:width])
+        return sql, params
+
+    @staticmethod
+    def _in(activities: Iterable[str]) -> Tuple[str, List]:
+        activities = list(activities)
+        return f"activity IN ({','.join('?' * len(activities))})", activities
+
+    def count(self, activity: str, since: Optional[str] = None, until: Optional[str] = None) -> int:
+        """활동 수 (시간별 집계 기준)"""
+        period, params = self._period("hour", 13, since, until)
+        return self._query(
+            f"SELECT COALESCE(SUM(n), 0) FROM counts_hourly WHERE activity = ?{period}", [activity] + params
+        )[0][0]
+
+    @classmethod
+    def _dimension_rows(cls, dimension: str, where: str, params: List, since: Optional[str],
+                        until: Optional[str]) -> Tuple[str, List]:
+        """
+        기간 내 사용자/IP 집계 행 ({차원}, n) 부분 쿼리 (count와 같은 시간 단위 경계)
+
+        since/until이 걸친 날짜는 시간별 집계, 그 사이 온전한 날짜는 일별 집계에서 읽음
+        (기간이 길어도 시간별 행은 최대 이틀치만 읽음)
+        """
+        since_day, until_day = since and since[:10], until and until[:10]
+        if since_day and since_day == until_day:
+            segments = [("hourly", "hour", 13, since, until)]
+        else:
+            after_since = since and (date.fromisoformat(since_day) + timedelta(days=1)).isoformat()
+            segments = [("daily", "day", 10, after_since, until_day)]
+            if since:
+                segments.append(("hourly", "hour", 13, since, f"{after_since}T00"))
+            if until:
+                segments.append(("hourly", "hour", 13, f"{until_day}T00", until))
+
+        parts, all_params = [], []
+        for granularity, column, width, lower, upper in segments:
+            period, period_params = cls._period(column, width, lower, upper)
+            parts.append(f"SELECT {dimension}, n FROM counts_{dimension}_{granularity} WHERE {where}{period}")
+            all_params += list(params) + period_params
+        return " UNION ALL ".join(parts), all_params
+
+    def unique_ips(self, activities: Iterable[str], since: Optional[str] = None,
+                   until: Optional[str] = None) -> int:
+        """고유 IP 수"""
+        where, params = self._in(activities)
+        rows, params = self._dimension_rows("ip", where, params, since, until)
+        return self._query(f"SELECT COUNT(DISTINCT ip) FROM ({rows})", params)[0][0]
+
+    def _counts_by(self, dimension: str, activity: str, since: Optional[str], until: Optional[str],
+                   limit: Optional[int]) -> List[Tuple[str, int]]:
+        rows, params = self._dimension_rows(dimension, "activity = ?", [activity], since, until)
+        sql = f"SELECT {dimension}, SUM(n) AS total FROM ({rows}) GROUP BY {dimension} ORDER BY total DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._query(sql, params)
+
+    def counts_by_ip(self, activity: str, since: Optional[str] = None, until: Optional[str] = None,
+                     limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """IP별 이벤트 수 (많은 순)"""
+        return self._counts_by("ip", activity, since, until, limit)
+
+    def counts_by_user(self, activity: str, since: Optional[str] = None, until: Optional[str] = None,
+                       limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """사용자별 이벤트 수 (많은 순)"""
+        return self._counts_by("user_id", activity, since, until, limit)
+
+    def time_series(self, activities: Iterable[str], bucket: str = "hour", since: Optional[str] = None,
+                    until: Optional[str] = None) -> List[Tuple[str, str, int]]:
+        """
+        기간별 활동 수 (차트용)
+
+        Args:
+            activities: 활동 유형 목록
+            bucket: 'hour' (YYYY-MM-DDTHH) 또는 'day' (YYYY-MM-DD)
+        Returns:
+            [(구간, 활동, 수), ...] 구간 오름차순
+        """
+        width = 13 if bucket == "hour" else 10
+        where, params = self._in(activities)
+        period, period_params = self._period("hour", 13, since, until)
+        return self._query(
+            f"SELECT substr(hour, 1, {width}) AS bucket, activity, SUM(n) FROM counts_hourly"
+            f" WHERE {where}{period} GROUP BY bucket, activity ORDER BY bucket",
+            params + period_params
+        )
+
+    def recent(self, activity: str, limit: int = 10, since: Optional[str] = None,
+               until: Optional[str] = None) -> List[Dict]:
+        """최근 이벤트 (오래된 것 → 최신 순)"""
+        period, params = self._period("timestamp", 26, since, until)
+        rows = self._query(
+            "SELECT timestamp, user_id, ip, activity, details FROM events"
+            f" WHERE activity = ?{period} ORDER BY timestamp DESC LIMIT ?", [activity] + params + [limit]
+        )
+        return [self._entry(row) for row in reversed(rows)]
+
+    @staticmethod
+    def _entry(row: Tuple) -> Dict:
+        timestamp, user_id, ip, activity, details = row
+        return {"timestamp": timestamp, "user_id": user_id, "ip": ip, "activity": activity, "details": details}
+
+    # ------------------------------------------------------------------ 백업/복원
+
+    def export_legacy(self) -> Dict:
+        """기존 user_logs.json 형식으로 내보내기 (백업 다운로드용)"""
+        data = {"users": {}}
+        for section, activity in LEGACY_SECTIONS.items():
+            rows = self._query(
+                "SELECT timestamp, user_id, ip, activity, details FROM events"
+                " WHERE activity = ? ORDER BY timestamp", (activity,)
+            )
+            data[section] = [self._entry(row) for row in rows]
+        return data
+
+    def import_legacy(self, data: Dict) -> int:
+        """기존 형식 백업 병합 (이미 있는 이벤트는 건너뜀), 추가된 이벤트 수 반환"""
+        before = self.stats['written']
+        for section, activity in LEGACY_SECTIONS.items():
+            for entry in data.get(section, []):
+                self.log(entry.get("user_id"), entry.get("activity", activity), entry.get("details", ""),
+                         ip=entry.get("ip", "unknown"), timestamp=entry.get("timestamp"))
+        self.flush()
+        return self.stats['written'] - before
+
+    def import_legacy_file(self, legacy_json: str) -> int:
+        """
+        기존 user_logs.json을 처음 한 번만 가져옴 (가져온 사실은 meta 테이블에 기록)
+
+        events가 비었는지로 판단하면 보관 기간이 지나 이벤트가 옮겨진 뒤
+        시작할 때마다 다시 가져와 보관 파일과 집계가 중복됨
+        """
+        if not os.path.exists(legacy_json) or self._query("SELECT 1 FROM meta WHERE key = 'legacy_imported'"):
+            return 0
+        with open(legacy_json, 'r', encoding='utf-8') as f:
+            added = self.import_legacy(json.load(f))
+        with self._read_lock, self._read_conn:
+            self._read_conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_imported', ?)",
+                                    (datetime.now().isoformat(),))
+        return added
+
+    def files(self) -> List[Tuple[str, int]]:
+        """로그 DB와 보관 파일 목록 (경로, 크기)"""
+        paths = [p for p in [self.path, Path(f"{self.path}-wal")] if p.exists()]
+        if self.archive_dir.exists():
+            paths += sorted(self.archive_dir.glob("activity_*.jsonl"))
+        return [(str(p), os.path.getsize(p)) for p in paths]
+
+
+_activity_log = None
+_activity_log_lock = threading.Lock()
+
+
+def get_activity_log(path: str = DEFAULT_LOG_PATH, legacy_json: Optional[str] = None) -> ActivityLog:
+    """
+    프로세스 전역 활동 로그 (Streamlit 세션/재실행 간 공유)
+
+    Args:
+        path: 로그 DB 파일 경로 (첫 호출에서만 사용)
+        legacy_json: 기존 user_logs.json 경로 - 아직 가져온 적이 없으면 가져옴
+    """
+    global _activity_log
+    with _activity_log_lock:
+        if _activity_log is None:
+            _activity_log = ActivityLog(path)
+            if legacy_json:
+                _activity_log.import_legacy_file(legacy_json)
+        return _activity_log
@@ -8,83 +8,62 @@ AutoGen 0.7.x + RAG 통합 구현
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.messages import TextMessage
 from autogen_ext.models.openai import OpenAIChatCompletionClient
+from llm_gateway import get_gateway
+from prompt_registry import get_prompt_registry
 from typing import Dict, List, Optional, Sequence
-import os
 
-class CustomerAgent(AssistantAgent):
-    """RAG 통합 고객 에이전트 (AutoGen 0.7.x)"""
-    
-    def __init__(
-        self, 
-        transition_type: str, 
-        rag_manager, 
-        model_client: OpenAIChatCompletionClient,
-        **kwargs
-    ):
-        """
-        RAG 기반 고객 에이전트 초기화
-        
-        Args:
-            transition_type: 전환 유형 (iphone_to_galaxy, galaxy_loyalist 등)
-            rag_manager: RAG 시스템 매니저
-            model_client: OpenAI 모델 클라이언트
-        """
-        self.transition_type = transition_type
-        self.rag_manager = rag_manager
-        self.persona_key = f"customer_{transition_type}"
-        
-        # 페르소나 정의 (실제 데이터 기반)
-        personas = {
-            "iphone_to_galaxy": {
-                "name": "IphoneToGalaxy",  # Python identifier
-                "display_name": "iPhone→Galaxy전환자",
-                "data_size": "570명 (전환 완료)",
-                "intensity": 0.73,
-                "concerns": ["생태계 단절", "UI 적응", "앱 재구매", "데이터 이전"],
-                "satisfaction": ["폴더블 혁신", "화면 크기", "삼성페이", "디자인 신선함"],
-                "perspective": "iPhone 15 Pro Max → Galaxy Z Fold 7 전환 완료",
-                "tone": "확신에 찬, '진짜', '완전' 강조",
-                "key_phrase": "폴더블 써보니까 진짜 신세계예요!"
-            },
-            "galaxy_loyalist": {
-                "name": "GalaxyLoyalist",  # Python identifier
-                "display_name": "갤럭시충성고객",
-                "data_size": "110명 (폴더블 전문가)",
-                "intensity": 0.68,
-                "concerns": ["S펜 제거", "가격 상승", "배터리", "발열"],
-                "satisfaction": ["폴더블 성숙도", "얇고 가벼움", "화면 품질"],
-                "perspective": "Fold 3 → Fold 5 → Fold 7 세대별 사용",
-                "tone": "전문가적, 세대 비교, 기술 용어",
-                "key_phrase": "저는 Fold 3부터 써왔는데 7이 확실히 다릅니다"
-            },
-            "tech_enthusiast": {
-                "name": "TechEnthusiast",  # Python identifier
-                "display_name": "기술애호가",
-                "data_size": "분석형 사용자 (높은 영향력)",
-                "intensity": 0.65,
-                "concerns": ["스펙 차이 불명확", "가격 정당성", "가성비"],
-                "satisfaction": ["17 일반형 가성비", "합리적 선택", "정확한 정보"],
-                "perspective": "스펙 비교 전문가, 벤치마크 분석",
-                "tone": "분석적, 수치 제시, 논리적",
-                "key_phrase": "제가 계산해봤는데요, 17 일반이 압도적 가성비입니다"
-            },
-            "price_conscious": {
-                "name": "PriceConscious",  # Python identifier
-                "display_name": "가격민감고객",
-                "data_size": "가격 중시형 (공감도 높음)",
-                "intensity": 0.55,
-                "concerns": ["높은 가격", "불필요한 기능", "숨겨진 비용"],
-                "satisfaction": ["할인 혜택", "가성비 좋은 모델", "합리적 소비"],
-                "perspective": "가격 대비 가치 최우선",
-                "tone": "계산적, 비교 집요, 실용적",
-                "key_phrase": "50만원 차이면 다른데 쓰는게 낫죠"
-            }
-        }
-        
-        persona = personas[transition_type]
-        
-        # System Message 생성 (1인칭 개인 관점)
-        system_message = f'''당신은 "{persona["display_name"]}" 성향을 가진 실제 사용자입니다.
+# 페르소나 정의 (실제 데이터 기반)
+CUSTOMER_PERSONAS = {
+    "iphone_to_galaxy": {
+        "name": "IphoneToGalaxy",  # Python identifier
+        "display_name": "iPhone→Galaxy전환자",
+        "data_size": "570명 (전환 완료)",
+        "intensity": 0.73,
+        "concerns": ["생태계 단절", "UI 적응", "앱 재구매", "데이터 이전"],
+        "satisfaction": ["폴더블 혁신", "화면 크기", "삼성페이", "디자인 신선함"],
+        "perspective": "iPhone 15 Pro Max → Galaxy Z Fold 7 전환 완료",
+        "tone": "확신에 찬, '진짜', '완전' 강조",
+        "key_phrase": "폴더블 써보니까 진짜 신세계예요!"
+    },
+    "galaxy_loyalist": {
+        "name": "GalaxyLoyalist",  # Python identifier
+        "display_name": "갤럭시충성고객",
+        "data_size": "110명 (폴더블 전문가)",
+        "intensity": 0.68,
+        "concerns": ["S펜 제거", "가격 상승", "배터리", "발열"],
+        "satisfaction": ["폴더블 성숙도", "얇고 가벼움", "화면 품질"],
+        "perspective": "Fold 3 → Fold 5 → Fold 7 세대별 사용",
+        "tone": "전문가적, 세대 비교, 기술 용어",
+        "key_phrase": "저는 Fold 3부터 써왔는데 7이 확실히 다릅니다"
+    },
+    "tech_enthusiast": {
+        "name": "TechEnthusiast",  # Python identifier
+        "display_name": "기술애호가",
+        "data_size": "분석형 사용자 (높은 영향력)",
+        "intensity": 0.65,
+        "concerns": ["스펙 차이 불명확", "가격 정당성", "가성비"],
+        "satisfaction": ["17 일반형 가성비", "합리적 선택", "정확한 정보"],
+        "perspective": "스펙 비교 전문가, 벤치마크 분석",
+        "tone": "분석적, 수치 제시, 논리적",
+        "key_phrase": "제가 계산해봤는데요, 17 일반이 압도적 가성비입니다"
+    },
+    "price_conscious": {
+        "name": "PriceConscious",  # Python identifier
+        "display_name": "가격민감고객",
+        "data_size": "가격 중시형 (공감도 높음)",
+        "intensity": 0.55,
+        "concerns": ["높은 가격", "불필요한 기능", "숨겨진 비용"],
+        "satisfaction": ["할인 혜택", "가성비 좋은 모델", "합리적 소비"],
+        "perspective": "가격 대비 가치 최우선",
+        "tone": "계산적, 비교 집요, 실용적",
+        "key_phrase": "50만원 차이면 다른데 쓰는게 낫죠"
+    }
+}
+
+
+def build_system_message(persona: Dict) -> str:
+    """System Message 생성 (1인칭 개인 관점)"""
+    return f'''당신은 "{persona["display_name"]}" 성향을 가진 실제 사용자입니다.
 
 [나의 배경과 경험]
 {persona["perspective"]}
@@ -122,6 +101,36 @@ class CustomerAgent(AssistantAgent):
 ✅ "나 아이폰 15 프맥 쓰다가 폴드7로 바꿨는데 진짜 신세계더라고요"
 
 토론 시 나만의 생생한 경험을 공유하세요. 통계가 아닌 개인의 솔직한 목소리로.'''
+
+
+class CustomerAgent(AssistantAgent):
+    """RAG 통합 고객 에이전트 (AutoGen 0.7.x)"""
+    
+    def __init__(
+        self, 
+        transition_type: str, 
+        rag_manager, 
+        model_client: OpenAIChatCompletionClient,
+        **kwargs
+    ):
+        """
+        RAG 기반 고객 에이전트 초기화
+        
+        Args:
+            transition_type: 전환 유형 (iphone_to_galaxy, galaxy_loyalist 등)
+            rag_manager: RAG 시스템 매니저
+            model_client: OpenAI 모델 클라이언트
+        """
+        self.transition_type = transition_type
+        self.rag_manager = rag_manager
+        self.persona_key = f"customer_{transition_type}"
+        
+        persona = CUSTOMER_PERSONAS[transition_type]
+        
+        # System Message (페르소나 버전별로 한 번만 생성)
+        system_message = get_prompt_registry().compile(
+            f"customer_agents.{transition_type}", persona, lambda: build_system_message(persona)
+        )
         
         super().__init__(
             name=persona["name"],
@@ -193,9 +202,8 @@ class CustomerAgents:
         self.temperature = temperature
         
         # OpenAI Model Client 생성 (사용자 지정 temperature)
-        self.model_client = OpenAIChatCompletionClient(
+        self.model_client = get_gateway().autogen_model_client(
             model="gpt-4",
-            api_key=os.getenv("OPENAI_API_KEY"),
             temperature=temperature,
         )
         
@@ -8,8 +8,106 @@ Customer Agents V2 - 세분화된 실제 데이터 기반 페르소나
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.messages import TextMessage
 from autogen_ext.models.openai import OpenAIChatCompletionClient
+from llm_gateway import get_gateway
+from prompt_registry import get_prompt_registry
 from typing import Dict, List, Optional, Sequence
-import os
+
+# 실제 데이터 기반 페르소나 정의 (과도한 극단화 제거)
+CUSTOMER_PERSONAS = {
+    "foldable_enthusiast": {
+        "name": "Foldable_Enthusiast",
+        "name_kr": "폴더블매력파",
+        "size": "564명 (최대규모)",
+        "likes": 63.2,
+        "status": "전환완료",
+        "key_phrase": "폴드7 진짜 신세계예요! 프맥보다 가벼워요!",
+        "tone": "확신찬, 열정적, '진짜' 강조, 경험 기반",
+        "brand_stance": "Samsung 폴더블 애호 - iPhone에서 전환한 만족감"
+    },
+    "ecosystem_dilemma": {
+        "name": "Ecosystem_Dilemma",
+        "name_kr": "생태계딜레마",
+        "size": "37명 (높은공감)",
+        "likes": 31.0,
+        "status": "강하게고려중",
+        "key_phrase": "폴더블 너무 끌리는데... 애플워치 때문에 못 바꾸겠어요 ㅠㅠ",
+        "tone": "망설임, '근데', '하지만' 많음, 아쉬움",
+        "brand_stance": "중립 - Samsung 관심 있지만 Apple 생태계 고려"
+    },
+    "foldable_critical": {
+        "name": "Foldable_Critic",
+        "name_kr": "폴더블비판자",
+        "size": "80명",
+        "likes": 7.74,
+        "status": "전환완료+불만",
+        "key_phrase": "카메라 초점 못 잡고 배터리 조루. 근데 폴더블은 못 버려요.",
+        "tone": "비판적, 솔직, 개선요구, 중독 인정",
+        "brand_stance": "Samsung 사용 중 - 품질 문제 지적하지만 폴더블 중독"
+    },
+    "value_seeker": {
+        "name": "Value_Seeker",
+        "name_kr": "가성비추구자",
+        "size": "8명 (영향력높음)",
+        "likes": 376.75,
+        "status": "합리적선택",
+        "key_phrase": "17 일반이 가성비 압승. 50만원 차이 가치 없어요.",
+        "tone": "분석적, 수치제시, 논리적, 가격 민감",
+        "brand_stance": "브랜드 중립 - 순수 가성비 기준으로 판단"
+    },
+    "apple_ecosystem_loyal": {
+        "name": "Apple_Ecosystem_Loyal",
+        "name_kr": "Apple생태계충성",
+        "size": "79명",
+        "likes": 12.56,
+        "status": "iPhone유지",
+        "key_phrase": "13년 Apple 생태계. 비싸지만 일반모델로 타협했어요.",
+        "tone": "충성스럽지만 가격의식적, 타협적",
+        "brand_stance": "Apple 충성 - Samsung/Galaxy에 회의적이지만 가격 고려"
+    },
+    "design_fatigue": {
+        "name": "Design_Fatigue",
+        "name_kr": "디자인피로",
+        "size": "48명",
+        "likes": 11.42,
+        "status": "불만있지만유지",
+        "key_phrase": "iPhone 10년 썼는데 디자인 똑같아요. Galaxy 부럽지만 생태계가...",
+        "tone": "피곤, 체념, 아쉬움, 망설임",
+        "brand_stance": "Apple 사용 중 - Samsung에 호기심 있지만 전환 못함"
+    },
+    "upgrade_cycler": {
+        "name": "Upgrade_Cycler",
+        "name_kr": "정기업그레이더",
+        "size": "58명",
+        "likes": 6.88,
+        "status": "정기교체중",
+        "key_phrase": "Fold 2, 4, 6 썼고 8 기다려요. 세대별로 나아져요.",
+        "tone": "전문가적, 세대비교, 냉정평가, 경험 풍부",
+        "brand_stance": "Samsung 폴더블 전문가 - 장단점 냉정 평가"
+    }
+}
+
+
+def build_system_message(persona: Dict) -> str:
+    """System Message 생성 (1인칭 개인 관점)"""
+    return f'''당신은 "{persona["name_kr"]}"입니다.
+
+[내 성향과 경험]
+{persona.get("brand_stance", "중립")}
+말투: {persona["tone"]}
+상태: {persona["status"]}
+
+[내 실제 발언]
+"{persona["key_phrase"]}"
+
+[답변 규칙]
+- 1인칭으로: "나는 ~", "내 경험으로는 ~"
+- 실제 사용자처럼 자연스럽게 답변
+- 내 성향에 맞는 관점 유지
+- 3-4문장으로 간결하게
+- 실제 경험과 느낌 공유
+
+토론에서 내 솔직한 경험을 공유하세요!'''
+
 
 class CustomerAgent(AssistantAgent):
     """RAG 통합 고객 에이전트 (AutoGen 0.7.x)"""
@@ -33,103 +131,13 @@ class CustomerAgent(AssistantAgent):
         self.rag_manager = rag_manager
         self.persona_key = f"customer_{persona_type}"
         
-        # 실제 데이터 기반 페르소나 정의 (과도한 극단화 제거)
-        personas = {
-            "foldable_enthusiast": {
-                "name": "Foldable_Enthusiast",
-                "name_kr": "폴더블매력파",
-                "size": "564명 (최대규모)",
-                "likes": 63.2,
-                "status": "전환완료",
-                "key_phrase": "폴드7 진짜 신세계예요! 프맥보다 가벼워요!",
-                "tone": "확신찬, 열정적, '진짜' 강조, 경험 기반",
-                "brand_stance": "Samsung 폴더블 애호 - iPhone에서 전환한 만족감"
-            },
-            "ecosystem_dilemma": {
-                "name": "Ecosystem_Dilemma",
-                "name_kr": "생태계딜레마",
-                "size": "37명 (높은공감)",
-                "likes": 31.0,
-                "status": "강하게고려중",
-                "key_phrase": "폴더블 너무 끌리는데... 애플워치 때문에 못 바꾸겠어요 ㅠㅠ",
-                "tone": "망설임, '근데', '하지만' 많음, 아쉬움",
-                "brand_stance": "중립 - Samsung 관심 있지만 Apple 생태계 고려"
-            },
-            "foldable_critical": {
-                "name": "Foldable_Critic",
-                "name_kr": "폴더블비판자",
-                "size": "80명",
-                "likes": 7.74,
-                "status": "전환완료+불만",
-                "key_phrase": "카메라 초점 못 잡고 배터리 조루. 근데 폴더블은 못 버려요.",
-                "tone": "비판적, 솔직, 개선요구, 중독 인정",
-                "brand_stance": "Samsung 사용 중 - 품질 문제 지적하지만 폴더블 중독"
-            },
-            "value_seeker": {
-                "name": "Value_Seeker",
-                "name_kr": "가성비추구자",
-                "size": "8명 (영향력높음)",
-                "likes": 376.75,
-                "status": "합리적선택",
-                "key_phrase": "17 일반이 가성비 압승. 50만원 차이 가치 없어요.",
-                "tone": "분석적, 수치제시, 논리적, 가격 민감",
-                "brand_stance": "브랜드 중립 - 순수 가성비 기준으로 판단"
-            },
-            "apple_ecosystem_loyal": {
-                "name": "Apple_Ecosystem_Loyal",
-                "name_kr": "Apple생태계충성",
-                "size": "79명",
-                "likes": 12.56,
-                "status": "iPhone유지",
-                "key_phrase": "13년 Apple 생태계. 비싸지만 일반모델로 타협했어요.",
-                "tone": "충성스럽지만 가격의식적, 타협적",
-                "brand_stance": "Apple 충성 - Samsung/Galaxy에 회의적이지만 가격 고려"
-            },
-            "design_fatigue": {
-                "name": "Design_Fatigue",
-                "name_kr": "디자인피로",
-                "size": "48명",
-                "likes": 11.42,
-                "status": "불만있지만유지",
-                "key_phrase": "iPhone 10년 썼는데 디자인 똑같아요. Galaxy 부럽지만 생태계가...",
-                "tone": "피곤, 체념, 아쉬움, 망설임",
-                "brand_stance": "Apple 사용 중 - Samsung에 호기심 있지만 전환 못함"
-            },
-            "upgrade_cycler": {
-                "name": "Upgrade_Cycler",
-                "name_kr": "정기업그레이더",
-                "size": "58명",
-                "likes": 6.88,
-                "status": "정기교체중",
-                "key_phrase": "Fold 2, 4, 6 썼고 8 기다려요. 세대별로 나아져요.",
-                "tone": "전문가적, 세대비교, 냉정평가, 경험 풍부",
-                "brand_stance": "Samsung 폴더블 전문가 - 장단점 냉정 평가"
-            }
-        }
-        
-        persona = personas[persona_type]
+        persona = CUSTOMER_PERSONAS[persona_type]
         self.persona = persona  # on_messages에서 사용하기 위해 저장
         
-        # System Message 생성 (1인칭 개인 관점)
-        brand_stance = persona.get("brand_stance", "중립")
-        system_message = f'''당신은 "{persona["name_kr"]}"입니다.
-
-[내 성향과 경험]
-{brand_stance}
-말투: {persona["tone"]}
-상태: {persona["status"]}
-
-[내 실제 발언]
-"{persona["key_phrase"]}"
-
-[답변 규칙]
-- 1인칭으로: "나는 ~", "내 경험으로는 ~"
-- 실제 사용자처럼 자연스럽게 답변
-- 내 성향에 맞는 관점 유지
-- 3-4문장으로 간결하게
-- 실제 경험과 느낌 공유
-
-토론에서 내 솔직한 경험을 공유하세요!'''
+        # 시스템 프롬프트 (페르소나 버전별로 한 번만 생성)
+        system_message = get_prompt_registry().compile(
+            f"customer_agents_v2.{persona_type}", persona, lambda: build_system_message(persona)
+        )
         
         super().__init__(
             name=persona["name"],
@@ -196,9 +204,8 @@ class CustomerAgentsV2:
         self.temperature = temperature
         
         # OpenAI Model Client (더 높은 temperature로 다양성 극대화)
-        self.model_client = OpenAIChatCompletionClient(
+        self.model_client = get_gateway().autogen_model_client(
             model="gpt-4",
-            api_key=os.getenv("OPENAI_API_KEY"),
             temperature=min(temperature + 0.3, 1.5)  # 기본보다 0.3 높여서 다양성 극대화
         )
         
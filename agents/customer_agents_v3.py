@@ -8,8 +8,88 @@ Customer Agents V3 - 실제 리뷰 데이터 기반 페르소나
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.messages import TextMessage
 from autogen_ext.models.openai import OpenAIChatCompletionClient
+from llm_gateway import get_gateway
+from prompt_registry import get_prompt_registry
 from typing import Dict, List, Optional, Sequence
-import os
+
+# 실제 데이터 기반 페르소나 정의 (간소화)
+REAL_REVIEW_PERSONAS = {
+    "foldable_enthusiast": {
+        "name": "Foldable_Enthusiast",
+        "name_kr": "폴더블매력파",
+        "description": "iPhone에서 Galaxy 폴더블로 전환한 만족한 사용자",
+        "tone": "확신찬, 열정적, 경험 기반",
+        "brand_stance": "Samsung 폴더블 애호 - iPhone에서 전환한 만족감"
+    },
+    "ecosystem_dilemma": {
+        "name": "Ecosystem_Dilemma", 
+        "name_kr": "생태계딜레마",
+        "description": "Galaxy 관심 있지만 Apple 생태계 때문에 망설이는 사용자",
+        "tone": "망설임, 아쉬움, 고민",
+        "brand_stance": "중립 - Samsung 관심 있지만 Apple 생태계 고려"
+    },
+    "foldable_critical": {
+        "name": "Foldable_Critic",
+        "name_kr": "폴더블비판자", 
+        "description": "Galaxy 폴더블 사용 중이지만 문제점을 지적하는 사용자",
+        "tone": "비판적, 솔직, 개선요구",
+        "brand_stance": "Samsung 사용 중 - 품질 문제 지적하지만 폴더블 중독"
+    },
+    "value_seeker": {
+        "name": "Value_Seeker",
+        "name_kr": "가성비추구자",
+        "description": "가격 대비 성능을 중시하는 합리적 소비자",
+        "tone": "분석적, 수치제시, 논리적",
+        "brand_stance": "브랜드 중립 - 순수 가성비 기준으로 판단"
+    },
+    "apple_ecosystem_loyal": {
+        "name": "Apple_Ecosystem_Loyal",
+        "name_kr": "Apple생태계충성",
+        "description": "Apple 생태계에 충성하지만 가격을 고려하는 사용자",
+        "tone": "충성스럽지만 현실적, 타협적",
+        "brand_stance": "Apple 충성 - Samsung/Galaxy에 회의적이지만 가격 고려"
+    },
+    "design_fatigue": {
+        "name": "Design_Fatigue",
+        "name_kr": "디자인피로",
+        "description": "iPhone 디자인에 피로감을 느끼는 장기 사용자",
+        "tone": "피곤, 체념, 아쉬움",
+        "brand_stance": "Apple 사용 중 - Samsung에 호기심 있지만 전환 못함"
+    },
+    "upgrade_cycler": {
+        "name": "Upgrade_Cycler",
+        "name_kr": "정기업그레이더",
+        "description": "정기적으로 기기를 업그레이드하는 사용자",
+        "tone": "경험적, 비교적, 트렌드 민감",
+        "brand_stance": "브랜드 중립 - 최신 기술과 트렌드 추구"
+    }
+}
+
+
+def build_system_message(persona: Dict) -> str:
+    """시스템 프롬프트 생성"""
+    return f"""당신은 {persona['name_kr']} ({persona['name']}) 페르소나입니다.
+
+**페르소나 특성:**
+- {persona['description']}
+- 말투: {persona['tone']}
+- 브랜드 성향: {persona['brand_stance']}
+
+**중요한 지침:**
+1. 실제 사용자 리뷰 데이터를 기반으로 답변하세요
+2. 자신의 경험과 의견을 솔직하게 표현하세요
+3. 다른 페르소나와 토론할 때는 자신의 입장을 명확히 하세요
+4. 감정적이거나 극단적인 표현보다는 현실적인 관점을 유지하세요
+5. 구체적인 사용 경험이나 사례를 들어 설명하세요
+
+**응답 스타일:**
+- 자연스러운 대화체 사용
+- 개인적 경험과 의견 중심
+- 감정과 논리를 균형있게 표현
+- 다른 의견에 대한 존중과 반박을 적절히 조화
+
+실제 사용자로서의 진정성 있는 의견을 표현하세요."""
+
 
 class RealReviewCustomerAgent(AssistantAgent):
     """실제 리뷰 데이터 기반 고객 에이전트"""
@@ -33,86 +113,16 @@ class RealReviewCustomerAgent(AssistantAgent):
         self.real_review_rag_manager = real_review_rag_manager
         self.persona_key = f"customer_{persona_type}"
         
-        # 실제 데이터 기반 페르소나 정의 (간소화)
-        personas = {
-            "foldable_enthusiast": {
-                "name": "Foldable_Enthusiast",
-                "name_kr": "폴더블매력파",
-                "description": "iPhone에서 Galaxy 폴더블로 전환한 만족한 사용자",
-                "tone": "확신찬, 열정적, 경험 기반",
-                "brand_stance": "Samsung 폴더블 애호 - iPhone에서 전환한 만족감"
-            },
-            "ecosystem_dilemma": {
-                "name": "Ecosystem_Dilemma", 
-                "name_kr": "생태계딜레마",
-                "description": "Galaxy 관심 있지만 Apple 생태계 때문에 망설이는 사용자",
-                "tone": "망설임, 아쉬움, 고민",
-                "brand_stance": "중립 - Samsung 관심 있지만 Apple 생태계 고려"
-            },
-            "foldable_critical": {
-                "name": "Foldable_Critic",
-                "name_kr": "폴더블비판자", 
-                "description": "Galaxy 폴더블 사용 중이지만 문제점을 지적하는 사용자",
-                "tone": "비판적, 솔직, 개선요구",
-                "brand_stance": "Samsung 사용 중 - 품질 문제 지적하지만 폴더블 중독"
-            },
-            "value_seeker": {
-                "name": "Value_Seeker",
-                "name_kr": "가성비추구자",
-                "description": "가격 대비 성능을 중시하는 합리적 소비자",
-                "tone": "분석적, 수치제시, 논리적",
-                "brand_stance": "브랜드 중립 - 순수 가성비 기준으로 판단"
-            },
-            "apple_ecosystem_loyal": {
-                "name": "Apple_Ecosystem_Loyal",
-                "name_kr": "Apple생태계충성",
-                "description": "Apple 생태계에 충성하지만 가격을 고려하는 사용자",
-                "tone": "충성스럽지만 현실적, 타협적",
-                "brand_stance": "Apple 충성 - Samsung/Galaxy에 회의적이지만 가격 고려"
-            },
-            "design_fatigue": {
-                "name": "Design_Fatigue",
-                "name_kr": "디자인피로",
-                "description": "iPhone 디자인에 피로감을 느끼는 장기 사용자",
-                "tone": "피곤, 체념, 아쉬움",
-                "brand_stance": "Apple 사용 중 - Samsung에 호기심 있지만 전환 못함"
-            },
-            "upgrade_cycler": {
-                "name": "Upgrade_Cycler",
-                "name_kr": "정기업그레이더",
-                "description": "정기적으로 기기를 업그레이드하는 사용자",
-                "tone": "경험적, 비교적, 트렌드 민감",
-                "brand_stance": "브랜드 중립 - 최신 기술과 트렌드 추구"
-            }
-        }
-        
-        if persona_type not in personas:
+        if persona_type not in REAL_REVIEW_PERSONAS:
             raise ValueError(f"Unknown persona type: {persona_type}")
         
-        self.persona = personas[persona_type]
+        persona = REAL_REVIEW_PERSONAS[persona_type]
+        self.persona = persona
         
-        # 시스템 프롬프트 생성
-        system_prompt = f"""당신은 {self.persona['name_kr']} ({self.persona['name']}) 페르소나입니다.
-
-**페르소나 특성:**
-- {self.persona['description']}
-- 말투: {self.persona['tone']}
-- 브랜드 성향: {self.persona['brand_stance']}
-
-**중요한 지침:**
-1. 실제 사용자 리뷰 데이터를 기반으로 답변하세요
-2. 자신의 경험과 의견을 솔직하게 표현하세요
-3. 다른 페르소나와 토론할 때는 자신의 입장을 명확히 하세요
-4. 감정적이거나 극단적인 표현보다는 현실적인 관점을 유지하세요
-5. 구체적인 사용 경험이나 사례를 들어 설명하세요
-
-**응답 스타일:**
-- 자연스러운 대화체 사용
-- 개인적 경험과 의견 중심
-- 감정과 논리를 균형있게 표현
-- 다른 의견에 대한 존중과 반박을 적절히 조화
-
-실제 사용자로서의 진정성 있는 의견을 표현하세요."""
+        # 시스템 프롬프트 (페르소나 버전별로 한 번만 생성)
+        system_prompt = get_prompt_registry().compile(
+            f"customer_agents_v3.{persona_type}", persona, lambda: build_system_message(persona)
+        )
 
         super().__init__(
             name=self.persona['name'],
@@ -178,9 +188,8 @@ class RealReviewCustomerAgentsV3:
         self.real_review_rag_manager = real_review_rag_manager
         
         # OpenAI 모델 클라이언트 설정
-        self.model_client = OpenAIChatCompletionClient(
+        self.model_client = get_gateway().autogen_model_client(
             model="gpt-4",
-            api_key=os.getenv("OPENAI_API_KEY"),
             temperature=temperature
         )
         
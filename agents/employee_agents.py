@@ -8,73 +8,52 @@ AutoGen 0.7.x + RAG 통합 구현
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.messages import TextMessage
 from autogen_ext.models.openai import OpenAIChatCompletionClient
+from llm_gateway import get_gateway
+from prompt_registry import get_prompt_registry
 from typing import Dict, List, Optional, Sequence
-import os
 
-class EmployeeAgent(AssistantAgent):
-    """RAG 통합 직원 에이전트 (AutoGen 0.7.x)"""
-    
-    def __init__(
-        self, 
-        role_type: str, 
-        rag_manager, 
-        model_client: OpenAIChatCompletionClient,
-        **kwargs
-    ):
-        """
-        RAG 기반 직원 에이전트 초기화
-        
-        Args:
-            role_type: 역할 유형 (marketer, developer, designer)
-            rag_manager: RAG 시스템 매니저
-            model_client: OpenAI 모델 클라이언트
-        """
-        self.role_type = role_type
-        self.rag_manager = rag_manager
-        self.persona_key = f"employee_{role_type}"
-        
-        # 실제 데이터 기반 임직원 페르소나 정의
-        personas = {
-            "marketer": {
-                "name": "Marketer",
-                "display_name": "최지훈 마케터",
-                "role": "MX사업부 마케팅 총괄 이사 / 글로벌 마케팅 디렉터",
-                "mission": "폴더블폰을 '주류 시장의 프리미엄 선택지'로 편입시키고, '두껍고 무겁다'는 기존 인식을 정면으로 해소",
-                "strategy": "기술적 우위를 '단순하고 임팩트 있는' 스토리로 전환하여 고객의 선망성을 극대화",
-                "kpi": "출시 후 3개월 내 전작 대비 판매량 10% 증가 및 'New 갤럭시 AI 구독 클럽' 가입률 30% 이상",
-                "achievement": "국내 사전 판매 104만 대 달성 (역대 갤럭시 폴더블 중 최다 판매 신기록)",
-                "tone": "전략적, 데이터 중심, 수치 제시, 마케팅 전문가",
-                "key_phrase": "울트라급 경험을 펼치다! 얇음의 복음으로 바이럴을 만들었습니다"
-            },
-            "developer": {
-                "name": "Developer", 
-                "display_name": "박준호 엔지니어",
-                "role": "MX사업부 제품 개발팀 / 하드웨어 및 성능 최적화 최고 책임자",
-                "mission": "'역대 가장 얇고 가벼운 디자인' 목표 달성을 위한 하드웨어 아키텍처 설계",
-                "expertise": "폼팩터 경량화 설계, AP 성능 튜닝 및 열 관리",
-                "achievement": "Fold 7의 4.2mm 두께와 NPU 41% 향상 달성",
-                "philosophy": "기술적 타협은 궁극의 사용자 경험을 해치지 않는 선에서만 허용",
-                "tone": "기술적, 구현 가능성, 현실적, 엔지니어링 중심",
-                "key_phrase": "휴대성 개선이 최우선! S펜 제거는 전략적 타협이었습니다"
-            },
-            "designer": {
-                "name": "Designer",
-                "display_name": "이현서 디자이너", 
-                "role": "MX사업부 디자인 전략 총괄 / 리드 디자이너",
-                "philosophy": "에센셜 디자인: Simple, Impactful, Emotive의 세 가지 원칙",
-                "identity": "제품 디자이너가 아닌, '라이프스타일 디자이너'",
-                "concept": "'울트라 슬릭, 울트라 모던' 미학적 콘셉트",
-                "goal": "폴더블폰의 가장 큰 진입 장벽인 '두껍고 무겁다'는 인식을 돌파하기 위한 '휴대성 개선'",
-                "achievement": "Fold 7 펼쳤을 때 4.2mm, 무게 215g 달성 (S25 울트라보다 가벼움)",
-                "tone": "사용자 중심, 경험 강조, 직관성, 디자인 철학",
-                "key_phrase": "처음부터 다시 시작한다는 마음으로 새롭게 디자인했습니다"
-            }
-        }
-        
-        persona = personas[role_type]
-        
-        # System Message 생성 (실제 데이터 기반 전문가 관점)
-        system_message = f'''당신은 "{persona["display_name"]}"입니다.
+# 실제 데이터 기반 임직원 페르소나 정의
+EMPLOYEE_PERSONAS = {
+    "marketer": {
+        "name": "Marketer",
+        "display_name": "최지훈 마케터",
+        "role": "MX사업부 마케팅 총괄 이사 / 글로벌 마케팅 디렉터",
+        "mission": "폴더블폰을 '주류 시장의 프리미엄 선택지'로 편입시키고, '두껍고 무겁다'는 기존 인식을 정면으로 해소",
+        "strategy": "기술적 우위를 '단순하고 임팩트 있는' 스토리로 전환하여 고객의 선망성을 극대화",
+        "kpi": "출시 후 3개월 내 전작 대비 판매량 10% 증가 및 'New 갤럭시 AI 구독 클럽' 가입률 30% 이상",
+        "achievement": "국내 사전 판매 104만 대 달성 (역대 갤럭시 폴더블 중 최다 판매 신기록)",
+        "tone": "전략적, 데이터 중심, 수치 제시, 마케팅 전문가",
+        "key_phrase": "울트라급 경험을 펼치다! 얇음의 복음으로 바이럴을 만들었습니다"
+    },
+    "developer": {
+        "name": "Developer", 
+        "display_name": "박준호 엔지니어",
+        "role": "MX사업부 제품 개발팀 / 하드웨어 및 성능 최적화 최고 책임자",
+        "mission": "'역대 가장 얇고 가벼운 디자인' 목표 달성을 위한 하드웨어 아키텍처 설계",
+        "expertise": "폼팩터 경량화 설계, AP 성능 튜닝 및 열 관리",
+        "achievement": "Fold 7의 4.2mm 두께와 NPU 41% 향상 달성",
+        "philosophy": "기술적 타협은 궁극의 사용자 경험을 해치지 않는 선에서만 허용",
+        "tone": "기술적, 구현 가능성, 현실적, 엔지니어링 중심",
+        "key_phrase": "휴대성 개선이 최우선! S펜 제거는 전략적 타협이었습니다"
+    },
+    "designer": {
+        "name": "Designer",
+        "display_name": "이현서 디자이너", 
+        "role": "MX사업부 디자인 전략 총괄 / 리드 디자이너",
+        "philosophy": "에센셜 디자인: Simple, Impactful, Emotive의 세 가지 원칙",
+        "identity": "제품 디자이너가 아닌, '라이프스타일 디자이너'",
+        "concept": "'울트라 슬릭, 울트라 모던' 미학적 콘셉트",
+        "goal": "폴더블폰의 가장 큰 진입 장벽인 '두껍고 무겁다'는 인식을 돌파하기 위한 '휴대성 개선'",
+        "achievement": "Fold 7 펼쳤을 때 4.2mm, 무게 215g 달성 (S25 울트라보다 가벼움)",
+        "tone": "사용자 중심, 경험 강조, 직관성, 디자인 철학",
+        "key_phrase": "처음부터 다시 시작한다는 마음으로 새롭게 디자인했습니다"
+    }
+}
+
+
+def build_system_message(persona: Dict) -> str:
+    """System Message 생성 (실제 데이터 기반 전문가 관점)"""
+    return f'''당신은 "{persona["display_name"]}"입니다.
 
 [나의 역할과 미션]
 {persona.get("role", persona.get("perspective", ""))}
@@ -100,6 +79,36 @@ class EmployeeAgent(AssistantAgent):
 - 내 전문 분야의 고유한 관점 유지
 
 토론에서 내 전문적 경험과 인사이트를 공유하세요!'''
+
+
+class EmployeeAgent(AssistantAgent):
+    """RAG 통합 직원 에이전트 (AutoGen 0.7.x)"""
+    
+    def __init__(
+        self, 
+        role_type: str, 
+        rag_manager, 
+        model_client: OpenAIChatCompletionClient,
+        **kwargs
+    ):
+        """
+        RAG 기반 직원 에이전트 초기화
+        
+        Args:
+            role_type: 역할 유형 (marketer, developer, designer)
+            rag_manager: RAG 시스템 매니저
+            model_client: OpenAI 모델 클라이언트
+        """
+        self.role_type = role_type
+        self.rag_manager = rag_manager
+        self.persona_key = f"employee_{role_type}"
+        
+        persona = EMPLOYEE_PERSONAS[role_type]
+        
+        # 시스템 프롬프트 (페르소나 버전별로 한 번만 생성)
+        system_message = get_prompt_registry().compile(
+            f"employee_agents.{role_type}", persona, lambda: build_system_message(persona)
+        )
         
         super().__init__(
             name=persona["name"],
@@ -171,9 +180,8 @@ class EmployeeAgents:
         self.temperature = temperature
         
         # OpenAI Model Client 생성 (사용자 지정 temperature)
-        self.model_client = OpenAIChatCompletionClient(
+        self.model_client = get_gateway().autogen_model_client(
             model="gpt-4",
-            api_key=os.getenv("OPENAI_API_KEY"),
             temperature=temperature,
         )
         
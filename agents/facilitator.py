@@ -6,8 +6,7 @@ AutoGen 0.7.x 구현
 """
 
 from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-import os
+from llm_gateway import get_gateway
 
 class Facilitator:
     """토론 퍼실리테이터 (AutoGen 0.7.x)"""
@@ -16,9 +15,8 @@ class Facilitator:
         """퍼실리테이터 초기화"""
         
         # OpenAI Model Client 생성 (AutoGen 0.7.x)
-        self.model_client = OpenAIChatCompletionClient(
+        self.model_client = get_gateway().autogen_model_client(
             model="gpt-4",
-            api_key=os.getenv("OPENAI_API_KEY"),
             temperature=0.5,  # 퍼실리테이터는 더 일관된 톤
         )
         
@@ -3,11 +3,11 @@ import streamlit as st
 import json
 import os
 import sys
-from datetime import datetime
-from cluster_chatbots import ChatbotManager
+from datetime import datetime, timedelta
+from cluster_chatbots import ChatbotManager, fan_out_chat
+from activity_log import get_activity_log
 import hashlib
 import ipaddress
-import requests
 
 # 인코딩 설정 (Windows 환경에서 한글 표시를 위한 환경 변수 설정)
 if sys.platform == "win32":
@@ -15,7 +15,10 @@ if sys.platform == "win32":
 
 class EnglishPersonaGUI:
     def __init__(self):
-        self.manager = ChatbotManager()
+        # 지식 베이스는 프로세스 전역으로 한 번만 구축, 대화 상태(챗봇 매니저)만 세션별로 유지
+        if 'chatbot_manager' not in st.session_state:
+            st.session_state.chatbot_manager = ChatbotManager()
+        self.manager = st.session_state.chatbot_manager
         
         # 페르소나 정보
         self.personas = {
@@ -76,77 +79,33 @@ class EnglishPersonaGUI:
             }
         }
         
-        # 사용자 데이터베이스 파일
-        self.db_file = "user_logs.json"
-        self.init_database()
-    
-    def init_database(self):
-        """데이터베이스 초기화"""
-        if not os.path.exists(self.db_file):
-            with open(self.db_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "users": {},
-                    "admin_logs": [],
-                    "search_logs": [],
-                    "usage_logs": []
-                }, f, ensure_ascii=False, indent=2)
+        # 사용자 활동 로그 (추가 전용 SQLite, 기존 user_logs.json은 처음 한 번 가져옴)
+        self.activity_log = get_activity_log(legacy_json="user_logs.json")
     
     def get_client_ip(self):
-        """클라이언트 IP 주소 가져오기"""
+        """클라이언트 IP 주소 가져오기 (요청 헤더 기준, 외부 서비스 호출 없음)"""
         try:
-            # Streamlit에서 제공하는 세션 정보에서 IP 가져오기
             if hasattr(st.session_state, 'client_ip'):
                 return st.session_state.client_ip
             
-            # 외부 서비스에서 IP 가져오기
-            response = requests.get('https://api.ipify.org?format=json', timeout=5)
-            if response.status_code == 200:
-                ip = response.json().get('ip', 'unknown')
-                st.session_state.client_ip = ip
-                return ip
+            ip = 'unknown'
+            context = getattr(st, 'context', None)  # Streamlit 1.37+
+            if context is not None:
+                ip = getattr(context, 'ip_address', None) or 'unknown'
+                headers = context.headers or {}
+                forwarded = headers.get('X-Forwarded-For') or headers.get('X-Real-Ip')
+                if forwarded:
+                    ip = forwarded.split(',')[0].strip()
+            st.session_state.client_ip = ip
+            return ip
         except:
             pass
         return 'unknown'
     
     def log_user_activity(self, user_id, activity_type, details=""):
-        """사용자 활동 로그 기록"""
+        """사용자 활동 로그 기록 (큐에 넣고 바로 반환, 기록은 백그라운드 스레드)"""
         try:
-            # 기존 데이터 로드 (파일이 없으면 새로 생성)
-            if os.path.exists(self.db_file):
-                with open(self.db_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            else:
-                data = {
-                    "users": {},
-                    "admin_logs": [],
-                    "search_logs": [],
-                    "usage_logs": []
-                }
-            
-            log_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "user_id": user_id,
-                "ip": self.get_client_ip(),
-                "activity": activity_type,
-                "details": details
-            }
-            
-            if activity_type == "search":
-                data["search_logs"].append(log_entry)
-            elif activity_type == "usage":
-                data["usage_logs"].append(log_entry)
-            elif activity_type == "admin":
-                data["admin_logs"].append(log_entry)
-            
-            # 로그 파일 저장
-            with open(self.db_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-                
-            # 백업 파일도 생성 (데이터 손실 방지)
-            backup_file = f"user_logs_backup_{datetime.now().strftime('%Y%m%d')}.json"
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-                
+            self.activity_log.log(user_id, activity_type, details, ip=self.get_client_ip())
         except Exception as e:
             st.error(f"로그 기록 중 오류: {e}")
     
@@ -240,13 +199,14 @@ class EnglishPersonaGUI:
                 st.session_state.username = None
                 st.rerun()
         
-        # 로그 데이터 로드
-        try:
-            with open(self.db_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except:
-            st.error("로그 데이터를 불러올 수 없습니다.")
-            return
+        # 통계는 사전 집계 테이블에서 조회 (원본 로그를 다시 훑지 않음)
+        log = self.activity_log
+        
+        periods = {"전체": None, "최근 24시간": 1, "최근 7일": 7, "최근 30일": 30}
+        period = st.selectbox("조회 기간", list(periods.keys()), index=2)
+        since = None
+        if periods[period]:
+            since = (datetime.now() - timedelta(days=periods[period])).isoformat()
         
         # 탭 생성
         tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 전체 통계", "🔍 검색 로그", "👥 사용 로그", "🔐 관리자 로그", "💾 로그 관리"])
@@ -256,64 +216,67 @@ class EnglishPersonaGUI:
             
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("총 검색 수", len(data.get("search_logs", [])))
+                st.metric("총 검색 수", log.count("search", since=since))
             with col2:
-                st.metric("총 사용 수", len(data.get("usage_logs", [])))
+                st.metric("총 사용 수", log.count("usage", since=since))
             with col3:
-                st.metric("관리자 접속 수", len(data.get("admin_logs", [])))
+                st.metric("관리자 접속 수", log.count("admin", since=since))
             with col4:
-                unique_ips = set()
-                for log in data.get("search_logs", []) + data.get("usage_logs", []):
-                    unique_ips.add(log.get("ip", "unknown"))
-                st.metric("고유 IP 수", len(unique_ips))
+                st.metric("고유 IP 수", log.unique_ips(["search", "usage"], since=since))
+            
+            # 기간별 활동 추이 (24시간 이내는 시간 단위, 그 외는 일 단위)
+            bucket = "hour" if periods[period] == 1 else "day"
+            series = log.time_series(["search", "usage", "admin"], bucket=bucket, since=since)
+            if series:
+                import pandas as pd
+                chart = pd.DataFrame(series, columns=["period", "activity", "count"]).pivot(
+                    index="period", columns="activity", values="count").fillna(0)
+                st.markdown(f"#### {'시간별' if bucket == 'hour' else '일별'} 활동 추이")
+                st.bar_chart(chart)
+            
+            top_users = log.counts_by_user("usage", since=since, limit=10)
+            if top_users:
+                st.markdown("#### 사용량 상위 사용자")
+                for user_id, count in top_users:
+                    st.write(f"**{user_id}**: {count}회")
         
         with tab2:
             st.markdown("### 🔍 검색 로그")
-            search_logs = data.get("search_logs", [])
+            search_logs = log.recent("search", limit=10, since=since)
             if search_logs:
                 # IP별 검색 통계
-                ip_search_count = {}
-                for log in search_logs:
-                    ip = log.get("ip", "unknown")
-                    ip_search_count[ip] = ip_search_count.get(ip, 0) + 1
-                
                 st.markdown("#### IP별 검색 통계")
-                for ip, count in sorted(ip_search_count.items(), key=lambda x: x[1], reverse=True):
+                for ip, count in log.counts_by_ip("search", since=since, limit=20):
                     st.write(f"**{ip}**: {count}회")
                 
                 st.markdown("#### 최근 검색 로그")
-                for log in search_logs[-10:]:  # 최근 10개
-                    st.write(f"**{log.get('timestamp', 'N/A')}** - IP: {log.get('ip', 'unknown')} - {log.get('details', 'N/A')}")
+                for entry in search_logs:  # 최근 10개
+                    st.write(f"**{entry.get('timestamp', 'N/A')}** - IP: {entry.get('ip', 'unknown')} - {entry.get('details', 'N/A')}")
             else:
                 st.info("검색 로그가 없습니다.")
         
         with tab3:
             st.markdown("### 👥 사용 로그")
-            usage_logs = data.get("usage_logs", [])
+            usage_logs = log.recent("usage", limit=10, since=since)
             if usage_logs:
                 # IP별 사용 통계
-                ip_usage_count = {}
-                for log in usage_logs:
-                    ip = log.get("ip", "unknown")
-                    ip_usage_count[ip] = ip_usage_count.get(ip, 0) + 1
-                
                 st.markdown("#### IP별 사용 통계")
-                for ip, count in sorted(ip_usage_count.items(), key=lambda x: x[1], reverse=True):
+                for ip, count in log.counts_by_ip("usage", since=since, limit=20):
                     st.write(f"**{ip}**: {count}회")
                 
                 st.markdown("#### 최근 사용 로그")
-                for log in usage_logs[-10:]:  # 최근 10개
-                    st.write(f"**{log.get('timestamp', 'N/A')}** - IP: {log.get('ip', 'unknown')} - {log.get('details', 'N/A')}")
+                for entry in usage_logs:  # 최근 10개
+                    st.write(f"**{entry.get('timestamp', 'N/A')}** - IP: {entry.get('ip', 'unknown')} - {entry.get('details', 'N/A')}")
             else:
                 st.info("사용 로그가 없습니다.")
         
         with tab4:
             st.markdown("### 🔐 관리자 로그")
-            admin_logs = data.get("admin_logs", [])
+            admin_logs = log.recent("admin", limit=10, since=since)
             if admin_logs:
                 st.markdown("#### 관리자 접속 로그")
-                for log in admin_logs[-10:]:  # 최근 10개
-                    st.write(f"**{log.get('timestamp', 'N/A')}** - IP: {log.get('ip', 'unknown')} - {log.get('details', 'N/A')}")
+                for entry in admin_logs:  # 최근 10개
+                    st.write(f"**{entry.get('timestamp', 'N/A')}** - IP: {entry.get('ip', 'unknown')} - {entry.get('details', 'N/A')}")
             else:
                 st.info("관리자 로그가 없습니다.")
         
@@ -326,10 +289,9 @@ class EnglishPersonaGUI:
                 st.markdown("#### 📤 로그 백업")
                 if st.button("📥 현재 로그 백업", use_container_width=True):
                     try:
-                        # 현재 로그 데이터 백업
+                        # 현재 로그 데이터 백업 (기존 JSON 형식으로 내보내기)
                         backup_filename = f"user_logs_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                        with open(self.db_file, 'r', encoding='utf-8') as f:
-                            backup_data = json.load(f)
+                        backup_data = log.export_legacy()
                         
                         with open(backup_filename, 'w', encoding='utf-8') as f:
                             json.dump(backup_data, f, ensure_ascii=False, indent=2)
@@ -356,30 +318,10 @@ class EnglishPersonaGUI:
                         file_content = uploaded_file.read().decode('utf-8')
                         backup_data = json.loads(file_content)
                         
-                        # 현재 로그에 백업 데이터 병합
-                        if os.path.exists(self.db_file):
-                            with open(self.db_file, 'r', encoding='utf-8') as f:
-                                current_data = json.load(f)
-                        else:
-                            current_data = {
-                                "users": {},
-                                "admin_logs": [],
-                                "search_logs": [],
-                                "usage_logs": []
-                            }
-                        
-                        # 백업 데이터 병합 (중복 제거)
-                        for log_type in ["admin_logs", "search_logs", "usage_logs"]:
-                            if log_type in backup_data:
-                                for log_entry in backup_data[log_type]:
-                                    if log_entry not in current_data[log_type]:
-                                        current_data[log_type].append(log_entry)
-                        
-                        # 병합된 데이터 저장
-                        with open(self.db_file, 'w', encoding='utf-8') as f:
-                            json.dump(current_data, f, ensure_ascii=False, indent=2)
+                        # 현재 로그에 백업 데이터 병합 (이미 있는 이벤트는 건너뜀)
+                        added = log.import_legacy(backup_data)
                         
-                        st.success("로그가 성공적으로 복원되었습니다!")
+                        st.success(f"로그가 성공적으로 복원되었습니다! ({added}건 추가)")
                         st.rerun()
                         
                     except Exception as e:
@@ -390,11 +332,9 @@ class EnglishPersonaGUI:
             # 로그 파일 목록 표시
             st.markdown("#### 📁 로그 파일 목록")
             try:
-                import glob
-                log_files = glob.glob("user_logs*.json")
+                log_files = log.files()
                 if log_files:
-                    for file in sorted(log_files):
-                        file_size = os.path.getsize(file)
+                    for file, file_size in log_files:
                         st.write(f"📄 {file} ({file_size:,} bytes)")
                 else:
                     st.info("로그 파일이 없습니다.")
@@ -610,6 +550,7 @@ class EnglishPersonaGUI:
             if st.button("🏠 홈", use_container_width=True, key="home_button"):
                 st.session_state.selected_personas = []
                 st.session_state.chat_history = []
+                self.manager.reset_conversations()
                 st.rerun()
             
             st.markdown("---")
@@ -633,6 +574,7 @@ class EnglishPersonaGUI:
             if st.button("💬 멀티 채팅 시작", use_container_width=True):
                 if st.session_state.selected_personas:
                     st.session_state.chat_history = []
+                    self.manager.reset_conversations()
                     st.rerun()
             
             st.markdown("---")
@@ -720,6 +662,7 @@ class EnglishPersonaGUI:
         with col2:
             if st.button("🔄 Reset", use_container_width=True):
                 st.session_state.chat_history = []
+                self.manager.reset_conversations()
                 st.rerun()
         
         with col3:
@@ -767,6 +710,7 @@ class EnglishPersonaGUI:
         with col2:
             if st.button("🔄 초기화", use_container_width=True):
                 st.session_state.chat_history = []
+                self.manager.reset_conversations()
                 st.rerun()
         
         with col3:
@@ -784,9 +728,9 @@ class EnglishPersonaGUI:
                 'timestamp': datetime.now().strftime('%H:%M:%S')
             })
             
-            # 봇 응답 생성
-            with st.spinner(f"{persona['name']} is preparing a response..."):
-                response = chatbot.chat(message)
+            # 봇 응답 생성 (토큰 스트리밍, 첫 토큰부터 바로 표시)
+            response = self.stream_response(chatbot, message, persona['name'],
+                                            f"{persona['name']} is preparing a response...")
             
             # 봇 응답 추가
             st.session_state.chat_history.append({
@@ -1229,6 +1173,19 @@ class EnglishPersonaGUI:
                 except Exception as e:
                     st.error(f"콘텐츠 아이디어 생성 중 오류가 발생했습니다: {e}")
     
+    def stream_response(self, chatbot, message, persona_name, waiting_text):
+        """챗봇 응답을 토큰 단위로 화면에 갱신하며 받아 전체 응답 반환"""
+        placeholder = st.empty()
+        placeholder.markdown(f"*{waiting_text}*")
+        
+        response = ""
+        for delta in chatbot.chat_stream(message):
+            response += delta
+            placeholder.markdown(f"**🤖 {persona_name}:** {response}▌")
+        
+        placeholder.markdown(f"**🤖 {persona_name}:** {response}")
+        return response
+    
     def send_multi_message(self, message, selected_personas):
         """다중 페르소나에게 메시지 전송"""
         try:
@@ -1239,14 +1196,40 @@ class EnglishPersonaGUI:
                 'timestamp': datetime.now().strftime('%H:%M:%S')
             })
             
-            # 각 페르소나의 응답 생성
+            # 모든 페르소나의 응답을 동시에 생성 (토큰 스트리밍, 페르소나별 자리 고정)
+            cluster_ids = list(self.personas.keys())
+            persona_values = list(self.personas.values())
+            chatbots = [self.manager.select_chatbot(cluster_ids[persona_values.index(persona)])
+                        for persona in selected_personas]
+            
+            placeholders = []
             for persona in selected_personas:
-                chatbot = self.manager.select_chatbot(list(self.personas.keys())[list(self.personas.values()).index(persona)])
-                
-                with st.spinner(f"{persona['name']} is responding..."):
-                    response = chatbot.chat(message)
+                placeholder = st.empty()
+                placeholder.markdown(f"*{persona['name']} is responding...*")
+                placeholders.append(placeholder)
+            
+            responses = [""] * len(selected_personas)
+            for event in fan_out_chat(chatbots, message, stream=True):
+                index = event[1]
+                name = selected_personas[index]['name']
+                if event[0] == 'delta':
+                    responses[index] += event[2]
+                    placeholders[index].markdown(f"**🤖 {name}:** {responses[index]}▌")
+                    continue
                 
-                # 페르소나 응답 추가
+                _, _, response, error = event
+                if error is not None:
+                    # 한 페르소나의 실패는 다른 페르소나 응답에 영향 없음
+                    responses[index] = None
+                    placeholders[index].error(f"{name} failed to respond: {error}")
+                else:
+                    responses[index] = response
+                    placeholders[index].markdown(f"**🤖 {name}:** {response}")
+            
+            # 페르소나 응답 추가 (완료 순서와 무관하게 선택 순서대로)
+            for persona, response in zip(selected_personas, responses):
+                if response is None:
+                    continue
                 st.session_state.chat_history.append({
                     'role': 'assistant',
                     'content': response,
@@ -1315,6 +1298,7 @@ class EnglishPersonaGUI:
                 st.session_state.authenticated = False
                 st.session_state.user_type = None
                 st.session_state.username = None
+                st.session_state.pop('chatbot_manager', None)  # 다음 사용자에게 대화 기록이 남지 않도록
                 st.rerun()
             
             # 사이드바
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+오디오 PCM 읽기 + 음성 구간(VAD) 기준 청크 분할
+긴 영상을 한 작업으로 전사하면 Whisper가 30초 창을 처음부터 끝까지 순서대로 처리하므로,
+무음에서 잘라 청크로 나누고 (무음 구간은 전사하지 않음) 여러 작업자가 나눠 전사한 뒤
+청크 시작 시각만큼 세그먼트 시각을 옮겨 이어 붙임
+
+VAD는 프레임 에너지 기반 (배경 잡음 수준에 맞춰 임계값 자동 조정)
+"""
+
+import os
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03
+
+
+def read_pcm(audio_path):
+    """
+    오디오 → 16kHz 모노 float32 배열
+
+    16kHz 모노 16bit WAV(download_audio 기본 형식)는 디코딩 없이 바로 읽고,
+    그 외 형식은 whisper.load_audio(ffmpeg)로 변환
+    """
+    if os.path.splitext(str(audio_path))[1].lower() == '.wav':
+        with wave.open(str(audio_path), 'rb') as f:
+            if (f.getframerate(), f.getnchannels(), f.getsampwidth()) == (SAMPLE_RATE, 1, 2):
+                return np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+
+    from whisper_service import load_audio
+    return load_audio(str(audio_path))
+
+
+def _frame_levels(audio, frame):
+    """프레임별 에너지(dB)"""
+    count = len(audio) // frame
+    if count == 0:
+        return np.zeros(0)
+    frames = audio[:count * frame].reshape(count, frame).astype(np.float64)
+    return 10 * np.log10((frames ** 2).mean(axis=1) + 1e-10)
+
+
+def voice_regions(audio, sample_rate=SAMPLE_RATE, min_silence=0.3, padding=0.2):
+    """
+    음성 구간 검출
+
+    Args:
+        min_silence: 이보다 짧은 무음은 같은 구간으로 이어 붙임 (초)
+        padding: 구간 앞뒤 여유 (초, 말 끝이 잘리지 않도록)
+
+    Returns:
+        [(시작 샘플, 끝 샘플), ...]
+    """
+    frame = int(FRAME_SECONDS * sample_rate)
+    levels = _frame_levels(audio, frame)
+    if not len(levels):
+        return []
+
+    # 배경 잡음(하위 10%)보다 충분히 크고, 큰 소리(상위 5%)보다 너무 작지 않은 프레임을 음성으로
+    floor, loud = np.percentile(levels, 10), np.percentile(levels, 95)
+    threshold = max(-50.0, min(floor + 12.0, loud - 25.0))
+    voiced = levels > threshold
+
+    regions, start, silent = [], None, 0
+    max_gap = int(min_silence / FRAME_SECONDS)
+    for i, is_voiced in enumerate(voiced):
+        if is_voiced:
+            if start is None:
+                start = i
+            silent = 0
+        elif start is not None:
+            silent += 1
+            if silent > max_gap:
+                regions.append((start, i - silent + 1))
+                start, silent = None, 0
+    if start is not None:
+        regions.append((start, len(voiced) - silent))
+
+    # 앞뒤 여유를 붙인 뒤 겹치는 구간은 합침 (같은 소리가 두 청크에 들어가지 않도록)
+    pad = int(padding * sample_rate)
+    padded = []
+    for s, e in regions:
+        s, e = max(0, s * frame - pad), min(len(audio), e * frame + pad)
+        if padded and s <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], e)
+        else:
+            padded.append((s, e))
+    return padded
+
+
+def voice_chunks(audio, sample_rate=SAMPLE_RATE, max_seconds=30.0, min_silence=0.3, padding=0.2):
+    """
+    음성 구간을 최대 길이 이하 청크로 묶음 (자르는 위치는 무음, 청크 사이 무음은 전사하지 않음)
+
+    max_seconds보다 긴 연속 음성은 창 후반부에서 가장 조용한 프레임에서 자름
+
+    Returns:
+        [(시작 샘플, 끝 샘플), ...] (시간순)
+    """
+    max_len = int(max_seconds * sample_rate)
+    frame = int(FRAME_SECONDS * sample_rate)
+
+    pieces = []
+    for start, end in voice_regions(audio, sample_rate, min_silence, padding):
+        while end - start > max_len:
+            # 창 절반 이후 가장 조용한 프레임에서 자름
+            window = audio[start + max_len // 2:start + max_len]
+            levels = _frame_levels(window, frame)
+            cut = start + max_len // 2 + (int(np.argmin(levels)) * frame if len(levels) else len(window))
+            pieces.append((start, cut))
+            start = cut
+        pieces.append((start, end))
+
+    chunks = []
+    for start, end in pieces:
+        if chunks and end - chunks[-1][0] <= max_len:
+            chunks[-1] = (chunks[-1][0], max(chunks[-1][1], end))
+        else:
+            chunks.append((start, end))
+    return chunks
+
+
+def stitch_segments(chunk_segments):
+    """
+    청크별 세그먼트 → 원본 오디오 기준 세그먼트
+
+    Args:
+        chunk_segments: [(청크 시작 초, 세그먼트 리스트), ...]
+    """
+    stitched = []
+    for offset, segments in sorted(chunk_segments, key=lambda item: item[0]):
+        for segment in segments:
+            stitched.append({**segment, 'start': segment['start'] + offset})
+    return stitched
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from persona_chatbot_rag import PersonaChatbotRAG
 import json
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 class EmmaChatbot(PersonaChatbotRAG):
     """클러스터 0: Emma - 다재다능한 라이프스타일 인플루언서"""
@@ -133,14 +135,83 @@ class ChatbotFactory:
                 print(f"Cluster {cluster_id} chatbot creation failed: {e}")
         return chatbots
 
+def fan_out_chat(chatbots, message, max_workers=None, stream=False):
+    """
+    여러 챗봇에 같은 메시지를 동시에 보내고 진행 상황을 이벤트로 전달
+    
+    챗봇마다 대화 기록이 따로 있으므로 챗봇 하나당 스레드 하나로 검색·생성을 병렬 실행하고,
+    이벤트는 호출한 스레드에서 받으므로 UI 갱신(Streamlit 등)을 그대로 할 수 있음
+    
+    Args:
+        chatbots: 챗봇 리스트 (chat / chat_stream 제공)
+        message: 사용자 메시지
+        max_workers: 최대 동시 실행 수 (기본: 챗봇 수)
+        stream: True면 chat_stream으로 토큰 단위 'delta' 이벤트도 전달
+    
+    Yields:
+        ('delta', index, 텍스트 조각) 또는 ('done', index, 응답, 예외 또는 None)
+        index는 chatbots 내 위치 (챗봇 하나의 실패는 해당 'done' 이벤트의 예외로만 전달)
+    """
+    if not chatbots:
+        return
+    
+    events = queue.Queue()
+    
+    def run(index, chatbot):
+        try:
+            if stream:
+                parts = []
+                for delta in chatbot.chat_stream(message):
+                    parts.append(delta)
+                    events.put(('delta', index, delta))
+                response = "".join(parts)
+            else:
+                response = chatbot.chat(message)
+            events.put(('done', index, response, None))
+        except Exception as e:
+            events.put(('done', index, None, e))
+    
+    with ThreadPoolExecutor(max_workers=max_workers or len(chatbots)) as executor:
+        for index, chatbot in enumerate(chatbots):
+            executor.submit(run, index, chatbot)
+        
+        remaining = len(chatbots)
+        while remaining:
+            event = events.get()
+            if event[0] == 'done':
+                remaining -= 1
+            yield event
+
+def chat_many(chatbots, message, max_workers=None):
+    """
+    여러 챗봇에 같은 메시지를 동시에 보내고 입력 순서대로 결과 반환
+    
+    Returns:
+        [(응답, 예외 또는 None), ...] - chatbots와 같은 순서
+    """
+    results = [None] * len(chatbots)
+    for _, index, response, error in fan_out_chat(chatbots, message, max_workers):
+        results[index] = (response, error)
+    return results
+
 # 챗봇 매니저 클래스
 class ChatbotManager:
-    """여러 챗봇을 관리하는 매니저"""
+    """
+    여러 챗봇을 관리하는 매니저 (세션당 하나)
+    
+    지식 베이스는 프로세스 전역 PersonaKnowledge를 공유하고 대화 기록만 챗봇별로 가지므로
+    세션마다 만들어도 디스크에서 다시 구축하지 않음
+    """
     
     def __init__(self):
         self.chatbots = ChatbotFactory.get_all_chatbots()
         self.current_chatbot = None
     
+    def reset_conversations(self):
+        """이 세션의 모든 챗봇 대화 기록 초기화"""
+        for chatbot in self.chatbots.values():
+            chatbot.reset_conversation()
+    
     def select_chatbot(self, cluster_id):
         """특정 클러스터의 챗봇 선택"""
         chatbot_key = f'cluster_{cluster_id}'
@@ -170,6 +241,16 @@ class ChatbotManager:
         else:
             return "먼저 챗봇을 선택해주세요."
     
+    def chat_with_many(self, cluster_ids, message, max_workers=None):
+        """
+        여러 챗봇과 동시에 대화
+        
+        Returns:
+            {cluster_id: (응답, 예외 또는 None)} - cluster_ids 순서 유지
+        """
+        chatbots = [self.chatbots[f'cluster_{cluster_id}'] for cluster_id in cluster_ids]
+        return dict(zip(cluster_ids, chat_many(chatbots, message, max_workers)))
+    
     def get_all_chatbot_info(self):
         """모든 챗봇 정보 조회"""
         info = {}
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Conversation Memory - 토큰 예산이 있는 챗봇 대화 기록
+최근 N턴은 원문 그대로 두고, 그보다 오래된 턴은 누적 요약 하나로 접어
+긴 세션에서도 매 요청의 프롬프트 크기·지연·메모리가 일정하게 유지되도록 함
+"""
+
+from typing import Callable, Dict, List, Optional
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken 미설치/오프라인 시 근사치 사용
+    _ENCODING = None
+
+# 메시지 하나당 역할/구분자 오버헤드 (OpenAI chat 포맷 기준)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+ROLE_LABELS = {"user": "사용자", "assistant": "나"}
+
+
+def count_tokens(text: str) -> int:
+    """로컬 토큰 수 계산 (tiktoken 없으면 한글 기준 보수적 근사)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(text) // 2 + 1
+
+
+def truncate_tokens(text: str, max_tokens: int, keep_tail: bool = False) -> str:
+    """토큰 수 상한에 맞춰 자르기 (keep_tail이면 뒤쪽 유지)"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if _ENCODING is not None:
+        tokens = _ENCODING.encode(text)
+        tokens = tokens[-max_tokens:] if keep_tail else tokens[:max_tokens]
+        return _ENCODING.decode(tokens)
+    max_chars = max((max_tokens - 1) * 2, 0)
+    return text[-max_chars:] if keep_tail else text[:max_chars]
+
+
+def message_tokens(messages: List[Dict]) -> int:
+    """chat 메시지 리스트의 프롬프트 토큰 수"""
+    return sum(count_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def extractive_summarizer(summary: str, turns: List[Dict], max_tokens: int) -> str:
+    """
+    LLM 없이 만드는 요약 (턴마다 앞부분 한 줄씩 누적, 예산을 넘으면 오래된 줄부터 제거)
+
+    LLM 요약이 실패했을 때의 대체 경로로도 사용
+    """
+    lines = [line for line in summary.split("\n") if line]
+    for turn in turns:
+        text = " ".join(turn["content"].split())
+        lines.append(f"- {ROLE_LABELS.get(turn['role'], turn['role'])}: {truncate_tokens(text, 40)}")
+    while len(lines) > 1 and count_tokens("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    return truncate_tokens("\n".join(lines), max_tokens, keep_tail=True)
+
+
+class ConversationMemory:
+    """
+    최근 턴 원문 + 오래된 턴 누적 요약
+
+    - 최근 keep_turns턴(사용자+응답 한 쌍)은 원문 유지
+    - 원문이 keep_turns + summarize_every턴을 넘거나 토큰 예산을 넘으면 오래된 턴을 요약에 합침
+      (여러 턴을 한 번에 접어 요약 호출 횟수를 줄임)
+    - 요약 자체도 summary_max_tokens로 제한
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 2000,
+        keep_turns: int = 4,
+        summarize_every: int = 4,
+        summary_max_tokens: int = 300,
+        summarizer: Optional[Callable[[str, List[Dict], int], str]] = None,
+    ):
+        """
+        Args:
+            token_budget: 요약 + 원문 기록의 최대 토큰 수 (시스템 프롬프트/검색 컨텍스트 제외)
+            keep_turns: 원문으로 유지할 최근 턴 수
+            summarize_every: 원문이 이만큼 더 쌓이면 한꺼번에 요약
+            summary_max_tokens: 누적 요약의 최대 토큰 수
+            summarizer: (기존 요약, 접을 메시지들, 최대 토큰) -> 새 요약 (기본: extractive_summarizer)
+        """
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self.summarize_every = summarize_every
+        self.summary_max_tokens = summary_max_tokens
+        self.summarizer = summarizer or extractive_summarizer
+
+        self.summary = ""
+        self.recent = []  # [{"role", "content", "tokens"}]
+
+        self.stats = {'turns': 0, 'summarized_messages': 0, 'summaries': 0, 'summary_failures': 0}
+
+    def add(self, role: str, content: str):
+        """메시지 추가 후 필요하면 오래된 턴을 요약으로 접기"""
+        self.recent.append({
+            "role": role,
+            "content": content,
+            "tokens": count_tokens(content) + MESSAGE_OVERHEAD_TOKENS,
+        })
+        if role == "user":
+            self.stats['turns'] += 1
+        self._compact()
+
+    def _recent_tokens(self) -> int:
+        return sum(m["tokens"] for m in self.recent)
+
+    def _summary_tokens(self) -> int:
+        return count_tokens(self.summary) + MESSAGE_OVERHEAD_TOKENS if self.summary else 0
+
+    def _compact(self):
+        keep_messages = self.keep_turns * 2
+        over_turns = len(self.recent) > (self.keep_turns + self.summarize_every) * 2
+        over_budget = self._recent_tokens() + self._summary_tokens() > self.token_budget
+        if not (over_turns or over_budget):
+            return
+
+        # 최근 keep_turns턴만 남기고, 그래도 예산을 넘으면 마지막 메시지 하나까지 접음
+        folded = self.recent[:-keep_messages] if len(self.recent) > keep_messages else []
+        recent = self.recent[len(folded):]
+        while len(recent) > 1 and sum(m["tokens"] for m in recent) + self.summary_max_tokens > self.token_budget:
+            folded.append(recent.pop(0))
+        if not folded:
+            return
+
+        turns = [{"role": m["role"], "content": m["content"]} for m in folded]
+        try:
+            summary = self.summarizer(self.summary, turns, self.summary_max_tokens)
+        except Exception as e:
+            print(f"대화 요약 실패, 로컬 요약으로 대체: {e}")
+            self.stats['summary_failures'] += 1
+            summary = extractive_summarizer(self.summary, turns, self.summary_max_tokens)
+
+        self.summary = truncate_tokens(summary.strip(), self.summary_max_tokens, keep_tail=True)
+        self.recent = recent
+        self.stats['summarized_messages'] += len(folded)
+        self.stats['summaries'] += 1
+
+    def messages(self) -> List[Dict]:
+        """요청에 넣을 메시지 (누적 요약 system 메시지 + 최근 원문)"""
+        messages = []
+        if self.summary:
+            messages.append({"role": "system", "content": f"## 이전 대화 요약\n{self.summary}"})
+        messages.extend({"role": m["role"], "content": m["content"]} for m in self.recent)
+        return messages
+
+    def token_count(self) -> int:
+        """현재 기록(요약 + 원문)의 토큰 수"""
+        return self._summary_tokens() + self._recent_tokens()
+
+    def clear(self):
+        self.summary = ""
+        self.recent = []
@@ -7,21 +7,38 @@ Deep Debate System - 페이즈별 심층 토론 시스템
 
 import asyncio
 import json
-from typing import List, Dict, AsyncGenerator
+from typing import List, Dict, AsyncGenerator, Callable, Optional
 from datetime import datetime
-import openai
-from agents.customer_agents_v2 import CustomerAgentsV2
-from agents.employee_agents import EmployeeAgents
-from agents.facilitator import Facilitator
+from debate.pacing import PacingPolicy
+from llm_gateway import get_gateway
 
 class DeepDebateSystem:
     """페이즈별 심층 토론 시스템"""
     
-    def __init__(self, customer_agents, employee_agents, facilitator):
+    def __init__(self, customer_agents, employee_agents, facilitator,
+                 concurrent_turns: bool = False, max_concurrency: int = 3,
+                 pacing: Optional[PacingPolicy] = None, llm_client: Optional[Callable] = None):
+        """
+        Args:
+            customer_agents: 고객 에이전트 매니저
+            employee_agents: 임직원 에이전트 매니저
+            facilitator: 퍼실리테이터
+            concurrent_turns: True면 independent_turns 페이즈의 라운드 내 발언을 동시에 생성
+            max_concurrency: 동시에 진행할 최대 LLM 호출 수
+            pacing: LLM 호출 속도 정책 (기본: 분당 500회)
+            llm_client: chat completion 비동기 함수 (기본: 공유 LLM 게이트웨이)
+        """
         self.customer_agents = customer_agents
         self.employee_agents = employee_agents
         self.facilitator = facilitator
         
+        self.concurrent_turns = concurrent_turns
+        self.max_concurrency = max_concurrency
+        self.pacing = pacing or PacingPolicy()
+        self.llm_client = llm_client
+        self._semaphore = None
+        self._semaphore_loop = None
+        
         # 페이즈별 토론 주제 정의
         self.debate_phases = {
             "galaxy_strategy": {
@@ -31,7 +48,9 @@ class DeepDebateSystem:
                         "name": "Phase I: 현상 진단 및 Switcher Pain Point 분석",
                         "description": "현재 상황 분석 및 애플 사용자 전환 장벽 파악",
                         "rounds": 3,
-                        "facilitator_summary": True
+                        "facilitator_summary": True,
+                        # 각자 전문 분야 진단이라 같은 라운드 발언끼리 서로 참조하지 않음
+                        "independent_turns": True
                     },
                     {
                         "name": "Phase II: 기술/디자인/금융 전략 심화",
@@ -129,49 +148,76 @@ class DeepDebateSystem:
                     }
                 }
                 
-                # 각 참가자 순차 발언
-                for agent_idx, agent in enumerate(participants):
-                    try:
-                        # 이전 메시지들을 컨텍스트로 활용
-                        context_messages = self._build_context_messages(
-                            phase_messages, 
-                            phase["name"], 
-                            round_idx + 1
-                        )
-                        
-                        # 에이전트 응답 생성
-                        response = await self._get_agent_response(
+                if self.concurrent_turns and phase.get("independent_turns"):
+                    # 라운드 시작 시점 컨텍스트로 전원 동시 생성, 발언 순서대로 전달
+                    context_messages = self._build_context_messages(
+                        phase_messages, 
+                        phase["name"], 
+                        round_idx + 1
+                    )
+                    turns = [
+                        asyncio.ensure_future(self._get_agent_response(
                             agent, 
                             context_messages,
                             phase["name"],
                             round_idx + 1
-                        )
-                        
-                        message_data = {
-                            "source": agent.name,
-                            "content": response,
-                            "phase": phase_idx + 1,
-                            "round": round_idx + 1,
-                            "turn": agent_idx + 1,
-                            "timestamp": datetime.now().isoformat()
-                        }
+                        ))
+                        for agent in participants
+                    ]
+                else:
+                    turns = None
+                
+                # 각 참가자 발언 (동시 모드에서도 이벤트는 참가자 순서대로)
+                try:
+                    for agent_idx, agent in enumerate(participants):
+                        try:
+                            if turns is not None:
+                                response = await turns[agent_idx]
+                            else:
+                                # 이전 메시지들을 컨텍스트로 활용
+                                context_messages = self._build_context_messages(
+                                    phase_messages, 
+                                    phase["name"], 
+                                    round_idx + 1
+                                )
+                            
+                                # 에이전트 응답 생성
+                                response = await self._get_agent_response(
+                                    agent, 
+                                    context_messages,
+                                    phase["name"],
+                                    round_idx + 1
+                                )
                         
-                        phase_messages.append(message_data)
-                        full_debate_log.append(message_data)
+                            message_data = {
+                                "source": agent.name,
+                                "content": response,
+                                "phase": phase_idx + 1,
+                                "round": round_idx + 1,
+                                "turn": agent_idx + 1,
+                                "timestamp": datetime.now().isoformat()
+                            }
                         
-                        yield {
-                            "type": "message",
-                            "data": message_data
-                        }
+                            phase_messages.append(message_data)
+                            full_debate_log.append(message_data)
                         
-                        # 메시지 간 간격
-                        await asyncio.sleep(1)
+                            yield {
+                                "type": "message",
+                                "data": message_data
+                            }
                         
-                    except Exception as e:
-                        yield {
-                            "type": "error",
-                            "data": {"message": f"Agent {agent.name} error: {str(e)}"}
-                        }
+                        except Exception as e:
+                            yield {
+                                "type": "error",
+                                "data": {"message": f"Agent {agent.name} error: {str(e)}"}
+                            }
+                finally:
+                    # 소비자가 도중에 닫으면(UI 취소, 연결 끊김) 남은 동시 발언 생성 중단
+                    for turn in turns or []:
+                        if not turn.done():
+                            turn.cancel()
+                        elif not turn.cancelled():
+                            turn.exception()  # 받지 못한 예외가 "never retrieved"로 남지 않도록
                 
                 yield {
                     "type": "round_end",
@@ -235,6 +281,19 @@ class DeepDebateSystem:
             }
         }
     
+    async def _create_completion(self, **kwargs):
+        """LLM 호출 (동시 실행 수 제한 + 속도 정책 적용)"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        
+        async with self._semaphore:
+            await self.pacing.wait()
+            if self.llm_client is not None:
+                return await self.llm_client(**kwargs)
+            return await get_gateway().chat_completion(**kwargs)
+    
     def _build_context_messages(self, previous_messages: List[Dict], phase_name: str, round_num: int) -> List[Dict]:
         """이전 메시지들을 컨텍스트로 구성"""
         context = []
@@ -273,7 +332,7 @@ class DeepDebateSystem:
             })
             
             # OpenAI API 호출
-            response = await openai.ChatCompletion.acreate(
+            response = await self._create_completion(
                 model="gpt-4o-mini",
                 messages=messages,
                 temperature=0.8,
@@ -336,7 +395,7 @@ class DeepDebateSystem:
                 """}
             ]
             
-            response = await openai.ChatCompletion.acreate(
+            response = await self._create_completion(
                 model="gpt-4o-mini",
                 messages=messages,
                 temperature=0.7,
@@ -403,7 +462,7 @@ class DeepDebateSystem:
                 """}
             ]
             
-            response = await openai.ChatCompletion.acreate(
+            response = await self._create_completion(
                 model="gpt-4o-mini",
                 messages=messages,
                 temperature=0.7,
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pacing - 토론 LLM 호출 속도 제어
+메시지마다 고정으로 쉬는 대신, 분당 요청 한도(RPM)와 요청 간 최소 간격만큼만 대기
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+
+class PacingPolicy:
+    """
+    분당 요청 수 슬라이딩 윈도우 + 요청 시작 간 최소 간격 (asyncio용)
+
+    한도 안에서는 바로 통과하므로 응답이 빠르면 토론도 빠르게 진행되고,
+    동시에 여러 턴을 실행해도 API 한도를 넘지 않음
+    """
+
+    def __init__(self, requests_per_minute: Optional[int] = 500, min_interval: float = 0.0,
+                 window: float = 60.0):
+        """
+        Args:
+            requests_per_minute: 분당 최대 요청 수 (None이면 제한 없음)
+            min_interval: 요청 시작 사이 최소 간격(초)
+            window: 슬라이딩 윈도우 길이(초)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.min_interval = min_interval
+        self.window = window
+
+        self._starts = deque()   # 윈도우 내 요청 시작 시각
+        self._last_start = None
+        self._lock = None        # 실행 중인 이벤트 루프에서 생성
+        self._loop = None
+
+        self.total_wait = 0.0    # 대기한 누적 시간(초)
+
+    async def wait(self):
+        """다음 요청을 보내도 될 때까지 대기 후 시작 시각 기록"""
+        # asyncio 잠금은 이벤트 루프에 묶이므로 루프가 바뀌면 새로 생성 (동기 래퍼에서 매번 새 루프 사용)
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+        # 대기 순서를 지키기 위해 잠금을 쥔 채로 대기 (요청 자체는 잠금 밖에서 실행)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._starts and now - self._starts[0] >= self.window:
+                    self._starts.popleft()
+
+                delay = 0.0
+                if self._last_start is not None and self.min_interval > 0:
+                    delay = max(delay, self._last_start + self.min_interval - now)
+                if self.requests_per_minute is not None and len(self._starts) >= self.requests_per_minute:
+                    delay = max(delay, self._starts[0] + self.window - now)
+
+                if delay <= 0:
+                    self._starts.append(now)
+                    self._last_start = now
+                    return
+
+                self.total_wait += delay
+                await asyncio.sleep(delay)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+지식 베이스 스냅샷 - PersonaChatbotRAG 콜드 스타트 단축용 디스크 캐시
+채널별로 파싱/토큰화 결과를 바이너리(pickle)로 저장하고,
+원본 STT 파일의 mtime/size 서명이 그대로면 재구축 없이 바로 로드
+"""
+
+import os
+import pickle
+import tempfile
+
+# 스냅샷 레이아웃이 바뀌면 올려서 기존 파일을 자동으로 무효화
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_DIR = "kb_snapshots"
+
+
+def file_signature(paths):
+    """원본 파일 서명: [(파일명, mtime_ns, size), ...] (이름순)"""
+    signature = []
+    for path in sorted(paths):
+        stat = os.stat(path)
+        signature.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+    return signature
+
+
+class KnowledgeBaseSnapshot:
+    """채널 단위 지식 베이스 스냅샷 저장소"""
+
+    def __init__(self, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+        self.snapshot_dir = snapshot_dir
+
+    def _channel_path(self, channel_id):
+        return os.path.join(self.snapshot_dir, f"{channel_id}.kb")
+
+    def load_channel(self, channel_id, signature):
+        """
+        채널 스냅샷 로드
+
+        Returns:
+            저장된 문서 리스트, 버전/서명이 다르거나 파일이 없으면 None
+        """
+        path = self._channel_path(channel_id)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            print(f"스냅샷 읽기 실패: {path} - {e}")
+            return None
+
+        if payload.get('version') != SNAPSHOT_VERSION:
+            return None
+        if payload.get('signature') != signature:
+            return None
+        return payload['documents']
+
+    def save_channel(self, channel_id, signature, documents):
+        """채널 스냅샷 저장 (임시 파일에 쓴 뒤 교체하여 부분 기록 방지)"""
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        payload = {
+            'version': SNAPSHOT_VERSION,
+            'channel_id': channel_id,
+            'signature': signature,
+            'documents': documents
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.snapshot_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._channel_path(channel_id))
+        except Exception as e:
+            print(f"스냅샷 저장 실패: {channel_id} - {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
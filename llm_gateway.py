@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLM Gateway - 프로세스 전역 OpenAI 연결 풀
+모든 에이전트/챗봇/토론 시스템이 같은 HTTP 커넥션 풀(keep-alive)을 공유해
+에이전트·요청마다 연결 수립/TLS 핸드셰이크를 반복하지 않도록 하고,
+전송 계층에서 모델별 동시 요청 수 제한과 지터 포함 지수 백오프 재시도를 적용
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+# 재시도 대상 HTTP 상태 (rate limit, 서버 오류)
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def _request_model(request: httpx.Request) -> str:
+    """요청 본문의 model 필드 (없으면 'default')"""
+    try:
+        return json.loads(request.content or b'{}').get('model') or 'default'
+    except (ValueError, AttributeError):
+        return 'default'
+
+
+class _RetryPolicy:
+    """지수 백오프 + 지터, Retry-After 헤더 우선"""
+
+    def __init__(self, max_retries: int, base_backoff: float, max_backoff: float):
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get('retry-after')
+            try:
+                if retry_after is not None:
+                    return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        backoff = min(self.base_backoff * (2 ** attempt), self.max_backoff)
+        return backoff * (0.5 + random.random() / 2)
+
+
+class _GatewayTransport(httpx.HTTPTransport):
+    """동기 전송: 모델별 세마포어 + 재시도"""
+
+    def __init__(self, gateway: 'LLMGateway', **kwargs):
+        super().__init__(**kwargs)
+        self.gateway = gateway
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        semaphore = self.gateway._sync_semaphore(_request_model(request))
+        policy = self.gateway.retry_policy
+
+        for attempt in range(policy.max_retries + 1):
+            with semaphore:
+                try:
+                    response = super().handle_request(request)
+                except httpx.TransportError:
+                    if attempt >= policy.max_retries:
+                        raise
+                    response = None
+            if response is not None and (response.status_code not in RETRY_STATUSES
+                                         or attempt >= policy.max_retries):
+                return response
+
+            delay = policy.delay(attempt, response)
+            if response is not None:
+                # 본문을 끝까지 읽어야 연결이 풀로 돌아가 재사용됨
+                response.read()
+                response.close()
+            self.gateway._record_retry()
+            time.sleep(delay)
+
+
+class _GatewayAsyncTransport(httpx.AsyncHTTPTransport):
+    """비동기 전송: 모델별 세마포어 + 재시도"""
+
+    def __init__(self, gateway: 'LLMGateway', **kwargs):
+        super().__init__(**kwargs)
+        self.gateway = gateway
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        semaphore = self.gateway._async_semaphore(_request_model(request))
+        policy = self.gateway.retry_policy
+
+        for attempt in range(policy.max_retries + 1):
+            async with semaphore:
+                try:
+                    response = await super().handle_async_request(request)
+                except httpx.TransportError:
+                    if attempt >= policy.max_retries:
+                        raise
+                    response = None
+            if response is not None and (response.status_code not in RETRY_STATUSES
+                                         or attempt >= policy.max_retries):
+                return response
+
+            delay = policy.delay(attempt, response)
+            if response is not None:
+                await response.aread()
+                await response.aclose()
+            self.gateway._record_retry()
+            await asyncio.sleep(delay)
+
+
+class LLMGateway:
+    """
+    OpenAI 호출용 공유 HTTP 클라이언트/SDK 클라이언트 관리자
+
+    - 동기 httpx.Client 1개 + 이벤트 루프별 httpx.AsyncClient 1개 (keep-alive 풀)
+    - 모델별 동시 요청 수 제한 (model_concurrency, 기본 default_concurrency)
+    - 429/5xx/연결 오류 재시도 (SDK 자체 재시도는 끄고 여기서 일괄 처리)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 120.0,
+        default_concurrency: int = 8,
+        model_concurrency: Optional[Dict[str, int]] = None,
+        max_retries: int = 4,
+        base_backoff: float = 0.5,
+        max_backoff: float = 20.0,
+    ):
+        """
+        Args:
+            api_key: OpenAI API 키 (기본: OPENAI_API_KEY 환경 변수)
+            max_connections: 풀 전체 최대 연결 수
+            max_keepalive_connections: 유지할 유휴 연결 수
+            keepalive_expiry: 유휴 연결 유지 시간(초)
+            timeout: 요청 타임아웃(초)
+            default_concurrency: 모델별 기본 동시 요청 수
+            model_concurrency: 모델별 동시 요청 수 재정의 (예: {"gpt-4": 4})
+            max_retries: 최대 재시도 횟수
+            base_backoff: 재시도 기본 대기(초), 시도마다 2배 + 지터
+            max_backoff: 재시도 대기 상한(초)
+        """
+        self.api_key = api_key
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=10.0)
+        self.default_concurrency = default_concurrency
+        self.model_concurrency = dict(model_concurrency or {})
+        self.retry_policy = _RetryPolicy(max_retries, base_backoff, max_backoff)
+
+        self._lock = threading.Lock()
+        self._http_client = None
+        self._openai_client = None
+        self._sync_semaphores = {}
+        # 비동기 자원은 이벤트 루프에 묶이므로 루프별로 보관 (루프가 사라지면 자동 정리)
+        self._async_state = weakref.WeakKeyDictionary()
+        # 루프 밖(동기 초기화 코드)에서 만든 비동기 클라이언트
+        self._default_async_state = self._new_async_state()
+
+        self.stats = {'retries': 0}
+
+    def _get_api_key(self) -> Optional[str]:
+        return self.api_key or os.getenv("OPENAI_API_KEY")
+
+    def _limit(self, model: str) -> int:
+        return self.model_concurrency.get(model, self.default_concurrency)
+
+    def _record_retry(self):
+        with self._lock:
+            self.stats['retries'] += 1
+
+    def _sync_semaphore(self, model: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._sync_semaphores.get(model)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self._limit(model))
+                self._sync_semaphores[model] = semaphore
+            return semaphore
+
+    @staticmethod
+    def _new_async_state() -> Dict:
+        return {'http_client': None, 'openai_client': None, 'semaphores': {}}
+
+    def _loop_state(self) -> Dict:
+        """현재 이벤트 루프의 비동기 자원 (루프 밖이면 기본 자원)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._default_async_state
+        with self._lock:
+            state = self._async_state.get(loop)
+            if state is None:
+                state = self._new_async_state()
+                self._async_state[loop] = state
+            return state
+
+    def _async_semaphore(self, model: str) -> asyncio.Semaphore:
+        semaphores = self._loop_state()['semaphores']
+        semaphore = semaphores.get(model)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._limit(model))
+            semaphores[model] = semaphore
+        return semaphore
+
+    def http_client(self) -> httpx.Client:
+        """공유 동기 HTTP 클라이언트"""
+        with self._lock:
+            if self._http_client is None:
+                self._http_client = httpx.Client(
+                    transport=_GatewayTransport(self, limits=self.limits),
+                    timeout=self.timeout,
+                )
+            return self._http_client
+
+    def async_http_client(self) -> httpx.AsyncClient:
+        """
+        공유 비동기 HTTP 클라이언트
+
+        실행 중인 이벤트 루프가 있으면 그 루프 전용 클라이언트를,
+        없으면(동기 초기화 코드) 루프 밖 기본 클라이언트를 반환
+        """
+        state = self._loop_state()
+        if state['http_client'] is None:
+            state['http_client'] = httpx.AsyncClient(
+                transport=_GatewayAsyncTransport(self, limits=self.limits),
+                timeout=self.timeout,
+            )
+        return state['http_client']
+
+    def openai_client(self) -> OpenAI:
+        """공유 풀을 쓰는 동기 OpenAI 클라이언트"""
+        http_client = self.http_client()
+        with self._lock:
+            if self._openai_client is None:
+                self._openai_client = OpenAI(
+                    api_key=self._get_api_key(),
+                    http_client=http_client,
+                    max_retries=0,  # 재시도는 게이트웨이 전송 계층에서 처리
+                )
+            return self._openai_client
+
+    def async_openai_client(self) -> AsyncOpenAI:
+        """공유 풀을 쓰는 비동기 OpenAI 클라이언트 (현재 이벤트 루프 기준)"""
+        http_client = self.async_http_client()
+        state = self._loop_state()
+        if state['openai_client'] is None:
+            state['openai_client'] = AsyncOpenAI(
+                api_key=self._get_api_key(),
+                http_client=http_client,
+                max_retries=0,
+            )
+        return state['openai_client']
+
+    async def chat_completion(self, **kwargs):
+        """chat.completions.create 비동기 호출"""
+        return await self.async_openai_client().chat.completions.create(**kwargs)
+
+    def autogen_model_client(self, model: str, **kwargs):
+        """
+        공유 풀을 쓰는 AutoGen OpenAIChatCompletionClient
+
+        Args:
+            model: 모델 이름
+            **kwargs: temperature 등 OpenAIChatCompletionClient 인자
+        """
+        from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+        return OpenAIChatCompletionClient(
+            model=model,
+            api_key=self._get_api_key(),
+            http_client=self.async_http_client(),
+            max_retries=0,
+            **kwargs
+        )
+
+    def langchain_chat_model(self, **kwargs):
+        """공유 풀을 쓰는 LangChain ChatOpenAI"""
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(
+            http_client=self.http_client(),
+            http_async_client=self.async_http_client(),
+            max_retries=0,
+            **kwargs
+        )
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """프로세스 전역 LLM 게이트웨이"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
@@ -1,27 +1,44 @@
 # -*- coding: utf-8 -*-
-from openai import OpenAI
 import json
 import os
 import pandas as pd
 import glob
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, Counter
 import re
+import threading
+from transcript_index import TranscriptIndex, tokenize
+from knowledge_base_snapshot import KnowledgeBaseSnapshot, file_signature
+from llm_gateway import get_gateway
+from conversation_memory import ConversationMemory, message_tokens
+from prompt_registry import compose_messages, get_prompt_registry
 
-class PersonaChatbotRAG:
+_persona_clusters_cache = {}
+
+def load_persona_clusters(path='persona_clusters.csv'):
+    """클러스터링 결과 CSV 로드 (mtime 기준 캐시, 챗봇 여러 개가 공유)"""
+    mtime = os.path.getmtime(path)
+    cached = _persona_clusters_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, pd.read_csv(path))
+        _persona_clusters_cache[path] = cached
+    return cached[1]
+
+class PersonaKnowledge:
+    """
+    클러스터별 읽기 전용 지식 서비스 (페르소나 정의 + 지식 베이스 + 정적 시스템 프롬프트)
+    
+    구축 후에는 바뀌지 않으므로 get_persona_knowledge()로 프로세스당 한 번만 만들어
+    모든 세션의 PersonaChatbotRAG가 공유
+    """
     def __init__(self, cluster_id):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
         self.cluster_id = cluster_id
         self.persona = self.load_persona_data()
         self.knowledge_base = self.build_knowledge_base()
-        self.conversation_history = []
+        self.system_prompt = self.get_static_prompt()
         
     def load_persona_data(self):
         """클러스터별 페르소나 데이터 로드"""
-        # 클러스터링 결과에서 해당 클러스터 데이터 가져오기
-        df = pd.read_csv('persona_clusters.csv')
-        cluster_data = df[df['cluster'] == self.cluster_id]
-        
         # 클러스터별 페르소나 정의
         personas = {
             0: {
@@ -82,11 +99,11 @@ class PersonaChatbotRAG:
         })
     
     def build_knowledge_base(self):
-        """클러스터별 STT 데이터 기반 지식 베이스 구축"""
+        """클러스터별 STT 데이터 기반 지식 베이스 구축 (변경 없는 채널은 스냅샷에서 로드)"""
         print(f"Building knowledge base for cluster {self.cluster_id}...")
         
         # 클러스터에 속한 채널들 찾기
-        df = pd.read_csv('persona_clusters.csv')
+        df = load_persona_clusters()
         cluster_data = df[df['cluster'] == self.cluster_id]
         channel_ids = cluster_data['channel_id'].tolist()
         
@@ -94,9 +111,13 @@ class PersonaChatbotRAG:
             'transcripts': [],
             'topics': defaultdict(int),
             'keywords': defaultdict(int),
-            'channels': []
+            'channels': [],
+            'index': TranscriptIndex()
         }
         
+        snapshot = KnowledgeBaseSnapshot()
+        rebuilt_channels = 0
+        
         # 각 채널의 STT 파일들 수집
         for channel_id in channel_ids:
             channel_dir = f"youtube_data/{channel_id}"
@@ -104,56 +125,98 @@ class PersonaChatbotRAG:
                 continue
                 
             # STT 파일들 찾기
-            txt_files = glob.glob(f"{channel_dir}/*.txt")
+            txt_files = sorted(glob.glob(f"{channel_dir}/*.txt"))
+            signature = file_signature(txt_files)
             
-            for txt_file in txt_files:
-                try:
-                    with open(txt_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                        # 메타데이터 추출
-                        lines = content.split('\n')
-                        title = ""
-                        for line in lines[:5]:
-                            if line.startswith('제목:'):
-                                title = line.replace('제목:', '').strip()
-                                break
-                        
-                        # 전사본 내용 추출 (시간 정보 제거)
-                        transcript_content = []
-                        for line in lines:
-                            if line.startswith('[') and ']' in line:
-                                # 시간 정보 제거하고 텍스트만 추출
-                                text_part = line.split('] ', 1)
-                                if len(text_part) > 1:
-                                    transcript_content.append(text_part[1])
-                        
-                        full_transcript = ' '.join(transcript_content)
-                        
-                        if full_transcript.strip():
-                            knowledge_base['transcripts'].append({
-                                'title': title,
-                                'content': full_transcript,
-                                'channel_id': channel_id
-                            })
-                            
-                            # 키워드 추출
-                            words = re.findall(r'\b\w+\b', full_transcript.lower())
-                            for word in words:
-                                if len(word) > 3:  # 3글자 이상만
-                                    knowledge_base['keywords'][word] += 1
-                                    
-                except Exception as e:
-                    print(f"파일 읽기 실패: {txt_file} - {e}")
-                    continue
+            documents = snapshot.load_channel(channel_id, signature)
+            if documents is None:
+                documents = self.parse_channel_transcripts(channel_id, txt_files)
+                snapshot.save_channel(channel_id, signature, documents)
+                rebuilt_channels += 1
+            
+            for doc in documents:
+                knowledge_base['transcripts'].append({
+                    'title': doc['title'],
+                    'content': doc['content'],
+                    'channel_id': channel_id
+                })
+                knowledge_base['index'].add_document_counts(
+                    doc['term_counts'], doc['length'], doc['title_terms']
+                )
+                
+                # 키워드 집계 (3글자 이상만)
+                for word, count in doc['term_counts'].items():
+                    if len(word) > 3:
+                        knowledge_base['keywords'][word] += count
         
         # 상위 키워드 추출
         top_keywords = sorted(knowledge_base['keywords'].items(), key=lambda x: x[1], reverse=True)[:50]
         knowledge_base['top_keywords'] = dict(top_keywords)
+        knowledge_base['topics'] = dict(knowledge_base['topics'])
+        knowledge_base['keywords'] = dict(knowledge_base['keywords'])
         
-        print(f"Knowledge base built: {len(knowledge_base['transcripts'])} transcripts")
+        print(f"Knowledge base built: {len(knowledge_base['transcripts'])} transcripts "
+              f"({rebuilt_channels}/{len(channel_ids)} channels rebuilt)")
         return knowledge_base
     
+    def parse_channel_transcripts(self, channel_id, txt_files):
+        """채널 STT 파일 파싱 + 토큰화 (스냅샷 저장 단위)"""
+        documents = []
+        
+        for txt_file in txt_files:
+            try:
+                with open(txt_file, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                # 메타데이터 추출
+                lines = content.split('\n')
+                title = ""
+                for line in lines[:5]:
+                    if line.startswith('제목:'):
+                        title = line.replace('제목:', '').strip()
+                        break
+                
+                # 전사본 내용 추출 (시간 정보 제거)
+                transcript_content = []
+                for line in lines:
+                    if line.startswith('[') and ']' in line:
+                        # 시간 정보 제거하고 텍스트만 추출
+                        text_part = line.split('] ', 1)
+                        if len(text_part) > 1:
+                            transcript_content.append(text_part[1])
+                
+                full_transcript = ' '.join(transcript_content)
+                
+                if full_transcript.strip():
+                    words = tokenize(full_transcript)
+                    documents.append({
+                        'title': title,
+                        'content': full_transcript,
+                        'term_counts': dict(Counter(words)),
+                        'length': len(words),
+                        'title_terms': tokenize(title)
+                    })
+                    
+            except Exception as e:
+                print(f"파일 읽기 실패: {txt_file} - {e}")
+                continue
+        
+        return documents
+    
+    def get_static_prompt(self):
+        """
+        레지스트리에서 컴파일된 시스템 프롬프트 조회
+        
+        페르소나 정의 + 상위 키워드가 같으면 같은 버전이므로 한 번만 생성
+        """
+        source = {
+            'persona': self.persona,
+            'keywords': list(self.knowledge_base['top_keywords'].keys())[:20],
+        }
+        return get_prompt_registry().compile(
+            f"persona_chatbot.{self.cluster_id}", source, self.get_system_prompt
+        )
+    
     def get_system_prompt(self):
         """페르소나 기반 시스템 프롬프트"""
         return f"""
@@ -184,55 +247,119 @@ class PersonaChatbotRAG:
         """
     
     def retrieve_relevant_content(self, query, top_k=3):
-        """RAG: 관련 콘텐츠 검색"""
-        query_lower = query.lower()
-        relevant_transcripts = []
+        """RAG: 관련 콘텐츠 검색 (역색인 + BM25)"""
+        transcripts = self.knowledge_base['transcripts']
+        results = self.knowledge_base['index'].search(query, top_k=top_k)
+        return [transcripts[doc_id] for doc_id, _ in results]
+    
+    def get_knowledge_stats(self):
+        """지식 베이스 통계"""
+        return {
+            'total_transcripts': len(self.knowledge_base['transcripts']),
+            'top_keywords': list(self.knowledge_base['top_keywords'].keys())[:10],
+            'cluster_id': self.cluster_id,
+            'persona_name': self.persona['name']
+        }
+
+_persona_knowledge = {}
+_persona_knowledge_lock = threading.Lock()
+
+def get_persona_knowledge(cluster_id):
+    """클러스터 지식 서비스 (프로세스 전역 싱글톤, 첫 호출에서만 구축)"""
+    with _persona_knowledge_lock:
+        knowledge = _persona_knowledge.get(cluster_id)
+        if knowledge is None:
+            knowledge = PersonaKnowledge(cluster_id)
+            _persona_knowledge[cluster_id] = knowledge
+        return knowledge
+
+def clear_persona_knowledge():
+    """공유 지식 서비스 폐기 (원본 데이터 갱신 후 다음 호출에서 다시 구축)"""
+    with _persona_knowledge_lock:
+        _persona_knowledge.clear()
+
+class PersonaChatbotRAG:
+    """
+    세션별 페르소나 대화 객체
+    
+    지식 베이스/프롬프트는 공유 PersonaKnowledge를 참조만 하고 대화 기록만 인스턴스가 소유하므로
+    세션마다 만들어도 가볍고, 세션 수가 늘어도 지식 베이스 메모리는 그대로
+    """
+    def __init__(self, cluster_id, knowledge=None):
+        # 챗봇끼리 HTTP 커넥션 풀을 공유하는 프로세스 전역 클라이언트
+        self.client = get_gateway().openai_client()
+        self.cluster_id = cluster_id
+        self.knowledge = knowledge or get_persona_knowledge(cluster_id)
+        # 최근 턴 원문 + 오래된 턴 요약 (세션이 길어져도 프롬프트 크기 일정)
+        self.memory = ConversationMemory(summarizer=self.summarize_history)
+        self.last_prompt_tokens = 0
+    
+    @property
+    def persona(self):
+        return self.knowledge.persona
+    
+    @property
+    def knowledge_base(self):
+        return self.knowledge.knowledge_base
+    
+    def get_static_prompt(self):
+        """공유 지식 서비스의 컴파일된 시스템 프롬프트"""
+        return self.knowledge.system_prompt
+    
+    def retrieve_relevant_content(self, query, top_k=3):
+        """RAG: 관련 콘텐츠 검색 (공유 역색인, 읽기 전용)"""
+        return self.knowledge.retrieve_relevant_content(query, top_k)
+    
+    @property
+    def conversation_history(self):
+        """요청에 들어가는 대화 기록 (요약 + 최근 원문)"""
+        return self.memory.messages()
+    
+    def summarize_history(self, summary, turns, max_tokens):
+        """오래된 대화 턴을 기존 요약에 합쳐 새 요약 생성 (ConversationMemory 요약기)"""
+        dialogue = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+        prompt = f"""
+        다음은 {self.persona['name']}(assistant)와 사용자(user)의 대화 요약과 이어지는 대화입니다.
+        사용자의 관심사, 질문, 주고받은 핵심 정보가 빠지지 않도록 하나의 요약으로 합쳐주세요.
+        {max_tokens} 토큰 이내의 한국어 글머리표로 작성하세요.
         
-        for transcript in self.knowledge_base['transcripts']:
-            content = transcript['content'].lower()
-            title = transcript['title'].lower()
-            
-            # 간단한 키워드 매칭으로 관련도 계산
-            relevance_score = 0
-            
-            # 제목에서 매칭
-            if any(word in title for word in query_lower.split()):
-                relevance_score += 3
-            
-            # 내용에서 매칭
-            for word in query_lower.split():
-                if word in content:
-                    relevance_score += content.count(word)
-            
-            if relevance_score > 0:
-                relevant_transcripts.append((transcript, relevance_score))
+        ## 기존 요약
+        {summary or "(없음)"}
         
-        # 관련도 순으로 정렬하고 상위 k개 반환
-        relevant_transcripts.sort(key=lambda x: x[1], reverse=True)
-        return [t[0] for t in relevant_transcripts[:top_k]]
+        ## 이어지는 대화
+        {dialogue}
+        """
+        response = self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content
     
-    def chat(self, user_message):
-        """RAG 기반 대화 처리"""
+    def _prepare_messages(self, user_message):
+        """검색 컨텍스트 + 대화 기록으로 요청 메시지 구성 (사용자 메시지는 기록에 추가)"""
         # 관련 콘텐츠 검색
         relevant_content = self.retrieve_relevant_content(user_message)
         
         # 컨텍스트 구성
         context = ""
         if relevant_content:
-            context = "\n\n## 관련 콘텐츠 참고:\n"
+            context = "## 관련 콘텐츠 참고:\n"
             for i, content in enumerate(relevant_content, 1):
                 context += f"{i}. {content['title']}: {content['content'][:200]}...\n"
         
-        # 대화 기록에 추가
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
+        # 대화 기록에 추가 (예산을 넘으면 오래된 턴은 요약으로 접힘)
+        self.memory.add("user", user_message)
         
-        # 메시지 구성
-        messages = [
-            {"role": "system", "content": self.get_system_prompt() + context}
-        ] + self.conversation_history
+        # 메시지 구성 (정적 시스템 프롬프트를 맨 앞에 고정하고 검색 컨텍스트는 마지막 질문 바로 앞에)
+        messages = compose_messages(self.get_static_prompt(), self.memory.messages(), context)
+        self.last_prompt_tokens = message_tokens(messages)
+        return messages
+    
+    def chat(self, user_message):
+        """RAG 기반 대화 처리"""
+        messages = self._prepare_messages(user_message)
         
         # GPT 응답 생성
         response = self.client.chat.completions.create(
@@ -244,13 +371,41 @@ class PersonaChatbotRAG:
         
         assistant_message = response.choices[0].message.content
         
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": assistant_message
-        })
+        self.memory.add("assistant", assistant_message)
         
         return assistant_message
     
+    def chat_stream(self, user_message):
+        """
+        RAG 기반 대화 처리 (토큰 스트리밍)
+        
+        Yields:
+            생성되는 응답 텍스트 조각 (전체 응답은 끝난 뒤 대화 기록에 저장)
+        """
+        messages = self._prepare_messages(user_message)
+        
+        stream = self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            temperature=0.9,
+            max_tokens=500,
+            stream=True
+        )
+        
+        parts = []
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        finally:
+            # 중간에 소비를 멈춰도 받은 만큼은 기록해 대화 흐름 유지
+            stream.close()
+            self.memory.add("assistant", "".join(parts))
+    
     def get_trend_analysis(self, topic):
         """특정 토픽에 대한 트렌드 분석"""
         # 관련 콘텐츠 검색
@@ -294,7 +449,7 @@ class PersonaChatbotRAG:
     def compare_with_peers(self):
         """같은 클러스터 내 다른 인플루언서들과 비교"""
         # 클러스터에 속한 채널들 정보
-        df = pd.read_csv('persona_clusters.csv')
+        df = load_persona_clusters()
         cluster_data = df[df['cluster'] == self.cluster_id]
         channels = cluster_data['channel_name'].tolist()
         
@@ -319,16 +474,11 @@ class PersonaChatbotRAG:
     
     def reset_conversation(self):
         """대화 기록 초기화"""
-        self.conversation_history = []
+        self.memory.clear()
     
     def get_knowledge_stats(self):
         """지식 베이스 통계"""
-        return {
-            'total_transcripts': len(self.knowledge_base['transcripts']),
-            'top_keywords': list(self.knowledge_base['top_keywords'].keys())[:10],
-            'cluster_id': self.cluster_id,
-            'persona_name': self.persona['name']
-        }
+        return self.knowledge.get_knowledge_stats()
 
 # 사용 예시
 if __name__ == "__main__":
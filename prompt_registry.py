@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prompt Registry - 페르소나별 정적 시스템 프롬프트 캐시
+페르소나 정의(버전)가 바뀌지 않는 한 시스템 프롬프트는 한 번만 만들고,
+턴마다 바뀌는 RAG 컨텍스트는 메시지 뒤쪽에만 끼워 넣어
+요청 앞부분(정적 프롬프트 + 이전 대화)이 그대로 유지되도록 함 (제공자 측 프롬프트 프리픽스 캐시 적중)
+"""
+
+import hashlib
+import json
+import threading
+from typing import Callable, Dict, List, Optional
+
+from conversation_memory import count_tokens
+
+
+def prompt_version(source) -> str:
+    """프롬프트 재료(페르소나 정의 등)의 내용 해시 - 재료가 바뀌면 버전도 바뀜"""
+    raw = json.dumps(source, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]
+
+
+class CompiledPrompt:
+    """컴파일된 정적 프롬프트와 크기 정보"""
+
+    def __init__(self, key: str, version: str, text: str):
+        self.key = key
+        self.version = version
+        self.text = text
+        self.chars = len(text)
+        self.tokens = count_tokens(text)
+        self.hits = 0
+
+
+class PromptRegistry:
+    """
+    (키, 버전)별 정적 프롬프트 저장소 (스레드 안전)
+
+    같은 페르소나의 챗봇/에이전트 인스턴스가 여러 개여도 프롬프트는 한 번만 생성하고,
+    키마다 최신 버전 하나만 보관
+    """
+
+    def __init__(self):
+        self._prompts = {}  # key -> CompiledPrompt
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def compile(self, key: str, source, builder: Callable[[], str], version: Optional[str] = None) -> str:
+        """
+        정적 프롬프트 조회 (없거나 버전이 다르면 builder로 생성)
+
+        Args:
+            key: 프롬프트 키 (예: "customer_agents.iphone_to_galaxy")
+            source: 프롬프트 재료 (version이 없으면 내용 해시로 버전 계산)
+            builder: 프롬프트 문자열 생성 함수
+            version: 명시적 버전 (선택)
+        """
+        version = version or prompt_version(source)
+        with self._lock:
+            prompt = self._prompts.get(key)
+            if prompt is not None and prompt.version == version:
+                prompt.hits += 1
+                return prompt.text
+
+        text = builder()
+        with self._lock:
+            self._prompts[key] = CompiledPrompt(key, version, text)
+            self.builds += 1
+        return text
+
+    def get(self, key: str) -> Optional[CompiledPrompt]:
+        with self._lock:
+            return self._prompts.get(key)
+
+    def stats(self) -> Dict:
+        """프롬프트 크기 통계 (키별 버전/문자 수/토큰 수/재사용 횟수 + 합계)"""
+        with self._lock:
+            prompts = {
+                key: {'version': p.version, 'chars': p.chars, 'tokens': p.tokens, 'hits': p.hits}
+                for key, p in sorted(self._prompts.items())
+            }
+            return {
+                'prompts': prompts,
+                'count': len(prompts),
+                'total_tokens': sum(p['tokens'] for p in prompts.values()),
+                'builds': self.builds,
+                'hits': sum(p['hits'] for p in prompts.values()),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._prompts.clear()
+
+
+def compose_messages(system_prompt: str, history: List[Dict], context: str = "") -> List[Dict]:
+    """
+    요청 메시지 배치: [정적 시스템 프롬프트] + 이전 대화 + [RAG 컨텍스트] + 마지막 사용자 메시지
+
+    턴마다 바뀌는 컨텍스트를 시스템 프롬프트에 붙이면 매 요청의 앞부분이 달라져
+    프리픽스 캐시가 맞지 않으므로, 마지막 사용자 메시지 바로 앞에 별도 메시지로 둠
+    """
+    messages = [{"role": "system", "content": system_prompt}] + list(history[:-1])
+    if context:
+        messages.append({"role": "system", "content": context.strip()})
+    messages.extend(history[-1:])
+    return messages
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """프로세스 전역 프롬프트 레지스트리"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = PromptRegistry()
+        return _registry
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Context Cache - get_context 검색 결과 LRU/TTL 캐시
+토론 중 같은 질의(진행자 프롬프트, 반복 주제)에 대한 임베딩 호출 + 벡터 검색을 생략
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 질의 정규화 (앞뒤/연속 공백 정리)"""
+    return ' '.join(query.split())
+
+
+class ContextCache:
+    """
+    (페르소나, 정규화된 질의, k) → 컨텍스트 목록 캐시
+
+    최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 제거하고,
+    ttl_seconds가 지난 항목은 조회 시 만료 처리.
+    벡터스토어가 재구축되면 invalidate(persona)로 해당 페르소나 항목을 비움
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = 600):
+        """
+        Args:
+            max_entries: 최대 캐시 항목 수
+            ttl_seconds: 항목 유효 시간 (None이면 만료 없음)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()  # key → (저장 시각, 컨텍스트 목록)
+        self._lock = threading.Lock()  # 에이전트 스레드에서 동시 호출 가능
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(persona: str, query: str, k: int) -> Tuple[str, str, int]:
+        return (persona, normalize_query(query), k)
+
+    def get(self, persona: str, query: str, k: int) -> Optional[List[str]]:
+        """캐시된 컨텍스트 (없거나 만료되면 None)"""
+        key = self.make_key(persona, query, k)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None \
+                    and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, persona: str, query: str, k: int, contexts: List[str]):
+        """검색 결과 저장 (호출자가 결과 리스트를 바꿔도 영향 없도록 복사)"""
+        key = self.make_key(persona, query, k)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), list(contexts))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, persona: Optional[str] = None) -> int:
+        """
+        페르소나 항목 제거 (persona가 None이면 전체)
+
+        Returns:
+            제거된 항목 수
+        """
+        with self._lock:
+            if persona is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+
+            stale = [key for key in self._entries if key[0] == persona]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self) -> Dict:
+        """적중/미스 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Embedding Cache - 청크 텍스트 해시 기반 임베딩 캐시
+RAGManager / RealReviewRAGManager가 공유하며, 벡터스토어를 지워도
+내용이 그대로인 청크는 다시 임베딩하지 않음
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+DEFAULT_CACHE_PATH = Path(__file__).parent / "embedding_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+def content_key(model: str, text: str) -> str:
+    """캐시 키: sha256(모델명 + 청크 텍스트)"""
+    digest = hashlib.sha256()
+    digest.update(model.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite 기반 float32 임베딩 저장소 (LRU 제거)"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path: 캐시 DB 파일 경로
+            max_entries: 최대 보관 벡터 수 (초과 시 오래 안 쓰인 것부터 제거)
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON embeddings(last_used)")
+        self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """키 목록 조회 (없는 항목은 None), 조회된 항목은 사용 시각 갱신"""
+        found = {}
+        with self._lock:
+            # SQLite 변수 개수 제한을 피하기 위해 나눠서 조회
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return [found.get(key) for key in keys]
+
+    def put_many(self, keys: List[str], vectors: List[List[float]]):
+        """벡터 저장 (float32로 압축) 후 용량 초과분 제거"""
+        now = time.time()
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in zip(keys, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)", rows
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """LRU 제거: max_entries 초과분을 last_used 오래된 순으로 삭제"""
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                " SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """기존 Embeddings를 감싸 캐시에 없는 텍스트만 실제로 임베딩"""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model_name: Optional[str] = None):
+        """
+        Args:
+            embeddings: 실제 임베딩 함수 (예: OpenAIEmbeddings)
+            cache: 공유 EmbeddingCache
+            model_name: 캐시 키용 모델명 (기본: embeddings.model)
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name or getattr(embeddings, 'model', type(embeddings).__name__)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [content_key(self.model_name, text) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        # 캐시 미스 텍스트만 모아서 한 번에 임베딩 (중복 텍스트는 1회만)
+        missing = {}
+        for key, text, vector in zip(keys, texts, cached):
+            if vector is None and key not in missing:
+                missing[key] = text
+
+        if missing:
+            new_vectors = self.embeddings.embed_documents(list(missing.values()))
+            self.cache.put_many(list(missing.keys()), new_vectors)
+            fresh = {
+                key: np.asarray(vector, dtype=np.float32)
+                for key, vector in zip(missing.keys(), new_vectors)
+            }
+        else:
+            fresh = {}
+
+        return [
+            (vector if vector is not None else fresh[key]).tolist()
+            for key, vector in zip(keys, cached)
+        ]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = content_key(self.model_name, text)
+        vector = self.cache.get_many([key])[0]
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self.cache.put_many([key], [vector])
+            return list(vector)
+        return vector.tolist()
+
+
+_shared_caches = {}
+
+
+def get_shared_cache(path: Path = DEFAULT_CACHE_PATH) -> EmbeddingCache:
+    """프로세스 내 공유 캐시 (매니저 여러 개가 같은 DB 연결 사용)"""
+    key = str(Path(path).resolve())
+    if key not in _shared_caches:
+        _shared_caches[key] = EmbeddingCache(path)
+    return _shared_caches[key]
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Embedding Pipeline - 전 페르소나 청크를 모아 배치 단위로 동시 임베딩
+분당 토큰(TPM) / 요청(RPM) 한도를 지키며 재시도(지수 백오프)하고,
+결과는 공유 임베딩 캐시에 채워 페르소나별 벡터스토어 생성 시 그대로 재사용
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List
+
+from rag.embedding_cache import CachedEmbeddings, content_key
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken 미설치/오프라인 시 근사치 사용
+    _ENCODING = None
+
+
+def estimate_tokens(text: str) -> int:
+    """요청 토큰 수 추정 (tiktoken 없으면 한글 기준 보수적 근사)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(text) // 2 + 1
+
+
+class RateLimiter:
+    """분당 토큰/요청 한도를 위한 슬라이딩 윈도우 리미터 (스레드 안전)"""
+
+    def __init__(self, tokens_per_minute: int, requests_per_minute: int, window: float = 60.0):
+        self.tokens_per_minute = tokens_per_minute
+        self.requests_per_minute = requests_per_minute
+        self.window = window
+        self._events = []  # [(timestamp, tokens), ...]
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int):
+        """한도 내에 들어올 때까지 대기 후 사용량 기록"""
+        # 단일 배치가 TPM보다 크면 영원히 못 들어가므로 상한으로 자름
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._events = [(t, n) for t, n in self._events if now - t < self.window]
+                used_tokens = sum(n for _, n in self._events)
+
+                if (len(self._events) < self.requests_per_minute
+                        and used_tokens + tokens <= self.tokens_per_minute):
+                    self._events.append((now, tokens))
+                    return
+
+                # 가장 오래된 기록이 윈도우를 벗어날 때까지 대기
+                wait = self.window - (now - self._events[0][0])
+            time.sleep(max(wait, 0.01))
+
+
+class EmbeddingPipeline:
+    """캐시 미스 청크를 크기 제한 배치로 묶어 동시에 임베딩"""
+
+    def __init__(
+        self,
+        embeddings: CachedEmbeddings,
+        max_batch_texts: int = 256,
+        max_batch_tokens: int = 8000,
+        tokens_per_minute: int = 1_000_000,
+        requests_per_minute: int = 3000,
+        max_workers: int = 8,
+        max_retries: int = 5,
+        base_backoff: float = 1.0,
+    ):
+        """
+        Args:
+            embeddings: 공유 캐시가 연결된 CachedEmbeddings
+            max_batch_texts: 배치당 최대 텍스트 수
+            max_batch_tokens: 배치당 최대 추정 토큰 수
+            tokens_per_minute: 분당 토큰 한도 (TPM)
+            requests_per_minute: 분당 요청 한도 (RPM)
+            max_workers: 동시 요청 수
+            max_retries: 배치당 최대 재시도 횟수
+            base_backoff: 재시도 기본 대기(초), 시도마다 2배 + 지터
+        """
+        self.embeddings = embeddings
+        self.max_batch_texts = max_batch_texts
+        self.max_batch_tokens = max_batch_tokens
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.rate_limiter = RateLimiter(tokens_per_minute, requests_per_minute)
+
+        self.stats = {'texts': 0, 'cached': 0, 'embedded': 0, 'batches': 0, 'retries': 0}
+        self._stats_lock = threading.Lock()
+
+    def make_batches(self, texts: List[str]) -> List[List[str]]:
+        """텍스트 수/토큰 수 상한을 넘지 않도록 순서대로 배치 구성"""
+        batches = []
+        current, current_tokens = [], 0
+        for text in texts:
+            tokens = estimate_tokens(text)
+            if current and (len(current) >= self.max_batch_texts
+                            or current_tokens + tokens > self.max_batch_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _embed_batch(self, batch: List[str]) -> int:
+        """배치 1개 임베딩 + 캐시 저장 (실패 시 지수 백오프 재시도)"""
+        tokens = sum(estimate_tokens(text) for text in batch)
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(tokens)
+            try:
+                vectors = self.embeddings.embeddings.embed_documents(batch)
+                keys = [content_key(self.embeddings.model_name, text) for text in batch]
+                self.embeddings.cache.put_many(keys, vectors)
+                return len(batch)
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                with self._stats_lock:
+                    self.stats['retries'] += 1
+                time.sleep(self.base_backoff * (2 ** attempt) * (1 + random.random()))
+        return 0
+
+    def prefetch(self, texts: Iterable[str]) -> Dict[str, int]:
+        """
+        캐시에 없는 텍스트만 동시 임베딩하여 캐시 채우기
+
+        Returns:
+            처리 통계 (texts / cached / embedded / batches / retries)
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        keys = [content_key(self.embeddings.model_name, text) for text in unique_texts]
+        cached = self.embeddings.cache.get_many(keys)
+        missing = [text for text, vector in zip(unique_texts, cached) if vector is None]
+
+        batches = self.make_batches(missing)
+        self.stats['texts'] += len(unique_texts)
+        self.stats['cached'] += len(unique_texts) - len(missing)
+        self.stats['batches'] += len(batches)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._embed_batch, batch) for batch in batches]
+            for future in as_completed(futures):
+                self.stats['embedded'] += future.result()
+
+        return dict(self.stats)
+
+    def prefetch_personas(self, chunks_by_persona: Dict[str, List]) -> Dict[str, int]:
+        """페르소나별 청크(Document) 목록을 한 번에 모아 prefetch"""
+        texts = [
+            chunk.page_content
+            for chunks in chunks_by_persona.values()
+            for chunk in chunks
+        ]
+        return self.prefetch(texts)
@@ -10,11 +10,16 @@ from pathlib import Path
 from typing import List, Dict, Optional
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+from langchain_openai import OpenAIEmbeddings
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
 from langchain_community.document_loaders import TextLoader, DirectoryLoader
+from rag.embedding_cache import CachedEmbeddings, get_shared_cache
+from llm_gateway import get_gateway
+from rag.embedding_pipeline import EmbeddingPipeline
+from rag.context_cache import ContextCache
+from rag.vector_backends import EXACT_MAX_VECTORS, build_retriever
 
 def safe_print(msg):
     """Windows 인코딩 오류 방지용 안전한 print"""
@@ -29,12 +34,15 @@ def safe_print(msg):
 class RAGManager:
     """페르소나별 RAG 시스템 관리자"""
     
-    def __init__(self, use_openai_embeddings=True):
+    def __init__(self, use_openai_embeddings=True, retrieval_backend: str = 'auto',
+                 exact_max_vectors: int = EXACT_MAX_VECTORS):
         """
         RAG 관리자 초기화
         
         Args:
             use_openai_embeddings: True면 OpenAI (요구사항), False면 HuggingFace
+            retrieval_backend: 검색 백엔드 ('auto'면 청크 수 기준 exact/hnsw/ivf, 'chroma'면 기존 방식)
+            exact_max_vectors: 'auto'에서 정확 검색을 쓰는 최대 청크 수
         """
         self.data_dir = Path(__file__).parent / "data"
         # Use new vector stores with updated content
@@ -50,12 +58,14 @@ class RAGManager:
             print("[*] OpenAI Embeddings initializing...")
         except:
             pass
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-ada-002"
+        # 청크 해시 기반 임베딩 캐시 (벡터스토어 재생성 시 변경된 청크만 임베딩)
+        self.embeddings = CachedEmbeddings(
+            OpenAIEmbeddings(model="text-embedding-ada-002"),
+            get_shared_cache()
         )
         
-        # LLM (OpenAI GPT-4)
-        self.llm = ChatOpenAI(
+        # LLM (OpenAI GPT-4, 공유 커넥션 풀)
+        self.llm = get_gateway().langchain_chat_model(
             model_name="gpt-4",
             temperature=0.7,
             max_tokens=500
@@ -72,6 +82,12 @@ class RAGManager:
         # 페르소나별 Vector Store & Retriever (LangChain 1.0 - qa_chains 제거)
         self.vector_stores = {}
         self.retrievers = {}
+        self.retrieval_backend = retrieval_backend
+        self.exact_max_vectors = exact_max_vectors
+        self.retriever_backends = {}  # 페르소나별 실제 선택된 백엔드 이름
+        
+        # get_context 결과 캐시 (벡터스토어 재로드 시 페르소나별 무효화)
+        self.context_cache = ContextCache()
         
         # 페르소나 정의 (실제 데이터 기반)
         self.personas = {
@@ -98,18 +114,19 @@ class RAGManager:
             print("   - Embeddings: OpenAI (text-embedding-ada-002)")
             print("   - Chunk Size: 500, Overlap: 50")
             print("   - Vector Store: ChromaDB")
+            print(f"   - Embedding cache: {len(self.embeddings.cache)} vectors")
         except:
             pass
     
-    def load_persona_knowledge(self, persona_name: str) -> Optional[Chroma]:
+    def load_persona_chunks(self, persona_name: str) -> Optional[List]:
         """
-        페르소나 지식 로드 및 벡터화
+        페르소나 지식 파일 로드 및 청크 분할
         
         Args:
-            persona_name: 페르소나 이름 (예: 'customer_iphone_to_galaxy')
+            persona_name: 페르소나 이름
         
         Returns:
-            Chroma 벡터 스토어 객체
+            청크(Document) 리스트, 파일이 없으면 None
         """
         file_path = self.data_dir / f"{persona_name}.txt"
         
@@ -124,7 +141,23 @@ class RAGManager:
         documents = loader.load()
         
         # 텍스트 분할 (요구사항: chunk_size=500, overlap=50)
-        chunks = self.text_splitter.split_documents(documents)
+        return self.text_splitter.split_documents(documents)
+    
+    def load_persona_knowledge(self, persona_name: str, chunks: Optional[List] = None) -> Optional[Chroma]:
+        """
+        페르소나 지식 로드 및 벡터화
+        
+        Args:
+            persona_name: 페르소나 이름 (예: 'customer_iphone_to_galaxy')
+            chunks: 미리 분할된 청크 (load_all_personas에서 전달, 없으면 직접 로드)
+        
+        Returns:
+            Chroma 벡터 스토어 객체
+        """
+        if chunks is None:
+            chunks = self.load_persona_chunks(persona_name)
+            if chunks is None:
+                return None
         
         safe_print(f"    Split into {len(chunks)} chunks (500 chars/chunk, 50 overlap)")
         
@@ -150,19 +183,22 @@ class RAGManager:
         # Vector Store 저장
         self.vector_stores[persona_name] = vector_store
         
-        # Retriever 생성 (별도 저장)
-        retriever = vector_store.as_retriever(
-            search_type="similarity",
-            search_kwargs={"k": 3}  # Top 3 관련 문서
+        # Retriever 생성 (별도 저장, 청크 수에 따라 exact/ANN 백엔드 선택)
+        retriever, backend_name = build_retriever(
+            vector_store, self.embeddings, k=3,  # Top 3 관련 문서
+            backend=self.retrieval_backend, exact_max=self.exact_max_vectors,
+            index_path=self.vector_store_dir / f"{persona_name}.ann.pkl"  # ANN 인덱스 재사용
         )
         self.retrievers[persona_name] = retriever
+        self.retriever_backends[persona_name] = backend_name
+        self.context_cache.invalidate(persona_name)
         
         # QA Chain 생성 (LangChain 1.0 LCEL 방식)
         # RAG Chain을 여기서 생성하지 않고, query_persona에서 생성
         
         safe_print(f"[OK] {self.personas[persona_name]} ready")
         safe_print(f"    - Chunks: {len(chunks)}")
-        safe_print(f"    - Retriever: similarity search (k=3)")
+        safe_print(f"    - Retriever: {backend_name} similarity search (k=3)")
         safe_print(f"    - Vector store: {vector_store_path}")
         
         return vector_store
@@ -173,8 +209,27 @@ class RAGManager:
         safe_print("[*] Loading all persona knowledge...")
         safe_print("="*80 + "\n")
         
+        # 1) 벡터스토어가 없는 페르소나의 청크를 모아 배치/동시 임베딩 (캐시 채우기)
+        pending_chunks = {}
         for persona_name in self.personas.keys():
-            self.load_persona_knowledge(persona_name)
+            if not (self.vector_store_dir / persona_name).exists():
+                chunks = self.load_persona_chunks(persona_name)
+                if chunks:
+                    pending_chunks[persona_name] = chunks
+        
+        if pending_chunks:
+            try:
+                stats = EmbeddingPipeline(self.embeddings).prefetch_personas(pending_chunks)
+                safe_print(f"[OK] Embedded {stats['embedded']} chunks in {stats['batches']} batches "
+                           f"({stats['cached']} cached, {stats['retries']} retries)")
+            except Exception as e:
+                # 실패한 배치는 벡터스토어 생성 시 개별 임베딩으로 재시도됨
+                safe_print(f"[!] Batch embedding failed: {e}")
+            safe_print("")
+        
+        # 2) 페르소나별 벡터스토어 생성 (임베딩은 캐시에서 조회)
+        for persona_name in self.personas.keys():
+            self.load_persona_knowledge(persona_name, chunks=pending_chunks.get(persona_name))
             safe_print("")  # 빈 줄
         
         safe_print("="*80)
@@ -199,11 +254,17 @@ class RAGManager:
             safe_print(f"[!] Retriever not found for '{persona_type}'")
             return []
         
+        cached = self.context_cache.get(persona_type, query, k)
+        if cached is not None:
+            return cached
+        
         # Retriever를 사용하여 검색 (LangChain 1.0 - invoke 사용)
         docs = self.retrievers[persona_type].invoke(query)
         
         # 상위 k개만 반환
-        return [doc.page_content for doc in docs[:k]]
+        contexts = [doc.page_content for doc in docs[:k]]
+        self.context_cache.put(persona_type, query, k, contexts)
+        return contexts
     
     def get_relevant_context(self, persona_name: str, query: str, k: int = 3) -> List[str]:
         """
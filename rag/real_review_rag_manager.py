@@ -6,12 +6,19 @@ Real Review Data RAG Manager - 실제 리뷰 데이터를 페르소나별로 분
 
 import os
 import json
+import hashlib
+from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
 from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
+from rag.embedding_cache import CachedEmbeddings, get_shared_cache
+from rag.embedding_pipeline import EmbeddingPipeline
+from rag.review_classifier import ReviewClassifier
+from rag.context_cache import ContextCache
+from rag.vector_backends import EXACT_MAX_VECTORS, build_retriever
 
 def safe_print(msg):
     """Windows 인코딩 오류 방지용 안전한 print"""
@@ -25,8 +32,16 @@ def safe_print(msg):
 class RealReviewRAGManager:
     """실제 리뷰 데이터 기반 RAG 시스템"""
     
-    def __init__(self, use_openai_embeddings=True):
-        """실제 리뷰 데이터 RAG 관리자 초기화"""
+    def __init__(self, use_openai_embeddings=True, retrieval_backend: str = 'auto',
+                 exact_max_vectors: int = EXACT_MAX_VECTORS):
+        """
+        실제 리뷰 데이터 RAG 관리자 초기화
+        
+        Args:
+            use_openai_embeddings: OpenAI 임베딩 사용 여부
+            retrieval_backend: 검색 백엔드 ('auto'면 청크 수 기준 exact/hnsw/ivf, 'chroma'면 기존 방식)
+            exact_max_vectors: 'auto'에서 정확 검색을 쓰는 최대 청크 수
+        """
         self.data_dir = Path(__file__).parent.parent / "data"
         self.vector_store_dir = Path(__file__).parent / "vector_stores_real_reviews"
         self.vector_store_dir.mkdir(exist_ok=True)
@@ -38,11 +53,15 @@ class RealReviewRAGManager:
         # OpenAI Embeddings 사용
         try:
             safe_print("[*] OpenAI Embeddings initializing...")
-            self.embeddings = OpenAIEmbeddings(
-                model="text-embedding-ada-002",
-                api_key=os.getenv("OPENAI_API_KEY")
+            self.embeddings = CachedEmbeddings(
+                OpenAIEmbeddings(
+                    model="text-embedding-ada-002",
+                    api_key=os.getenv("OPENAI_API_KEY")
+                ),
+                get_shared_cache()
             )
             safe_print("   - Embeddings: OpenAI text-embedding-ada-002")
+            safe_print(f"   - Embedding cache: {len(self.embeddings.cache)} vectors")
         except Exception as e:
             safe_print(f"[!] OpenAI Embeddings 초기화 실패: {e}")
             raise
@@ -101,8 +120,21 @@ class RealReviewRAGManager:
             }
         }
         
+        # 단일 패스 분류기 (키워드 매처를 한 번만 컴파일)
+        self.classifier = ReviewClassifier(self.persona_mapping)
+        
         # Retriever 저장소
         self.retrievers = {}
+        self.retrieval_backend = retrieval_backend
+        self.exact_max_vectors = exact_max_vectors
+        self.retriever_backends = {}  # 페르소나별 실제 선택된 백엔드 이름
+        
+        # get_context 결과 캐시 (벡터스토어 동기화 시 페르소나별 무효화)
+        self.context_cache = ContextCache()
+        
+        # 현재 로드된 리뷰 원본 파일 정보 (manifest 기록용)
+        self.review_source = {}
+        self._review_data_cache = None  # (파일 경로, mtime_ns, size, 파싱 결과)
         
         safe_print("   - Vector Store: ChromaDB")
     
@@ -115,14 +147,26 @@ class RealReviewRAGManager:
         
         # 가장 최신 파일 사용
         latest_file = max(review_files, key=lambda x: x.stat().st_mtime)
+        
+        # 같은 파일이 그대로면 다시 파싱하지 않음
+        stat = latest_file.stat()
+        cache_key = (latest_file, stat.st_mtime_ns, stat.st_size)
+        if self._review_data_cache and self._review_data_cache[:3] == cache_key:
+            return self._review_data_cache[3]
+        
         safe_print(f"[*] Loading real review data from {latest_file.name}")
         
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        raw = latest_file.read_bytes()
+        data = json.loads(raw.decode('utf-8'))
+        self.review_source = {
+            'source_file': latest_file.name,
+            'source_sha256': hashlib.sha256(raw).hexdigest()
+        }
         
         safe_print(f"   - iPhone reviews: {len(data.get('iphone_reviews', []))}")
         safe_print(f"   - Galaxy reviews: {len(data.get('galaxy_reviews', []))}")
         
+        self._review_data_cache = (*cache_key, data)
         return data
     
     def classify_reviews_by_persona(self, reviews: List[Dict], persona_name: str) -> List[Dict]:
@@ -130,33 +174,15 @@ class RealReviewRAGManager:
         if persona_name not in self.persona_mapping:
             return []
         
-        persona_config = self.persona_mapping[persona_name]
-        classified_reviews = []
-        
-        for review in reviews:
-            # 기본 조건 확인
-            if review.get('conversion_direction') not in persona_config['conversion_direction']:
-                continue
-            
-            if review.get('conversion_level') not in persona_config['conversion_level']:
-                continue
-            
-            # 키워드 매칭 확인
-            review_text = review.get('review', '').lower()
-            if persona_config['keywords']:
-                keyword_match = any(keyword.lower() in review_text for keyword in persona_config['keywords'])
-                if not keyword_match:
-                    continue
-            
-            # 감정 매칭 확인
-            if persona_config['sentiment']:
-                sentiment = review.get('sentiment', 'neutral')
-                if sentiment not in persona_config['sentiment']:
-                    continue
-            
-            classified_reviews.append(review)
+        return self.classifier.classify(reviews, [persona_name])[persona_name]
+    
+    def classify_all_reviews(self, review_data: Dict) -> Dict[str, List[Dict]]:
+        """전체 리뷰를 한 번만 훑어 모든 페르소나로 분류"""
+        all_reviews = []
+        all_reviews.extend(review_data.get('iphone_reviews', []))
+        all_reviews.extend(review_data.get('galaxy_reviews', []))
         
-        return classified_reviews
+        return self.classifier.classify(all_reviews)
     
     def create_persona_documents(self, reviews: List[Dict], persona_name: str) -> List[Document]:
         """페르소나별 문서 생성"""
@@ -176,7 +202,8 @@ class RealReviewRAGManager:
             # 메타데이터 추가
             metadata = {
                 'persona': persona_name,
-                'review_id': review.get('id', f'review_{i}'),
+                # id 없는 리뷰는 내용 해시로 고정 ID 부여 (증분 동기화 키)
+                'review_id': review.get('id') or f"review_{hashlib.sha1(review_text.encode('utf-8')).hexdigest()[:12]}",
                 'author': review.get('author', ''),
                 'conversion_direction': review.get('conversion_direction', ''),
                 'conversion_level': review.get('conversion_level', ''),
@@ -195,22 +222,29 @@ class RealReviewRAGManager:
         
         return documents
     
-    def load_persona_real_reviews(self, persona_name: str) -> Optional[Chroma]:
-        """페르소나별 실제 리뷰 데이터 로드 및 벡터화"""
+    def build_persona_chunks(self, persona_name: str, classified_reviews: Optional[List[Dict]] = None) -> Optional[List]:
+        """
+        페르소나별 리뷰 분류 → 문서 생성 → 청크 분할
+        
+        Args:
+            persona_name: 페르소나 이름
+            classified_reviews: 이미 분류된 리뷰 (classify_all_reviews 결과, 없으면 직접 분류)
+        """
         safe_print(f"[*] Loading real reviews for {persona_name}...")
         
-        # 실제 리뷰 데이터 로드
-        review_data = self.load_real_review_data()
-        if not review_data:
-            return None
-        
-        # 모든 리뷰 수집
-        all_reviews = []
-        all_reviews.extend(review_data.get('iphone_reviews', []))
-        all_reviews.extend(review_data.get('galaxy_reviews', []))
-        
-        # 페르소나별 분류
-        classified_reviews = self.classify_reviews_by_persona(all_reviews, persona_name)
+        if classified_reviews is None:
+            # 실제 리뷰 데이터 로드
+            review_data = self.load_real_review_data()
+            if not review_data:
+                return None
+            
+            # 모든 리뷰 수집
+            all_reviews = []
+            all_reviews.extend(review_data.get('iphone_reviews', []))
+            all_reviews.extend(review_data.get('galaxy_reviews', []))
+            
+            # 페르소나별 분류
+            classified_reviews = self.classify_reviews_by_persona(all_reviews, persona_name)
         safe_print(f"   - Classified {len(classified_reviews)} reviews for {persona_name}")
         
         if not classified_reviews:
@@ -223,31 +257,153 @@ class RealReviewRAGManager:
         # 텍스트 분할
         chunks = self.text_splitter.split_documents(documents)
         safe_print(f"   - Split into {len(chunks)} chunks")
-        
-        # Vector Store 생성
-        vector_store_path = str(self.vector_store_dir / persona_name)
-        
-        if (self.vector_store_dir / persona_name).exists():
-            safe_print(f"   - Loading existing vector store...")
-            vector_store = Chroma(
-                persist_directory=vector_store_path,
-                embedding_function=self.embeddings
-            )
-        else:
-            safe_print(f"   - Creating new vector store...")
-            vector_store = Chroma.from_documents(
-                documents=chunks,
-                embedding=self.embeddings,
-                persist_directory=vector_store_path
-            )
-            safe_print(f"   - Vector store saved")
-        
-        # Retriever 생성
-        retriever = vector_store.as_retriever(
-            search_type="similarity",
-            search_kwargs={"k": 5}  # 상위 5개 관련 리뷰
+        return chunks
+    
+    def load_persona_real_reviews(self, persona_name: str, chunks: Optional[List] = None) -> Optional[Chroma]:
+        """
+        페르소나별 실제 리뷰 데이터 로드 및 벡터화
+        
+        Args:
+            persona_name: 페르소나 이름
+            chunks: 미리 만든 청크 (load_all_personas_real_reviews에서 전달, 없으면 직접 생성)
+        """
+        if chunks is None:
+            chunks = self.build_persona_chunks(persona_name)
+            if not chunks:
+                return None
+        
+        # Vector Store 로드 후 review_id 기준 증분 반영
+        vector_store = self.sync_persona_store(persona_name, chunks)
+        
+        # Retriever 생성 (청크 수에 따라 exact/ANN 백엔드 선택)
+        retriever, backend_name = build_retriever(
+            vector_store, self.embeddings, k=5,  # 상위 5개 관련 리뷰
+            backend=self.retrieval_backend, exact_max=self.exact_max_vectors,
+            index_path=self.vector_store_dir / f"{persona_name}.ann.pkl"  # ANN 인덱스 재사용
         )
         self.retrievers[persona_name] = retriever
+        self.retriever_backends[persona_name] = backend_name
+        safe_print(f"   - Retriever: {backend_name} similarity search (k=5)")
+        self.context_cache.invalidate(persona_name)
+        
+        return vector_store
+    
+    def _manifest_path(self, persona_name: str) -> Path:
+        return self.vector_store_dir / f"{persona_name}.manifest.json"
+    
+    def load_manifest(self, persona_name: str) -> Optional[Dict]:
+        """벡터스토어가 반영하고 있는 원본 파일/리뷰 해시 기록 로드"""
+        manifest_path = self._manifest_path(persona_name)
+        if not manifest_path.exists():
+            return None
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            safe_print(f"[!] Manifest read failed for {persona_name}: {e}")
+            return None
+    
+    def save_manifest(self, persona_name: str, reviews: Dict):
+        """manifest 저장 (임시 파일 기록 후 교체)"""
+        manifest = {
+            **self.review_source,
+            'persona': persona_name,
+            'updated_at': datetime.now().isoformat(),
+            'reviews': reviews
+        }
+        manifest_path = self._manifest_path(persona_name)
+        tmp_path = manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, manifest_path)
+    
+    def group_chunks_by_review(self, persona_name: str, chunks: List) -> Dict:
+        """
+        청크를 review_id별로 묶고 내용 해시와 고정 청크 ID 부여
+        
+        Returns:
+            {review_id: {'hash': str, 'chunk_ids': [...], 'chunks': [Document, ...]}}
+        """
+        grouped = {}
+        for chunk in chunks:
+            review_id = str(chunk.metadata.get('review_id'))
+            grouped.setdefault(review_id, {'chunks': []})['chunks'].append(chunk)
+        
+        for review_id, entry in grouped.items():
+            digest = hashlib.sha256()
+            for chunk in entry['chunks']:
+                digest.update(chunk.page_content.encode('utf-8'))
+                digest.update(json.dumps(chunk.metadata, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+            entry['hash'] = digest.hexdigest()
+            entry['chunk_ids'] = [f"{persona_name}:{review_id}:{n}" for n in range(len(entry['chunks']))]
+        
+        return grouped
+    
+    def sync_persona_store(self, persona_name: str, chunks: List) -> Chroma:
+        """
+        최신 리뷰 파일과 벡터스토어의 차이(신규/변경/삭제 리뷰)만 반영
+        
+        Args:
+            persona_name: 페르소나 이름
+            chunks: 최신 리뷰 파일에서 만든 페르소나 청크
+        
+        Returns:
+            동기화된 Chroma 벡터 스토어
+        """
+        store_dir = self.vector_store_dir / persona_name
+        store_existed = store_dir.exists()
+        vector_store = Chroma(
+            persist_directory=str(store_dir),
+            embedding_function=self.embeddings
+        )
+        
+        manifest = self.load_manifest(persona_name)
+        old_reviews = manifest.get('reviews', {}) if manifest else {}
+        
+        # manifest는 스토어에 실제로 들어 있는 청크 ID와 일치할 때만 믿음
+        # (스토어 디렉터리를 지워 강제 갱신한 경우 등 어긋나면 비우고 재구축, 임베딩은 캐시에서 재사용)
+        stored_ids = set(vector_store.get(include=[])['ids']) if store_existed else set()
+        expected_ids = {cid for entry in old_reviews.values() for cid in entry['chunk_ids']}
+        rebuilt = manifest is None or stored_ids != expected_ids
+        if rebuilt:
+            if manifest is not None or stored_ids:
+                safe_print(f"   - Manifest does not match vector store, rebuilding...")
+            if stored_ids:
+                vector_store.delete_collection()
+                vector_store = Chroma(
+                    persist_directory=str(store_dir),
+                    embedding_function=self.embeddings
+                )
+            old_reviews = {}
+        
+        current = self.group_chunks_by_review(persona_name, chunks)
+        
+        added = [rid for rid in current if rid not in old_reviews]
+        changed = [rid for rid in current if rid in old_reviews and old_reviews[rid]['hash'] != current[rid]['hash']]
+        deleted = [rid for rid in old_reviews if rid not in current]
+        
+        # 삭제/변경 리뷰의 기존 청크 제거
+        stale_ids = [cid for rid in deleted + changed for cid in old_reviews[rid]['chunk_ids']]
+        if stale_ids:
+            vector_store.delete(ids=stale_ids)
+        
+        # 신규/변경 리뷰 청크 추가
+        new_docs, new_ids = [], []
+        for rid in added + changed:
+            new_docs.extend(current[rid]['chunks'])
+            new_ids.extend(current[rid]['chunk_ids'])
+        if new_docs:
+            vector_store.add_documents(new_docs, ids=new_ids)
+        
+        safe_print(f"   - Sync: +{len(added)} added, ~{len(changed)} changed, -{len(deleted)} deleted "
+                   f"({len(current)} reviews)")
+        
+        if added or changed or deleted or rebuilt \
+                or manifest.get('source_sha256') != self.review_source.get('source_sha256'):
+            self.save_manifest(persona_name, {
+                rid: {'hash': entry['hash'], 'chunk_ids': entry['chunk_ids']}
+                for rid, entry in current.items()
+            })
         
         return vector_store
     
@@ -255,9 +411,47 @@ class RealReviewRAGManager:
         """모든 페르소나의 실제 리뷰 데이터 로드"""
         safe_print("[*] Loading real review data for all personas...")
         
+        review_data = self.load_real_review_data()
+        if not review_data:
+            return
+        
+        # 1) 단일 패스 분류 → 페르소나별 청크 생성 후 한 번에 배치/동시 임베딩
+        classified = self.classify_all_reviews(review_data)
+        chunks_by_persona = {}
+        emptied = []  # 리뷰가 모두 사라진 페르소나 (기존 스토어의 삭제 반영 대상)
         for persona_name in self.persona_mapping.keys():
             try:
-                self.load_persona_real_reviews(persona_name)
+                chunks = self.build_persona_chunks(persona_name, classified[persona_name])
+                if chunks:
+                    chunks_by_persona[persona_name] = chunks
+                elif self.load_manifest(persona_name) is not None:
+                    emptied.append(persona_name)
+            except Exception as e:
+                safe_print(f"[!] Failed to load {persona_name}: {e}")
+        
+        for persona_name in emptied:
+            try:
+                self.sync_persona_store(persona_name, [])
+                self.retrievers.pop(persona_name, None)
+                self.retriever_backends.pop(persona_name, None)
+                self.context_cache.invalidate(persona_name)
+            except Exception as e:
+                safe_print(f"[!] Failed to clear {persona_name}: {e}")
+        
+        # 증분 반영 대상 청크는 미리 알 수 없으므로 전체를 넘기고, 캐시 적중분은 건너뜀
+        if chunks_by_persona:
+            try:
+                stats = EmbeddingPipeline(self.embeddings).prefetch_personas(chunks_by_persona)
+                safe_print(f"[*] Embedded {stats['embedded']} chunks in {stats['batches']} batches "
+                           f"({stats['cached']} cached, {stats['retries']} retries)")
+            except Exception as e:
+                # 실패한 배치는 벡터스토어 생성 시 개별 임베딩으로 재시도됨
+                safe_print(f"[!] Batch embedding failed: {e}")
+        
+        # 2) 페르소나별 벡터스토어 증분 동기화 (임베딩은 캐시에서 조회)
+        for persona_name, chunks in chunks_by_persona.items():
+            try:
+                self.load_persona_real_reviews(persona_name, chunks=chunks)
             except Exception as e:
                 safe_print(f"[!] Failed to load {persona_name}: {e}")
         
@@ -322,6 +516,10 @@ class RealReviewRAGManager:
             safe_print(f"[!] Retriever not found for '{persona_name}'")
             return []
         
+        cached = self.context_cache.get(persona_name, query, k)
+        if cached is not None:
+            return cached
+        
         try:
             # Retriever를 사용하여 검색 (1개 문서만 가져옴)
             docs = self.retrievers[persona_name].invoke(query)
@@ -351,6 +549,7 @@ class RealReviewRAGManager:
                         break
             
             safe_print(f"[*] '{persona_name}' 컨텍스트 로드: {len(contexts)}개 문서, 총 {total_length}자")
+            self.context_cache.put(persona_name, query, k, contexts)
             return contexts
             
         except Exception as e:
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Review Classifier - 리뷰를 한 번만 훑어 모든 페르소나로 분류
+persona_mapping의 키워드를 미리 컴파일한 매처로 리뷰당 1회 스캔하고,
+방향/단계/감정 조건과 함께 해당되는 모든 페르소나에 동시에 라우팅
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+try:
+    import ahocorasick  # pyahocorasick (선택 의존성)
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """
+    키워드 집합에 대한 다중 패턴 매처 (부분 문자열 의미, 소문자 기준)
+
+    pyahocorasick이 있으면 Aho-Corasick 오토마톤으로 텍스트를 한 번만 훑고,
+    없으면 전체 키워드 합집합에 대해 키워드당 1회 부분 문자열 검사로 대체
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({kw.lower() for kw in keywords if kw})
+
+        if ahocorasick is not None and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for kw in self.keywords:
+                self._automaton.add_word(kw, kw)
+            self._automaton.make_automaton()
+            self.backend = 'aho-corasick'
+        else:
+            self._automaton = None
+            self.backend = 'substring'
+
+    def find(self, text: str) -> Set[str]:
+        """text(소문자 정규화된)에 등장하는 키워드 집합"""
+        if self._automaton is not None:
+            return {kw for _, kw in self._automaton.iter(text)}
+        return {kw for kw in self.keywords if kw in text}
+
+
+class ReviewClassifier:
+    """persona_mapping 기준 단일 패스 리뷰 분류기"""
+
+    def __init__(self, persona_mapping: Dict[str, Dict]):
+        self.persona_mapping = persona_mapping
+
+        # 페르소나별 조건을 집합으로 미리 변환
+        self._rules = {}
+        for persona_name, config in persona_mapping.items():
+            self._rules[persona_name] = {
+                'conversion_direction': set(config.get('conversion_direction', [])),
+                'conversion_level': set(config.get('conversion_level', [])),
+                'keywords': {kw.lower() for kw in config.get('keywords', [])},
+                'sentiment': set(config.get('sentiment', [])),
+            }
+
+        self.matcher = KeywordMatcher(
+            kw for rule in self._rules.values() for kw in rule['keywords']
+        )
+
+    def classify(self, reviews: List[Dict], personas: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        """
+        리뷰 목록을 한 번 순회하며 페르소나별로 분류
+
+        Args:
+            reviews: 구조화된 리뷰 목록
+            personas: 분류할 페르소나 (기본: 전체)
+
+        Returns:
+            {persona_name: [review, ...]} (원래 순서 유지)
+        """
+        rules = {
+            name: rule for name, rule in self._rules.items()
+            if personas is None or name in personas
+        }
+        classified = {name: [] for name in rules}
+
+        # (방향, 단계, 감정) 조합별 후보 페르소나 (조합 수가 적어 한 번씩만 계산)
+        candidates_by_key = {}
+
+        for review in reviews:
+            key = (
+                review.get('conversion_direction'),
+                review.get('conversion_level'),
+                review.get('sentiment', 'neutral'),
+            )
+            candidates = candidates_by_key.get(key)
+            if candidates is None:
+                direction, level, sentiment = key
+                candidates = [
+                    (classified[name], rule['keywords']) for name, rule in rules.items()
+                    if direction in rule['conversion_direction']
+                    and level in rule['conversion_level']
+                    and (not rule['sentiment'] or sentiment in rule['sentiment'])
+                ]
+                candidates_by_key[key] = candidates
+
+            # 키워드 외 조건에서 걸러지면 텍스트는 보지 않음
+            if not candidates:
+                continue
+
+            # 텍스트 정규화 + 키워드 매칭은 리뷰당 1회
+            matched = self.matcher.find(review.get('review', '').lower())
+
+            for bucket, keywords in candidates:
+                if not keywords or not keywords.isdisjoint(matched):
+                    bucket.append(review)
+
+        return classified
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vector Backends - 페르소나별 검색 백엔드 (정확 검색 / 근사 최근접 이웃)
+Chroma는 영속 저장소로 유지하고, 검색은 청크 수에 따라 고른 인메모리 백엔드로 수행
+
+- exact: NumPy 내적 + argpartition (소규모 페르소나)
+- hnsw:  hnswlib 그래프 인덱스 (선택 의존성, 대규모 페르소나)
+- ivf:   k-means 역색인 (NumPy만 사용, hnswlib이 없을 때 대규모 페르소나)
+
+ANN 인덱스는 생성 비용이 커서 청크 id/본문 서명과 함께 저장해 두고,
+청크가 그대로면 다음 로드 때 다시 만들지 않고 읽어 옴
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+try:
+    import hnswlib  # 선택 의존성
+except ImportError:
+    hnswlib = None
+
+# 이 청크 수 이하는 정확 검색이 ANN보다 빠르거나 비슷함
+EXACT_MAX_VECTORS = 50_000
+
+# 저장된 ANN 인덱스 형식 버전 (바뀌면 다시 생성)
+ANN_INDEX_VERSION = 1
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """행 L2 정규화 (내적 = 코사인 유사도)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 배열에서 상위 k개 위치 (점수 내림차순)"""
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+class VectorBackend:
+    """검색 백엔드 공통 인터페이스 (행 번호 기준)"""
+
+    name = 'base'
+
+    def build(self, vectors: np.ndarray):
+        """벡터 행렬로 인덱스 생성"""
+        raise NotImplementedError
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            (행 번호 배열, 코사인 유사도 배열) 유사도 내림차순
+        """
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class ExactBackend(VectorBackend):
+    """전수 내적 검색 (정확)"""
+
+    name = 'exact'
+
+    def __init__(self):
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+
+    def build(self, vectors: np.ndarray):
+        self.vectors = _normalize(vectors)
+        return self
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if not len(self.vectors):
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        scores = self.vectors @ _normalize(query)
+        top = _top_k(scores, k)
+        return top, scores[top]
+
+    def __len__(self):
+        return len(self.vectors)
+
+
+class IVFBackend(VectorBackend):
+    """
+    k-means 역색인 (Inverted File) 근사 검색
+
+    벡터를 n_lists개 클러스터로 나눠 클러스터 순서로 연속 저장하고,
+    질의와 가까운 n_probe개 클러스터만 전수 비교
+    """
+
+    name = 'ivf'
+
+    def __init__(self, n_lists: Optional[int] = None, n_probe: int = 16,
+                 train_iterations: int = 10, max_train_samples: int = 100_000, seed: int = 0):
+        """
+        Args:
+            n_lists: 클러스터 수 (기본: sqrt(N))
+            n_probe: 질의당 탐색 클러스터 수 (클수록 recall↑, 지연↑)
+            train_iterations: k-means 반복 횟수
+            max_train_samples: k-means 학습 표본 수 상한
+            seed: 표본/초기 중심 난수 시드
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_iterations = train_iterations
+        self.max_train_samples = max_train_samples
+        self.seed = seed
+
+        self.centroids = None
+        self.vectors = None   # 클러스터 순서로 정렬된 벡터
+        self.row_ids = None   # 정렬된 위치 → 원래 행 번호
+        self.offsets = None   # 클러스터 i = [offsets[i], offsets[i+1])
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray, block: int = 65_536) -> np.ndarray:
+        """가장 가까운(내적 최대) 중심 번호 (메모리 제한을 위해 블록 단위)"""
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), block):
+            labels[start:start + block] = np.argmax(vectors[start:start + block] @ centroids.T, axis=1)
+        return labels
+
+    def _train(self, vectors: np.ndarray, n_lists: int) -> np.ndarray:
+        """구면 k-means로 중심 학습"""
+        rng = np.random.default_rng(self.seed)
+        if len(vectors) > self.max_train_samples:
+            sample = vectors[rng.choice(len(vectors), self.max_train_samples, replace=False)]
+        else:
+            sample = vectors
+
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self.train_iterations):
+            labels = self._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength=n_lists) == 0
+            # 빈 클러스터는 임의 표본으로 다시 시작
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = _normalize(sums)
+        return centroids
+
+    def build(self, vectors: np.ndarray):
+        vectors = _normalize(vectors)
+        n_lists = self.n_lists or int(np.sqrt(len(vectors)))
+        n_lists = max(1, min(n_lists, len(vectors)))
+
+        self.centroids = self._train(vectors, n_lists)
+        labels = self._assign(vectors, self.centroids)
+
+        order = np.argsort(labels, kind='stable')
+        self.vectors = vectors[order]
+        self.row_ids = order
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_lists))])
+        return self
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if self.vectors is None or not len(self.vectors):
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        query = _normalize(query)
+
+        probes = _top_k(self.centroids @ query, self.n_probe)
+        positions = np.concatenate([
+            np.arange(self.offsets[c], self.offsets[c + 1]) for c in probes
+        ])
+        scores = self.vectors[positions] @ query
+        top = _top_k(scores, k)
+        return self.row_ids[positions[top]], scores[top]
+
+    def __len__(self):
+        return 0 if self.vectors is None else len(self.vectors)
+
+
+class HNSWBackend(VectorBackend):
+    """hnswlib 그래프 기반 근사 검색 (내적 공간)"""
+
+    name = 'hnsw'
+
+    def __init__(self, m: int = 16, ef_construction: int = 200, ef_search: int = 64, num_threads: int = -1):
+        """
+        Args:
+            m: 노드당 연결 수
+            ef_construction: 인덱스 생성 시 후보 수
+            ef_search: 질의 시 후보 수 (클수록 recall↑, 지연↑)
+            num_threads: 인덱스 생성 스레드 수 (-1: 전체 코어)
+        """
+        if hnswlib is None:
+            raise ImportError("hnswlib이 설치되지 않았습니다 (pip install hnswlib)")
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.num_threads = num_threads
+        self.index = None
+
+    def build(self, vectors: np.ndarray):
+        vectors = _normalize(vectors)
+        self.index = hnswlib.Index(space='ip', dim=vectors.shape[1])
+        self.index.init_index(max_elements=len(vectors), ef_construction=self.ef_construction, M=self.m)
+        self.index.add_items(vectors, np.arange(len(vectors)), num_threads=self.num_threads)
+        self.index.set_ef(self.ef_search)
+        return self
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if self.index is None or not len(self):
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        k = min(k, len(self))
+        if self.index.ef < k:
+            self.index.set_ef(k)
+        labels, distances = self.index.knn_query(_normalize(query)[None, :], k=k)
+        # ip 공간의 거리 = 1 - 내적
+        return labels[0].astype(np.int64), 1.0 - distances[0]
+
+    def __len__(self):
+        return 0 if self.index is None else self.index.get_current_count()
+
+
+def choose_backend(num_vectors: int, exact_max: int = EXACT_MAX_VECTORS) -> VectorBackend:
+    """청크 수에 따라 백엔드 선택 (소규모 exact, 대규모 hnsw → 없으면 ivf)"""
+    if num_vectors <= exact_max:
+        return ExactBackend()
+    if hnswlib is not None:
+        return HNSWBackend()
+    return IVFBackend()
+
+
+def make_backend(name: str, num_vectors: int, exact_max: int = EXACT_MAX_VECTORS) -> VectorBackend:
+    """이름으로 백엔드 생성 ('auto'는 청크 수 기준 선택)"""
+    if name == 'auto':
+        return choose_backend(num_vectors, exact_max)
+    if name == 'exact':
+        return ExactBackend()
+    if name == 'ivf':
+        return IVFBackend()
+    if name == 'hnsw':
+        return HNSWBackend()
+    raise ValueError(f"Unknown retrieval backend: {name}")
+
+
+def chunk_signature(backend_name: str, ids: List[str], texts: List[Optional[str]]) -> str:
+    """백엔드 이름 + 청크 id/본문(행 순서 포함) 서명 (같은 id의 본문이 바뀌어도 달라짐)"""
+    digest = hashlib.sha256(backend_name.encode('utf-8'))
+    for chunk_id, text in zip(ids, texts):
+        digest.update(b'\0' + chunk_id.encode('utf-8') + b'\0' + (text or '').encode('utf-8'))
+    return digest.hexdigest()
+
+
+def save_backend(backend: VectorBackend, path, signature: str):
+    """ANN 인덱스 저장 (임시 파일에 쓴 뒤 교체하여 부분 기록 방지)"""
+    directory = os.path.dirname(path) or "."
+    payload = {'version': ANN_INDEX_VERSION, 'signature': signature, 'backend': backend}
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"ANN 인덱스 저장 실패: {path} - {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_backend(path, signature: str) -> Optional[VectorBackend]:
+    """
+    저장된 ANN 인덱스 로드
+
+    Returns:
+        VectorBackend, 버전/서명이 다르거나 파일이 없으면 None
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except Exception as e:
+        print(f"ANN 인덱스 읽기 실패: {path} - {e}")
+        return None
+    if payload.get('version') != ANN_INDEX_VERSION or payload.get('signature') != signature:
+        return None
+    return payload['backend']
+
+
+class VectorBackendRetriever(BaseRetriever):
+    """
+    VectorBackend 검색 결과를 LangChain 문서로 돌려주는 Retriever
+    (Chroma retriever와 같은 invoke 인터페이스, LCEL 체인에 그대로 사용 가능)
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    backend: Any
+    documents: List[Document]
+    embeddings: Any
+    k: int = 3
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        query_vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        rows, _ = self.backend.search(query_vector, self.k)
+        return [self.documents[int(row)] for row in rows]
+
+
+def build_retriever(vector_store, embeddings, k: int = 3, backend: str = 'auto',
+                    exact_max: int = EXACT_MAX_VECTORS, index_path=None):
+    """
+    Chroma 벡터스토어의 벡터로 검색 백엔드를 만들어 Retriever 반환
+
+    Args:
+        vector_store: 영속 Chroma 벡터스토어 (임베딩 원본)
+        embeddings: 질의 임베딩 함수
+        k: 반환 문서 수
+        backend: 'auto' | 'exact' | 'ivf' | 'hnsw' | 'chroma' (기존 Chroma 검색)
+        exact_max: 'auto'에서 exact를 쓰는 최대 청크 수
+        index_path: ANN 인덱스 저장 파일 (청크 서명이 같으면 다시 만들지 않고 로드, None이면 매번 생성)
+
+    Returns:
+        (retriever, 백엔드 이름)
+    """
+    if backend == 'chroma':
+        return vector_store.as_retriever(search_type="similarity", search_kwargs={"k": k}), 'chroma'
+
+    # 임베딩 없이 문서/id만 먼저 읽어 백엔드 결정 (exact는 인덱스가 곧 벡터라 저장하지 않음)
+    data = vector_store.get(include=['documents', 'metadatas'])
+    index = make_backend(backend, len(data['ids']), exact_max)
+    signature = None
+    loaded = None
+    if index_path is not None and index.name != 'exact':
+        signature = chunk_signature(index.name, data['ids'], data['documents'])
+        loaded = load_backend(index_path, signature)
+
+    if loaded is not None:
+        index = loaded
+    else:
+        data = vector_store.get(include=['embeddings', 'documents', 'metadatas'])
+        if len(data['ids']):
+            index.build(np.asarray(data['embeddings'], dtype=np.float32))
+        if signature is not None:
+            # 두 번 읽는 사이 스토어가 바뀌었을 수 있으므로 실제로 색인한 청크로 서명
+            save_backend(index, index_path, chunk_signature(index.name, data['ids'], data['documents']))
+
+    documents = [
+        Document(page_content=text or '', metadata=metadata or {})
+        for text, metadata in zip(data['documents'], data['metadatas'])
+    ]
+    return VectorBackendRetriever(backend=index, documents=documents, embeddings=embeddings, k=k), index.name
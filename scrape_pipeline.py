@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+영상 수집 파이프라인 - 다운로드 / 전사 / 저장 단계를 겹쳐 실행
+영상 하나씩 메타데이터 → 자막 → 오디오 다운로드 → Whisper → 저장을 차례로 하면
+다운로드 중에는 CPU가, 전사 중에는 네트워크가 놀게 되므로 단계별 작업자와 크기 제한 큐로 연결
+
+  items → [다운로드 스레드 N개] → 오디오 큐 → [전사 프로세스 풀 / 전사 서비스] → 저장 큐 → [저장 스레드]
+
+큐 크기가 제한되어 있어 전사가 밀리면 다운로드도 멈춤 (임시 오디오 파일이 쌓이지 않음)
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+STAGES = ("download", "transcribe", "write")
+
+_STOP = object()
+
+
+def _timed_call(fn, arg):
+    """전사 프로세스에서 실행 시간을 함께 반환 (단계별 처리량 집계용)"""
+    start = time.perf_counter()
+    result = fn(arg)
+    return time.perf_counter() - start, result
+
+
+class TranscriptionPipeline:
+    """다운로드 스레드 풀 → 전사 프로세스 풀 → 저장 스레드 단계형 파이프라인"""
+
+    def __init__(self, fetch, save, transcribe=None, download_workers=3, transcribe_workers=None,
+                 queue_size=4, request_interval=0.0, remove_audio=True,
+                 executor=None, initializer=None, initargs=(), transcriber=None):
+        """
+        Args:
+            fetch: fetch(item) -> (record, audio_path 또는 None) / None이면 건너뜀 (다운로드 스레드에서 실행)
+            save: save(record, 결과 또는 None) (저장 스레드에서 순서대로 실행)
+            transcribe: transcribe(audio_path) -> 결과 (전사 프로세스에서 실행, 피클 가능한 모듈 함수)
+            download_workers: 다운로드 스레드 수
+            transcribe_workers: 동시에 전사 중인 최대 작업 수 (기본: 전사 프로세스 = CPU 코어 수)
+            queue_size: 단계 사이 큐 최대 길이
+            request_interval: 다운로드 작업 시작 사이 최소 간격(초, 스레드 전체 공유 - 차단 방지)
+            remove_audio: 전사가 끝난 임시 오디오 파일 삭제
+            executor: 전사에 쓸 Executor (기본: spawn 방식 ProcessPoolExecutor)
+            initializer, initargs: 기본 프로세스 풀의 작업자 초기화 함수
+            transcriber: submit(audio_path) -> Future[(작업 시간, 결과)]를 제공하는 전사 서비스
+                         (지정하면 transcribe/프로세스 풀 대신 사용, 예: whisper_service.WhisperService)
+        """
+        if transcribe is None and transcriber is None:
+            raise ValueError("transcribe 또는 transcriber가 필요합니다")
+        self.fetch = fetch
+        self.transcribe = transcribe
+        self.save = save
+        self.download_workers = max(1, download_workers)
+        self.transcribe_workers = transcribe_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.request_interval = request_interval
+        self.remove_audio = remove_audio
+        self.executor = executor
+        self.initializer = initializer
+        self.initargs = initargs
+        self.transcriber = transcriber
+
+        self._interval_lock = threading.Lock()
+        self._last_request = None
+        self._stats_lock = threading.Lock()
+        self.stats = {}
+        self.wall_seconds = 0.0
+
+    def _record(self, stage, busy, failed=False):
+        with self._stats_lock:
+            stats = self.stats[stage]
+            stats['items'] += 1
+            stats['failed'] += int(failed)
+            stats['busy_seconds'] += busy
+            stats['last_done'] = time.perf_counter()
+
+    def _wait_turn(self):
+        """다운로드 시작 간격 유지 (여러 스레드가 동시에 요청을 몰아 보내지 않도록)"""
+        if not self.request_interval:
+            return
+        with self._interval_lock:
+            now = time.monotonic()
+            if self._last_request is not None:
+                delay = self._last_request + self.request_interval - now
+                if delay > 0:
+                    time.sleep(delay)
+                    now = time.monotonic()
+            self._last_request = now
+
+    def _download_worker(self, items, audio_queue, write_queue):
+        while True:
+            item = items.get()
+            if item is _STOP:
+                return
+            self._wait_turn()
+            start = time.perf_counter()
+            try:
+                fetched = self.fetch(item)
+            except Exception as e:
+                print(f"다운로드 단계 실패: {item} - {e}")
+                self._record("download", time.perf_counter() - start, failed=True)
+                continue
+            self._record("download", time.perf_counter() - start, failed=fetched is None)
+            if fetched is None:
+                continue
+
+            record, audio_path = fetched
+            if audio_path:
+                audio_queue.put((record, audio_path))
+            else:
+                write_queue.put((record, None))
+
+    def _transcribe_dispatcher(self, executor, audio_queue, write_queue):
+        """오디오 큐에서 꺼내 빈 전사 작업자에 제출하고, 끝난 순서대로 저장 큐로 전달"""
+        pending = {}
+        inputs_done = False
+
+        try:
+            while not inputs_done or pending:
+                # 빈 작업자가 있으면 다음 오디오 제출 (작업자가 모두 바쁘면 오디오 큐가 차서 다운로드도 대기)
+                while not inputs_done and len(pending) < self.transcribe_workers:
+                    try:
+                        job = audio_queue.get(timeout=0.05) if pending else audio_queue.get()
+                    except queue.Empty:
+                        break
+                    if job is _STOP:
+                        inputs_done = True
+                        break
+                    record, audio_path = job
+                    try:
+                        if self.transcriber is not None:
+                            future = self.transcriber.submit(audio_path)
+                        else:
+                            future = executor.submit(_timed_call, self.transcribe, audio_path)
+                    except Exception as e:
+                        # 전사 서비스 종료, 프로세스 풀 손상(BrokenProcessPool) 등 - 이 항목만 실패로 저장
+                        print(f"전사 단계 실패: {audio_path} - {e}")
+                        self._record("transcribe", 0.0, failed=True)
+                        self._forward(write_queue, record, audio_path, None)
+                        continue
+                    pending[future] = (record, audio_path)
+
+                if not pending:
+                    continue
+                timeout = None if inputs_done or len(pending) >= self.transcribe_workers else 0.05
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record, audio_path = pending.pop(future)
+                    try:
+                        busy, result = future.result()
+                        self._record("transcribe", busy, failed=result is None)
+                    except Exception as e:
+                        print(f"전사 단계 실패: {audio_path} - {e}")
+                        self._record("transcribe", 0.0, failed=True)
+                        result = None
+                    self._forward(write_queue, record, audio_path, result)
+        except Exception as e:
+            print(f"전사 단계 중단: {e}")
+        finally:
+            # 중간에 멈춰도 남은 항목은 실패로 저장하고 저장 스레드를 끝내
+            # 다운로드 스레드가 가득 찬 오디오 큐에서 멈추지 않도록 함
+            for record, audio_path in pending.values():
+                self._record("transcribe", 0.0, failed=True)
+                self._forward(write_queue, record, audio_path, None)
+            while not inputs_done:
+                job = audio_queue.get()
+                if job is _STOP:
+                    break
+                self._record("transcribe", 0.0, failed=True)
+                self._forward(write_queue, *job, None)
+            write_queue.put(_STOP)
+
+    def _forward(self, write_queue, record, audio_path, result):
+        """임시 오디오 정리 후 저장 큐로 전달"""
+        if self.remove_audio:
+            try:
+                os.remove(audio_path)
+            except OSError:
+                pass
+        write_queue.put((record, result))
+
+    def _writer(self, write_queue):
+        while True:
+            job = write_queue.get()
+            if job is _STOP:
+                return
+            record, result = job
+            start = time.perf_counter()
+            try:
+                self.save(record, result)
+                failed = False
+            except Exception as e:
+                print(f"저장 단계 실패: {e}")
+                failed = True
+            self._record("write", time.perf_counter() - start, failed=failed)
+
+    def run(self, items):
+        """
+        모든 항목 처리 (끝날 때까지 대기)
+
+        Returns:
+            단계별 통계 (stats_summary()와 같은 형식)
+        """
+        items = list(items)
+        self.stats = {stage: {'items': 0, 'failed': 0, 'busy_seconds': 0.0, 'last_done': None}
+                      for stage in STAGES}
+        self._last_request = None
+
+        item_queue = queue.Queue()
+        for item in items:
+            item_queue.put(item)
+        for _ in range(self.download_workers):
+            item_queue.put(_STOP)
+        audio_queue = queue.Queue(maxsize=self.queue_size)
+        write_queue = queue.Queue(maxsize=self.queue_size)
+
+        executor = self.executor
+        owns_executor = executor is None and self.transcriber is None
+        if owns_executor:
+            # torch/CUDA는 fork 후 사용이 안전하지 않으므로 spawn
+            executor = ProcessPoolExecutor(
+                max_workers=self.transcribe_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer, initargs=self.initargs,
+            )
+
+        self._started = time.perf_counter()
+        try:
+            downloaders = [threading.Thread(target=self._download_worker,
+                                            args=(item_queue, audio_queue, write_queue), daemon=True)
+                           for _ in range(self.download_workers)]
+            dispatcher = threading.Thread(target=self._transcribe_dispatcher,
+                                          args=(executor, audio_queue, write_queue), daemon=True)
+            writer = threading.Thread(target=self._writer, args=(write_queue,), daemon=True)
+            for thread in downloaders + [dispatcher, writer]:
+                thread.start()
+
+            for thread in downloaders:
+                thread.join()
+            audio_queue.put(_STOP)
+            dispatcher.join()
+            writer.join()
+        finally:
+            if owns_executor:
+                executor.shutdown()
+
+        self.wall_seconds = time.perf_counter() - self._started
+        return self.stats_summary()
+
+    def stats_summary(self):
+        """
+        단계별 처리량
+
+        Returns:
+            {stage: {'items', 'failed', 'busy_seconds', 'throughput'(건/초, 파이프라인 시작 기준)}}
+        """
+        summary = {}
+        for stage, stats in self.stats.items():
+            span = (stats['last_done'] - self._started) if stats['last_done'] else 0.0
+            summary[stage] = {
+                'items': stats['items'],
+                'failed': stats['failed'],
+                'busy_seconds': stats['busy_seconds'],
+                'throughput': stats['items'] / span if span > 0 else 0.0,
+            }
+        return summary
+
+    def format_stats(self):
+        """단계별 처리량 출력용 문자열"""
+        lines = [f"파이프라인 {self.wall_seconds:.1f}s (다운로드 {self.download_workers}개, "
+                 f"전사 동시 {self.transcribe_workers}개)"]
+        for stage, stats in self.stats_summary().items():
+            lines.append(f"  {stage:<10}: {stats['items']:4d}건 (실패 {stats['failed']}), "
+                         f"작업 {stats['busy_seconds']:7.1f}s, {stats['throughput']:.2f}건/s")
+        return "\n".join(lines)
@@ -4,46 +4,30 @@
 모든 수집된 영상의 텍스트를 분석하여 주요 토픽 추출
 """
 
-import json
 import os
-import glob
 from collections import Counter, defaultdict
 import re
 import sys
 
+# 프로젝트 루트 모듈 (video_corpus) 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from video_corpus import load_corpus
+
 # Windows 콘솔 UTF-8 설정
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
 def load_all_videos():
-    """모든 채널의 영상 데이터 로드"""
-    all_videos = []
+    """모든 채널의 영상 데이터 로드 (컬럼형 코퍼스에서 텍스트/메타데이터 컬럼만)"""
+    all_videos = load_corpus('youtube_data').records(fields=('channel_id', 'full_text', 'stt_text'))
     
-    for json_file in glob.glob('youtube_data/*/*.json'):
-        if 'channel_info' in json_file:
-            continue
+    for video in all_videos:
+        # 자막이 없으면 STT 텍스트 사용
+        stt_text = video.pop('stt_text')
+        full_text = video['full_text'] or stt_text or ""
         
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                video = json.load(f)
-                
-                # 채널 정보 추가
-                channel_id = os.path.basename(os.path.dirname(json_file))
-                video['channel_id'] = channel_id
-                
-                # 전체 텍스트 생성
-                full_text = ""
-                if video.get('transcript'):
-                    full_text = ' '.join([item['text'] for item in video['transcript']])
-                elif video.get('stt_text'):
-                    full_text = video['stt_text']
-                
-                video['full_text'] = full_text
-                video['has_text'] = bool(full_text.strip())
-                
-                all_videos.append(video)
-        except Exception as e:
-            print(f"Error loading {json_file}: {e}")
+        video['full_text'] = full_text
+        video['has_text'] = bool(full_text.strip())
     
     return all_videos
 
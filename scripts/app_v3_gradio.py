@@ -289,7 +289,8 @@ def init_system(api_key, temperature):
         deep_debate_system = DeepDebateSystem(
             customer_agents=real_review_customer_agents,  # 실제 리뷰 데이터 사용
             employee_agents=employee_agents,
-            facilitator=facilitator
+            facilitator=facilitator,
+            concurrent_turns=True  # 서로 참조하지 않는 페이즈(independent_turns)의 라운드 발언 동시 생성
         )
         
         initialized = True
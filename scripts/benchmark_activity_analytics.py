@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+관리자 대시보드 통계 벤치마크 (오프라인, 임시 폴더 사용)
+합성 로그 1M건(90일, 사용자 500명)으로 대시보드 한 화면을 그리는 데 드는 시간을 비교
+  - legacy: user_logs.json 전체 로드 + 파이썬 루프 집계 (기존 방식)
+  - raw scan: SQLite 원본 이벤트 테이블 GROUP BY
+  - aggregates: 시간별/일별 사전 집계 테이블 (ActivityLog, 사용자/IP는 기간 양 끝 날짜만 시간별)
+
+실행: python -m scripts.benchmark_activity_analytics [--events 1000000] [--skip-legacy] (프로젝트 루트에서)
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from activity_log import ActivityLog
+
+# Windows 콘솔 UTF-8 설정
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DAYS = 90
+USERS = 500
+ACTIVITIES = ["usage"] * 6 + ["search"] * 3 + ["admin"]
+
+
+def make_events(count, rng):
+    """(timestamp, user_id, ip, activity, details) 합성 이벤트"""
+    start = datetime.now() - timedelta(days=DAYS)
+    span = DAYS * 86400
+    for i in range(count):
+        user = rng.randrange(USERS)
+        timestamp = (start + timedelta(seconds=rng.random() * span)).isoformat()
+        yield timestamp, f"user{user}", f"10.{user // 256}.{user % 256}.1", rng.choice(ACTIVITIES), f"이벤트 {i}"
+
+
+def time_it(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def legacy_dashboard(db_file):
+    """기존 show_admin_dashboard의 데이터 처리 부분"""
+    with open(db_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    counts = [len(data.get(k, [])) for k in ("search_logs", "usage_logs", "admin_logs")]
+    unique_ips = {log.get("ip", "unknown") for log in data["search_logs"] + data["usage_logs"]}
+    for key in ("search_logs", "usage_logs"):
+        ip_count = {}
+        for log in data[key]:
+            ip_count[log.get("ip", "unknown")] = ip_count.get(log.get("ip", "unknown"), 0) + 1
+        sorted(ip_count.items(), key=lambda x: x[1], reverse=True)
+        data[key][-10:]
+    return counts, len(unique_ips)
+
+
+def raw_dashboard(log, since):
+    """원본 이벤트 테이블을 직접 집계"""
+    q = log._query
+    [q("SELECT COUNT(*) FROM events WHERE activity = ? AND timestamp >= ?", (a, since))
+     for a in ("search", "usage", "admin")]
+    q("SELECT COUNT(DISTINCT ip) FROM events WHERE activity IN ('search', 'usage') AND timestamp >= ?", (since,))
+    q("SELECT substr(timestamp, 1, 10) AS d, activity, COUNT(*) FROM events WHERE timestamp >= ?"
+      " GROUP BY d, activity", (since,))
+    q("SELECT user_id, COUNT(*) AS n FROM events WHERE activity = 'usage' AND timestamp >= ?"
+      " GROUP BY user_id ORDER BY n DESC LIMIT 10", (since,))
+    for a in ("search", "usage"):
+        q("SELECT ip, COUNT(*) AS n FROM events WHERE activity = ? AND timestamp >= ?"
+          " GROUP BY ip ORDER BY n DESC LIMIT 20", (a, since))
+        log.recent(a, limit=10, since=since)
+
+
+def aggregate_dashboard(log, since):
+    """사전 집계 테이블로 같은 화면 구성 (app.py 대시보드와 같은 호출)"""
+    [log.count(a, since=since) for a in ("search", "usage", "admin")]
+    log.unique_ips(["search", "usage"], since=since)
+    log.time_series(["search", "usage", "admin"], bucket="day", since=since)
+    log.counts_by_user("usage", since=since, limit=10)
+    for a in ("search", "usage"):
+        log.counts_by_ip(a, since=since, limit=20)
+        log.recent(a, limit=10, since=since)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=1_000_000)
+    parser.add_argument('--skip-legacy', action='store_true', help="JSON 방식 측정 생략")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print("=" * 72)
+    print(f"대시보드 통계 벤치마크 ({args.events:,} events, {DAYS}일, 사용자 {USERS}명)")
+    print("=" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        log = ActivityLog(tmp / "logs.sqlite3", archive_dir=tmp / "archive", batch_size=5000,
+                          retention_days=None)
+
+        start = time.perf_counter()
+        legacy = {"users": {}, "search_logs": [], "usage_logs": [], "admin_logs": []}
+        for timestamp, user_id, ip, activity, details in make_events(args.events, rng):
+            log.log(user_id, activity, details, ip=ip, timestamp=timestamp)
+            if not args.skip_legacy:
+                legacy[f"{activity}_logs"].append({"timestamp": timestamp, "user_id": user_id, "ip": ip,
+                                                   "activity": activity, "details": details})
+        log.flush(timeout=600)
+        print(f"ingest (log() + background writer): {time.perf_counter() - start:6.1f}s")
+
+        rows = {name: log._query(f"SELECT COUNT(*) FROM {name}")[0][0]
+                for name in ("events", "counts_hourly", "counts_user_id_daily", "counts_ip_daily",
+                             "counts_user_id_hourly", "counts_ip_hourly")}
+        print("rows: " + ", ".join(f"{k} {v:,}" for k, v in rows.items()))
+        print("-" * 72)
+
+        if not args.skip_legacy:
+            for key in ("search_logs", "usage_logs", "admin_logs"):
+                legacy[key].sort(key=lambda e: e["timestamp"])
+            db_file = tmp / "user_logs.json"
+            with open(db_file, 'w', encoding='utf-8') as f:
+                json.dump(legacy, f, ensure_ascii=False)
+            del legacy
+            print(f"legacy JSON (load + python loops, all time) : {time_it(lambda: legacy_dashboard(db_file), 1):9.1f}ms")
+
+        for label, days in [("all time", None), ("last 7 days", 7), ("last 24h", 1)]:
+            since = (datetime.now() - timedelta(days=days)).isoformat() if days else "0000"
+            raw_ms = time_it(lambda: raw_dashboard(log, since))
+            agg_ms = time_it(lambda: aggregate_dashboard(log, None if not days else since))
+            print(f"raw event scan ({label:<11})               : {raw_ms:9.1f}ms")
+            print(f"aggregates     ({label:<11})               : {agg_ms:9.1f}ms  ({raw_ms / agg_ms:.0f}x)")
+
+        # 집계 결과는 원본 집계와 일치해야 함
+        assert log.count("usage") == log._query("SELECT COUNT(*) FROM events WHERE activity = 'usage'")[0][0]
+        assert log.counts_by_user("usage", limit=1)[0][1] == log._query(
+            "SELECT COUNT(*) AS n FROM events WHERE activity = 'usage'"
+            " GROUP BY user_id ORDER BY n DESC LIMIT 1")[0][0]
+
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
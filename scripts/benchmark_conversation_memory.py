@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대화 메모리 벤치마크 (오프라인)
+200턴 세션에서 기존 방식(전체 기록 전송)과 ConversationMemory(최근 턴 + 누적 요약)의
+턴별 프롬프트 토큰 수와 요약 호출 횟수를 비교
+
+실행: python -m scripts.benchmark_conversation_memory [--turns 200] (프로젝트 루트에서)
+"""
+
+import argparse
+import random
+import sys
+
+from conversation_memory import ConversationMemory, extractive_summarizer, message_tokens
+
+# Windows 콘솔 UTF-8 설정
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+SYSTEM_PROMPT = "당신은 Gen Z 라이프스타일 인플루언서입니다. " * 20
+CONTEXT = "\n\n## 관련 콘텐츠 참고:\n" + "1. 영상 제목: 요즘 유행하는 루틴 소개...\n" * 3
+CHECKPOINTS = [1, 10, 25, 50, 100, 150, 200]
+
+
+def make_turn(rng, turn):
+    words = ["트렌드", "루틴", "뷰티", "요리", "여행", "패션", "추천", "브이로그", "카페", "운동"]
+    user = f"{turn}번째 질문: " + " ".join(rng.choice(words) for _ in range(rng.randint(8, 20)))
+    assistant = f"{turn}번째 답변! " + " ".join(rng.choice(words) for _ in range(rng.randint(60, 120)))
+    return user, assistant
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--turns', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    summary_calls = []
+
+    def counting_summarizer(summary, turns, max_tokens):
+        # LLM 요약 대신 로컬 요약 (호출 횟수만 기록)
+        summary_calls.append(len(turns))
+        return extractive_summarizer(summary, turns, max_tokens)
+
+    memory = ConversationMemory(summarizer=counting_summarizer)
+    full_history = []
+
+    print("=" * 72)
+    print(f"대화 메모리 벤치마크 ({args.turns}턴, 메모리 예산 {memory.token_budget:,} 토큰)")
+    print("=" * 72)
+    print(f"{'turn':>5} | {'unbounded tokens':>16} | {'memory tokens':>13} | {'history msgs':>12}")
+    print("-" * 72)
+
+    bounded_sizes = []
+    for turn in range(1, args.turns + 1):
+        user, assistant = make_turn(rng, turn)
+        system = {"role": "system", "content": SYSTEM_PROMPT + CONTEXT}
+
+        full_history.append({"role": "user", "content": user})
+        unbounded = message_tokens([system] + full_history)
+
+        memory.add("user", user)
+        bounded = message_tokens([system] + memory.messages())
+        bounded_sizes.append(bounded)
+
+        full_history.append({"role": "assistant", "content": assistant})
+        memory.add("assistant", assistant)
+
+        if turn in CHECKPOINTS or turn == args.turns:
+            print(f"{turn:>5} | {unbounded:>16,} | {bounded:>13,} | {len(memory.recent):>12}")
+
+    system_tokens = message_tokens([{"role": "system", "content": SYSTEM_PROMPT + CONTEXT}])
+    print("-" * 72)
+    print(f"memory prompt tokens: min {min(bounded_sizes):,} / max {max(bounded_sizes):,} "
+          f"(budget {memory.token_budget:,} + system {system_tokens:,})")
+    print(f"summaries: {len(summary_calls)} calls for {args.turns} turns "
+          f"(avg {sum(summary_calls) / max(len(summary_calls), 1):.1f} messages folded per call)")
+
+    # 프롬프트 크기는 세션 길이와 무관하게 예산 안에 머물러야 함
+    assert max(bounded_sizes) <= memory.token_budget + system_tokens
+    print("✅ 프롬프트 크기 상한 유지")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+심층토론 지연 벤치마크 (오프라인)
+가짜 비동기 LLM 클라이언트(고정 지연)로 DeepDebateSystem 전체 토론을 실행해
+기존 방식(순차 + 메시지당 1초 대기) 추정치, 순차 모드, 라운드 내 동시 모드의 소요 시간과
+이벤트 순서가 결정적인지 비교하고, 동시 모드에서 소비자가 도중에 닫으면 남은 호출이 취소되는지 확인
+
+실행: python -m scripts.benchmark_deep_debate (프로젝트 루트에서)
+"""
+
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+from debate.deep_debate_system import DeepDebateSystem
+from debate.pacing import PacingPolicy
+
+# Windows 콘솔 UTF-8 설정
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+LATENCY = 0.2        # 가짜 LLM 응답 지연(초)
+LEGACY_SLEEP = 1.0   # 기존 메시지당 고정 대기(초)
+
+
+class FakeAsyncLLM:
+    """chat.completions.create와 같은 모양의 응답을 돌려주는 가짜 클라이언트"""
+
+    def __init__(self, latency, first_latency=None):
+        self.latency = latency
+        self.first_latency = latency if first_latency is None else first_latency
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.first_latency if self.calls == 1 else self.latency)
+        finally:
+            self.in_flight -= 1
+        system = kwargs['messages'][0]['content']
+        message = SimpleNamespace(content=f"{system} 의견 #{self.calls}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeAgents:
+    """get_agent(name)만 제공하는 에이전트 매니저"""
+
+    def get_agent(self, name):
+        return SimpleNamespace(name=name, system_message=f"{name} 페르소나")
+
+
+async def run(concurrent_turns):
+    llm = FakeAsyncLLM(LATENCY)
+    system = DeepDebateSystem(
+        FakeAgents(), FakeAgents(), facilitator=None,
+        concurrent_turns=concurrent_turns,
+        pacing=PacingPolicy(requests_per_minute=None),
+        llm_client=llm,
+    )
+    start = time.perf_counter()
+    events = [event async for event in system.run_deep_debate_streaming()]
+    elapsed = time.perf_counter() - start
+    order = [(e['data']['phase'], e['data']['round'], e['data']['source'])
+             for e in events if e['type'] == 'message']
+    return elapsed, order, llm
+
+
+async def disconnect():
+    """동시 라운드 첫 메시지를 받자마자 스트림을 닫음 (UI 취소/연결 끊김) → 진행 중 호출 수, 닫은 뒤 추가 호출 수"""
+    llm = FakeAsyncLLM(LATENCY * 5, first_latency=LATENCY)  # 첫 발언만 빨리 끝나고 나머지는 진행 중
+    system = DeepDebateSystem(
+        FakeAgents(), FakeAgents(), facilitator=None, concurrent_turns=True,
+        pacing=PacingPolicy(requests_per_minute=None), llm_client=llm,
+    )
+    stream = system.run_deep_debate_streaming()
+    async for event in stream:
+        if event['type'] == 'message':
+            break
+    await stream.aclose()
+    calls = llm.calls
+    await asyncio.sleep(LATENCY)  # 취소가 반영될 시간 (남은 발언의 지연보다 짧음)
+    in_flight = llm.in_flight
+    await asyncio.sleep(LATENCY * 10)
+    return in_flight, llm.calls - calls
+
+
+def main():
+    print("=" * 72)
+    print(f"심층토론 벤치마크 (참가자 3명, 페이즈 5개, LLM 지연 {LATENCY}s)")
+    print("=" * 72)
+
+    sequential_seconds, sequential_order, llm = asyncio.run(run(concurrent_turns=False))
+    messages = len(sequential_order)
+    legacy_estimate = sequential_seconds + messages * LEGACY_SLEEP
+    print(f"legacy (sequential + {LEGACY_SLEEP:.0f}s sleep/msg, estimate): {legacy_estimate:6.2f}s")
+    print(f"sequential                                  : {sequential_seconds:6.2f}s "
+          f"({llm.calls} LLM calls, max in flight {llm.max_in_flight})")
+
+    concurrent_seconds, concurrent_order, llm = asyncio.run(run(concurrent_turns=True))
+    print(f"concurrent independent rounds               : {concurrent_seconds:6.2f}s "
+          f"({llm.calls} LLM calls, max in flight {llm.max_in_flight})")
+
+    # 동시 모드에서도 이벤트 순서는 순차 모드와 동일해야 함
+    assert concurrent_order == sequential_order
+    print("-" * 72)
+    print(f"speedup vs legacy: {legacy_estimate / concurrent_seconds:4.1f}x | "
+          f"vs sequential: {sequential_seconds / concurrent_seconds:4.1f}x")
+    print("✅ 메시지 이벤트 순서 동일")
+
+    in_flight, later_calls = asyncio.run(disconnect())
+    assert in_flight == 0 and later_calls == 0
+    print("✅ 스트림을 닫으면 남은 동시 발언 취소 (진행 중 호출 0, 추가 호출 0)")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+다중 페르소나 채팅 벤치마크 (오프라인)
+고정 지연 가짜 챗봇으로 send_multi_message의 기존 순차 호출과 동시 호출(fan_out_chat)의
+체감 시간(wall-clock)을 비교하고, 결과 순서 유지와 실패 격리를 확인
+
+실행: python -m scripts.benchmark_multi_persona_chat [--personas 5] [--latency 0.5] (프로젝트 루트에서)
+"""
+
+import argparse
+import sys
+import time
+
+from cluster_chatbots import chat_many, fan_out_chat
+
+# Windows 콘솔 UTF-8 설정
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+TOKENS = 20  # 스트리밍 응답 토큰 수
+
+
+class StubChatbot:
+    """검색 + LLM 왕복을 고정 지연으로 흉내 내는 챗봇 (chat / chat_stream)"""
+
+    def __init__(self, name, latency, fail=False):
+        self.name = name
+        self.latency = latency
+        self.fail = fail
+
+    def chat(self, message):
+        time.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError(f"{self.name} 응답 실패")
+        return f"{self.name}: {message}"
+
+    def chat_stream(self, message):
+        # 첫 토큰까지 지연의 절반, 나머지는 토큰 간격으로 분산
+        time.sleep(self.latency / 2)
+        if self.fail:
+            raise RuntimeError(f"{self.name} 응답 실패")
+        for i in range(TOKENS):
+            time.sleep(self.latency / 2 / TOKENS)
+            yield f"{self.name}-{i} "
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--personas', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.5, help="챗봇 1회 응답 지연(초)")
+    args = parser.parse_args()
+
+    chatbots = [StubChatbot(f"persona{i}", args.latency) for i in range(args.personas)]
+    message = "요즘 관심 있는 트렌드는?"
+
+    print("=" * 72)
+    print(f"다중 페르소나 채팅 벤치마크 (페르소나 {args.personas}명, 응답 지연 {args.latency}s)")
+    print("=" * 72)
+
+    # 기존 방식: 한 명씩 순차 호출
+    start = time.perf_counter()
+    sequential = [chatbot.chat(message) for chatbot in chatbots]
+    sequential_seconds = time.perf_counter() - start
+    print(f"sequential              : {sequential_seconds:6.2f}s")
+
+    # 동시 호출: 결과는 입력 순서대로
+    start = time.perf_counter()
+    results = chat_many(chatbots, message)
+    parallel_seconds = time.perf_counter() - start
+    print(f"fan-out (chat)          : {parallel_seconds:6.2f}s")
+    assert [response for response, _ in results] == sequential
+
+    # 동시 스트리밍: 첫 토큰 도착 시간 + 완료 시간
+    start = time.perf_counter()
+    first_token = None
+    streamed = [""] * len(chatbots)
+    for event in fan_out_chat(chatbots, message, stream=True):
+        if event[0] == 'delta':
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            streamed[event[1]] += event[2]
+    stream_seconds = time.perf_counter() - start
+    print(f"fan-out (stream)        : {stream_seconds:6.2f}s (first token {first_token:.2f}s)")
+    assert all(text.startswith(f"persona{i}-0 ") for i, text in enumerate(streamed))
+
+    # 실패 격리: 한 명이 실패해도 나머지 응답은 그대로
+    chatbots[1] = StubChatbot("persona1", args.latency, fail=True)
+    results = chat_many(chatbots, message)
+    failed = [i for i, (_, error) in enumerate(results) if error is not None]
+    assert failed == [1]
+    assert all(results[i][0] == sequential[i] for i in range(len(chatbots)) if i != 1)
+
+    print("-" * 72)
+    print(f"speedup: {sequential_seconds / parallel_seconds:4.1f}x")
+    print("✅ 결과 순서 유지, 실패 페르소나만 오류 처리")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+리뷰 분류 벤치마크 - 페르소나별 반복 분류 vs 단일 패스 분류
+100k 합성 리뷰 파일로 기존 방식(파일 7회 파싱 + 페르소나마다 전체 스캔)과
+ReviewClassifier(1회 파싱 + 키워드 매처 1회 스캔) 비교, 결과 동일성 확인
+
+실행: python -m scripts.benchmark_review_classifier (프로젝트 루트에서)
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from rag.review_classifier import KeywordMatcher, ReviewClassifier
+
+# Windows 콘솔 UTF-8 설정
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+NUM_REVIEWS = 100_000
+
+# RealReviewRAGManager.persona_mapping과 동일
+PERSONA_MAPPING = {
+    "foldable_enthusiast": {
+        "conversion_direction": ["iPhone_to_Galaxy"],
+        "conversion_level": ["completed"],
+        "keywords": ["폴드", "폴더블", "접기", "펼치기", "Fold", "foldable"],
+        "sentiment": ["positive"]
+    },
+    "ecosystem_dilemma": {
+        "conversion_direction": ["iPhone_to_Galaxy"],
+        "conversion_level": ["considering_strong", "considering_weak"],
+        "keywords": ["생태계", "애플워치", "에어팟", "ecosystem", "watch", "airpods"],
+        "sentiment": ["neutral", "negative"]
+    },
+    "foldable_critical": {
+        "conversion_direction": ["iPhone_to_Galaxy"],
+        "conversion_level": ["completed"],
+        "keywords": ["폴드", "폴더블", "문제", "불만", "Fold", "issue", "problem"],
+        "sentiment": ["negative"]
+    },
+    "value_seeker": {
+        "conversion_direction": ["iPhone_to_iPhone", "Galaxy_to_iPhone"],
+        "conversion_level": ["completed", "considering_strong"],
+        "keywords": ["가성비", "가격", "비용", "value", "price", "cost", "일반", "프로"],
+        "sentiment": ["neutral", "positive"]
+    },
+    "apple_ecosystem_loyal": {
+        "conversion_direction": ["iPhone_to_iPhone"],
+        "conversion_level": ["completed", "considering_weak"],
+        "keywords": ["애플", "생태계", "Apple", "ecosystem", "충성", "loyal"],
+        "sentiment": ["positive", "neutral"]
+    },
+    "design_fatigue": {
+        "conversion_direction": ["iPhone_to_iPhone", "iPhone_to_Galaxy"],
+        "conversion_level": ["considering_weak", "interested"],
+        "keywords": ["디자인", "피로", "똑같", "design", "fatigue", "same", "boring"],
+        "sentiment": ["negative", "neutral"]
+    },
+    "upgrade_cycler": {
+        "conversion_direction": ["Galaxy_to_Galaxy", "iPhone_to_iPhone"],
+        "conversion_level": ["completed"],
+        "keywords": ["업그레이드", "교체", "새로", "upgrade", "new", "replace"],
+        "sentiment": ["positive", "neutral"]
+    }
+}
+
+DIRECTIONS = ["iPhone_to_Galaxy", "iPhone_to_iPhone", "Galaxy_to_iPhone", "Galaxy_to_Galaxy"]
+LEVELS = ["completed", "considering_strong", "considering_weak", "interested"]
+SENTIMENTS = ["positive", "neutral", "negative"]
+WORDS = ("이번 폰 화면 카메라 배터리 정말 좋아요 별로 그냥 쓰고 있어요 폴더블 폴드 생태계 가격 디자인 "
+         "업그레이드 애플 에어팟 문제 불만 가성비 프로 똑같 새로 교체 "
+         "the phone camera is great foldable ecosystem price design same upgrade new watch").split()
+
+
+def make_review_file(path, size, seed=7):
+    rng = random.Random(seed)
+    reviews = [{
+        'id': f"review_{i:06d}",
+        'review': ' '.join(rng.choices(WORDS, k=rng.randint(8, 40))),
+        'conversion_direction': rng.choice(DIRECTIONS),
+        'conversion_level': rng.choice(LEVELS),
+        'sentiment': rng.choice(SENTIMENTS),
+    } for i in range(size)]
+    half = size // 2
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'iphone_reviews': reviews[:half], 'galaxy_reviews': reviews[half:]}, f, ensure_ascii=False)
+
+
+def load_reviews(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('iphone_reviews', []) + data.get('galaxy_reviews', [])
+
+
+def legacy_classify(reviews, persona_config):
+    """기존 RealReviewRAGManager.classify_reviews_by_persona 로직"""
+    classified_reviews = []
+    for review in reviews:
+        if review.get('conversion_direction') not in persona_config['conversion_direction']:
+            continue
+        if review.get('conversion_level') not in persona_config['conversion_level']:
+            continue
+        review_text = review.get('review', '').lower()
+        if persona_config['keywords']:
+            if not any(keyword.lower() in review_text for keyword in persona_config['keywords']):
+                continue
+        if persona_config['sentiment']:
+            if review.get('sentiment', 'neutral') not in persona_config['sentiment']:
+                continue
+        classified_reviews.append(review)
+    return classified_reviews
+
+
+def main():
+    print("=" * 80)
+    print(f"리뷰 분류 벤치마크 ({NUM_REVIEWS:,} 합성 리뷰, 페르소나 {len(PERSONA_MAPPING)}개)")
+    print(f"키워드 매처: {KeywordMatcher(['x']).backend}")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "structured_reviews_bench.json"
+        make_review_file(path, NUM_REVIEWS)
+
+        # 기존: 페르소나마다 파일 파싱 + 전체 스캔
+        start = time.perf_counter()
+        legacy = {}
+        for persona_name, config in PERSONA_MAPPING.items():
+            legacy[persona_name] = legacy_classify(load_reviews(path), config)
+        legacy_seconds = time.perf_counter() - start
+
+        # 신규: 1회 파싱 + 단일 패스 분류
+        start = time.perf_counter()
+        classifier = ReviewClassifier(PERSONA_MAPPING)
+        single = classifier.classify(load_reviews(path))
+        single_seconds = time.perf_counter() - start
+
+        # 파싱 제외 분류만 비교
+        reviews = load_reviews(path)
+        start = time.perf_counter()
+        for config in PERSONA_MAPPING.values():
+            legacy_classify(reviews, config)
+        legacy_scan = time.perf_counter() - start
+        start = time.perf_counter()
+        classifier.classify(reviews)
+        single_scan = time.perf_counter() - start
+
+    for persona_name in PERSONA_MAPPING:
+        assert [r['id'] for r in legacy[persona_name]] == [r['id'] for r in single[persona_name]], persona_name
+        print(f"  {persona_name:<24} {len(single[persona_name]):>7,} reviews")
+
+    print("-" * 80)
+    print(f"parse + classify : legacy {legacy_seconds:6.2f}s | single-pass {single_seconds:6.2f}s "
+          f"| {legacy_seconds / single_seconds:4.1f}x")
+    print(f"classify only    : legacy {legacy_scan:6.2f}s | single-pass {single_scan:6.2f}s "
+          f"| {legacy_scan / single_scan:4.1f}x")
+    print("✅ 분류 결과 동일")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
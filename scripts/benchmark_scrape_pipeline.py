@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+수집 파이프라인 벤치마크 (오프라인, 임시 폴더 사용)
+로컬 WAV 오디오 픽스처와 스텁 다운로더/전사기로 YouTube 수집 흐름을 흉내 내어 총 소요 시간을 비교
+  - sequential: 영상마다 다운로드 → 전사 → 저장을 차례로 (기존 process_videos 루프)
+  - pipeline: 다운로드 스레드 → 전사 프로세스 풀 → 저장 스레드 (scrape_pipeline)
+스텁 다운로더는 네트워크 지연만큼 대기 후 픽스처를 복사하고,
+스텁 전사기는 오디오 길이에 비례하는 CPU 작업(프레임별 FFT)으로 세그먼트를 만듦
+
+실행: python -m scripts.benchmark_scrape_pipeline [--videos 16] [--latency 0.5] (프로젝트 루트에서)
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import wave
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from scrape_pipeline import TranscriptionPipeline
+
+# Windows 콘솔 UTF-8 설정
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+SAMPLE_RATE = 16000
+SEGMENT_SECONDS = 5
+FIXTURES = 4
+
+
+def make_fixtures(fixture_dir, rng):
+    """16kHz 모노 WAV 픽스처 (길이 20~40초, 음성 대역 톤 + 잡음)"""
+    fixture_dir.mkdir(parents=True)
+    paths = []
+    for i in range(FIXTURES):
+        seconds = rng.uniform(20, 40)
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        signal = 0.3 * np.sin(2 * np.pi * rng.uniform(150, 400) * t) + 0.05 * np.random.default_rng(i).standard_normal(len(t))
+        path = fixture_dir / f"fixture_{i}.wav"
+        with wave.open(str(path), 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(SAMPLE_RATE)
+            f.writeframes((signal * 32767).astype(np.int16).tobytes())
+        paths.append(path)
+    return paths
+
+
+def stub_transcribe(audio_path, passes=40):
+    """오디오 길이에 비례하는 CPU 작업 후 5초 단위 세그먼트 반환 (전사 프로세스에서 실행)"""
+    with wave.open(audio_path, 'rb') as f:
+        samples = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16).astype(np.float32)
+    frame = SAMPLE_RATE // 50
+    frames = samples[:len(samples) // frame * frame].reshape(-1, frame)
+    energy = np.zeros(len(frames))
+    for _ in range(passes):
+        energy += np.abs(np.fft.rfft(frames, axis=1)).sum(axis=1)
+
+    per_segment = SEGMENT_SECONDS * 50
+    segments = []
+    for start in range(0, len(frames), per_segment):
+        chunk = energy[start:start + per_segment]
+        segments.append({
+            'text': f"구간 에너지 {chunk.mean():.0f}",
+            'start': start / 50,
+            'duration': len(chunk) / 50,
+        })
+    return segments, 'ko', 'stub-stt'
+
+
+class StubSource:
+    """스텁 다운로더: 네트워크 지연만큼 대기 후 로컬 픽스처를 임시 오디오 폴더로 복사"""
+
+    def __init__(self, fixtures, audio_dir, latency):
+        self.fixtures = fixtures
+        self.audio_dir = audio_dir
+        self.latency = latency
+        audio_dir.mkdir(parents=True, exist_ok=True)
+
+    def fetch(self, video_id):
+        time.sleep(self.latency)
+        fixture = self.fixtures[int(video_id[3:]) % len(self.fixtures)]
+        audio_path = self.audio_dir / f"{video_id}.wav"
+        shutil.copyfile(fixture, audio_path)
+        return {'metadata': {'video_id': video_id}, 'transcript': None}, str(audio_path)
+
+
+def make_saver(output_dir):
+    output_dir.mkdir(parents=True)
+
+    def save(video_data, transcription):
+        if transcription:
+            video_data['transcript'], video_data['transcript_language'], video_data['transcript_type'] = transcription
+        path = output_dir / f"{video_data['metadata']['video_id']}.json"
+        path.write_text(json.dumps(video_data, ensure_ascii=False), encoding='utf-8')
+
+    return save
+
+
+def run_sequential(video_ids, source, transcribe, save):
+    """기존 process_videos 루프와 같은 순서"""
+    start = time.perf_counter()
+    for video_id in video_ids:
+        video_data, audio_path = source.fetch(video_id)
+        transcription = transcribe(audio_path)
+        os.remove(audio_path)
+        save(video_data, transcription)
+    return time.perf_counter() - start
+
+
+def read_outputs(output_dir):
+    return {p.stem: json.loads(p.read_text(encoding='utf-8'))['transcript'] for p in output_dir.glob("*.json")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 파이프라인 벤치마크")
+    parser.add_argument("--videos", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.5, help="스텁 다운로드 지연(초)")
+    parser.add_argument("--download-workers", type=int, default=4)
+    parser.add_argument("--transcribe-workers", type=int, default=None, help="기본: CPU 코어 수")
+    parser.add_argument("--passes", type=int, default=40, help="스텁 전사 CPU 작업량")
+    args = parser.parse_args()
+
+    video_ids = [f"vid{v:04d}" for v in range(args.videos)]
+    transcribe = partial(stub_transcribe, passes=args.passes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        fixtures = make_fixtures(tmp / "fixtures", random.Random(0))
+        audio_seconds = sum((p.stat().st_size - 44) / 2 for p in fixtures) / SAMPLE_RATE / len(fixtures)
+        print(f"영상 {args.videos}개 (평균 오디오 {audio_seconds:.0f}초), 다운로드 지연 {args.latency}s, "
+              f"CPU 코어 {os.cpu_count()}개")
+
+        sequential_s = run_sequential(video_ids, StubSource(fixtures, tmp / "audio_seq", args.latency),
+                                      transcribe, make_saver(tmp / "out_seq"))
+        print(f"sequential: {sequential_s:.1f}s")
+
+        source = StubSource(fixtures, tmp / "audio_pipe", args.latency)
+        pipeline = TranscriptionPipeline(
+            fetch=source.fetch, transcribe=transcribe, save=make_saver(tmp / "out_pipe"),
+            download_workers=args.download_workers, transcribe_workers=args.transcribe_workers,
+        )
+        stats = pipeline.run(video_ids)
+        print(pipeline.format_stats())
+
+        # 같은 결과 + 임시 오디오 정리 확인
+        assert read_outputs(tmp / "out_seq") == read_outputs(tmp / "out_pipe")
+        assert all(stats[stage]['items'] == args.videos and not stats[stage]['failed'] for stage in stats)
+        assert not any((tmp / "audio_pipe").iterdir())
+        print(f"pipeline vs sequential: {sequential_s:.1f}s → {pipeline.wall_seconds:.1f}s "
+              f"({sequential_s / pipeline.wall_seconds:.1f}x), outputs identical")
+
+
+if __name__ == "__main__":
+    main()
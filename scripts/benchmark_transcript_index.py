@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+전사본 검색 벤치마크 - 기존 전체 스캔 vs 역색인(BM25)
+합성 코퍼스(1k / 10k / 100k 전사본)에서 색인 구축 시간과 질의 지연 비교
+
+실행: python -m scripts.benchmark_transcript_index (프로젝트 루트에서)
+"""
+
+import random
+import sys
+import time
+
+from transcript_index import TranscriptIndex, tokenize
+
+# Windows 콘솔 UTF-8 설정
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+CORPUS_SIZES = [1_000, 10_000, 100_000]
+WORDS_PER_TRANSCRIPT = 200
+QUERIES = [
+    "오늘 뷰티 루틴 알려줘",
+    "홈 데코 아이디어",
+    "요리 초보 레시피",
+    "패션 트렌드 스타일링",
+    "저널링 시작하는 방법",
+]
+
+VOCAB = (
+    "뷰티 뷰티템 메이크업 스킨케어 패션 코디 스타일링 요리 레시피 초보 홈 데코 인테리어 "
+    "일상 브이로그 반려동물 강아지 고양이 독서 저널링 자기계발 테크 사진 예술 크래프트 "
+    "여행 카페 루틴 아침 저녁 트렌드 아이디어 방법 추천 오늘 하루 시작 정리 "
+    "makeup skincare fashion recipe routine vlog home decor journal camera"
+).split()
+
+
+# 주제어 외 일반 어휘 (실제 전사본처럼 어휘 분포가 긴 꼬리를 갖도록)
+FILLER_SYLLABLES = "가 나 다 라 마 바 사 아 자 차 카 타 파 하 고 노 도 로 모 보 소 오 조".split()
+
+
+def make_filler_vocab(rng, size=5000):
+    return [''.join(rng.choices(FILLER_SYLLABLES, k=rng.randint(2, 4))) for _ in range(size)]
+
+
+def make_corpus(size, seed=42):
+    """합성 전사본 생성 (주제어 약 10% + 일반 어휘 90%)"""
+    rng = random.Random(seed)
+    filler = make_filler_vocab(rng)
+    filler_weights = [1 / (rank + 1) for rank in range(len(filler))]
+    corpus = []
+    for i in range(size):
+        topic_words = rng.sample(VOCAB, k=5)
+        words = rng.choices(filler, weights=filler_weights, k=WORDS_PER_TRANSCRIPT)
+        for pos in rng.sample(range(WORDS_PER_TRANSCRIPT), k=WORDS_PER_TRANSCRIPT // 10):
+            words[pos] = rng.choice(topic_words)
+        corpus.append({
+            'title': ' '.join(rng.choices(topic_words, k=3)),
+            'content': ' '.join(words),
+            'channel_id': f'channel_{i % 30}'
+        })
+    return corpus
+
+
+def scan_retrieve(transcripts, query, top_k=3):
+    """기존 PersonaChatbotRAG.retrieve_relevant_content (전체 스캔 + count)"""
+    query_lower = query.lower()
+    relevant_transcripts = []
+
+    for transcript in transcripts:
+        content = transcript['content'].lower()
+        title = transcript['title'].lower()
+
+        relevance_score = 0
+        if any(word in title for word in query_lower.split()):
+            relevance_score += 3
+        for word in query_lower.split():
+            if word in content:
+                relevance_score += content.count(word)
+
+        if relevance_score > 0:
+            relevant_transcripts.append((transcript, relevance_score))
+
+    relevant_transcripts.sort(key=lambda x: x[1], reverse=True)
+    return [t[0] for t in relevant_transcripts[:top_k]]
+
+
+def build_index(transcripts):
+    index = TranscriptIndex()
+    for transcript in transcripts:
+        index.add_document(tokenize(transcript['content']), tokenize(transcript['title']))
+    return index
+
+
+def topk_overlap(corpus, index, top_k=3):
+    """기존 스캔과 역색인 결과의 top_k 일치율 (질의 평균)"""
+    overlaps = []
+    for query in QUERIES:
+        scan_ids = {id(t) for t in scan_retrieve(corpus, query, top_k)}
+        index_ids = {id(corpus[doc_id]) for doc_id, _ in index.search(query, top_k)}
+        overlaps.append(len(scan_ids & index_ids) / top_k)
+    return sum(overlaps) / len(overlaps)
+
+
+def time_queries(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            fn(query)
+    return (time.perf_counter() - start) / (repeat * len(QUERIES)) * 1000
+
+
+def main():
+    print("=" * 80)
+    print("전사본 검색 벤치마크: 전체 스캔 vs 역색인(BM25)")
+    print("=" * 80)
+    print(f"{'corpus':>10} | {'index build':>12} | {'scan ms/q':>10} | {'index ms/q':>10} | {'speedup':>8} | {'top-3 overlap':>13}")
+    print("-" * 80)
+
+    for size in CORPUS_SIZES:
+        corpus = make_corpus(size)
+
+        start = time.perf_counter()
+        index = build_index(corpus)
+        build_seconds = time.perf_counter() - start
+
+        # 큰 코퍼스에서는 기존 스캔이 느리므로 반복 횟수 축소
+        scan_repeat = 3 if size <= 10_000 else 1
+        scan_ms = time_queries(lambda q: scan_retrieve(corpus, q), scan_repeat)
+        index_ms = time_queries(lambda q: index.search(q, top_k=3), scan_repeat)
+        overlap = topk_overlap(corpus, index)
+
+        print(f"{size:>10,} | {build_seconds:>10.2f} s | {scan_ms:>10.2f} | {index_ms:>10.2f} | {scan_ms / index_ms:>7.1f}x | {overlap:>12.0%}")
+
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
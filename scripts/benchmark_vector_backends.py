@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+검색 백엔드 벤치마크 - recall@k vs 지연 시간 (정확 검색 기준)
+클러스터 구조가 있는 합성 임베딩으로 exact / ivf(n_probe 스윕) / hnsw(ef 스윕) 비교
+
+실행: python -m scripts.benchmark_vector_backends [--sizes 10000 100000 1000000] [--dim 256] [--noise 1.5]
+(프로젝트 루트에서, hnsw는 hnswlib 설치 시에만 측정)
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from rag.vector_backends import ExactBackend, HNSWBackend, IVFBackend, hnswlib
+
+# Windows 콘솔 UTF-8 설정
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+K = 10
+NUM_QUERIES = 200
+IVF_PROBES = [4, 8, 16, 32, 64]
+HNSW_EFS = [16, 32, 64, 128, 256]
+
+
+def make_corpus(size, dim, rng, noise, num_topics=500):
+    """토픽 중심 주변에 흩어진 임베딩 (실제 리뷰 임베딩처럼 군집 구조)"""
+    topics = rng.standard_normal((num_topics, dim)).astype(np.float32)
+    labels = rng.integers(num_topics, size=size)
+    vectors = np.empty((size, dim), dtype=np.float32)
+    for start in range(0, size, 100_000):
+        end = min(start + 100_000, size)
+        vectors[start:end] = topics[labels[start:end]] + noise * rng.standard_normal((end - start, dim))
+    queries = topics[rng.integers(num_topics, size=NUM_QUERIES)] \
+        + noise * rng.standard_normal((NUM_QUERIES, dim)).astype(np.float32)
+    return vectors, queries.astype(np.float32)
+
+
+def run_queries(backend, queries):
+    start = time.perf_counter()
+    results = [backend.search(q, K)[0] for q in queries]
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+
+def recall(results, truth):
+    return np.mean([len(set(r.tolist()) & set(t.tolist())) / len(t) for r, t in zip(results, truth)])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--dim', type=int, default=256)
+    parser.add_argument('--noise', type=float, default=1.5, help="토픽 중심 대비 노이즈 (클수록 어려움)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print("=" * 72)
+    print(f"검색 백엔드 recall@{K} vs 지연 (dim={args.dim}, 질의 {NUM_QUERIES}개)")
+    print(f"hnswlib: {'available' if hnswlib is not None else 'not installed (skip hnsw)'}")
+    print("=" * 72)
+
+    for size in args.sizes:
+        vectors, queries = make_corpus(size, args.dim, rng, args.noise)
+        print(f"\n[{size:,} vectors]")
+        print(f"  {'backend':<18} | {'build s':>8} | {'ms/query':>8} | {'recall@' + str(K):>9}")
+        print("  " + "-" * 52)
+
+        start = time.perf_counter()
+        exact = ExactBackend().build(vectors)
+        build_seconds = time.perf_counter() - start
+        truth, exact_ms = run_queries(exact, queries)
+        print(f"  {'exact':<18} | {build_seconds:>8.2f} | {exact_ms:>8.3f} | {1.0:>9.3f}")
+
+        start = time.perf_counter()
+        ivf = IVFBackend().build(vectors)
+        build_seconds = time.perf_counter() - start
+        for n_probe in IVF_PROBES:
+            ivf.n_probe = n_probe
+            results, ms = run_queries(ivf, queries)
+            label = f"ivf n_probe={n_probe}"
+            print(f"  {label:<18} | {build_seconds:>8.2f} | {ms:>8.3f} | {recall(results, truth):>9.3f}")
+
+        if hnswlib is not None:
+            start = time.perf_counter()
+            hnsw = HNSWBackend().build(vectors)
+            build_seconds = time.perf_counter() - start
+            for ef in HNSW_EFS:
+                hnsw.index.set_ef(ef)
+                results, ms = run_queries(hnsw, queries)
+                label = f"hnsw ef={ef}"
+                print(f"  {label:<18} | {build_seconds:>8.2f} | {ms:>8.3f} | {recall(results, truth):>9.3f}")
+
+    print("\n" + "=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+영상 코퍼스 로딩 벤치마크 (오프라인, 임시 폴더 사용)
+합성 youtube_data(채널 20개, 영상 3,000개, 영상당 자막 세그먼트 300개)로
+대시보드 로더가 영상 목록을 읽는 시간과 최대 메모리(RSS)를 비교
+  - legacy: 영상 JSON 전체 json.load + 자막 이어붙이기 (기존 로더)
+  - corpus: 컬럼형 코퍼스에서 필요한 컬럼만 메모리 맵으로 읽기 (video_corpus)
+각 방식은 RSS를 따로 재기 위해 별도 프로세스에서 실행
+
+실행: python -m scripts.benchmark_video_corpus [--videos 3000] [--segments 300] (프로젝트 루트에서)
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from video_corpus import build_corpus, load_corpus
+
+# Windows 콘솔 UTF-8 설정
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+CHANNELS = 20
+WORDS = ["아이폰", "갤럭시", "배터리", "카메라", "케이스", "충전", "화면", "리뷰", "언박싱", "가격", "성능", "디자인"]
+
+
+def make_data(data_dir, videos, segments, rng):
+    """합성 youtube_data/<channel_id>/<video_id>.json"""
+    for c in range(CHANNELS):
+        channel_dir = data_dir / f"UC{c:04d}"
+        channel_dir.mkdir(parents=True)
+        (channel_dir / "channel_info.json").write_text(
+            json.dumps({"channel_title": f"채널 {c}"}, ensure_ascii=False), encoding='utf-8')
+    for v in range(videos):
+        video_id = f"vid{v:06d}"
+        has_transcript = v % 5 != 0
+        video = {
+            "metadata": {
+                "video_id": video_id, "video_url": f"https://www.youtube.com/watch?v={video_id}",
+                "title": f"영상 {v} " + rng.choice(WORDS), "description": "설명 " * 50,
+                "published_at": f"2024-{v % 12 + 1:02d}-01T00:00:00Z", "channel_title": f"채널 {v % CHANNELS}",
+                "tags": rng.sample(WORDS, 3), "duration": "PT10M", "view_count": str(rng.randrange(10**6)),
+                "like_count": str(rng.randrange(10**4)), "comment_count": str(rng.randrange(10**3)),
+                "thumbnail_url": f"https://i.ytimg.com/vi/{video_id}/hq.jpg",
+            },
+            "transcript": [
+                {"text": " ".join(rng.choices(WORDS, k=8)), "start": i * 3.0, "duration": 3.0}
+                for i in range(segments)
+            ] if has_transcript else None,
+            "transcript_language": "ko" if has_transcript else None,
+            "transcript_type": "manual" if has_transcript else "none",
+        }
+        (data_dir / f"UC{v % CHANNELS:04d}" / f"{video_id}.json").write_text(
+            json.dumps(video, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def legacy_load(data_dir):
+    """기존 dashboard.load_all_videos와 같은 처리"""
+    videos = []
+    for channel_id in os.listdir(data_dir):
+        channel_path = os.path.join(data_dir, channel_id)
+        with open(os.path.join(channel_path, 'channel_info.json'), 'r', encoding='utf-8') as f:
+            channel_name = json.load(f).get('channel_title', channel_id)
+        for name in os.listdir(channel_path):
+            if name == 'channel_info.json':
+                continue
+            with open(os.path.join(channel_path, name), 'r', encoding='utf-8') as f:
+                video = json.load(f)
+            video['channel_name'] = channel_name
+            video['channel_id'] = channel_id
+            video['full_text'] = " ".join(seg.get('text', '') for seg in video.get('transcript') or [])
+            video['has_transcript'] = len(video['full_text']) > 0
+            videos.append(video)
+    return videos
+
+
+def corpus_load(data_dir, corpus_dir):
+    videos = load_corpus(data_dir, corpus_dir).records()
+    for video in videos:
+        video['has_transcript'] = len(video['full_text']) > 0
+    return videos
+
+
+def measure(mode, data_dir, corpus_dir):
+    """자식 프로세스: 로드 시간(ms)과 최대 RSS(MB)를 JSON으로 출력"""
+    start = time.perf_counter()
+    videos = legacy_load(data_dir) if mode == "legacy" else corpus_load(data_dir, corpus_dir)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(json.dumps({"ms": elapsed, "rss_mb": peak_rss_mb(), "videos": len(videos)}))
+
+
+def peak_rss_mb():
+    """프로세스 최대 RSS (ru_maxrss는 fork/exec 시 부모 값을 물려받을 수 있어 VmHWM 우선)"""
+    try:
+        with open("/proc/self/status", encoding='utf-8') as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_child(mode, data_dir, corpus_dir):
+    output = subprocess.run(
+        [sys.executable, "-m", "scripts.benchmark_video_corpus", "--measure", mode,
+         "--data-dir", str(data_dir), "--corpus-dir", str(corpus_dir)],
+        check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--videos', type=int, default=3000)
+    parser.add_argument('--segments', type=int, default=300)
+    parser.add_argument('--measure', choices=["legacy", "corpus"], help=argparse.SUPPRESS)
+    parser.add_argument('--data-dir', help=argparse.SUPPRESS)
+    parser.add_argument('--corpus-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.data_dir, args.corpus_dir)
+        return
+
+    print("=" * 72)
+    print(f"영상 코퍼스 벤치마크 (영상 {args.videos:,}개, 영상당 세그먼트 {args.segments}개, 채널 {CHANNELS}개)")
+    print("=" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        data_dir, corpus_dir = tmp / "youtube_data", tmp / "video_corpus"
+        make_data(data_dir, args.videos, args.segments, random.Random(0))
+        json_mb = sum(p.stat().st_size for p in data_dir.rglob("*.json")) / 2**20
+
+        start = time.perf_counter()
+        build_corpus(data_dir, corpus_dir, verbose=True)
+        print(f"ingest (full)        : {time.perf_counter() - start:6.2f}s")
+
+        # 파일 하나만 바뀌면 그 파일만 다시 파싱
+        changed = data_dir / "UC0001" / "vid000001.json"
+        video = json.loads(changed.read_text(encoding='utf-8'))
+        video["metadata"]["title"] = "수정된 제목"
+        changed.write_text(json.dumps(video, ensure_ascii=False), encoding='utf-8')
+        start = time.perf_counter()
+        build_corpus(data_dir, corpus_dir, verbose=True)
+        print(f"ingest (1 changed)   : {time.perf_counter() - start:6.2f}s")
+        start = time.perf_counter()
+        assert not build_corpus(data_dir, corpus_dir)
+        print(f"freshness check      : {(time.perf_counter() - start) * 1000:6.1f}ms")
+
+        # 코퍼스 결과는 기존 로더와 같아야 함 (자막 세그먼트는 영상별 조회)
+        legacy = {v['metadata']['video_id']: v for v in legacy_load(data_dir)}
+        corpus = load_corpus(data_dir, corpus_dir)
+        records = corpus_load(data_dir, corpus_dir)
+        assert len(records) == len(legacy) == args.videos
+        for record in records:
+            expected = legacy[record['metadata']['video_id']]
+            for key in ('channel_id', 'channel_name', 'full_text', 'has_transcript', 'transcript_type'):
+                assert record[key] == expected[key], key
+            assert all(record['metadata'][k] == expected['metadata'][k] for k in record['metadata'])
+            assert corpus.segments_for(record['metadata']['video_id']) == (expected['transcript'] or [])
+        assert legacy['vid000001']['metadata']['title'] == "수정된 제목"
+        del legacy, records, corpus
+
+        corpus_mb = sum(p.stat().st_size for p in corpus_dir.glob("*.arrow")) / 2**20
+        print(f"on disk: JSON {json_mb:.1f}MB, corpus {corpus_mb:.1f}MB")
+        print("-" * 72)
+
+        legacy_run = run_child("legacy", data_dir, corpus_dir)
+        corpus_run = run_child("corpus", data_dir, corpus_dir)
+        for label, run in [("legacy JSON walk", legacy_run), ("columnar corpus", corpus_run)]:
+            print(f"{label:<17}: {run['ms']:8.1f}ms, peak RSS {run['rss_mb']:7.1f}MB ({run['videos']:,} videos)")
+        print(f"speedup {legacy_run['ms'] / corpus_run['ms']:.1f}x, "
+              f"peak RSS {corpus_run['rss_mb'] / legacy_run['rss_mb']:.0%} of legacy")
+
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
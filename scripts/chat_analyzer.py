@@ -1,12 +1,15 @@
 # -*- coding: utf-8 -*-
 import os
 import sys
-import json
-import glob
 from datetime import datetime
 from collections import defaultdict, Counter
 import re
 
+# 프로젝트 루트 모듈 (video_corpus, segment_index) 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from segment_index import load_segment_index
+from video_corpus import load_corpus
+
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
@@ -19,58 +22,16 @@ class VideoDataAnalyzer:
         self.load_database()
     
     def load_database(self):
-        """모든 영상 데이터를 메모리에 로드"""
+        """모든 영상 데이터를 메모리에 로드 (컬럼형 코퍼스, 자막 세그먼트는 검색 시 조회)"""
         print("\n🔄 데이터베이스 로딩 중...")
         
         if not os.path.exists(self.data_dir):
             print(f"❌ {self.data_dir} 폴더가 없습니다.")
             return
         
-        channel_dirs = [d for d in os.listdir(self.data_dir) 
-                       if os.path.isdir(os.path.join(self.data_dir, d))]
-        
-        for channel_id in channel_dirs:
-            channel_path = os.path.join(self.data_dir, channel_id)
-            
-            # 채널 정보
-            channel_info_path = os.path.join(channel_path, 'channel_info.json')
-            channel_name = channel_id
-            
-            if os.path.exists(channel_info_path):
-                try:
-                    with open(channel_info_path, 'r', encoding='utf-8') as f:
-                        info = json.load(f)
-                        channel_name = info.get('channel_title', channel_id)
-                except:
-                    pass
-            
-            # 영상 데이터 로드
-            json_files = glob.glob(os.path.join(channel_path, '*.json'))
-            
-            for json_file in json_files:
-                if 'channel_info.json' in json_file:
-                    continue
-                
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        video_data = json.load(f)
-                    
-                    # 데이터베이스에 추가
-                    video_data['channel_name'] = channel_name
-                    video_data['channel_id'] = channel_id
-                    
-                    # 전체 텍스트 생성 (검색용)
-                    full_text = ""
-                    if video_data.get('transcript'):
-                        full_text = " ".join([seg.get('text', '') for seg in video_data['transcript']])
-                    
-                    video_data['full_text'] = full_text
-                    video_data['full_text_lower'] = full_text.lower()
-                    
-                    self.videos_db.append(video_data)
-                    
-                except Exception as e:
-                    continue
+        self.corpus = load_corpus(self.data_dir)
+        self.index = load_segment_index(self.data_dir)
+        self.videos_db = self.corpus.records()
         
         # 자막/STT가 있는 것만 필터링
         self.videos_with_text = [v for v in self.videos_db if v.get('full_text')]
@@ -79,22 +40,17 @@ class VideoDataAnalyzer:
         print(f"   자막/STT 있음: {len(self.videos_with_text)}개\n")
     
     def search_keyword(self, keyword):
-        """키워드로 영상 검색"""
-        keyword_lower = keyword.lower()
+        """키워드로 영상 검색 (세그먼트 색인 postings로 매칭, 원문은 매칭 세그먼트만 조회)"""
+        hits = self.index.search([keyword])
         results = []
         
         for video in self.videos_with_text:
-            if keyword_lower in video['full_text_lower']:
-                # 키워드가 포함된 세그먼트 찾기
-                matching_segments = []
-                for seg in video['transcript']:
-                    if keyword_lower in seg.get('text', '').lower():
-                        matching_segments.append(seg)
-                
+            hit = hits.get(video['metadata'].get('video_id'))
+            if hit:
                 results.append({
                     'video': video,
-                    'match_count': len(matching_segments),
-                    'matching_segments': matching_segments
+                    'match_count': len(hit['segments']),
+                    'matching_segments': self.corpus.segments_at(hit['segments'])
                 })
         
         # 매칭 횟수로 정렬
@@ -102,23 +58,9 @@ class VideoDataAnalyzer:
         return results
     
     def search_multiple_keywords(self, keywords, mode='OR'):
-        """여러 키워드로 검색 (OR/AND)"""
-        if mode == 'OR':
-            results = set()
-            for keyword in keywords:
-                keyword_results = self.search_keyword(keyword)
-                for r in keyword_results:
-                    results.add(r['video']['metadata']['video_id'])
-            
-            # 결과 재구성
-            return [r for r in self.videos_with_text if r['metadata']['video_id'] in results]
-        
-        elif mode == 'AND':
-            results = self.videos_with_text.copy()
-            for keyword in keywords:
-                keyword_lower = keyword.lower()
-                results = [v for v in results if keyword_lower in v['full_text_lower']]
-            return results
+        """여러 키워드로 검색 (OR/AND, 색인 한 번 조회)"""
+        hits = self.index.search(keywords, mode=mode)
+        return [v for v in self.videos_with_text if v['metadata'].get('video_id') in hits]
     
     def filter_by_channel(self, channel_name_part):
         """채널명으로 필터링"""
@@ -133,7 +75,8 @@ class VideoDataAnalyzer:
         videos = self.videos_with_text.copy()
         
         if keyword:
-            videos = [v for v in videos if keyword.lower() in v['full_text_lower']]
+            hits = self.index.search([keyword])
+            videos = [v for v in videos if v['metadata'].get('video_id') in hits]
         
         videos.sort(key=lambda x: int(x['metadata'].get('view_count', 0)), reverse=True)
         return videos[:limit]
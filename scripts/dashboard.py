@@ -3,12 +3,16 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import json
 import os
-import glob
+import sys
 from collections import Counter, defaultdict
 from datetime import datetime
 
+# 프로젝트 루트 모듈 (video_corpus, segment_index) 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from segment_index import load_segment_index
+from video_corpus import load_corpus
+
 # 페이지 설정
 st.set_page_config(
     page_title="YouTube 영상 데이터 분석 대시보드",
@@ -78,79 +82,32 @@ st.markdown("""
 
 @st.cache_data
 def load_all_videos(data_dir='youtube_data'):
-    """모든 영상 데이터를 로드"""
-    videos = []
-    
+    """모든 영상 데이터를 로드 (컬럼형 코퍼스에서 필요한 컬럼만, 자막 세그먼트는 검색 시 조회)"""
     if not os.path.exists(data_dir):
-        return videos
-    
-    channel_dirs = [d for d in os.listdir(data_dir) 
-                   if os.path.isdir(os.path.join(data_dir, d))]
+        return []
     
-    for channel_id in channel_dirs:
-        channel_path = os.path.join(data_dir, channel_id)
-        
-        # 채널 정보
-        channel_info_path = os.path.join(channel_path, 'channel_info.json')
-        channel_name = channel_id
-        
-        if os.path.exists(channel_info_path):
-            try:
-                with open(channel_info_path, 'r', encoding='utf-8') as f:
-                    info = json.load(f)
-                    channel_name = info.get('channel_title', channel_id)
-            except:
-                pass
-        
-        # 영상 데이터
-        json_files = glob.glob(os.path.join(channel_path, '*.json'))
-        
-        for json_file in json_files:
-            if 'channel_info.json' in json_file:
-                continue
-            
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    video_data = json.load(f)
-                
-                video_data['channel_name'] = channel_name
-                video_data['channel_id'] = channel_id
-                
-                # 전체 텍스트
-                full_text = ""
-                if video_data.get('transcript'):
-                    full_text = " ".join([seg.get('text', '') for seg in video_data['transcript']])
-                
-                video_data['full_text'] = full_text
-                video_data['has_transcript'] = len(full_text) > 0
-                
-                videos.append(video_data)
-                
-            except:
-                continue
+    videos = load_corpus(data_dir).records()
+    for video in videos:
+        video['has_transcript'] = len(video['full_text']) > 0
     
     return videos
 
 def search_videos(videos, keyword):
-    """키워드로 영상 검색"""
-    keyword_lower = keyword.lower()
+    """키워드로 영상 검색 (세그먼트 색인 postings로 매칭)"""
+    hits = load_segment_index().search([keyword])
+    corpus = load_corpus()
     results = []
     
     for video in videos:
         if not video.get('has_transcript'):
             continue
         
-        if keyword_lower in video['full_text'].lower():
-            # 매칭 세그먼트 찾기
-            matching_segments = []
-            for seg in video.get('transcript', []):
-                if keyword_lower in seg.get('text', '').lower():
-                    matching_segments.append(seg)
-            
+        hit = hits.get(video['metadata'].get('video_id'))
+        if hit:
             results.append({
                 **video,
-                'match_count': len(matching_segments),
-                'matching_segments': matching_segments
+                'match_count': len(hit['segments']),
+                'matching_segments': corpus.segments_at(hit['segments'])
             })
     
     return sorted(results, key=lambda x: x['match_count'], reverse=True)
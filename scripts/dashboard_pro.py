@@ -3,13 +3,17 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import json
 import os
-import glob
+import sys
 from collections import Counter, defaultdict
 from datetime import datetime
 from openai import OpenAI
 
+# 프로젝트 루트 모듈 (video_corpus, segment_index) 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from segment_index import load_segment_index
+from video_corpus import load_corpus
+
 # ============================================================================
 # 페이지 설정
 # ============================================================================
@@ -278,60 +282,15 @@ st.markdown("""
 # ============================================================================
 @st.cache_data(show_spinner=False)
 def load_database():
-    """데이터베이스 로드 및 전처리"""
-    videos = []
+    """데이터베이스 로드 및 전처리 (컬럼형 코퍼스에서 필요한 컬럼만 읽음)"""
     data_dir = 'youtube_data'
     
     if not os.path.exists(data_dir):
         return []
     
-    for channel_dir in os.listdir(data_dir):
-        channel_path = os.path.join(data_dir, channel_dir)
-        if not os.path.isdir(channel_path):
-            continue
-        
-        # 채널 정보
-        channel_name = channel_dir
-        channel_info_path = os.path.join(channel_path, 'channel_info.json')
-        
-        if os.path.exists(channel_info_path):
-            try:
-                with open(channel_info_path, 'r', encoding='utf-8') as f:
-                    info = json.load(f)
-                    channel_name = info.get('channel_title', channel_dir)
-            except:
-                pass
-        
-        # 영상 데이터
-        for json_file in glob.glob(os.path.join(channel_path, '*.json')):
-            if 'channel_info' in json_file:
-                continue
-            
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    video = json.load(f)
-                
-                # 메타데이터 정규화
-                video['channel_name'] = channel_name
-                video['channel_id'] = channel_dir
-                
-                # 텍스트 처리
-                full_text = ""
-                if video.get('transcript'):
-                    full_text = " ".join([seg.get('text', '') for seg in video['transcript']])
-                
-                video['full_text'] = full_text
-                video['has_text'] = len(full_text) > 0
-                
-                # 조회수 정수 변환
-                try:
-                    video['view_count_int'] = int(video['metadata'].get('view_count', 0))
-                except:
-                    video['view_count_int'] = 0
-                
-                videos.append(video)
-            except:
-                continue
+    videos = load_corpus(data_dir).records(extra_columns=('view_count_int',))
+    for video in videos:
+        video['has_text'] = len(video['full_text']) > 0
     
     return videos
 
@@ -339,27 +298,21 @@ def load_database():
 # 유틸리티 함수
 # ============================================================================
 def search_videos(videos, keyword):
-    """키워드 검색"""
-    keyword_lower = keyword.lower()
+    """키워드 검색 (세그먼트 색인 postings로 매칭)"""
+    hits = load_segment_index().search([keyword])
+    corpus = load_corpus()
     results = []
     
     for video in videos:
         if not video.get('has_text'):
             continue
         
-        if keyword_lower in video['full_text'].lower():
-            count = video['full_text'].lower().count(keyword_lower)
-            
-            # 매칭 세그먼트
-            matching_segs = []
-            for seg in video.get('transcript', []):
-                if keyword_lower in seg.get('text', '').lower():
-                    matching_segs.append(seg)
-            
+        hit = hits.get(video['metadata'].get('video_id'))
+        if hit:
             results.append({
                 **video,
-                'match_count': count,
-                'matching_segments': matching_segs[:5]  # 상위 5개만
+                'match_count': hit['match_count'],
+                'matching_segments': corpus.segments_at(hit['segments'][:5])  # 상위 5개만
             })
     
     return sorted(results, key=lambda x: x['match_count'], reverse=True)
@@ -17,6 +17,7 @@ from langchain_community.vectorstores import Chroma
 from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import TextLoader
+from rag.embedding_cache import CachedEmbeddings, get_shared_cache
 
 class ForceRefreshRAG:
     """Force refresh RAG with new data"""
@@ -26,7 +27,11 @@ class ForceRefreshRAG:
         self.vector_store_dir = Path("rag/vector_stores_new")  # New directory
         self.vector_store_dir.mkdir(exist_ok=True)
         
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-ada-002")
+        # 내용이 그대로인 청크는 임베딩 캐시에서 재사용
+        self.embeddings = CachedEmbeddings(
+            OpenAIEmbeddings(model="text-embedding-ada-002"),
+            get_shared_cache()
+        )
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=500,
             chunk_overlap=50,
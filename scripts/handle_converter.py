@@ -1,20 +1,27 @@
-from googleapiclient.discovery import build
+import os
+import sys
 import json
 
+# 프로젝트 루트 모듈 (youtube_api) 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from youtube_api import get_youtube_client
+
 class YouTubeHandleConverter:
     def __init__(self, api_key):
         """
         YouTube 핸들 변환기 초기화
         
         Args:
-            api_key: YouTube Data API v3 키
+            api_key: YouTube Data API v3 키 (또는 키 리스트)
         """
         self.api_key = api_key
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+        # 디스크 캐시 + 키별 쿼터 관리 (이미 변환한 핸들은 다시 요청하지 않음)
+        self.api = get_youtube_client(api_key)
     
     def handle_to_channel_id(self, handle):
         """
         단일 핸들을 채널 ID로 변환
+        (forHandle은 요청당 핸들 하나만 받으므로 묶지 않고, 결과를 캐시)
         
         Args:
             handle: @로 시작하는 핸들 (예: @kyliejenner) 또는 핸들명만 (예: kyliejenner)
@@ -29,13 +36,9 @@ class YouTubeHandleConverter:
         
         try:
             # forHandle 파라미터로 검색
-            response = self.youtube.channels().list(
-                part='snippet,contentDetails,statistics',
-                forHandle=clean_handle
-            ).execute()
+            channel = self.api.channel_for_handle(clean_handle)
             
-            if response.get('items'):
-                channel = response['items'][0]
+            if channel is not None:
                 channel_id = channel['id']
                 channel_name = channel['snippet']['title']
                 
@@ -51,26 +54,17 @@ class YouTubeHandleConverter:
                 print(f"  ✅ 찾음: {channel_name} (ID: {channel_id})")
                 return result
             else:
-                # forHandle로 못 찾으면 검색 API로 시도
-                search_response = self.youtube.search().list(
-                    part='snippet',
-                    q=clean_handle,
-                    type='channel',
-                    maxResults=1
-                ).execute()
+                # forHandle로 못 찾으면 검색 API로 시도 (100 단위)
+                channel = self.api.search_channel(clean_handle)
                 
-                if search_response.get('items'):
-                    channel = search_response['items'][0]
+                if channel is not None:
                     channel_id = channel['snippet']['channelId']
                     channel_name = channel['snippet']['title']
                     
                     # 통계 정보 추가 조회
-                    stats_response = self.youtube.channels().list(
-                        part='statistics',
-                        id=channel_id
-                    ).execute()
+                    stats_channel = self.api.channels([channel_id], part='statistics')[channel_id]
                     
-                    stats = stats_response['items'][0]['statistics'] if stats_response.get('items') else {}
+                    stats = stats_channel['statistics'] if stats_channel else {}
                     
                     result = {
                         'handle': f'@{clean_handle}',
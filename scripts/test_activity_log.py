@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+활동 로그 테스트 스크립트 (오프라인, 임시 폴더 사용)
+여러 스레드(세션)가 동시에 기록해도 유실이 없는지, 사전 집계 조회, 기존 JSON 가져오기/중복 제거,
+보관 기간 지난 날짜의 JSON Lines 이동을 확인하고 기존 방식(파일 전체 재작성)과 기록 지연을 비교
+
+실행: python -m scripts.test_activity_log (프로젝트 루트에서)
+"""
+
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from activity_log import ActivityLog
+
+SESSIONS = 8
+EVENTS_PER_SESSION = 250
+
+
+def legacy_log_seconds(path, existing, samples=20):
+    """기존 방식: 로드 → 1건 추가 → 전체 저장(+백업) 1회 평균 시간"""
+    data = {"users": {}, "admin_logs": [], "search_logs": [], "usage_logs": [
+        {"timestamp": datetime.now().isoformat(), "user_id": "u", "ip": "1.1.1.1",
+         "activity": "usage", "details": "채팅"} for _ in range(existing)]}
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+    start = time.perf_counter()
+    for _ in range(samples):
+        data = json.loads(path.read_text(encoding='utf-8'))
+        data["usage_logs"].append({"timestamp": datetime.now().isoformat(), "user_id": "u",
+                                   "ip": "1.1.1.1", "activity": "usage", "details": "채팅"})
+        for target in (path, path.with_name("backup.json")):
+            target.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+    return (time.perf_counter() - start) / samples
+
+
+def test_activity_log():
+    print("=== Activity Log Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        log = ActivityLog(tmp / "logs.sqlite3", archive_dir=tmp / "archive", retention_days=30)
+
+        # 세션 여러 개가 동시에 기록
+        def session(n):
+            for i in range(EVENTS_PER_SESSION):
+                log.log(f"user{n}", "search" if i % 5 == 0 else "usage", f"이벤트 {i}", ip=f"10.0.0.{n}")
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=session, args=(n,)) for n in range(SESSIONS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        enqueue_us = (time.perf_counter() - start) / (SESSIONS * EVENTS_PER_SESSION) * 1e6
+        log.flush()
+
+        total = SESSIONS * EVENTS_PER_SESSION
+        assert log.count("search") + log.count("usage") == total
+        assert log.count("search") == total // 5
+        assert log.unique_ips(["search", "usage"]) == SESSIONS
+        assert log.counts_by_ip("usage")[0][1] == EVENTS_PER_SESSION * 4 // 5
+        assert len(log.recent("search", limit=10)) == 10
+        print(f"concurrent: {total} events from {SESSIONS} sessions in {log.stats['batches']} batch(es), "
+              f"log() {enqueue_us:.1f}us/event")
+
+        # 기존 JSON 가져오기 (두 번 가져와도 중복 없음) + 내보내기 형식 유지
+        old_day = (datetime.now() - timedelta(days=40)).replace(microsecond=0)
+        legacy = {"users": {}, "admin_logs": [
+            {"timestamp": old_day.isoformat(), "user_id": "admin", "ip": "1.2.3.4",
+             "activity": "admin", "details": "관리자 로그인"}], "search_logs": [], "usage_logs": []}
+        assert log.import_legacy(legacy) == 1
+        assert log.import_legacy(legacy) == 0
+        assert log.count("admin") == 1  # 중복으로 건너뛴 이벤트는 집계에도 반영 안 됨
+        assert log.export_legacy()["admin_logs"] == legacy["admin_logs"]
+        # user_id/ip/details가 없는 항목도 두 번째 복원에서는 중복으로 걸러짐 (집계도 한 번만)
+        anonymous_log = ActivityLog(tmp / "anonymous.sqlite3", archive_dir=tmp / "anonymous_archive")
+        anonymous = {"usage_logs": [{"timestamp": old_day.isoformat(), "user_id": None, "ip": None,
+                                     "activity": "usage", "details": None}]}
+        assert (anonymous_log.import_legacy(anonymous), anonymous_log.import_legacy(anonymous)) == (1, 0)
+        assert anonymous_log.count("usage") == 1 and anonymous_log.counts_by_ip("usage") == [("unknown", 1)]
+
+        # 기간 필터 / 사용자별 집계
+        recent_since = (datetime.now() - timedelta(days=1)).isoformat()
+        assert log.count("admin", since=recent_since) == 0
+        assert log.count("admin", until=recent_since) == 1
+        assert log.counts_by_user("usage", limit=1)[0][1] == EVENTS_PER_SESSION * 4 // 5
+        assert sum(n for _, _, n in log.time_series(["search", "usage"], bucket="day")) == total
+
+        # 사용자/IP 통계도 시간 단위 - 30시간 전 이벤트는 "최근 24시간"에 들어가지 않음
+        log.log("late", "usage", "어제", ip="10.9.9.9",
+                timestamp=(datetime.now() - timedelta(hours=30)).isoformat())
+        log.flush()
+        assert log.unique_ips(["usage"], since=recent_since) == SESSIONS
+        assert "10.9.9.9" not in dict(log.counts_by_ip("usage", since=recent_since))
+        assert "late" not in dict(log.counts_by_user("usage", since=recent_since))
+        assert log.unique_ips(["usage"]) == SESSIONS + 1
+        assert log.unique_ips(["usage"], since=(datetime.now() - timedelta(hours=48)).isoformat()) == SESSIONS + 1
+        assert log.counts_by_user("usage", until=recent_since) == [("late", 1)]
+        print("periods: IP/user stats cut at the hour like count()")
+
+        # 보관 기간 지난 날짜는 JSON Lines로 이동 (하루 한 번 검사 → 다음 날로 간주)
+        log._last_rotation = None
+        log.log("user0", "usage", "회전 트리거")
+        log.flush()
+        archive = tmp / "archive" / f"activity_{old_day.date().isoformat()}.jsonl"
+        assert archive.exists() and not log.recent("admin")
+        assert log.count("admin") == 1  # 원본은 보관 파일로 옮겨도 집계는 유지
+        assert json.loads(archive.read_text(encoding='utf-8').splitlines()[0])["details"] == "관리자 로그인"
+        print(f"rotation: {log.stats['archived']} event(s) archived to {archive.name}")
+
+        # user_logs.json은 한 번만 가져옴 - 가져온 이벤트가 보관 파일로 옮겨진 뒤 다시 시작해도 중복 없음
+        legacy_path = tmp / "legacy_user_logs.json"
+        legacy_path.write_text(json.dumps(legacy, ensure_ascii=False), encoding='utf-8')
+        for start_no in range(3):
+            restarted = ActivityLog(tmp / "restarts.sqlite3", archive_dir=tmp / "restart_archive", retention_days=30)
+            # 가져오기 전에 이미 기록된 이벤트가 있어도 처음 한 번은 가져옴
+            restarted.log("user0", "usage", "회전 트리거")
+            restarted.flush()
+            assert restarted.import_legacy_file(str(legacy_path)) == (1 if start_no == 0 else 0)
+            assert restarted.count("admin") == 1
+        lines = (tmp / "restart_archive" / archive.name).read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 1
+        print("legacy import: imported once across 3 restarts, archive not duplicated")
+
+        # 집계 도입 전 DB (원본 이벤트만 있음) → 시간별/일별 집계를 한 번 채움
+        baseline_path = tmp / "baseline.sqlite3"
+        with sqlite3.connect(baseline_path) as conn:
+            conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, day TEXT NOT NULL,"
+                         " user_id TEXT, ip TEXT, activity TEXT NOT NULL, details TEXT)")
+            conn.executemany("INSERT INTO events (timestamp, day, user_id, ip, activity, details) VALUES (?, ?, ?, ?, ?, ?)",
+                             [("2026-01-01T09:00:00", "2026-01-01", "u", "2.2.2.2", "usage", ""),
+                              ("2026-01-02T15:30:00", "2026-01-02", "u", "1.1.1.1", "usage", "")])
+        backfilled = ActivityLog(baseline_path, archive_dir=tmp / "baseline_archive", retention_days=None)
+        assert backfilled.count("usage") == 2
+        assert sorted(backfilled.counts_by_ip("usage")) == [("1.1.1.1", 1), ("2.2.2.2", 1)]
+        assert backfilled.unique_ips(["usage"], since="2026-01-02T12:00:00") == 1
+        assert backfilled.unique_ips(["usage"], since="2026-01-02T16:00:00") == 0
+        print("backfill: aggregates built once from pre-aggregate events")
+
+        legacy_ms = legacy_log_seconds(tmp / "user_logs.json", existing=20_000) * 1000
+        print(f"legacy JSON rewrite at 20,000 entries: {legacy_ms:.1f}ms/event "
+              f"vs log() {enqueue_us / 1000:.3f}ms/event")
+
+    print("✅ Activity log test passed")
+
+
+if __name__ == "__main__":
+    test_activity_log()
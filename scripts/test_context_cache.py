@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+get_context 결과 캐시 테스트 스크립트 (오프라인)
+가짜 임베딩 + 임시 Chroma 스토어로 반복 질의 시 임베딩 호출 생략,
+공백만 다른 질의 적중, 벡터스토어 재로드 시 무효화, LRU/TTL 동작을 확인
+
+실행: python -m scripts.test_context_cache (프로젝트 루트에서)
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from langchain_core.documents import Document
+
+from rag.context_cache import ContextCache
+from rag.embedding_cache import CachedEmbeddings, EmbeddingCache
+from scripts.test_embedding_cache import FakeEmbeddings
+
+
+def test_context_cache_unit():
+    print("=== ContextCache Unit Test ===")
+
+    cache = ContextCache(max_entries=2, ttl_seconds=0.2)
+    cache.put("a", "폴더블  화면 ", 2, ["ctx-a"])
+    assert cache.get("a", "폴더블 화면", 2) == ["ctx-a"]   # 공백 정규화
+    assert cache.get("a", "폴더블 화면", 3) is None        # k가 다르면 미스
+
+    # LRU: "a"를 방금 조회했으므로 "b" 다음 "c"를 넣으면 "b"가 아닌 가장 오래된 항목 제거
+    cache.put("b", "q", 2, ["ctx-b"])
+    cache.get("a", "폴더블 화면", 2)
+    cache.put("c", "q", 2, ["ctx-c"])
+    assert cache.get("b", "q", 2) is None
+    assert cache.get("a", "폴더블 화면", 2) == ["ctx-a"]
+
+    # 페르소나 단위 무효화
+    assert cache.invalidate("a") == 1
+    assert cache.get("a", "폴더블 화면", 2) is None
+
+    # TTL 만료
+    time.sleep(0.25)
+    assert cache.get("c", "q", 2) is None
+
+    print(f"stats: {cache.stats()}")
+    print("✅ ContextCache unit test passed")
+
+
+def test_rag_manager_context_cache():
+    print("\n=== RAGManager get_context Cache Test ===")
+
+    os.environ.setdefault("OPENAI_API_KEY", "test")
+    from rag.rag_manager import RAGManager
+
+    persona = "customer_foldable_enthusiast"
+    chunks = [Document(page_content=f"폴더블 화면 리뷰 {i}") for i in range(5)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = RAGManager()
+        fake = FakeEmbeddings()
+        manager.embeddings = CachedEmbeddings(fake, EmbeddingCache(Path(tmp) / "cache.sqlite3"))
+        manager.vector_store_dir = Path(tmp) / "stores"
+        manager.vector_store_dir.mkdir()
+
+        manager.load_persona_knowledge(persona, chunks=chunks)
+
+        calls = fake.calls
+        first = manager.get_context(persona, "폴더블 화면 어때요?", k=2)
+        after_first = fake.calls
+        second = manager.get_context(persona, "  폴더블 화면   어때요? ", k=2)
+        assert second == first
+        assert fake.calls == after_first, "cached query must not be embedded again"
+        assert after_first > calls
+
+        # 벡터스토어 재로드 → 해당 페르소나 캐시 무효화 → 다시 검색
+        manager.load_persona_knowledge(persona, chunks=chunks)
+        manager.get_context(persona, "폴더블 화면 어때요?", k=2)
+        stats = manager.context_cache.stats()
+        print(f"stats: {stats}")
+        assert stats['hits'] == 1 and stats['misses'] == 2, stats
+
+        manager.embeddings.cache.close()
+
+    print("✅ RAGManager context cache test passed")
+
+
+if __name__ == "__main__":
+    test_context_cache_unit()
+    test_rag_manager_context_cache()
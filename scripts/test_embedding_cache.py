@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+임베딩 캐시 테스트 스크립트 (오프라인)
+결정적인 가짜 임베딩 함수로 캐시 적중/미스, LRU 제거를 검증
+
+실행: python -m scripts.test_embedding_cache (프로젝트 루트에서)
+"""
+
+import hashlib
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from rag.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class FakeEmbeddings(Embeddings):
+    """텍스트 해시로 시드한 결정적 임베딩 (API 호출 없음)"""
+
+    model = "fake-embedding"
+
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.calls = 0
+
+    def _embed(self, text):
+        seed = int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16)
+        return np.random.default_rng(seed).random(self.dim).tolist()
+
+    def embed_documents(self, texts):
+        self.calls += len(texts)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        return self._embed(text)
+
+
+def test_embedding_cache():
+    print("=== Embedding Cache Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fake = FakeEmbeddings()
+        cache = EmbeddingCache(Path(tmp) / "cache.sqlite3", max_entries=3)
+        embeddings = CachedEmbeddings(fake, cache)
+
+        chunks = ["폴더블 화면이 좋아요", "생태계 전환이 어려워요", "가성비가 중요해요"]
+
+        # 1) 최초 임베딩: 모두 미스
+        first = embeddings.embed_documents(chunks)
+        assert fake.calls == 3, fake.calls
+        print(f"first pass: {fake.calls} embedded, hits={cache.hits}, misses={cache.misses}")
+
+        # 2) 같은 청크 재임베딩: 모두 캐시 적중, 값은 float32 정밀도로 동일
+        second = embeddings.embed_documents(chunks)
+        assert fake.calls == 3, fake.calls
+        assert np.allclose(first, second, atol=1e-6)
+        print(f"second pass: {fake.calls} embedded, hits={cache.hits}, misses={cache.misses}")
+
+        # 3) 변경된 청크만 새로 임베딩
+        embeddings.embed_documents(chunks[:2] + ["가성비가 정말 중요해요"])
+        assert fake.calls == 4, fake.calls
+        print(f"changed chunk: {fake.calls} embedded")
+
+        # 4) LRU 제거: 최대 3개 유지, 가장 오래 안 쓰인 '가성비가 중요해요' 제거
+        assert len(cache) == 3, len(cache)
+        embeddings.embed_documents([chunks[2]])
+        assert fake.calls == 5, fake.calls
+        print(f"after eviction: {len(cache)} cached vectors")
+
+        # 5) 모델명이 다르면 별도 키
+        other = CachedEmbeddings(fake, cache, model_name="other-model")
+        other.embed_documents(chunks[:1])
+        assert fake.calls == 6, fake.calls
+
+        cache.close()
+
+    print("✅ Embedding cache test passed")
+
+
+if __name__ == "__main__":
+    test_embedding_cache()
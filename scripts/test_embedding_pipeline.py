@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+임베딩 파이프라인 테스트 스크립트 (오프라인)
+로컬 스텁 임베딩 서버(OpenAI /v1/embeddings 호환)를 띄워
+배치 구성, 동시 요청, 429 재시도, 직렬 대비 소요 시간을 확인
+
+실행: python -m scripts.test_embedding_pipeline (프로젝트 루트에서)
+"""
+
+import hashlib
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from openai import OpenAI
+
+from rag.embedding_cache import CachedEmbeddings, EmbeddingCache
+from rag.embedding_pipeline import EmbeddingPipeline
+
+LATENCY = 0.2          # 요청당 서버 지연(초)
+RATE_LIMIT_FIRST = 2   # 처음 N개 요청은 429 반환
+DIM = 8
+
+
+class StubEmbeddingHandler(BaseHTTPRequestHandler):
+    """OpenAI 임베딩 API 흉내 (결정적 벡터, 초기 429, 동시성 기록)"""
+
+    lock = threading.Lock()
+    requests = 0
+    in_flight = 0
+    max_in_flight = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        cls = type(self)
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+
+        with cls.lock:
+            cls.requests += 1
+            request_no = cls.requests
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+
+        try:
+            time.sleep(LATENCY)
+            if request_no <= RATE_LIMIT_FIRST:
+                self._send(429, {"error": {"message": "rate limited", "type": "rate_limit"}})
+                return
+
+            inputs = body['input'] if isinstance(body['input'], list) else [body['input']]
+            data = []
+            for i, text in enumerate(inputs):
+                digest = hashlib.sha256(text.encode('utf-8')).digest()
+                data.append({"object": "embedding", "index": i,
+                             "embedding": [b / 255 for b in digest[:DIM]]})
+            self._send(200, {"object": "list", "data": data, "model": body['model'],
+                             "usage": {"prompt_tokens": 0, "total_tokens": 0}})
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def _send(self, status, payload):
+        raw = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+class StubServerEmbeddings(Embeddings):
+    """스텁 서버를 호출하는 임베딩 (SDK 자체 재시도는 끄고 파이프라인이 재시도)"""
+
+    model = "stub-embedding"
+
+    def __init__(self, base_url):
+        self.client = OpenAI(base_url=base_url, api_key="test", max_retries=0)
+
+    def embed_documents(self, texts):
+        response = self.client.embeddings.create(model=self.model, input=texts)
+        return [item.embedding for item in response.data]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_embedding_pipeline():
+    print("=== Embedding Pipeline Test ===")
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubEmbeddingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    # 페르소나 7개 x 청크 40개 (일부 청크는 페르소나 간 중복)
+    chunks_by_persona = {
+        f"persona_{p}": [Document(page_content=f"리뷰 {p}-{i} 폴더블 화면 생태계 가격") for i in range(40)]
+        + [Document(page_content="공통 리뷰 텍스트")]
+        for p in range(7)
+    }
+    total_unique = 7 * 40 + 1
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = EmbeddingCache(Path(tmp) / "cache.sqlite3")
+            embeddings = CachedEmbeddings(StubServerEmbeddings(base_url), cache)
+            pipeline = EmbeddingPipeline(
+                embeddings,
+                max_batch_texts=20,
+                requests_per_minute=600,
+                max_workers=8,
+                base_backoff=0.05,
+            )
+
+            start = time.perf_counter()
+            stats = pipeline.prefetch_personas(chunks_by_persona)
+            elapsed = time.perf_counter() - start
+
+            serial_estimate = stats['batches'] * LATENCY
+            print(f"stats: {stats}")
+            print(f"server requests: {StubEmbeddingHandler.requests}, "
+                  f"max concurrent: {StubEmbeddingHandler.max_in_flight}")
+            print(f"elapsed: {elapsed:.2f}s (serial estimate {serial_estimate:.2f}s)")
+
+            assert stats['embedded'] == total_unique, stats
+            assert stats['batches'] == -(-total_unique // 20), stats
+            assert stats['retries'] >= RATE_LIMIT_FIRST, stats
+            assert StubEmbeddingHandler.max_in_flight > 1
+            assert len(cache) == total_unique
+
+            # 두 번째 실행은 전부 캐시 적중 → 서버 요청 없음
+            requests_before = StubEmbeddingHandler.requests
+            stats = EmbeddingPipeline(embeddings).prefetch_personas(chunks_by_persona)
+            assert stats['embedded'] == 0 and stats['cached'] == total_unique, stats
+            assert StubEmbeddingHandler.requests == requests_before
+            print("second run: all chunks served from cache")
+
+            cache.close()
+    finally:
+        server.shutdown()
+
+    print("✅ Embedding pipeline test passed")
+
+
+if __name__ == "__main__":
+    test_embedding_pipeline()
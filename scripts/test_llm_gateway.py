@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLM 게이트웨이 테스트 스크립트 (오프라인)
+로컬 스텁 서버(OpenAI /v1/chat/completions 호환)로
+커넥션 재사용(keep-alive), 429 재시도, 모델별 동시 요청 제한을 확인
+
+실행: python -m scripts.test_llm_gateway (프로젝트 루트에서)
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from llm_gateway import LLMGateway
+
+LATENCY = 0.1
+RATE_LIMIT_FIRST = 2   # 처음 N개 요청은 429 반환
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """chat.completions 흉내 (연결별 포트, 모델별 동시성 기록)"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    lock = threading.Lock()
+    requests = 0
+    client_ports = set()
+    in_flight = {}
+    max_in_flight = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        cls = type(self)
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        model = body['model']
+
+        with cls.lock:
+            cls.requests += 1
+            request_no = cls.requests
+            cls.client_ports.add(self.client_address[1])
+            cls.in_flight[model] = cls.in_flight.get(model, 0) + 1
+            cls.max_in_flight[model] = max(cls.max_in_flight.get(model, 0), cls.in_flight[model])
+
+        try:
+            time.sleep(LATENCY)
+            if request_no <= RATE_LIMIT_FIRST:
+                self._send(429, {"error": {"message": "rate limited", "type": "rate_limit"}},
+                           {"Retry-After": "0.05"})
+                return
+            self._send(200, {
+                "id": f"chatcmpl-{request_no}", "object": "chat.completion", "created": 0, "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": f"응답 {request_no}"}}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            })
+        finally:
+            with cls.lock:
+                cls.in_flight[model] -= 1
+
+    def _send(self, status, payload, headers=None):
+        raw = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+def test_llm_gateway():
+    print("=== LLM Gateway Test ===")
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    gateway = LLMGateway(api_key="test", default_concurrency=4, model_concurrency={"gpt-4": 2},
+                         base_backoff=0.05)
+
+    try:
+        # 동기 클라이언트: 순차 요청 10회는 연결 1개를 재사용
+        client = gateway.openai_client().with_options(base_url=base_url)
+        for i in range(10):
+            response = client.chat.completions.create(
+                model="gpt-4o-mini", messages=[{"role": "user", "content": f"질문 {i}"}])
+            assert response.choices[0].message.content.startswith("응답")
+        sync_ports = len(StubChatHandler.client_ports)
+        print(f"sync: 10 requests over {sync_ports} connection(s), retries {gateway.stats['retries']}")
+        assert gateway.stats['retries'] == RATE_LIMIT_FIRST
+        assert sync_ports == 1
+
+        # 비동기 클라이언트: 모델별 동시 요청 제한
+        async def fan_out():
+            async_client = gateway.async_openai_client().with_options(base_url=base_url)
+            calls = [
+                async_client.chat.completions.create(
+                    model=model, messages=[{"role": "user", "content": "동시 질문"}])
+                for model in ["gpt-4"] * 6 + ["gpt-4o-mini"] * 8
+            ]
+            start = time.perf_counter()
+            await asyncio.gather(*calls)
+            return time.perf_counter() - start
+
+        elapsed = asyncio.run(fan_out())
+        print(f"async: 14 requests in {elapsed:.2f}s, max in flight {StubChatHandler.max_in_flight}")
+        assert StubChatHandler.max_in_flight["gpt-4"] <= 2
+        assert StubChatHandler.max_in_flight["gpt-4o-mini"] <= 4
+        assert StubChatHandler.max_in_flight["gpt-4o-mini"] > 1
+    finally:
+        server.shutdown()
+
+    print("✅ LLM gateway test passed")
+
+
+if __name__ == "__main__":
+    test_llm_gateway()
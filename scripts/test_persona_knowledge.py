@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공유 지식 서비스 테스트 스크립트 (오프라인, 임시 폴더 사용)
+세션(ChatbotManager)을 여러 개 만들어도 클러스터 지식 베이스는 프로세스에서 한 번만 구축되는지,
+세션끼리 대화 기록이 섞이지 않는지, 세션 생성 시간/메모리가 지식 베이스 크기와 무관한지 확인
+
+실행: python -m scripts.test_persona_knowledge (프로젝트 루트에서)
+"""
+
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")  # 클라이언트 생성만 (요청 없음)
+
+import persona_chatbot_rag
+from cluster_chatbots import ChatbotManager
+from persona_chatbot_rag import PersonaKnowledge, clear_persona_knowledge, get_persona_knowledge
+
+CHANNELS_PER_CLUSTER = 4
+FILES_PER_CHANNEL = 40
+SESSIONS = 50
+WORDS = ["루틴", "뷰티", "요리", "여행", "패션", "추천", "브이로그", "카페", "운동", "홈데코", "독서", "사진"]
+
+
+def make_data(root, rng):
+    """persona_clusters.csv + youtube_data/<channel>/*.txt (STT 형식)"""
+    rows = ["channel_id,channel_name,cluster"]
+    for cluster in range(5):
+        for c in range(CHANNELS_PER_CLUSTER):
+            channel_id = f"UC{cluster}{c:03d}"
+            rows.append(f"{channel_id},채널{cluster}-{c},{cluster}")
+            channel_dir = root / "youtube_data" / channel_id
+            channel_dir.mkdir(parents=True)
+            for f in range(FILES_PER_CHANNEL):
+                lines = [f"제목: {rng.choice(WORDS)} 영상 {f}", ""]
+                lines += [f"[00:{s:02d}] " + " ".join(rng.choices(WORDS, k=12)) for s in range(60)]
+                (channel_dir / f"video_{f}.txt").write_text("\n".join(lines), encoding='utf-8')
+    (root / "persona_clusters.csv").write_text("\n".join(rows), encoding='utf-8')
+
+
+def test_persona_knowledge():
+    print("=== Persona Knowledge Test ===")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            make_data(Path(tmp), random.Random(0))
+
+            builds = []
+            original_build = PersonaKnowledge.build_knowledge_base
+
+            def counting_build(self):
+                builds.append(self.cluster_id)
+                return original_build(self)
+
+            PersonaKnowledge.build_knowledge_base = counting_build
+            try:
+                # 동시에 들어온 첫 세션들도 클러스터당 한 번만 구축
+                clear_persona_knowledge()
+                threads = [threading.Thread(target=get_persona_knowledge, args=(0,)) for _ in range(8)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+                assert builds == [0]
+
+                tracemalloc.start()
+                start = time.perf_counter()
+                first = ChatbotManager()
+                first_ms = (time.perf_counter() - start) * 1000
+                knowledge_bytes = tracemalloc.get_traced_memory()[0]
+
+                start = time.perf_counter()
+                sessions = [ChatbotManager() for _ in range(SESSIONS)]
+                session_ms = (time.perf_counter() - start) * 1000 / SESSIONS
+                session_bytes = (tracemalloc.get_traced_memory()[0] - knowledge_bytes) / SESSIONS
+                tracemalloc.stop()
+            finally:
+                PersonaKnowledge.build_knowledge_base = original_build
+
+            assert sorted(builds) == [0, 1, 2, 3, 4]
+            print(f"first session (builds clusters 1-4): {first_ms:.0f}ms, "
+                  f"later sessions: {session_ms:.2f}ms each ({len(builds)} builds total)")
+            print(f"memory: shared knowledge (clusters 1-4) ~{knowledge_bytes / 2**20:.1f}MB, "
+                  f"per session ~{session_bytes / 1024:.0f}KB")
+            assert session_ms * 20 < first_ms
+            assert session_bytes * 20 < knowledge_bytes
+
+            # 지식은 같은 객체를 공유하고 대화 기록은 세션별
+            a, b = first.select_chatbot(2), sessions[0].select_chatbot(2)
+            assert a.knowledge is b.knowledge and a.knowledge_base is b.knowledge_base
+            assert a.get_static_prompt() == b.get_static_prompt()
+            assert a.retrieve_relevant_content("요리 루틴") == b.retrieve_relevant_content("요리 루틴")
+            a.memory.add("user", "세션 A 질문")
+            assert a.conversation_history and not b.conversation_history
+            first.reset_conversations()
+            assert not a.conversation_history
+            print(f"sessions share knowledge ({a.get_knowledge_stats()['total_transcripts']} transcripts "
+                  f"for {a.persona['name']}), conversation state stays per session")
+
+            assert persona_chatbot_rag._persona_knowledge[2] is a.knowledge
+        finally:
+            os.chdir(cwd)
+
+    print("✅ Persona knowledge test passed")
+
+
+if __name__ == "__main__":
+    test_persona_knowledge()
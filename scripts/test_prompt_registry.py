@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+프롬프트 레지스트리 테스트 스크립트 (오프라인)
+같은 페르소나 버전은 한 번만 컴파일되는지, 페르소나가 바뀌면 다시 만드는지,
+턴이 이어져도 요청 앞부분(정적 프롬프트 + 이전 대화)이 그대로인지 확인
+
+실행: python -m scripts.test_prompt_registry (프로젝트 루트에서)
+"""
+
+from prompt_registry import PromptRegistry, compose_messages
+
+
+def test_prompt_registry():
+    print("=== Prompt Registry Test ===")
+
+    registry = PromptRegistry()
+    persona = {"name": "Emma", "tone": "친근한", "interests": ["요리", "패션"]}
+    builds = []
+
+    def builder():
+        builds.append(1)
+        return f"당신은 {persona['name']}입니다. 말투: {persona['tone']}\n" * 10
+
+    # 인스턴스 5개가 같은 페르소나로 조회해도 컴파일은 1회
+    prompts = [registry.compile("persona_chatbot.0", persona, builder) for _ in range(5)]
+    assert len(builds) == 1 and len(set(prompts)) == 1
+
+    # 페르소나 정의가 바뀌면 새 버전으로 다시 컴파일
+    old_version = registry.get("persona_chatbot.0").version
+    persona = dict(persona, tone="차분한")
+    registry.compile("persona_chatbot.0", persona, builder)
+    assert len(builds) == 2
+    assert registry.get("persona_chatbot.0").version != old_version
+
+    stats = registry.stats()
+    print(f"stats: {stats['count']} prompt(s), {stats['total_tokens']} tokens, "
+          f"builds {stats['builds']}, hits {stats['hits']}")
+    assert stats['builds'] == 2 and stats['prompts']['persona_chatbot.0']['tokens'] > 0
+
+    # 턴마다 컨텍스트가 달라도 이전 요청 전체가 다음 요청의 앞부분으로 유지 (컨텍스트 제외)
+    system_prompt = registry.get("persona_chatbot.0").text
+    history = [{"role": "user", "content": "첫 질문"}]
+    first = compose_messages(system_prompt, history, "## 관련 콘텐츠 참고:\n1. A")
+    history += [{"role": "assistant", "content": "첫 답변"}, {"role": "user", "content": "두 번째 질문"}]
+    second = compose_messages(system_prompt, history, "## 관련 콘텐츠 참고:\n1. B")
+
+    assert first[0] == second[0] == {"role": "system", "content": system_prompt}
+    assert first[-1] == second[1]  # 이전 질문은 컨텍스트 없이 그대로 이어짐
+    assert second[-2]["content"].endswith("1. B") and second[-1]["content"] == "두 번째 질문"
+    print(f"layout: {[m['role'] for m in second]}")
+
+    print("✅ Prompt registry test passed")
+
+
+if __name__ == "__main__":
+    test_prompt_registry()
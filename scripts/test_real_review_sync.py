@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RealReviewRAGManager 증분 동기화 테스트 스크립트 (오프라인, 임시 폴더 사용)
+가짜 임베딩 + 임시 Chroma 스토어로 실행(프로세스)마다 리뷰 파일을 바꿔 가며
+  - 신규/변경/삭제 리뷰만 스토어에 반영되는지
+  - 리뷰가 모두 사라진 페르소나의 스토어가 비워지는지
+  - 스토어 디렉터리만 지우고 manifest가 남은 경우 다시 구축되는지
+확인
+
+실행: python -m scripts.test_real_review_sync (프로젝트 루트에서)
+"""
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+FOLDABLE = "foldable_enthusiast"
+VALUE = "value_seeker"
+
+
+def foldable_review(review_id, text):
+    return {"id": review_id, "review": text, "author": "user", "sentiment": "positive",
+            "conversion_direction": "iPhone_to_Galaxy", "conversion_level": "completed"}
+
+
+def value_review(review_id, text):
+    return {"id": review_id, "review": text, "author": "user", "sentiment": "neutral",
+            "conversion_direction": "iPhone_to_iPhone", "conversion_level": "completed"}
+
+
+def run_sync(tmp):
+    """새 프로세스에서 관리자를 만들어 전체 동기화 후 스토어 상태 반환"""
+    os.environ.setdefault("OPENAI_API_KEY", "test")
+    from langchain_community.vectorstores import Chroma
+
+    from rag.embedding_cache import CachedEmbeddings, EmbeddingCache
+    from rag.real_review_rag_manager import RealReviewRAGManager
+    from scripts.test_embedding_cache import FakeEmbeddings
+
+    manager = RealReviewRAGManager()
+    manager.embeddings = CachedEmbeddings(FakeEmbeddings(), EmbeddingCache(Path(tmp) / "cache.sqlite3"))
+    manager.data_dir = Path(tmp) / "data"
+    manager.vector_store_dir = Path(tmp) / "stores"
+    manager.vector_store_dir.mkdir(exist_ok=True)
+    manager.load_all_personas_real_reviews()
+
+    state = {'retrievers': sorted(manager.retrievers)}
+    for persona in (FOLDABLE, VALUE):
+        store = Chroma(persist_directory=str(manager.vector_store_dir / persona),
+                       embedding_function=manager.embeddings)
+        stored = store.get()
+        state[persona] = dict(zip(stored['ids'], stored['documents']))
+    retriever = manager.retrievers.get(FOLDABLE)
+    state['hits'] = [doc.page_content for doc in retriever.invoke("폴드 화면")] if retriever else []
+    manager.embeddings.cache.close()
+    return state
+
+
+def sync_in_new_process(tmp, iphone_reviews, galaxy_reviews):
+    review_file = Path(tmp) / "data" / "structured_reviews_test.json"
+    review_file.write_text(json.dumps({"iphone_reviews": iphone_reviews, "galaxy_reviews": galaxy_reviews},
+                                      ensure_ascii=False), encoding='utf-8')
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(run_sync, (tmp,))
+
+
+def test_real_review_sync():
+    print("=== RealReviewRAGManager Incremental Sync Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "data").mkdir()
+        foldable = [foldable_review(f"r{i}", f"폴드 화면이 좋아요 {i}") for i in range(1, 6)]
+        value = [value_review("v1", "가격 대비 만족"), value_review("v2", "가격이 괜찮아요")]
+
+        # 1) 처음 구축
+        state = sync_in_new_process(tmp, value, foldable)
+        assert sorted(state[FOLDABLE]) == [f"{FOLDABLE}:r{i}:0" for i in range(1, 6)]
+        assert len(state[VALUE]) == 2 and state['retrievers'] == [FOLDABLE, VALUE]
+        print(f"build: {len(state[FOLDABLE])} + {len(state[VALUE])} chunks")
+
+        # 2) r2 변경, r5 삭제, r6 추가 → 해당 청크만 반영
+        foldable = foldable[:4] + [foldable_review("r6", "폴드 새로 샀어요")]
+        foldable[1] = foldable_review("r2", "폴드 힌지가 단단해요")
+        state = sync_in_new_process(tmp, value, foldable)
+        assert sorted(state[FOLDABLE]) == [f"{FOLDABLE}:r{i}:0" for i in (1, 2, 3, 4, 6)]
+        assert "힌지" in state[FOLDABLE][f"{FOLDABLE}:r2:0"]
+        print("add/change/delete: r6 added, r2 replaced, r5 removed")
+
+        # 3) value_seeker 리뷰가 모두 사라짐 → 스토어 비우고 retriever 제외
+        state = sync_in_new_process(tmp, [], foldable)
+        assert state[VALUE] == {} and state['retrievers'] == [FOLDABLE]
+        print("emptied persona: store cleared")
+
+        # 4) 스토어 디렉터리만 삭제 (manifest는 남음) → 다시 구축되어 검색 가능
+        shutil.rmtree(Path(tmp) / "stores" / FOLDABLE)
+        state = sync_in_new_process(tmp, [], foldable)
+        assert len(state[FOLDABLE]) == 5 and len(state['hits']) == 5, state
+        print(f"wiped store: rebuilt {len(state[FOLDABLE])} chunks, retriever returns {len(state['hits'])} hits")
+
+    print("✅ RealReviewRAGManager incremental sync test passed")
+
+
+if __name__ == "__main__":
+    test_real_review_sync()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+수집 파이프라인 장애 처리 테스트 스크립트 (오프라인, 임시 폴더 사용)
+  - 전사 프로세스 하나가 죽어(BrokenProcessPool) 풀이 망가져도 run()이 끝나고 모든 항목이 저장되는지
+  - 전사 서비스 submit이 예외를 던져도 해당 항목만 실패로 저장되는지
+확인 (멈추면 제한 시간 초과로 실패)
+
+실행: python -m scripts.test_scrape_pipeline (프로젝트 루트에서)
+"""
+
+import os
+import tempfile
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+from scrape_pipeline import TranscriptionPipeline
+
+ITEMS = 12
+TIMEOUT = 60
+
+
+def crashing_transcribe(audio_path):
+    """crash가 들어간 파일이면 전사 프로세스를 바로 종료 (메모리 부족 강제 종료 흉내)"""
+    if 'crash' in os.path.basename(audio_path):
+        os._exit(1)
+    return Path(audio_path).read_text()
+
+
+class FlakyTranscriber:
+    """세 번째 submit부터 예외 (종료된 전사 서비스 흉내)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def submit(self, audio_path):
+        self.calls += 1
+        if self.calls >= 3:
+            raise RuntimeError("전사 서비스가 종료되었습니다")
+        future = Future()
+        future.set_result((0.0, Path(audio_path).read_text()))
+        return future
+
+
+def run_with_timeout(pipeline, items):
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.update(stats=pipeline.run(items)), daemon=True)
+    thread.start()
+    thread.join(TIMEOUT)
+    assert not thread.is_alive(), "pipeline.run() did not finish"
+    return outcome['stats']
+
+
+def make_pipeline(tmp, saved, **options):
+    def fetch(i):
+        path = Path(tmp) / (f"crash_{i}.txt" if i == 3 else f"audio_{i}.txt")
+        path.write_text(f"text {i}")
+        return {'id': i}, str(path)
+
+    return TranscriptionPipeline(
+        fetch=fetch,
+        save=lambda record, result: saved.__setitem__(record['id'], result),
+        download_workers=2, queue_size=2, **options,
+    )
+
+
+def test_scrape_pipeline():
+    print("=== Scrape Pipeline Failure Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 전사 프로세스가 죽으면 풀 전체가 BrokenProcessPool - 남은 항목은 실패로 저장되고 run()은 끝남
+        saved = {}
+        stats = run_with_timeout(make_pipeline(tmp, saved, transcribe=crashing_transcribe, transcribe_workers=2),
+                                 range(ITEMS))
+        assert sorted(saved) == list(range(ITEMS)) and saved[3] is None
+        assert stats['transcribe']['items'] == ITEMS and stats['transcribe']['failed'] >= 1
+        assert stats['write']['items'] == ITEMS and not list(Path(tmp).iterdir())
+        print(f"worker crash: {ITEMS} items saved, {stats['transcribe']['failed']} failed transcriptions")
+
+        # 전사 서비스 submit 예외 - 해당 항목만 실패, 나머지는 계속
+        saved = {}
+        stats = run_with_timeout(make_pipeline(tmp, saved, transcriber=FlakyTranscriber(), transcribe_workers=1),
+                                 range(ITEMS))
+        assert sorted(saved) == list(range(ITEMS))
+        assert sum(result is not None for result in saved.values()) == 2
+        assert stats['transcribe']['failed'] == ITEMS - 2 and not list(Path(tmp).iterdir())
+        print(f"submit errors: {ITEMS} items saved, {stats['transcribe']['failed']} failed transcriptions")
+
+    print("✅ Scrape pipeline failure test passed")
+
+
+if __name__ == "__main__":
+    test_scrape_pipeline()
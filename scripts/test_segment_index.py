@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+세그먼트 색인 테스트 스크립트 (오프라인, 임시 폴더 사용)
+한국어/영어 단어 검색(조사 포함), 구문 검색, AND/OR 결과와 매칭 수, 세그먼트 위치/시각,
+저장된 색인 재사용과 코퍼스 변경 시 재색인을 확인하고 기존 방식(영상마다 문자열 스캔)과 검색 시간을 비교
+
+실행: python -m scripts.test_segment_index (프로젝트 루트에서)
+"""
+
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import segment_index
+from segment_index import SegmentIndex, load_segment_index, parse_query
+from video_corpus import load_corpus
+
+WORDS = ["아이폰", "갤럭시", "배터리가", "카메라는", "케이스", "충전", "화면이", "iPhone", "Case", "battery", "좋아요", "별로"]
+FILLER = [f"일반{n}" for n in range(3000)]
+
+
+def write_video(data_dir, channel_id, video_id, texts):
+    channel_dir = data_dir / channel_id
+    channel_dir.mkdir(parents=True, exist_ok=True)
+    video = {
+        "metadata": {"video_id": video_id, "title": f"영상 {video_id}"},
+        "transcript": [{"text": text, "start": i * 2.5, "duration": 2.5} for i, text in enumerate(texts)],
+        "transcript_type": "manual",
+    }
+    (channel_dir / f"{video_id}.json").write_text(json.dumps(video, ensure_ascii=False), encoding='utf-8')
+
+
+def legacy_search(videos, keyword):
+    """기존 방식: 영상 전체 텍스트 → 세그먼트 재스캔"""
+    keyword_lower = keyword.lower()
+    results = {}
+    for video_id, segments in videos.items():
+        if keyword_lower in " ".join(segments).lower():
+            results[video_id] = [i for i, text in enumerate(segments) if keyword_lower in text.lower()]
+    return results
+
+
+def test_segment_index():
+    print("=== Segment Index Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        data_dir, corpus_dir = tmp / "youtube_data", tmp / "video_corpus"
+        write_video(data_dir, "UC1", "a", ["아이폰 배터리가 빨리 닳아요", "배터리 수명은 괜찮아요", "iPhone battery life"])
+        write_video(data_dir, "UC1", "b", ["갤럭시 배터리 수명 최고", "케이스 추천"])
+        write_video(data_dir, "UC2", "c", ["수명 배터리", "Battery BATTERY battery"])
+
+        index = load_segment_index(data_dir, corpus_dir)
+        corpus = load_corpus(data_dir, corpus_dir)
+        assert len(index) == 7
+
+        # 단어: 대소문자 무시 + 부분 일치(조사, 합성어), 매칭 수는 등장 횟수
+        hits = index.search(["배터리"])
+        assert set(hits) == {"a", "b", "c"}
+        assert hits["a"]["match_count"] == 2 and hits["a"]["segments"] == [0, 1]
+        assert index.search(["battery"])["c"]["match_count"] == 3
+        assert set(index.search(["폰"])) == {"a"} and set(index.search(["터리"])) == {"a", "b", "c"}
+
+        # 구문: 연속된 단어만 ('수명 배터리'는 순서가 달라 제외)
+        hits = index.search(["배터리 수명"])
+        assert set(hits) == {"a", "b"} and index.search(parse_query('"배터리 수명"')) == hits
+        row = hits["b"]["segments"][0]
+        assert index.segment_info(row) == ("b", 0, 0.0, 2.5)
+        assert corpus.segments_at([row])[0]["text"] == "갤럭시 배터리 수명 최고"
+
+        # AND / OR (영상 단위)
+        assert set(index.search(["아이폰", "케이스"], mode='OR')) == {"a", "b"}
+        assert set(index.search(["배터리", "케이스"], mode='AND')) == {"b"}
+        assert index.search("갤럭시 케이스", mode='AND')["b"]["keyword_counts"] == {"갤럭시": 1, "케이스": 1}
+        print(f"queries: {len(index.postings)} terms over {len(index)} segments")
+
+        # 저장된 색인은 다시 만들지 않고 로드, 코퍼스가 바뀌면 재색인
+        segment_index._indexes.clear()
+        original_build = SegmentIndex.build
+        SegmentIndex.build = classmethod(lambda cls, corpus: (_ for _ in ()).throw(AssertionError("rebuilt")))
+        try:
+            assert set(load_segment_index(data_dir, corpus_dir).search(["케이스"])) == {"b"}
+        finally:
+            SegmentIndex.build = original_build
+        write_video(data_dir, "UC2", "d", ["새 케이스 리뷰"])
+        assert set(load_segment_index(data_dir, corpus_dir).search(["케이스"])) == {"b", "d"}
+        # 증분 수집은 새 세대 파일로 기록 (열려 있던 코퍼스는 교체되지 않고 계속 읽힘)
+        assert corpus.segments_for("b")[1]["text"] == "케이스 추천"
+        assert load_corpus(data_dir, corpus_dir).generation == corpus.generation + 1
+        assert len(list(corpus_dir.glob("*.arrow"))) == 2
+        print("persistence: reused saved index, re-indexed after corpus change")
+
+        # 기존 방식과 같은 결과 + 검색 시간 비교 (영상 2,000개 x 세그먼트 200개)
+        rng = random.Random(0)
+        def segment_text():
+            return " ".join(rng.choice(WORDS) if rng.random() < 0.003 else rng.choice(FILLER) for _ in range(8))
+
+        videos = {f"v{v:05d}": [segment_text() for _ in range(200)] for v in range(2000)}
+        for video_id, texts in videos.items():
+            write_video(data_dir, f"UC{int(video_id[1:]) % 10}", video_id, texts)
+        start = time.perf_counter()
+        index = load_segment_index(data_dir, corpus_dir)
+        build_s = time.perf_counter() - start
+        corpus = load_corpus(data_dir, corpus_dir)
+        for video_id in "abcd":
+            videos[video_id] = [seg["text"] for seg in corpus.segments_for(video_id)]
+
+        keywords = ["별로", "iphone", "카메라", "폰"]
+        start = time.perf_counter()
+        legacy = {k: legacy_search(videos, k) for k in keywords}
+        legacy_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        indexed = {k: index.search([k]) for k in keywords}
+        index_ms = (time.perf_counter() - start) * 1000
+        for k in keywords:
+            assert set(legacy[k]) == set(indexed[k]), k
+            for video_id, hit in indexed[k].items():
+                offset = index.segment_offset[index.video_ids.index(video_id)]
+                assert [row - offset for row in hit["segments"]] == legacy[k][video_id]
+
+        start = time.perf_counter()
+        union = set(index.search(keywords, mode='OR'))
+        or_ms = (time.perf_counter() - start) * 1000
+        assert union == set().union(*(legacy[k] for k in keywords))
+        print(f"index build + save: {build_s:.2f}s for {len(index):,} segments")
+        print(f"search {len(keywords)} keywords: legacy scan {legacy_ms:.1f}ms vs index {index_ms:.1f}ms "
+              f"({legacy_ms / index_ms:.0f}x), OR query {or_ms:.1f}ms")
+
+    print("✅ Segment index test passed")
+
+
+if __name__ == "__main__":
+    test_segment_index()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+검색 백엔드 ANN 인덱스 저장/재사용 테스트 스크립트 (오프라인, 임시 폴더 사용)
+가짜 임베딩 + 임시 Chroma 스토어로
+  - 처음 로드 때 만든 IVF 인덱스가 저장되고, 청크가 그대로면 다시 만들지 않고 읽어 오는지
+  - 청크 본문이 바뀌면(같은 id) 인덱스를 다시 만드는지
+  - 저장된 인덱스의 검색 결과가 새로 만든 인덱스와 같은지
+확인
+
+실행: python -m scripts.test_vector_backends (프로젝트 루트에서)
+"""
+
+import tempfile
+from pathlib import Path
+
+from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
+
+from rag.vector_backends import IVFBackend, build_retriever
+from scripts.test_embedding_cache import FakeEmbeddings
+
+CHUNKS = 400
+
+
+def counting_builds():
+    """IVFBackend.build 호출 횟수를 세도록 감싸기 (원래 함수 복원용으로 함께 반환)"""
+    original = IVFBackend.build
+    calls = []
+
+    def build(self, vectors):
+        calls.append(len(vectors))
+        return original(self, vectors)
+
+    IVFBackend.build = build
+    return calls, original
+
+
+def test_vector_backends():
+    print("=== Vector Backend Persistence Test ===")
+
+    embeddings = FakeEmbeddings(dim=16)
+    calls, original = counting_builds()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = Chroma.from_documents(
+                documents=[Document(page_content=f"리뷰 {i}", metadata={'n': i}) for i in range(CHUNKS)],
+                embedding=embeddings, ids=[f"c{i}" for i in range(CHUNKS)],
+                persist_directory=str(Path(tmp) / "store"),
+            )
+            index_path = Path(tmp) / "persona.ann.pkl"
+
+            # 1) 처음: 생성 후 저장
+            retriever, name = build_retriever(store, embeddings, k=5, backend='ivf', index_path=index_path)
+            assert name == 'ivf' and calls == [CHUNKS] and index_path.exists()
+            expected = [doc.metadata['n'] for doc in retriever.invoke("리뷰 7")]
+            print(f"first load: built ivf over {CHUNKS} chunks, saved {index_path.stat().st_size} bytes")
+
+            # 2) 청크 그대로: 저장된 인덱스 로드, 결과 동일
+            retriever, _ = build_retriever(store, embeddings, k=5, backend='ivf', index_path=index_path)
+            assert calls == [CHUNKS], calls
+            assert [doc.metadata['n'] for doc in retriever.invoke("리뷰 7")] == expected
+            print("reload: reused saved index, same results")
+
+            # 3) 같은 id의 본문 변경 → 다시 생성
+            store.update_document("c3", Document(page_content="바뀐 리뷰", metadata={'n': 3}))
+            retriever, _ = build_retriever(store, embeddings, k=5, backend='ivf', index_path=index_path)
+            assert calls == [CHUNKS, CHUNKS], calls
+            assert retriever.invoke("바뀐 리뷰")[0].metadata['n'] == 3
+            print("changed chunk: index rebuilt")
+
+            # 4) exact는 저장하지 않음
+            index_path.unlink()
+            _, name = build_retriever(store, embeddings, k=5, backend='exact', index_path=index_path)
+            assert name == 'exact' and not index_path.exists()
+            print("exact backend: nothing persisted")
+    finally:
+        IVFBackend.build = original
+
+    print("✅ Vector backend persistence test passed")
+
+
+if __name__ == "__main__":
+    test_vector_backends()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공유 Whisper 전사 서비스 테스트 스크립트 (오프라인, 임시 폴더 사용)
+스텁 모델(로드 지연 + 모델 호출당 고정 비용, 톤 구간을 세그먼트로 인식)과 WAV 픽스처로
+  - 스크래퍼(채널)가 여러 개여도 모델 크기별로 한 번만 로드되는지
+  - 짧은 클립을 묶어 모델 호출 수가 줄고, 클립별 세그먼트 시각이 단독 전사와 같은지
+  - 파이프라인(scrape_pipeline)에서 전사 서비스를 쓸 수 있는지
+  - 전사 프로세스가 죽으면 대기 작업이 실패로 끝나고 다음 get_whisper_service가 새 서비스를 띄우는지
+  - 작업자 여러 개 중 하나가 죽으면 그 작업자의 작업만 실패하고 나머지는 계속 처리되는지
+  - 청크 전사에서 읽을 수 없는 오디오가 submit 예외가 아닌 실패 결과로 돌아오는지
+확인하고 채널마다 모델을 새로 로드하던 방식과 시간을 비교
+
+실행: python -m scripts.test_whisper_service (프로젝트 루트에서)
+"""
+
+import os
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+import whisper_service
+from scrape_pipeline import TranscriptionPipeline
+from whisper_service import SAMPLE_RATE, WhisperService, get_whisper_service, shutdown_whisper_services
+
+LOAD_SECONDS = 1.0
+CALL_SECONDS = 0.3
+CHANNELS = 3
+CLIPS = 8
+
+
+class StubModel:
+    """톤이 있는 구간마다 세그먼트 하나 (텍스트는 주파수)"""
+
+    def transcribe(self, audio, language=None, fp16=False):
+        time.sleep(CALL_SECONDS)
+        frame = SAMPLE_RATE // 50
+        frames = audio[:len(audio) // frame * frame].reshape(-1, frame)
+        loud = np.sqrt((frames ** 2).mean(axis=1)) > 0.05
+
+        segments, start = [], None
+        for i, is_loud in enumerate(np.append(loud, False)):
+            if is_loud and start is None:
+                start = i
+            elif not is_loud and start is not None:
+                tone = audio[start * frame:i * frame]
+                freq = np.argmax(np.abs(np.fft.rfft(tone))) * SAMPLE_RATE / len(tone)
+                segments.append({'start': start / 50, 'end': i / 50, 'text': f"{round(freq, -1):.0f}Hz"})
+                start = None
+        return {'segments': segments}
+
+
+def load_stub_model(model_size, device):
+    time.sleep(LOAD_SECONDS)
+    return StubModel()
+
+
+def load_wav(audio_path):
+    with wave.open(audio_path, 'rb') as f:
+        return np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16).astype(np.float32) / 32768
+
+
+def load_wav_or_crash(audio_path):
+    """파일 이름에 crash가 있으면 전사 프로세스를 바로 종료 (메모리 부족 강제 종료 흉내)"""
+    if 'crash' in os.path.basename(audio_path):
+        os._exit(1)
+    return load_wav(audio_path)
+
+
+def write_clip(path, parts):
+    """parts: [(무음 초, 톤 주파수, 톤 초), ...]"""
+    audio = []
+    for silence, freq, seconds in parts:
+        audio.append(np.zeros(int(silence * SAMPLE_RATE)))
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        audio.append(0.5 * np.sin(2 * np.pi * freq * t))
+    audio.append(np.zeros(int(0.3 * SAMPLE_RATE)))
+    with wave.open(str(path), 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((np.concatenate(audio) * 32767).astype(np.int16).tobytes())
+
+
+def test_whisper_service():
+    print("=== Whisper Service Test ===")
+    options = dict(model_loader=load_stub_model, audio_loader=load_wav)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        clips = []
+        for i in range(CLIPS):
+            path = tmp / f"clip_{i}.wav"
+            write_clip(path, [(0.5, 200 + 50 * i, 1.5), (0.4, 600 + 50 * i, 1.0)])
+            clips.append(str(path))
+
+        # 기준: 클립별 단독 전사 (묶지 않음)
+        single = WhisperService(max_batch=1, **options)
+        expected = [single.transcribe(path) for path in clips]
+        single.close()
+        assert all(len(segments) == 2 for segments, _, _ in expected)
+        assert expected[0][0][0]['text'] == "200Hz" and abs(expected[0][0][0]['start'] - 0.5) < 0.05
+
+        # 채널마다 스크래퍼를 새로 만들어도 서비스(모델)는 하나
+        start = time.perf_counter()
+        services = [get_whisper_service('base', 'cpu', **options) for _ in range(CHANNELS)]
+        assert all(service is services[0] for service in services)
+        service = services[0]
+        futures = [service.submit(path) for path in clips]
+        batched = [future.result()[1] for future in futures]
+        shared_s = time.perf_counter() - start
+
+        for (got, lang, kind), (want, _, _) in zip(batched, expected):
+            assert (lang, kind) == ('ko', 'whisper-stt')
+            assert [s['text'] for s in got] == [s['text'] for s in want]
+            for g, w in zip(got, want):
+                assert abs(g['start'] - w['start']) < 0.05 and abs(g['duration'] - w['duration']) < 0.05
+        assert service.stats['jobs'] == CLIPS and service.stats['model_calls'] < CLIPS
+        print(f"batching: {CLIPS} clips in {service.stats['model_calls']} model calls, "
+              f"segment offsets match single-clip transcription")
+
+        # 파이프라인 전사 단계로 사용 (임시 오디오 정리 포함)
+        saved = {}
+        for i, path in enumerate(clips[:4]):
+            copy = tmp / f"pipe_{i}.wav"
+            copy.write_bytes(Path(path).read_bytes())
+        pipeline = TranscriptionPipeline(
+            fetch=lambda i: ({'id': i}, str(tmp / f"pipe_{i}.wav")),
+            save=lambda record, result: saved.__setitem__(record['id'], result),
+            transcriber=service, transcribe_workers=service.max_batch, download_workers=2,
+        )
+        stats = pipeline.run(range(4))
+        assert stats['transcribe']['items'] == 4 and not stats['transcribe']['failed']
+        assert [saved[i][0] for i in range(4)] == [r[0] for r in batched[:4]]
+        assert not list(tmp.glob("pipe_*.wav"))
+        assert get_whisper_service('base', 'cpu') is service
+
+        # 기존 방식: 채널(스크래퍼)마다 모델 로드 + 클립마다 모델 호출
+        start = time.perf_counter()
+        for channel in range(CHANNELS):
+            model = load_stub_model('base', 'cpu')
+            for path in clips[channel::CHANNELS]:
+                model.transcribe(load_wav(path))
+        legacy_s = time.perf_counter() - start
+        print(f"{CHANNELS} channels x {CLIPS} clips: per-scraper model loads ~{legacy_s:.1f}s "
+              f"vs shared service {shared_s:.1f}s (model loaded once in {service.load_seconds:.1f}s)")
+
+        # 전사 프로세스가 죽으면: 대기 작업은 실패, 서비스는 종료 상태, 다음 호출은 새 서비스
+        crash = tmp / "crash.wav"
+        crash.write_bytes(Path(clips[0]).read_bytes())
+        crashing = get_whisper_service('small', 'cpu', model_loader=load_stub_model, audio_loader=load_wav_or_crash)
+        assert crashing.submit(str(crash)).result(timeout=30) == (0.0, None)
+        try:
+            crashing.submit(clips[0])
+            raise AssertionError("expected RuntimeError from a dead service")
+        except RuntimeError:
+            pass
+        assert crashing.transcribe(clips[0]) == (None, None, None)
+        restarted = get_whisper_service('small', 'cpu', model_loader=load_stub_model, audio_loader=load_wav_or_crash)
+        assert restarted is not crashing
+        assert restarted.submit(clips[0]).result(timeout=30)[1][0] == expected[0][0]
+        print(f"worker crash: pending job failed ({crashing.error}), next call started a new service")
+
+        # 작업자 2개 중 하나가 죽으면: 그 작업자가 가져간 작업만 실패, 남은 작업자가 계속 처리
+        pool = WhisperService(workers=2, max_batch=1, model_loader=load_stub_model, audio_loader=load_wav_or_crash)
+        assert pool.submit(str(crash)).result(timeout=30) == (0.0, None)
+        survivors = [pool.submit(path) for path in clips[:3]]
+        assert [future.result(timeout=30)[1][0] for future in survivors] == [r[0] for r in expected[:3]]
+        assert not pool._closed and len(pool._dead) == 1
+        pool.close()
+        print("one of 2 workers crashed: only its job failed, the other worker finished the rest")
+
+        # 청크 전사: 읽을 수 없는 WAV는 submit에서 예외 대신 실패 결과
+        broken = tmp / "broken.wav"
+        broken.write_bytes(b"RIFF\x00")
+        chunked = WhisperService(model_loader=load_stub_model, chunk_seconds=30)
+        assert chunked.submit(str(broken)).result(timeout=30) == (0.0, None)
+        assert [s['text'] for s in chunked.transcribe(clips[1])[0]] == [s['text'] for s in expected[1][0]]
+        chunked.close()
+        print("chunked: unreadable audio resolved as a failed transcription")
+
+        shutdown_whisper_services()
+        assert not whisper_service._services
+
+    print("✅ Whisper service test passed")
+
+
+if __name__ == "__main__":
+    test_whisper_service()
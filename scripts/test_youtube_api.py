@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+YouTube API 클라이언트 테스트 스크립트 (오프라인, 임시 폴더 사용)
+로컬 가짜 API 서버(videos / channels / search / playlistItems)로
+50개 묶음 요청, 디스크 캐시와 TTL, 키별 쿼터 기록과 키 전환(quotaExceeded 응답 / 예산 소진),
+변환기(video_to_channel, handle_converter)의 요청 수를 확인
+
+실행: python -m scripts.test_youtube_api (프로젝트 루트에서)
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import youtube_api
+from youtube_api import QuotaExhaustedError, YouTubeAPIClient, get_youtube_client
+
+EXHAUSTED_AFTER = {"key-a": 6}   # 서버 측 키별 허용 요청 수 (넘으면 quotaExceeded)
+MISSING = {"v0007", "v0042"}
+
+
+class FakeYouTubeHandler(BaseHTTPRequestHandler):
+    """YouTube Data API v3 흉내 (키별 요청 수, 요청당 ID 수 기록)"""
+
+    protocol_version = 'HTTP/1.1'
+    lock = threading.Lock()
+    calls = []          # (resource, key, ID 수)
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        url = urlparse(self.path)
+        resource = url.path.rsplit('/', 1)[-1]
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        key = params.get('key')
+        ids = params['id'].split(',') if 'id' in params else []
+
+        with cls.lock:
+            used = sum(1 for _, k, _ in cls.calls if k == key)
+            if used >= EXHAUSTED_AFTER.get(key, 10**9):
+                self._send(403, {"error": {"code": 403, "message": "quota exceeded",
+                                           "errors": [{"reason": "quotaExceeded"}]}})
+                return
+            cls.calls.append((resource, key, len(ids)))
+
+        if resource == 'videos':
+            if len(ids) > 50:
+                self._send(400, {"error": {"code": 400, "errors": [{"reason": "tooManyIds"}]}})
+                return
+            items = [{"id": i, "snippet": {"title": f"영상 {i}", "channelId": f"UC{int(i[1:]) % 3}",
+                                           "channelTitle": f"채널 {int(i[1:]) % 3}", "publishedAt": "2024-01-01T00:00:00Z",
+                                           "description": "", "thumbnails": {"high": {"url": ""}}},
+                      "statistics": {"viewCount": str(int(i[1:]) * 10)}, "contentDetails": {"duration": "PT1M"}}
+                     for i in ids if i not in MISSING]
+        elif resource == 'channels':
+            handle = params.get('forHandle')
+            if handle:
+                items = [] if handle == 'nobody' else [
+                    {"id": f"UC-{handle}", "snippet": {"title": handle}, "statistics": {"subscriberCount": "5"}}]
+            else:
+                items = [{"id": i, "snippet": {"title": i}, "statistics": {"subscriberCount": "7"},
+                          "contentDetails": {"relatedPlaylists": {"uploads": f"UU{i[2:]}"}}} for i in ids]
+        elif resource == 'search':
+            items = [{"snippet": {"channelId": "UC-found", "title": params['q']}}]
+        else:
+            items = []
+        self._send(200, {"items": items})
+
+    def _send(self, status, payload):
+        raw = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+def requests_since(mark):
+    return FakeYouTubeHandler.calls[mark:]
+
+
+def test_youtube_api():
+    print("=== YouTube API Client Test ===")
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeYouTubeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/youtube/v3"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "cache.sqlite3")
+        options = dict(cache_path=cache_path, base_url=base_url)
+
+        # 120개 ID → 50개씩 3회 요청, 없는 ID는 None
+        client = YouTubeAPIClient(["key-b"], **options)
+        video_ids = [f"v{i:04d}" for i in range(120)]
+        videos = client.videos(video_ids + video_ids[:5])
+        calls = requests_since(0)
+        assert [n for _, _, n in calls] == [50, 50, 20]
+        assert list(videos) == video_ids
+        assert videos["v0007"] is None and videos["v0001"]["snippet"]["title"] == "영상 v0001"
+        assert client.quota_usage()[0]['used'] == 3
+        print(f"batching: {len(video_ids)} ids in {len(calls)} videos.list calls (legacy: {len(video_ids)})")
+
+        # 캐시: 같은 프로세스 / 새 클라이언트(디스크) 모두 요청 없음, 없는 ID도 캐시
+        mark = len(FakeYouTubeHandler.calls)
+        assert client.videos(video_ids) == videos
+        assert YouTubeAPIClient(["key-b"], **options).videos(["v0007", "v0100"])["v0100"] == videos["v0100"]
+        assert not requests_since(mark)
+        expired = YouTubeAPIClient(["key-b"], ttl=0, **options)
+        expired.videos(["v0001"])
+        assert len(requests_since(mark)) == 1
+        print(f"cache: repeated lookups served from disk ({client.stats['cache_hits']} hits), ttl=0 refetches")
+
+        # 키 전환 1: 서버가 quotaExceeded를 돌려주면 다음 키로 재시도, 그 키는 오늘 소진으로 기록
+        rotating = YouTubeAPIClient(["key-a", "key-c"], **options)
+        mark = len(FakeYouTubeHandler.calls)
+        rotating.videos([f"v{i:04d}" for i in range(1000, 1400)])  # 8회 요청
+        keys = [k for _, k, _ in requests_since(mark)]
+        assert keys == ["key-a"] * 6 + ["key-c"] * 2 and rotating.stats['rotations'] == 1
+        usage = {u['key']: u['used'] for u in rotating.quota_usage()}
+        assert usage == {"#1": youtube_api.DAILY_QUOTA, "#2": 2}
+
+        # 키 전환 2: 로컬 예산이 떨어지면 서버 오류 없이 다음 키, 모두 떨어지면 QuotaExhaustedError
+        budgeted = YouTubeAPIClient(["key-d", "key-e"], daily_budget=3, **options)
+        mark = len(FakeYouTubeHandler.calls)
+        budgeted.videos([f"v{i}" for i in range(2000, 2250)])  # 5회 요청
+        assert [k for _, k, _ in requests_since(mark)] == ["key-d"] * 3 + ["key-e"] * 2
+        try:
+            budgeted.videos([f"v{i}" for i in range(3000, 3100)])
+            raise AssertionError("expected QuotaExhaustedError")
+        except QuotaExhaustedError as e:
+            assert 'quota' in str(e)
+        assert [u['used'] for u in budgeted.quota_usage()] == [3, 3]
+        print("quota: rotated on quotaExceeded and on local budget, raised when every key was spent")
+
+        # 변환기: 같은 키 조합이면 공유 클라이언트를 사용
+        from scripts.handle_converter import YouTubeHandleConverter
+        from scripts.video_to_channel import VideoToChannelConverter
+
+        get_youtube_client(["key-f"], **options)
+        converter = VideoToChannelConverter(["key-f"])
+        mark = len(FakeYouTubeHandler.calls)
+        batch_ids = [f"v{i:04d}" for i in range(5000, 5060)] + ["v0042"]
+        with contextlib.redirect_stdout(io.StringIO()):  # 변환기 진행 출력 생략
+            results = converter.batch_get_channels_from_videos(batch_ids)
+            singles = [converter.get_channel_from_video(video_id) for video_id in batch_ids]
+        assert len(requests_since(mark)) == 2 and results == singles
+        assert results[-1]['success'] is False and results[0]['channel_id'] == "UC2"
+
+        handles = YouTubeHandleConverter(["key-f"])
+        mark = len(FakeYouTubeHandler.calls)
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = handles.convert_handles_to_ids(["@alice", "@nobody", "@alice"])
+            again = handles.convert_handles_to_ids(["@alice", "@nobody"])
+        resources = [r for r, _, _ in requests_since(mark)]
+        assert resources == ["channels", "channels", "search", "channels"]
+        assert first[0]['channel_id'] == "UC-alice" and first[1]['channel_id'] == "UC-found" and again == first[:2]
+        used = get_youtube_client(["key-f"]).quota_usage()[0]['used']
+        assert used == 2 + 3 + 100
+        print(f"converters: {len(batch_ids)} videos in 2 calls (+{len(batch_ids)} single lookups from cache), "
+              f"handles cached after first lookup, key usage {used} units")
+
+    server.shutdown()
+    print("✅ YouTube API client test passed")
+
+
+if __name__ == "__main__":
+    test_youtube_api()
@@ -1,17 +1,25 @@
-from googleapiclient.discovery import build
+import os
+import sys
 import json
 import re
 
+# 프로젝트 루트 모듈 (youtube_api) 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from youtube_api import get_youtube_client
+
+VIDEO_PARTS = 'snippet,statistics'
+
 class VideoToChannelConverter:
     def __init__(self, api_key):
         """
         비디오 ID를 채널 ID로 변환하는 클래스
         
         Args:
-            api_key: YouTube Data API v3 키
+            api_key: YouTube Data API v3 키 (또는 키 리스트)
         """
         self.api_key = api_key
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+        # 50개씩 묶음 요청 + 디스크 캐시 + 키별 쿼터 관리
+        self.api = get_youtube_client(api_key)
     
     def parse_video_ids(self, video_id_string):
         """
@@ -35,7 +43,7 @@ class VideoToChannelConverter:
     
     def get_channel_from_video(self, video_id):
         """
-        단일 비디오 ID에서 채널 ID와 정보 가져오기
+        단일 비디오 ID에서 채널 ID와 정보 가져오기 (캐시된 비디오는 요청 없이)
         
         Args:
             video_id: YouTube 비디오 ID (11자)
@@ -46,55 +54,23 @@ class VideoToChannelConverter:
         print(f"처리 중: {video_id}")
         
         try:
-            response = self.youtube.videos().list(
-                part='snippet,statistics',
-                id=video_id
-            ).execute()
-            
-            if response.get('items'):
-                video = response['items'][0]
-                snippet = video['snippet']
-                stats = video.get('statistics', {})
-                
-                result = {
-                    'video_id': video_id,
-                    'video_url': f'https://www.youtube.com/watch?v={video_id}',
-                    'video_title': snippet['title'],
-                    'channel_id': snippet['channelId'],
-                    'channel_title': snippet['channelTitle'],
-                    'published_at': snippet['publishedAt'],
-                    'view_count': stats.get('viewCount', 'N/A'),
-                    'like_count': stats.get('likeCount', 'N/A'),
-                    'comment_count': stats.get('commentCount', 'N/A'),
-                    'success': True
-                }
-                
-                print(f"  ✅ 채널: {snippet['channelTitle']} (ID: {snippet['channelId']})")
-                return result
-            else:
-                print(f"  ❌ 비디오를 찾을 수 없음")
-                return {
-                    'video_id': video_id,
-                    'video_url': f'https://www.youtube.com/watch?v={video_id}',
-                    'channel_id': None,
-                    'success': False,
-                    'error': '비디오를 찾을 수 없습니다'
-                }
-                
+            video = self.api.videos([video_id], part=VIDEO_PARTS)[video_id]
         except Exception as e:
             print(f"  ❌ 에러: {e}")
-            return {
-                'video_id': video_id,
-                'video_url': f'https://www.youtube.com/watch?v={video_id}',
-                'channel_id': None,
-                'success': False,
-                'error': str(e)
-            }
+            return self._failure(video_id, str(e))
+        
+        if video is None:
+            print(f"  ❌ 비디오를 찾을 수 없음")
+            return self._failure(video_id, '비디오를 찾을 수 없습니다')
+        
+        result = self._video_result(video)
+        print(f"  ✅ 채널: {result['channel_title']} (ID: {result['channel_id']})")
+        return result
     
     def batch_get_channels_from_videos(self, video_ids):
         """
         여러 비디오 ID에서 채널 정보 가져오기 (배치 처리)
-        최대 50개씩 한 번에 요청
+        최대 50개씩 한 번에 요청, 캐시된 비디오는 요청하지 않음
         
         Args:
             video_ids: 비디오 ID 리스트
@@ -102,68 +78,48 @@ class VideoToChannelConverter:
         Returns:
             list: 결과 딕셔너리 리스트
         """
-        results = []
-        batch_size = 50
-        
         print(f"\n{'='*60}")
         print(f"총 {len(video_ids)}개 비디오 처리 시작")
         print(f"{'='*60}\n")
         
-        for i in range(0, len(video_ids), batch_size):
-            batch = video_ids[i:i+batch_size]
-            print(f"배치 {i//batch_size + 1}: {len(batch)}개 처리 중...")
-            
-            try:
-                response = self.youtube.videos().list(
-                    part='snippet,statistics',
-                    id=','.join(batch)
-                ).execute()
-                
-                # 성공한 비디오들
-                found_video_ids = set()
-                for video in response.get('items', []):
-                    video_id = video['id']
-                    found_video_ids.add(video_id)
-                    snippet = video['snippet']
-                    stats = video.get('statistics', {})
-                    
-                    result = {
-                        'video_id': video_id,
-                        'video_url': f'https://www.youtube.com/watch?v={video_id}',
-                        'video_title': snippet['title'],
-                        'channel_id': snippet['channelId'],
-                        'channel_title': snippet['channelTitle'],
-                        'published_at': snippet['publishedAt'],
-                        'view_count': stats.get('viewCount', 'N/A'),
-                        'like_count': stats.get('likeCount', 'N/A'),
-                        'comment_count': stats.get('commentCount', 'N/A'),
-                        'success': True
-                    }
-                    results.append(result)
-                
-                # 찾지 못한 비디오들
-                for video_id in batch:
-                    if video_id not in found_video_ids:
-                        results.append({
-                            'video_id': video_id,
-                            'video_url': f'https://www.youtube.com/watch?v={video_id}',
-                            'channel_id': None,
-                            'success': False,
-                            'error': '비디오를 찾을 수 없습니다'
-                        })
-                        
-            except Exception as e:
-                print(f"  배치 처리 에러: {e}")
-                for video_id in batch:
-                    results.append({
-                        'video_id': video_id,
-                        'video_url': f'https://www.youtube.com/watch?v={video_id}',
-                        'channel_id': None,
-                        'success': False,
-                        'error': str(e)
-                    })
-        
-        return results
+        try:
+            videos = self.api.videos(video_ids, part=VIDEO_PARTS)
+        except Exception as e:
+            print(f"  배치 처리 에러: {e}")
+            return [self._failure(video_id, str(e)) for video_id in video_ids]
+        
+        return [self._video_result(video) if video is not None
+                else self._failure(video_id, '비디오를 찾을 수 없습니다')
+                for video_id, video in videos.items()]
+    
+    @staticmethod
+    def _video_result(video):
+        """videos.list 항목 → 결과 딕셔너리"""
+        video_id = video['id']
+        snippet = video['snippet']
+        stats = video.get('statistics', {})
+        return {
+            'video_id': video_id,
+            'video_url': f'https://www.youtube.com/watch?v={video_id}',
+            'video_title': snippet['title'],
+            'channel_id': snippet['channelId'],
+            'channel_title': snippet['channelTitle'],
+            'published_at': snippet['publishedAt'],
+            'view_count': stats.get('viewCount', 'N/A'),
+            'like_count': stats.get('likeCount', 'N/A'),
+            'comment_count': stats.get('commentCount', 'N/A'),
+            'success': True
+        }
+    
+    @staticmethod
+    def _failure(video_id, error):
+        return {
+            'video_id': video_id,
+            'video_url': f'https://www.youtube.com/watch?v={video_id}',
+            'channel_id': None,
+            'success': False,
+            'error': error
+        }
     
     def print_results(self, results):
         """결과를 보기 좋게 출력"""
@@ -2,33 +2,57 @@
 import os
 import sys
 import json
-from googleapiclient.discovery import build
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
 import yt_dlp
-import whisper
 import torch
 from datetime import datetime
 import glob
 import time
+from functools import partial
+
+# 프로젝트 루트 모듈 (scrape_pipeline, whisper_service, youtube_api) 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scrape_pipeline import TranscriptionPipeline
+from whisper_service import get_whisper_service
+from youtube_api import QuotaExhaustedError, get_youtube_client
 
 # Windows 콘솔 인코딩 설정
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
+# STT: 음성 구간(VAD) 청크 최대 길이(초), CPU 전사 작업자 수 상한 (작업자마다 모델 하나)
+STT_CHUNK_SECONDS = 30
+STT_MAX_CPU_WORKERS = 4
+
+
+def stt_service(model_size, device):
+    """채널/스크래퍼끼리 공유하는 Whisper 전사 서비스
+
+    CPU 코어가 여러 개면 음성 구간 청크를 작업자들이 코어를 나눠 병렬 전사,
+    GPU나 단일 코어는 청크를 나눠도 병렬로 돌지 않고 30초 창만 늘어나므로 파일 단위로 전사
+    """
+    cores = os.cpu_count() or 1
+    if device == "cuda" or cores == 1:
+        return get_whisper_service(model_size, device)
+    workers = min(STT_MAX_CPU_WORKERS, cores)
+    return get_whisper_service(model_size, device, workers=workers, num_threads=max(1, cores // workers),
+                               chunk_seconds=STT_CHUNK_SECONDS)
+
+
 class YouTubeChannelScraper:
     def __init__(self, api_key, channel_id):
         """
         YouTube 채널 스크래퍼 초기화
         
         Args:
-            api_key: YouTube Data API v3 키
+            api_key: YouTube Data API v3 키 (또는 키 리스트 - 쿼터가 떨어지면 다음 키로 전환)
             channel_id: YouTube 채널 ID (예: UCxxxxxx)
         """
         self.api_key = api_key
         self.channel_id = channel_id
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
-        self.whisper_model = None
+        # 묶음 요청 + 디스크 캐시 + 키별 쿼터 관리 (같은 키 조합의 스크래퍼끼리 공유)
+        self.api = get_youtube_client(api_key)
         
         # GPU 사용 가능 여부 확인
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -40,43 +64,36 @@ class YouTubeChannelScraper:
         """채널의 최신 영상 목록 가져오기"""
         print(f"채널의 최신 {max_results}개 영상을 가져오는 중...")
         
-        # 채널의 업로드 플레이리스트 ID 가져오기
-        channel_response = self.youtube.channels().list(
-            part='contentDetails',
-            id=self.channel_id
-        ).execute()
-        
-        playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-        
-        # 플레이리스트에서 영상 목록 가져오기
-        videos = []
-        request = self.youtube.playlistItems().list(
-            part='snippet',
-            playlistId=playlist_id,
-            maxResults=max_results
-        )
+        # 채널의 업로드 플레이리스트 ID 가져오기 (캐시)
+        channel = self.api.channels([self.channel_id], part='contentDetails')[self.channel_id]
+        if channel is None:
+            raise ValueError(f"채널을 찾을 수 없습니다: {self.channel_id}")
         
-        response = request.execute()
+        playlist_id = channel['contentDetails']['relatedPlaylists']['uploads']
         
-        for item in response['items']:
-            video_id = item['snippet']['resourceId']['videoId']
-            videos.append(video_id)
-            
-        return videos
+        # 플레이리스트에서 영상 목록 가져오기 (50개씩 페이지 요청)
+        return self.api.playlist_video_ids(playlist_id, max_results)
+    
+    def get_videos_metadata(self, video_ids):
+        """여러 영상의 메타데이터를 한 번에 가져오기 (50개씩 묶어 요청, 캐시)
+
+        Returns:
+            {video_id: 메타데이터 또는 None}
+        """
+        print(f"영상 {len(video_ids)}개의 메타데이터를 가져오는 중...")
+        return {video_id: self._video_metadata(video_id, video)
+                for video_id, video in self.api.videos(video_ids).items()}
     
     def get_video_metadata(self, video_id):
-        """영상의 메타데이터 가져오기"""
+        """영상의 메타데이터 가져오기 (get_videos_metadata로 미리 받아 둔 영상은 캐시에서)"""
         print(f"영상 {video_id}의 메타데이터를 가져오는 중...")
-        
-        response = self.youtube.videos().list(
-            part='snippet,statistics,contentDetails',
-            id=video_id
-        ).execute()
-        
-        if not response['items']:
+        return self._video_metadata(video_id, self.api.videos([video_id])[video_id])
+    
+    @staticmethod
+    def _video_metadata(video_id, video):
+        """videos.list 항목 → 저장용 메타데이터"""
+        if video is None:
             return None
-            
-        video = response['items'][0]
         
         metadata = {
             'video_id': video_id,
@@ -135,20 +152,30 @@ class YouTubeChannelScraper:
                 print(f"자막 가져오기 에러: {e}")
                 return None, None, None
     
-    def download_audio(self, video_id, output_path='temp_audio'):
-        """영상의 오디오만 다운로드"""
+    def download_audio(self, video_id, output_path='temp_audio', pcm=True):
+        """영상의 오디오만 다운로드
+
+        Args:
+            pcm: True면 Whisper 입력 형식(16kHz 모노 PCM WAV)으로 바로 추출
+                 (MP3로 인코딩했다가 전사 때 다시 디코딩하는 단계 생략), False면 192kbps MP3
+        """
         print(f"영상 {video_id}의 오디오를 다운로드하는 중...")
         
         os.makedirs(output_path, exist_ok=True)
         
+        if pcm:
+            extension = 'wav'
+            postprocessor = {'key': 'FFmpegExtractAudio', 'preferredcodec': 'wav'}
+        else:
+            extension = 'mp3'
+            postprocessor = {'key': 'FFmpegExtractAudio', 'preferredcodec': 'mp3', 'preferredquality': '192'}
+        
         ydl_opts = {
             'format': 'bestaudio/best',
             'outtmpl': f'{output_path}/{video_id}.%(ext)s',
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
+            'postprocessors': [postprocessor],
+            # 16kHz 모노로 리샘플링 (pcm_s16le WAV)
+            'postprocessor_args': {'extractaudio': ['-ar', '16000', '-ac', '1']} if pcm else {},
             'quiet': True,
             'no_warnings': True,
             # 403 에러 및 IP 차단 방지를 위한 강화 옵션
@@ -174,35 +201,15 @@ class YouTubeChannelScraper:
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([f'https://www.youtube.com/watch?v={video_id}'])
-            return f'{output_path}/{video_id}.mp3'
+            return f'{output_path}/{video_id}.{extension}'
         except Exception as e:
             print(f"오디오 다운로드 실패: {e}")
             return None
     
     def transcribe_audio(self, audio_path, model_size='base'):
-        """Whisper를 사용하여 오디오를 텍스트로 변환"""
+        """Whisper를 사용하여 오디오를 텍스트로 변환 (채널/스크래퍼끼리 공유하는 전사 서비스 사용)"""
         print(f"오디오를 텍스트로 변환하는 중... (모델: {model_size}, 디바이스: {self.device})")
-        
-        if self.whisper_model is None:
-            print(f"Whisper 모델 로딩 중... ({self.device})")
-            self.whisper_model = whisper.load_model(model_size, device=self.device)
-        
-        try:
-            result = self.whisper_model.transcribe(audio_path, language='ko', fp16=(self.device == "cuda"))
-            
-            # YouTube 자막 형식과 유사하게 변환
-            segments = []
-            for segment in result['segments']:
-                segments.append({
-                    'text': segment['text'],
-                    'start': segment['start'],
-                    'duration': segment['end'] - segment['start']
-                })
-            
-            return segments, 'ko', 'whisper-stt'
-        except Exception as e:
-            print(f"STT 변환 실패: {e}")
-            return None, None, None
+        return stt_service(model_size, self.device).transcribe(audio_path)
     
     def get_collected_video_ids(self, output_dir='youtube_data'):
         """이미 수집된 영상 ID 목록 가져오기"""
@@ -262,14 +269,60 @@ class YouTubeChannelScraper:
             
             print(f"텍스트 파일 저장 완료: {txt_file}")
     
-    def process_videos(self, max_videos=10, use_stt=True, whisper_model='base', skip_transcript_api=False):
+    def fetch_video(self, video_id, use_stt=True, skip_transcript_api=False):
+        """메타데이터 + 자막 수집, 자막이 없으면 오디오 다운로드 (파이프라인 다운로드 단계)
+
+        Returns:
+            (video_data, 전사할 오디오 경로 또는 None), 메타데이터가 없으면 None
+        """
+        print(f"처리 중: {video_id}")
+
+        # 메타데이터 수집
+        metadata = self.get_video_metadata(video_id)
+        if not metadata:
+            print(f"{video_id}: 메타데이터를 가져올 수 없습니다. 건너뜁니다.")
+            return None
+
+        video_data = {
+            'metadata': metadata,
+            'transcript': None,
+            'transcript_language': None,
+            'transcript_type': None
+        }
+
+        # 자막 가져오기 시도
+        transcript = None
+        if not skip_transcript_api:
+            transcript, lang, trans_type = self.get_transcript(video_id)
+
+        if transcript:
+            video_data['transcript'] = transcript
+            video_data['transcript_language'] = lang
+            video_data['transcript_type'] = trans_type
+            print(f"{video_id}: 자막 수집 완료 (언어: {lang}, 타입: {trans_type})")
+            return video_data, None
+
+        if use_stt:
+            # 자막이 없으면 오디오를 받아 전사 단계로 넘김
+            audio_path = self.download_audio(video_id)
+            if audio_path and os.path.exists(audio_path):
+                return video_data, audio_path
+
+        return video_data, None
+
+    def process_videos(self, max_videos=10, use_stt=True, whisper_model='base', skip_transcript_api=False,
+                       download_workers=3):
         """전체 프로세스 실행
-        
+
+        다운로드 스레드 → 공유 Whisper 전사 서비스 → 저장 스레드 파이프라인으로
+        다음 영상 다운로드와 이전 영상 전사/저장을 겹쳐 처리
+
         Args:
             max_videos: 수집할 최대 영상 수
             use_stt: 자막이 없을 때 STT 사용 여부
             whisper_model: Whisper 모델 크기
             skip_transcript_api: True면 자막 API를 건너뛰고 바로 STT 사용 (IP 차단 시)
+            download_workers: 동시에 다운로드할 영상 수
         """
         print(f"\n{'='*50}")
         print(f"YouTube 채널 영상 수집 시작")
@@ -302,8 +355,11 @@ class YouTubeChannelScraper:
         os.makedirs(channel_info_dir, exist_ok=True)
         channel_info_file = f"{channel_info_dir}/channel_info.json"
         
+        # 새 영상 메타데이터를 묶음 요청으로 미리 받아 둠 (이후 영상별 조회는 캐시에서)
+        metadata_by_id = self.get_videos_metadata(new_video_ids)
+        
         # 첫 번째 영상의 메타데이터에서 채널 정보 가져오기
-        first_metadata = self.get_video_metadata(new_video_ids[0])
+        first_metadata = metadata_by_id.get(new_video_ids[0])
         if first_metadata:
             # 기존 channel_info가 있으면 읽어오기
             total_collected = len(collected_ids) + len(new_video_ids)
@@ -318,67 +374,35 @@ class YouTubeChannelScraper:
             print(f"채널 정보 업데이트: {channel_info_file}\n")
         
         results = []
-        
-        for idx, video_id in enumerate(new_video_ids, 1):
-            print(f"\n[{idx}/{len(new_video_ids)}] 처리 중: {video_id}")
-            print("-" * 50)
-            
-            # 메타데이터 수집
-            metadata = self.get_video_metadata(video_id)
-            if not metadata:
-                print(f"메타데이터를 가져올 수 없습니다. 건너뜁니다.")
-                continue
-            
-            video_data = {
-                'metadata': metadata,
-                'transcript': None,
-                'transcript_language': None,
-                'transcript_type': None
-            }
-            
-            # 자막 가져오기 시도
-            transcript = None
-            lang = None
-            trans_type = None
-            
-            if not skip_transcript_api:
-                transcript, lang, trans_type = self.get_transcript(video_id)
-            else:
-                print(f"자막 API 건너뛰기 - STT로 직접 진행")
-            
-            if transcript:
+
+        def save(video_data, transcription):
+            if transcription:
+                transcript, lang, trans_type = transcription
                 video_data['transcript'] = transcript
                 video_data['transcript_language'] = lang
                 video_data['transcript_type'] = trans_type
-                print(f"자막 수집 완료 (언어: {lang}, 타입: {trans_type})")
-            elif use_stt:
-                # 자막이 없으면 STT 수행
-                audio_path = self.download_audio(video_id)
-                
-                if audio_path and os.path.exists(audio_path):
-                    transcript, lang, trans_type = self.transcribe_audio(audio_path, whisper_model)
-                    
-                    if transcript:
-                        video_data['transcript'] = transcript
-                        video_data['transcript_language'] = lang
-                        video_data['transcript_type'] = trans_type
-                        print(f"STT 변환 완료 (언어: {lang})")
-                    
-                    # 임시 오디오 파일 삭제
-                    try:
-                        os.remove(audio_path)
-                    except:
-                        pass
-            
+                print(f"{video_data['metadata']['video_id']}: STT 변환 완료 (언어: {lang})")
+
             # 데이터 저장
             self.save_data(video_data)
             results.append(video_data)
-            
-            # 영상 처리 사이 딜레이 (IP 차단 방지)
-            time.sleep(1)
+            print(f"[{len(results)}/{len(new_video_ids)}] 저장 완료")
+
+        # 모델은 크기별 전사 서비스 하나가 로드해 두고 모든 채널이 공유
+        transcriber = stt_service(whisper_model, self.device)
+        pipeline = TranscriptionPipeline(
+            fetch=partial(self.fetch_video, use_stt=use_stt, skip_transcript_api=skip_transcript_api),
+            save=save,
+            transcriber=transcriber,
+            download_workers=download_workers,
+            transcribe_workers=transcriber.max_batch,  # 짧은 클립을 묶을 수 있도록 여러 개를 대기시킴
+            request_interval=1,  # 영상 처리 사이 딜레이 (IP 차단 방지)
+        )
+        pipeline.run(new_video_ids)
         
         print(f"\n{'='*50}")
         print(f"처리 완료! 새로 수집: {len(results)}개, 전체: {len(collected_ids) + len(results)}개")
+        print(pipeline.format_stats())
         print(f"{'='*50}\n")
         
         return results
@@ -459,12 +483,11 @@ if __name__ == "__main__":
     
     # 전체 결과 저장
     all_results = {}
-    api_key_usage = {i: 0 for i in range(len(API_KEYS))}  # API 키별 사용 횟수 추적
     
     # 초기 API 키 설정
     print(f"\n{'='*70}")
     print(f"🔑 사용 가능한 API 키: {len(API_KEYS)}개")
-    print(f"   각 채널마다 자동으로 순환 사용하여 쿼터 분산!")
+    print(f"   키별 쿼터를 기록하다가 소진되면 자동으로 다음 키로 전환!")
     print(f"{'='*70}\n")
     
     # 각 채널별로 스크래퍼 실행
@@ -473,59 +496,33 @@ if __name__ == "__main__":
         print(f"채널 [{idx}/{len(CHANNEL_IDS)}] 처리 중: {channel_id}")
         print(f"{'='*70}")
         
-        # API 키 순환 사용
-        api_key_tried = 0
-        success = False
-        
-        while api_key_tried < len(API_KEYS) and not success:
-            # 현재 API 키 선택
-            current_key_idx = (idx - 1 + api_key_tried) % len(API_KEYS)
-            current_api_key = API_KEYS[current_key_idx]
-            
-            print(f"🔑 API 키 [{current_key_idx + 1}/{len(API_KEYS)}] 사용 중...")
+        try:
+            # 스크래퍼 초기화 (모든 키를 넘기면 API 클라이언트가 쿼터에 따라 키를 순환)
+            scraper = YouTubeChannelScraper(API_KEYS, channel_id)
+        
+            # 최신 100개 영상 처리
+            # use_stt=True: 자막이 없으면 STT 수행
+            # whisper_model: 'tiny', 'base', 'small', 'medium', 'large' 중 선택
+            #                (크기가 클수록 정확도 높지만 속도 느림)
+            # skip_transcript_api=True: IP 차단 시 자막 API를 건너뛰고 STT만 사용
+            results = scraper.process_videos(
+                max_videos=100,
+                use_stt=USE_STT,
+                whisper_model='base',
+                skip_transcript_api=SKIP_TRANSCRIPT_API
+            )
             
-            try:
-                # 스크래퍼 초기화
-                scraper = YouTubeChannelScraper(current_api_key, channel_id)
+            all_results[channel_id] = results
+            print(f"\n✓ 채널 {channel_id}: {len(results)}개 영상 수집 완료")
             
-                # 최신 100개 영상 처리
-                # use_stt=True: 자막이 없으면 STT 수행
-                # whisper_model: 'tiny', 'base', 'small', 'medium', 'large' 중 선택
-                #                (크기가 클수록 정확도 높지만 속도 느림)
-                # skip_transcript_api=True: IP 차단 시 자막 API를 건너뛰고 STT만 사용
-                results = scraper.process_videos(
-                    max_videos=100,
-                    use_stt=USE_STT,
-                    whisper_model='base',
-                    skip_transcript_api=SKIP_TRANSCRIPT_API
-                )
-                
-                all_results[channel_id] = results
-                success = True
-                api_key_usage[current_key_idx] += 1  # API 키 사용 횟수 증가
-                
-                print(f"\n✓ 채널 {channel_id}: {len(results)}개 영상 수집 완료 (API 키 #{current_key_idx + 1})")
-                
-            except Exception as e:
-                error_msg = str(e)
-                
-                # API 쿼터 에러 체크
-                if 'quota' in error_msg.lower() or 'limit' in error_msg.lower() or '403' in error_msg:
-                    print(f"\n⚠️ API 쿼터 제한! 다음 API 키로 전환합니다...")
-                    api_key_tried += 1
-                    
-                    if api_key_tried >= len(API_KEYS):
-                        print(f"\n❌ 모든 API 키의 쿼터가 소진되었습니다!")
-                        print(f"   내일 다시 시도하거나 새로운 API 키를 추가하세요.")
-                        break
-                else:
-                    # 다른 에러는 바로 종료
-                    print(f"\n✗ 채널 {channel_id} 처리 중 에러 발생: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    break
-        
-        if not success:
+        except QuotaExhaustedError:
+            print(f"\n❌ 모든 API 키의 쿼터가 소진되었습니다!")
+            print(f"   내일 다시 시도하거나 새로운 API 키를 추가하세요.")
+            break
+        except Exception as e:
+            print(f"\n✗ 채널 {channel_id} 처리 중 에러 발생: {e}")
+            import traceback
+            traceback.print_exc()
             print(f"\n⚠️ 채널 {channel_id} 수집 실패 - 다음 채널로 이동...")
             continue
     
@@ -535,13 +532,15 @@ if __name__ == "__main__":
     print(f"{'='*70}")
     print(f"총 {len(CHANNEL_IDS)}개 채널, {sum(len(v) for v in all_results.values())}개 영상 수집\n")
     
-    # API 키 사용 통계
+    # API 키 쿼터 사용 통계 (오늘, 태평양 시간 기준)
     print(f"{'─'*70}")
-    print(f"🔑 API 키 사용 통계:")
+    print(f"🔑 API 키 쿼터 사용량:")
     print(f"{'─'*70}")
-    for key_idx, usage_count in api_key_usage.items():
-        if usage_count > 0:
-            print(f"   API 키 #{key_idx + 1}: {usage_count}개 채널 처리")
+    if API_KEYS:
+        api = get_youtube_client(API_KEYS)
+        for usage in api.quota_usage():
+            print(f"   API 키 {usage['key']}: {usage['used']:,} / {usage['budget']:,} 단위")
+        print(f"   요청 {api.stats['requests']}회, 캐시 적중 {api.stats['cache_hits']}건")
     print()
     
     for channel_id, results in all_results.items():
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+자막 세그먼트 역색인 - 키워드/구문 검색을 postings만으로 처리
+video_corpus의 세그먼트 테이블을 한 번 색인해 term -> (세그먼트 행, 토큰 위치) postings로 저장하고,
+AND/OR/구문 질의와 영상별·세그먼트별 매칭 수를 원문 스캔 없이 계산
+(원문은 화면에 보여줄 세그먼트만 VideoCorpus.segments_at으로 조회)
+
+질의 규칙 (transcript_index와 같은 토큰화):
+  - 단어 하나: 부분 일치 ('배터리' → '배터리가', '폰' → '스마트폰' 등 조사/합성어 포함,
+    원문이 아니라 어휘 목록에서 찾음)
+  - 여러 단어(또는 "따옴표"): 연속 구문, 마지막 단어만 접두어 일치
+"""
+
+import os
+import pickle
+import re
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from knowledge_base_snapshot import file_signature
+from transcript_index import tokenize
+from video_corpus import DEFAULT_CORPUS_DIR, DEFAULT_DATA_DIR, load_corpus
+
+# 색인 레이아웃이 바뀌면 올려서 기존 파일을 자동으로 무효화
+SEGMENT_INDEX_VERSION = 1
+INDEX_FILENAME = "segment_index.pkl"
+
+QUOTED_PATTERN = re.compile(r'"([^"]+)"')
+
+
+def parse_query(query):
+    """
+    검색어 문자열 → 키워드 리스트 ("따옴표" 안은 구문 하나, 나머지는 단어별)
+
+    예: '아이폰 "배터리 수명"' → ['아이폰', '배터리 수명']
+    """
+    phrases = QUOTED_PATTERN.findall(query)
+    rest = QUOTED_PATTERN.sub(' ', query)
+    return [p.strip() for p in phrases if p.strip()] + rest.split()
+
+
+class SegmentIndex:
+    """세그먼트 역색인: term -> (세그먼트 행 array, 세그먼트 내 토큰 위치 array)"""
+
+    def __init__(self):
+        self.postings = {}
+        self.video_ids = []                 # 영상 행 -> video_id
+        self.segment_video = array('I')     # 세그먼트 행 -> 영상 행
+        self.segment_offset = array('q')    # 영상 행 -> 첫 세그먼트 행
+        self.segment_start = array('d')     # 세그먼트 행 -> 시작 시각(초)
+        self.segment_duration = array('d')  # 세그먼트 행 -> 길이(초)
+
+        self._vocab = None
+
+    def __len__(self):
+        return len(self.segment_video)
+
+    @classmethod
+    def build(cls, corpus):
+        """VideoCorpus 세그먼트 테이블 전체 색인"""
+        index = cls()
+        videos = corpus.videos(["video_id", "segment_offset", "segment_count"])
+        segments = corpus.segments(["start", "duration", "text"])
+
+        index.video_ids = videos.column("video_id").to_pylist()
+        index.segment_offset = array('q', videos.column("segment_offset").to_pylist())
+        for video_row, count in enumerate(videos.column("segment_count").to_pylist()):
+            index.segment_video.extend([video_row] * count)
+        index.segment_start = array('d', segments.column("start").to_pylist())
+        index.segment_duration = array('d', segments.column("duration").to_pylist())
+
+        postings = defaultdict(lambda: (array('I'), array('I')))
+        for row, text in enumerate(segments.column("text").to_pylist()):
+            for position, term in enumerate(tokenize(text or "")):
+                rows, positions = postings[term]
+                rows.append(row)
+                positions.append(position)
+        index.postings = dict(postings)
+        return index
+
+    def _expand(self, term):
+        """정확히 일치 + 접두어 일치 어휘 (transcript_index.TranscriptIndex._expand와 같은 규칙)"""
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        start = bisect_left(self._vocab, term)
+        for i in range(start, len(self._vocab)):
+            if not self._vocab[i].startswith(term):
+                break
+            yield self._vocab[i]
+
+    def _containing(self, term):
+        """term을 포함하는 어휘 (단어 하나 질의, 합성어 '스마트폰'도 '폰'으로 찾도록)"""
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        return [t for t in self._vocab if term in t]
+
+    def _occurrences(self, term, prefix):
+        """term의 (세그먼트 행, 위치) 집합"""
+        terms = self._expand(term) if prefix else ([term] if term in self.postings else [])
+        occurrences = set()
+        for t in terms:
+            rows, positions = self.postings[t]
+            occurrences.update(zip(rows, positions))
+        return occurrences
+
+    def keyword_hits(self, keyword):
+        """
+        키워드(단어 또는 구문)가 나온 세그먼트별 횟수
+
+        Returns:
+            Counter {세그먼트 행: 매칭 횟수}
+        """
+        tokens = tokenize(keyword)
+        if not tokens:
+            return Counter()
+        if len(tokens) == 1:
+            hits = Counter()
+            for term in self._containing(tokens[0]):
+                hits.update(self.postings[term][0])
+            return hits
+
+        # 구문: 첫 단어 위치에서 이어지는 위치에 다음 단어가 모두 있어야 함
+        matches = self._occurrences(tokens[0], prefix=False)
+        for offset, token in enumerate(tokens[1:], start=1):
+            if not matches:
+                break
+            following = self._occurrences(token, prefix=offset == len(tokens) - 1)
+            matches = {(row, pos) for row, pos in matches if (row, pos + offset) in following}
+        return Counter(row for row, _ in matches)
+
+    def search(self, keywords, mode='OR'):
+        """
+        영상 단위 검색
+
+        Args:
+            keywords: 키워드 리스트 또는 검색어 문자열 (parse_query 규칙)
+            mode: 'OR' (키워드 중 하나라도) / 'AND' (모든 키워드가 영상 안에)
+
+        Returns:
+            {video_id: {'match_count', 'keyword_counts', 'segments': [세그먼트 행, ...]}}
+            segments는 시간순, match_count는 전체 매칭 횟수
+        """
+        if isinstance(keywords, str):
+            keywords = parse_query(keywords)
+
+        segment_video = self.segment_video
+        keyword_hits, per_keyword = [], []
+        for keyword in keywords:
+            hits = self.keyword_hits(keyword)
+            counts = defaultdict(int)  # 영상 행 -> 매칭 횟수
+            for row, count in hits.items():
+                counts[segment_video[row]] += count
+            keyword_hits.append(hits)
+            per_keyword.append(counts)
+        if not per_keyword:
+            return {}
+
+        video_rows = set(per_keyword[0])
+        for counts in per_keyword[1:]:
+            video_rows = video_rows & counts.keys() if mode == 'AND' else video_rows | counts.keys()
+
+        segments = defaultdict(list)
+        for row in sorted(set().union(*keyword_hits)):
+            if segment_video[row] in video_rows:
+                segments[segment_video[row]].append(row)
+
+        results = {}
+        for video_row in video_rows:
+            keyword_counts = {keyword: counts.get(video_row, 0) for keyword, counts in zip(keywords, per_keyword)}
+            results[self.video_ids[video_row]] = {
+                'match_count': sum(keyword_counts.values()),
+                'keyword_counts': keyword_counts,
+                'segments': segments[video_row],
+            }
+        return results
+
+    def segment_info(self, row):
+        """세그먼트 행 → (video_id, 영상 내 세그먼트 번호, 시작 시각, 길이)"""
+        video_row = self.segment_video[row]
+        return (self.video_ids[video_row], row - self.segment_offset[video_row],
+                self.segment_start[row], self.segment_duration[row])
+
+    def save(self, path, signature):
+        """색인 저장 (임시 파일에 쓴 뒤 교체하여 부분 기록 방지)"""
+        directory = os.path.dirname(path) or "."
+        payload = {
+            'version': SEGMENT_INDEX_VERSION,
+            'signature': signature,
+            'postings': self.postings,
+            'video_ids': self.video_ids,
+            'segment_video': self.segment_video,
+            'segment_offset': self.segment_offset,
+            'segment_start': self.segment_start,
+            'segment_duration': self.segment_duration,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"세그먼트 색인 저장 실패: {path} - {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path, signature):
+        """
+        저장된 색인 로드
+
+        Returns:
+            SegmentIndex, 버전/서명이 다르거나 파일이 없으면 None
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            print(f"세그먼트 색인 읽기 실패: {path} - {e}")
+            return None
+        if payload.get('version') != SEGMENT_INDEX_VERSION or payload.get('signature') != signature:
+            return None
+
+        index = cls()
+        for name in ('postings', 'video_ids', 'segment_video', 'segment_offset',
+                     'segment_start', 'segment_duration'):
+            setattr(index, name, payload[name])
+        return index
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def load_segment_index(data_dir=DEFAULT_DATA_DIR, corpus_dir=DEFAULT_CORPUS_DIR):
+    """
+    최신 코퍼스에 대한 세그먼트 색인 (코퍼스가 바뀌었으면 다시 색인해 corpus_dir에 저장)
+
+    같은 프로세스에서는 코퍼스가 그대로인 동안 색인 객체를 재사용
+    """
+    corpus = load_corpus(data_dir, corpus_dir)
+    signature = file_signature(list(corpus.table_paths))
+    with _indexes_lock:
+        cached = _indexes.get(corpus_dir)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        path = os.path.join(corpus_dir, INDEX_FILENAME)
+        index = SegmentIndex.load(path, signature)
+        if index is None:
+            index = SegmentIndex.build(corpus)
+            index.save(path, signature)
+        _indexes[corpus_dir] = (signature, index)
+        return index
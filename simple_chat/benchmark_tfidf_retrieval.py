@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TF-IDF 검색 마이크로벤치마크
+기존 방식(cosine_similarity → dense 점수 배열 → 전체 argsort)과
+TfidfRetriever(희소 내적 + argpartition, 배치 질의)를 10k / 100k / 1M 리뷰에서 비교하고,
+토론 메시지 1건의 참가자 전체 검색을 페르소나별 검색과 공유 인덱스 배치 검색(MultiPersonaTfidfIndex)으로 비교
+
+실행: python simple_chat/benchmark_tfidf_retrieval.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tfidf_retriever import MultiPersonaTfidfIndex, TfidfRetriever
+
+CORPUS_SIZES = [10_000, 100_000, 1_000_000]
+VOCAB_SIZE = 1000      # TfidfVectorizer(max_features=1000)과 동일
+TERMS_PER_DOC = 20
+TERMS_PER_QUERY = 6
+NUM_QUERIES = 32
+K = 2
+DEBATE_PERSONAS = 4
+DEBATE_DOCS_PER_PERSONA = 10_000
+DEBATE_MESSAGES = 50
+
+
+def random_tfidf(rows, terms_per_row, rng):
+    """Zipf 분포 어휘로 L2 정규화된 합성 TF-IDF 행렬 생성"""
+    weights = 1.0 / np.arange(1, VOCAB_SIZE + 1)
+    weights /= weights.sum()
+    cols = rng.choice(VOCAB_SIZE, size=rows * terms_per_row, p=weights)
+    row_ids = np.repeat(np.arange(rows), terms_per_row)
+    data = rng.random(rows * terms_per_row).astype(np.float32)
+    matrix = sparse.csr_matrix((data, (row_ids, cols)), shape=(rows, VOCAB_SIZE))
+    matrix.sum_duplicates()
+    return normalize(matrix, norm='l2')
+
+
+def legacy_top_k(query_vector, matrix, k):
+    """기존 get_context 검색 로직"""
+    similarity_scores = cosine_similarity(query_vector, matrix).flatten()
+    top_indices = similarity_scores.argsort()[-k:][::-1]
+    return [(int(i), float(similarity_scores[i])) for i in top_indices if similarity_scores[i] > 0.1]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print("=" * 84)
+    print(f"TF-IDF top-{K} 검색: cosine_similarity + argsort vs 희소 내적 + argpartition")
+    print("=" * 84)
+    print(f"{'reviews':>10} | {'legacy ms/q':>11} | {'sparse ms/q':>11} | {'batch ms/q':>10} | {'speedup':>8} | match")
+    print("-" * 84)
+
+    for size in CORPUS_SIZES:
+        matrix = random_tfidf(size, TERMS_PER_DOC, rng)
+        queries = random_tfidf(NUM_QUERIES, TERMS_PER_QUERY, rng)
+        retriever = TfidfRetriever(vectorizer=None, matrix=matrix)
+
+        start = time.perf_counter()
+        legacy = [legacy_top_k(queries[i], matrix, K) for i in range(NUM_QUERIES)]
+        legacy_ms = (time.perf_counter() - start) / NUM_QUERIES * 1000
+
+        start = time.perf_counter()
+        single = [retriever.search_vectors(queries[i], K, min_score=0.1)[0] for i in range(NUM_QUERIES)]
+        sparse_ms = (time.perf_counter() - start) / NUM_QUERIES * 1000
+
+        start = time.perf_counter()
+        batch = retriever.search_vectors(queries, K, min_score=0.1)
+        batch_ms = (time.perf_counter() - start) / NUM_QUERIES * 1000
+
+        # 점수 기준 일치 확인 (동점 문서 순서는 다를 수 있음)
+        match = all(
+            np.allclose([s for _, s in a], [s for _, s in b], atol=1e-5)
+            and np.allclose([s for _, s in a], [s for _, s in c], atol=1e-5)
+            for a, b, c in zip(legacy, single, batch)
+        )
+
+        print(f"{size:>10,} | {legacy_ms:>11.2f} | {sparse_ms:>11.2f} | {batch_ms:>10.2f} | "
+              f"{legacy_ms / batch_ms:>7.1f}x | {'OK' if match else 'MISMATCH'}")
+
+    print("=" * 84)
+
+
+def random_texts(count, rng, words=40, vocab=3000):
+    """Zipf 분포 합성 단어로 된 리뷰 텍스트"""
+    weights = 1.0 / np.arange(1, vocab + 1)
+    weights /= weights.sum()
+    tokens = rng.choice(vocab, size=(count, words), p=weights)
+    return [" ".join(f"w{t}" for t in row) for row in tokens]
+
+
+def debate_benchmark():
+    """토론 메시지 1건: 참가자마다 검색(질의 벡터화 N회) vs 공유 인덱스 배치 검색(1회)"""
+    rng = np.random.default_rng(1)
+    personas = [f"persona_{i}" for i in range(DEBATE_PERSONAS)]
+    index = MultiPersonaTfidfIndex(tempfile.gettempdir(), "debate_tfidf", max_features=1000 * DEBATE_PERSONAS)
+    index.build({persona: random_texts(DEBATE_DOCS_PER_PERSONA, rng) for persona in personas})
+    messages = random_texts(DEBATE_MESSAGES, rng, words=8)
+
+    # 질의 벡터화 횟수 집계
+    transform, calls = index.retriever.transform, [0]
+
+    def counted_transform(queries):
+        calls[0] += 1
+        return transform(queries)
+
+    index.retriever.transform = counted_transform
+
+    start = time.perf_counter()
+    per_persona = [{persona: index.search(message, personas=[persona], k=K, min_score=0.1)[persona]
+                    for persona in personas} for message in messages]
+    per_persona_ms = (time.perf_counter() - start) / DEBATE_MESSAGES * 1000
+    per_persona_calls, calls[0] = calls[0], 0
+
+    start = time.perf_counter()
+    batched = [index.search(message, personas=personas, k=K, min_score=0.1) for message in messages]
+    batch_ms = (time.perf_counter() - start) / DEBATE_MESSAGES * 1000
+
+    match = all(
+        np.allclose([s for _, s in a[p]], [s for _, s in b[p]], atol=1e-5)
+        for a, b in zip(per_persona, batched) for p in personas
+    )
+    print(f"토론 메시지 (참가자 {DEBATE_PERSONAS}명, 리뷰 {DEBATE_PERSONAS * DEBATE_DOCS_PER_PERSONA:,}개): "
+          f"페르소나별 {per_persona_ms:.2f}ms/메시지 (벡터화 {per_persona_calls // DEBATE_MESSAGES}회) vs "
+          f"배치 {batch_ms:.2f}ms/메시지 (벡터화 {calls[0] // DEBATE_MESSAGES}회), "
+          f"{per_persona_ms / batch_ms:.1f}x | {'OK' if match else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
+    debate_benchmark()
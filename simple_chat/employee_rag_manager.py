@@ -10,8 +10,7 @@ import json
 import openai
 from typing import List, Dict, Optional
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from tfidf_retriever import MultiPersonaTfidfIndex, file_signature
 import pickle
 
 class EmployeePersonaRAGManager:
@@ -47,12 +46,15 @@ class EmployeePersonaRAGManager:
         
         # 데이터 저장 경로
         self.data_path = "simple_chat/employee_data"
+        self.index_path = "simple_chat/indexes"
         os.makedirs(self.data_path, exist_ok=True)
         
-        # 인덱스 저장
-        self.text_indexes = {}
-        self.vectorizers = {}
+        # 전체 임직원 페르소나가 어휘/행렬을 공유하는 단일 TF-IDF 인덱스
+        # (페르소나당 1000개였던 어휘 예산을 합쳐 사용)
         self.documents = {}
+        self.index = MultiPersonaTfidfIndex(
+            self.index_path, "employee_tfidf", max_features=1000 * len(self.employee_personas)
+        )
     
     def load_employee_data(self, persona_type: str) -> str:
         """특정 임직원 페르소나의 데이터 로드"""
@@ -76,14 +78,12 @@ class EmployeePersonaRAGManager:
             print(f"Error loading data for {persona_type}: {e}")
             return ""
     
-    def create_text_index(self, persona_type: str) -> bool:
-        """특정 임직원 페르소나에 대한 텍스트 인덱스 생성"""
-        print(f"Creating text index for {persona_type}...")
-        
+    def build_documents(self, persona_type: str) -> List[Dict]:
+        """특정 임직원 페르소나에 대한 검색 문서 목록 생성"""
         # 데이터 로드
         content = self.load_employee_data(persona_type)
         if not content:
-            return False
+            return []
         
         # 텍스트를 문단 단위로 분할
         paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
@@ -105,76 +105,73 @@ class EmployeePersonaRAGManager:
         
         if not documents:
             print(f"No valid documents found for {persona_type}")
-            return False
-        
-        # TF-IDF 벡터화
-        texts = [doc['content'] for doc in documents]
-        vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words=None,  # 한국어는 불용어 제거하지 않음
-            ngram_range=(1, 2)
-        )
-        
-        try:
-            tfidf_matrix = vectorizer.fit_transform(texts)
-            
-            # 저장
-            self.documents[persona_type] = documents
-            self.vectorizers[persona_type] = vectorizer
-            self.text_indexes[persona_type] = tfidf_matrix
-            
-            print(f"Text index created for {persona_type}: {len(documents)} documents")
-            return True
-            
-        except Exception as e:
-            print(f"Error creating text index for {persona_type}: {e}")
-            return False
+        return documents
     
     def load_all_personas(self) -> bool:
-        """모든 임직원 페르소나에 대한 텍스트 인덱스 생성"""
+        """모든 임직원 페르소나에 대한 공유 텍스트 인덱스 로드 (원본이 바뀐 경우에만 재학습)"""
         print("Loading all employee persona text indexes...")
         
-        success_count = 0
+        documents = {}
         for persona_type in self.employee_personas.keys():
-            if self.create_text_index(persona_type):
-                success_count += 1
+            docs = self.build_documents(persona_type)
+            if docs:
+                documents[persona_type] = docs
         
-        print(f"Successfully loaded {success_count}/{len(self.employee_personas)} employee persona text indexes")
-        return success_count > 0
+        if not documents:
+            print(f"Successfully loaded 0/{len(self.employee_personas)} employee persona text indexes")
+            return False
+        
+        try:
+            loaded = self.index.build_or_load(
+                {name: [doc['content'] for doc in docs] for name, docs in documents.items()},
+                file_signature([info["file"] for info in self.employee_personas.values()])
+            )
+        except Exception as e:
+            print(f"Error creating text index: {e}")
+            return False
+        
+        self.documents = documents
+        print(f"{'Loaded saved' if loaded else 'Created'} shared text index: "
+              f"{sum(len(docs) for docs in documents.values())} documents, "
+              f"{len(self.index.vectorizer.vocabulary_)} terms")
+        print(f"Successfully loaded {len(documents)}/{len(self.employee_personas)} employee persona text indexes")
+        return True
+    
+    def format_context(self, persona_type: str, idx: int) -> str:
+        """검색된 문서를 프롬프트용 컨텍스트 문자열로 변환"""
+        doc = self.documents[persona_type][idx]
+        persona_info = self.employee_personas[persona_type]
+        return f"[{persona_info['name']} - {persona_info['role']}] {doc['content'][:300]}..."
     
     def get_context(self, persona_type: str, query: str, k: int = 2) -> List[str]:
         """특정 임직원 페르소나에서 관련 컨텍스트 검색"""
-        if persona_type not in self.text_indexes:
-            print(f"Text index not found for {persona_type}")
-            return []
+        return self.get_context_batch([persona_type], query, k).get(persona_type, [])
+    
+    def get_context_batch(self, persona_types: List[str], query: str, k: int = 2) -> Dict[str, List[str]]:
+        """한 질의를 여러 임직원 페르소나에 대해 한 번에 검색 (질의 벡터화 + 행렬곱 1회)"""
+        contexts = {}
+        targets = []
+        for persona_type in persona_types:
+            if self.index.has_persona(persona_type):
+                targets.append(persona_type)
+            else:
+                print(f"Text index not found for {persona_type}")
+                contexts[persona_type] = []
+        
+        if not targets:
+            return contexts
         
         try:
-            # 쿼리 벡터화
-            query_vector = self.vectorizers[persona_type].transform([query])
-            
-            # 코사인 유사도 계산
-            similarity_scores = cosine_similarity(
-                query_vector, 
-                self.text_indexes[persona_type]
-            ).flatten()
-            
-            # 상위 k개 문서 선택
-            top_indices = similarity_scores.argsort()[-k:][::-1]
-            
-            # 컨텍스트 생성
-            contexts = []
-            for idx in top_indices:
-                if similarity_scores[idx] > 0.1:  # 최소 유사도 임계값
-                    doc = self.documents[persona_type][idx]
-                    persona_info = self.employee_personas[persona_type]
-                    context = f"[{persona_info['name']} - {persona_info['role']}] {doc['content'][:300]}..."
-                    contexts.append(context)
-            
-            return contexts
-            
+            # 공유 인덱스 희소 내적 후 페르소나별 상위 k개 (최소 유사도 임계값 0.1)
+            results = self.index.search(query, personas=targets, k=k, min_score=0.1)
+            for persona_type, hits in results.items():
+                contexts[persona_type] = [self.format_context(persona_type, idx) for idx, _ in hits]
         except Exception as e:
-            print(f"Error retrieving context for {persona_type}: {e}")
-            return []
+            print(f"Error retrieving context for {', '.join(targets)}: {e}")
+            for persona_type in targets:
+                contexts[persona_type] = []
+        
+        return {persona_type: contexts[persona_type] for persona_type in persona_types}
     
     def get_persona_info(self, persona_type: str) -> Dict:
         """임직원 페르소나 정보 반환"""
@@ -6,6 +6,7 @@
 """
 
 import os
+import sys
 import gradio as gr
 import openai
 from typing import List, Dict, Optional
@@ -14,6 +15,10 @@ import json
 import random
 import time
 
+# 프로젝트 루트 모듈 (공유 LLM 게이트웨이)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_gateway import get_gateway
+
 # 로컬 모듈 import
 from simple_rag_manager import SimplePersonaRAGManager
 from employee_rag_manager import EmployeePersonaRAGManager
@@ -91,6 +96,9 @@ class MultiPersonaDebateSystem:
             "messages": []
         }
         
+        # 메시지별 참가자 RAG 컨텍스트 ((메시지, 참가자), {(페르소나 유형, 카테고리): 컨텍스트})
+        self._message_contexts = None
+        
         # 시스템 초기화
         self.initialize_system()
     
@@ -107,9 +115,34 @@ class MultiPersonaDebateSystem:
         else:
             print("Some RAG systems failed to load!")
     
-    def get_persona_response(self, persona_type: str, persona_category: str, 
-                           user_message: str, chat_history: List) -> str:
-        """특정 페르소나의 응답 생성"""
+    def get_participant_contexts(self, user_message: str, k: int = 2) -> Dict[tuple, List[str]]:
+        """
+        메시지 하나에 대한 토론 참가자 전체의 RAG 컨텍스트
+        
+        RAG 매니저(공유 인덱스)별로 get_context_batch를 한 번만 호출해 질의 벡터화/행렬곱을 1회로 줄이고,
+        같은 메시지에 대해서는 결과를 재사용
+        
+        Returns:
+            {(persona_type, persona_category): 컨텍스트 목록}
+        """
+        key = (user_message, tuple(self.debate_state["participants"]))
+        if self._message_contexts and self._message_contexts[0] == key:
+            return self._message_contexts[1]
+        
+        speakers = [self.parse_speaker(participant) for participant in self.debate_state["participants"]]
+        contexts = {}
+        for persona_type, rag_manager in (("customer", self.customer_rag), ("employee", self.employee_rag)):
+            categories = list(dict.fromkeys(category for kind, category in speakers if kind == persona_type))
+            if categories:
+                for category, found in rag_manager.get_context_batch(categories, user_message, k=k).items():
+                    contexts[(persona_type, category)] = found
+        
+        self._message_contexts = (key, contexts)
+        return contexts
+    
+    def build_persona_messages(self, persona_type: str, persona_category: str,
+                               user_message: str, chat_history: List) -> Optional[List[Dict]]:
+        """페르소나 프롬프트 + RAG 컨텍스트 + 최근 대화로 요청 메시지 구성 (알 수 없는 페르소나면 None)"""
         
         if persona_type == "customer":
             persona_info = self.customer_personas.get(persona_category, {})
@@ -118,13 +151,15 @@ class MultiPersonaDebateSystem:
             persona_info = self.employee_personas.get(persona_category, {})
             rag_manager = self.employee_rag
         else:
-            return "죄송합니다. 해당 페르소나를 찾을 수 없습니다."
+            return None
         
         if not persona_info:
-            return "죄송합니다. 해당 페르소나를 찾을 수 없습니다."
+            return None
         
-        # RAG 컨텍스트 검색
-        contexts = rag_manager.get_context(persona_category, user_message, k=2)
+        # RAG 컨텍스트 검색 (참가자 전체를 메시지당 한 번에 검색, 참가자가 아니면 단독 검색)
+        contexts = self.get_participant_contexts(user_message, k=2).get((persona_type, persona_category))
+        if contexts is None:
+            contexts = rag_manager.get_context(persona_category, user_message, k=2)
         
         # 컨텍스트를 프롬프트에 포함
         context_text = ""
@@ -161,9 +196,18 @@ class MultiPersonaDebateSystem:
         # 현재 사용자 메시지 추가
         messages.append({"role": "user", "content": user_message})
         
+        return messages
+    
+    def get_persona_response(self, persona_type: str, persona_category: str, 
+                           user_message: str, chat_history: List) -> str:
+        """특정 페르소나의 응답 생성"""
+        messages = self.build_persona_messages(persona_type, persona_category, user_message, chat_history)
+        if messages is None:
+            return "죄송합니다. 해당 페르소나를 찾을 수 없습니다."
+        
         try:
-            # OpenAI API 호출
-            response = openai.ChatCompletion.create(
+            # OpenAI API 호출 (공유 게이트웨이 클라이언트, openai 1.x)
+            response = get_gateway().openai_client().chat.completions.create(
                 model="gpt-4o-mini",
                 messages=messages,
                 max_tokens=300,
@@ -176,6 +220,39 @@ class MultiPersonaDebateSystem:
             print(f"Error generating response: {e}")
             return "죄송합니다. 응답을 생성하는 중 오류가 발생했습니다."
     
+    def get_persona_response_stream(self, persona_type: str, persona_category: str,
+                                    user_message: str, chat_history: List):
+        """
+        특정 페르소나의 응답 생성 (토큰 스트리밍)
+        
+        Yields:
+            생성되는 응답 텍스트 조각
+        """
+        messages = self.build_persona_messages(persona_type, persona_category, user_message, chat_history)
+        if messages is None:
+            yield "죄송합니다. 해당 페르소나를 찾을 수 없습니다."
+            return
+        
+        try:
+            stream = get_gateway().openai_client().chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                max_tokens=300,
+                temperature=0.7,
+                stream=True
+            )
+            
+            # 중간에 소비가 멈추면(UI 취소) 스트림 연결을 닫음
+            with stream:
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        yield delta
+                    
+        except Exception as e:
+            print(f"Error generating response: {e}")
+            yield "죄송합니다. 응답을 생성하는 중 오류가 발생했습니다."
+    
     def start_debate(self, topic: str, selected_personas: List[str]) -> tuple:
         """토론 시작"""
         if not topic.strip():
@@ -217,39 +294,37 @@ class MultiPersonaDebateSystem:
         
         return chat_history, f"토론이 시작되었습니다! 주제: {topic}"
     
-    def continue_debate(self, user_message: str, chat_history: List) -> tuple:
-        """토론 계속 진행"""
+    def _begin_turn(self, user_message: str, chat_history: List):
+        """
+        이번 턴 발언자 결정
+        
+        Returns:
+            (speaker_type, speaker_category, 메시지 머리말) 또는 진행할 수 없으면 (None, 상태 메시지)
+        """
         if not self.debate_state["is_active"]:
-            return chat_history, "토론이 진행 중이 아닙니다. 새 토론을 시작해주세요."
+            return None, "토론이 진행 중이 아닙니다. 새 토론을 시작해주세요."
         
         if not user_message.strip():
-            return chat_history, ""
+            return None, ""
         
         # 현재 턴의 발언자 결정
         current_speaker = self.get_current_speaker()
         if not current_speaker:
-            return chat_history, "발언자를 결정할 수 없습니다."
+            return None, "발언자를 결정할 수 없습니다."
         
         # 발언자 정보 파싱
         speaker_type, speaker_category = self.parse_speaker(current_speaker)
         
-        # 페르소나 응답 생성
-        persona_response = self.get_persona_response(
-            speaker_type, speaker_category, user_message, chat_history
-        )
-        
-        # 응답 메시지 생성
         if speaker_type == "employee":
             persona_info = self.employee_personas.get(speaker_category, {})
         else:
             persona_info = self.customer_personas.get(speaker_category, {})
         
-        response_message = f"{persona_info.get('emoji', '👤')} {persona_info.get('name', current_speaker)}: {persona_response}"
-        
-        # 채팅 히스토리 업데이트
-        chat_history.append({"role": "user", "content": user_message})
-        chat_history.append({"role": "assistant", "content": response_message})
-        
+        prefix = f"{persona_info.get('emoji', '👤')} {persona_info.get('name', current_speaker)}: "
+        return (speaker_type, speaker_category, prefix), ""
+    
+    def _end_turn(self, chat_history: List):
+        """발언이 끝난 뒤 토론 상태 갱신 + 필요시 진행자 발언 추가"""
         # 토론 상태 업데이트
         self.debate_state["messages"] = chat_history.copy()
         self.debate_state["turn_count"] += 1
@@ -275,9 +350,56 @@ class MultiPersonaDebateSystem:
             self.debate_state["messages"] = chat_history.copy()
         
         self.debate_state["current_phase"] = next_phase
+    
+    def continue_debate(self, user_message: str, chat_history: List) -> tuple:
+        """토론 계속 진행"""
+        turn, status = self._begin_turn(user_message, chat_history)
+        if turn is None:
+            return chat_history, status
+        speaker_type, speaker_category, prefix = turn
         
+        # 페르소나 응답 생성
+        persona_response = self.get_persona_response(
+            speaker_type, speaker_category, user_message, chat_history
+        )
+        
+        # 채팅 히스토리 업데이트
+        chat_history.append({"role": "user", "content": user_message})
+        chat_history.append({"role": "assistant", "content": prefix + persona_response})
+        
+        self._end_turn(chat_history)
         return chat_history, ""
     
+    def continue_debate_stream(self, user_message: str, chat_history: List):
+        """
+        토론 계속 진행 (토큰 스트리밍)
+        
+        Yields:
+            (chat_history, 입력창 값) - 발언이 생성되는 동안 마지막 메시지를 계속 갱신
+        """
+        turn, status = self._begin_turn(user_message, chat_history)
+        if turn is None:
+            yield chat_history, status
+            return
+        speaker_type, speaker_category, prefix = turn
+        
+        # 응답 생성 전에 대화 기록을 읽으므로 사용자 메시지는 스트림 시작 후 추가
+        stream = self.get_persona_response_stream(
+            speaker_type, speaker_category, user_message, list(chat_history)
+        )
+        
+        chat_history.append({"role": "user", "content": user_message})
+        response_message = {"role": "assistant", "content": prefix}
+        chat_history.append(response_message)
+        yield chat_history, ""
+        
+        for delta in stream:
+            response_message["content"] += delta
+            yield chat_history, ""
+        
+        self._end_turn(chat_history)
+        yield chat_history, ""
+    
     def get_current_speaker(self) -> str:
         """현재 발언자 결정"""
         participants = self.debate_state["participants"]
@@ -449,7 +571,8 @@ def create_gradio_interface():
             return debate_system.start_debate(topic, all_participants)
         
         def continue_debate_function(user_message, chat_history):
-            return debate_system.continue_debate(user_message, chat_history)
+            # 발언을 토큰 단위로 채팅창에 갱신
+            yield from debate_system.continue_debate_stream(user_message, chat_history)
         
         def end_debate_function():
             summary = debate_system.end_debate()
@@ -488,7 +611,8 @@ def main():
     interface = create_gradio_interface()
     
     if interface:
-        interface.launch(
+        # 스트리밍(제너레이터) 이벤트는 큐를 통해 전달
+        interface.queue().launch(
             server_name="0.0.0.0",
             server_port=8001,
             share=False,
@@ -10,8 +10,7 @@ import json
 import openai
 from typing import List, Dict, Optional
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from tfidf_retriever import MultiPersonaTfidfIndex, file_signature
 import pickle
 
 class SimplePersonaRAGManager:
@@ -49,10 +48,12 @@ class SimplePersonaRAGManager:
         self.index_path = "simple_chat/indexes"
         os.makedirs(self.index_path, exist_ok=True)
         
-        # 인덱스 저장
-        self.text_indexes = {}
-        self.vectorizers = {}
+        # 전체 페르소나 카테고리가 어휘/행렬을 공유하는 단일 TF-IDF 인덱스
+        # (페르소나당 1000개였던 어휘 예산을 합쳐 사용)
         self.documents = {}
+        self.index = MultiPersonaTfidfIndex(
+            self.index_path, "customer_tfidf", max_features=1000 * len(self.persona_categories)
+        )
     
     def load_persona_data(self, persona_category: str) -> List[Dict]:
         """특정 페르소나 카테고리의 데이터 로드"""
@@ -71,14 +72,12 @@ class SimplePersonaRAGManager:
             print(f"Error loading data for {persona_category}: {e}")
             return []
     
-    def create_text_index(self, persona_category: str) -> bool:
-        """특정 페르소나 카테고리에 대한 텍스트 인덱스 생성"""
-        print(f"Creating text index for {persona_category}...")
-        
+    def build_documents(self, persona_category: str) -> List[Dict]:
+        """특정 페르소나 카테고리에 대한 검색 문서 목록 생성"""
         # 데이터 로드
         reviews = self.load_persona_data(persona_category)
         if not reviews:
-            return False
+            return []
         
         # 문서 생성
         documents = []
@@ -104,77 +103,75 @@ class SimplePersonaRAGManager:
         
         if not documents:
             print(f"No valid documents found for {persona_category}")
-            return False
-        
-        # TF-IDF 벡터화
-        texts = [doc['content'] for doc in documents]
-        vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words=None,  # 한국어는 불용어 제거하지 않음
-            ngram_range=(1, 2)
-        )
-        
-        try:
-            tfidf_matrix = vectorizer.fit_transform(texts)
-            
-            # 저장
-            self.documents[persona_category] = documents
-            self.vectorizers[persona_category] = vectorizer
-            self.text_indexes[persona_category] = tfidf_matrix
-            
-            print(f"Text index created for {persona_category}: {len(documents)} documents")
-            return True
-            
-        except Exception as e:
-            print(f"Error creating text index for {persona_category}: {e}")
-            return False
+        return documents
     
     def load_all_personas(self) -> bool:
-        """모든 페르소나 카테고리에 대한 텍스트 인덱스 생성"""
+        """모든 페르소나 카테고리에 대한 공유 텍스트 인덱스 로드 (원본이 바뀐 경우에만 재학습)"""
         print("Loading all persona text indexes...")
         
-        success_count = 0
+        documents = {}
         for category in self.persona_categories.keys():
-            if self.create_text_index(category):
-                success_count += 1
+            docs = self.build_documents(category)
+            if docs:
+                documents[category] = docs
+        
+        if not documents:
+            print(f"Successfully loaded 0/{len(self.persona_categories)} persona text indexes")
+            return False
         
-        print(f"Successfully loaded {success_count}/{len(self.persona_categories)} persona text indexes")
-        return success_count > 0
+        try:
+            loaded = self.index.build_or_load(
+                {name: [doc['content'] for doc in docs] for name, docs in documents.items()},
+                file_signature([f"{self.data_path}/{category}_reviews.json" for category in self.persona_categories])
+            )
+        except Exception as e:
+            print(f"Error creating text index: {e}")
+            return False
+        
+        self.documents = documents
+        print(f"{'Loaded saved' if loaded else 'Created'} shared text index: "
+              f"{sum(len(docs) for docs in documents.values())} documents, "
+              f"{len(self.index.vectorizer.vocabulary_)} terms")
+        print(f"Successfully loaded {len(documents)}/{len(self.persona_categories)} persona text indexes")
+        return True
+    
+    def format_context(self, persona_category: str, idx: int) -> str:
+        """검색된 문서를 프롬프트용 컨텍스트 문자열로 변환"""
+        doc = self.documents[persona_category][idx]
+        context = f"[{self.persona_categories[persona_category]['name']}] {doc['content'][:200]}..."
+        if doc['metadata'].get('author'):
+            context += f" - {doc['metadata']['author']}"
+        return context
     
     def get_context(self, persona_category: str, query: str, k: int = 2) -> List[str]:
         """특정 페르소나 카테고리에서 관련 컨텍스트 검색"""
-        if persona_category not in self.text_indexes:
-            print(f"Text index not found for {persona_category}")
-            return []
+        return self.get_context_batch([persona_category], query, k).get(persona_category, [])
+    
+    def get_context_batch(self, persona_categories: List[str], query: str, k: int = 2) -> Dict[str, List[str]]:
+        """한 질의를 여러 페르소나 카테고리에 대해 한 번에 검색 (질의 벡터화 + 행렬곱 1회)"""
+        contexts = {}
+        targets = []
+        for persona_category in persona_categories:
+            if self.index.has_persona(persona_category):
+                targets.append(persona_category)
+            else:
+                print(f"Text index not found for {persona_category}")
+                contexts[persona_category] = []
         
-        try:
-            # 쿼리 벡터화
-            query_vector = self.vectorizers[persona_category].transform([query])
-            
-            # 코사인 유사도 계산
-            similarity_scores = cosine_similarity(
-                query_vector, 
-                self.text_indexes[persona_category]
-            ).flatten()
-            
-            # 상위 k개 문서 선택
-            top_indices = similarity_scores.argsort()[-k:][::-1]
-            
-            # 컨텍스트 생성
-            contexts = []
-            for idx in top_indices:
-                if similarity_scores[idx] > 0.1:  # 최소 유사도 임계값
-                    doc = self.documents[persona_category][idx]
-                    context = f"[{self.persona_categories[persona_category]['name']}] {doc['content'][:200]}..."
-                    if doc['metadata'].get('author'):
-                        context += f" - {doc['metadata']['author']}"
-                    contexts.append(context)
-            
+        if not targets:
             return contexts
-            
+        
+        try:
+            # 공유 인덱스 희소 내적 후 페르소나별 상위 k개 (최소 유사도 임계값 0.1)
+            results = self.index.search(query, personas=targets, k=k, min_score=0.1)
+            for persona_category, hits in results.items():
+                contexts[persona_category] = [self.format_context(persona_category, idx) for idx, _ in hits]
         except Exception as e:
-            print(f"Error retrieving context for {persona_category}: {e}")
-            return []
+            print(f"Error retrieving context for {', '.join(targets)}: {e}")
+            for persona_category in targets:
+                contexts[persona_category] = []
+        
+        return {persona_category: contexts[persona_category] for persona_category in persona_categories}
     
     def get_persona_info(self, persona_category: str) -> Dict:
         """페르소나 카테고리 정보 반환"""
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+희소 TF-IDF 검색 엔진
+L2 정규화된 CSR 행렬에 대해 희소 내적으로 코사인 유사도를 구하고,
+전체 정렬 대신 argpartition으로 상위 k개만 선택 (배치 질의 지원)
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+# 저장된 인덱스 레이아웃이 바뀌면 올려서 자동 재학습
+INDEX_VERSION = 1
+
+
+def file_signature(paths: List[str]) -> List[List]:
+    """원본 파일 목록의 (경로, mtime_ns, 크기) 시그니처 (없는 파일은 None)"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append([path, stat.st_mtime_ns, stat.st_size])
+        except OSError:
+            signature.append([path, None, None])
+    return signature
+
+
+def _top_k(data, indices, k: int, min_score: float = 0.0) -> List[Tuple[int, float]]:
+    """매칭된 (점수, 문서 인덱스) 배열에서 상위 k개 (점수 내림차순, 동점은 인덱스 오름차순)"""
+    if min_score > 0:
+        mask = data > min_score
+        data, indices = data[mask], indices[mask]
+
+    if len(data) > k:
+        top = np.argpartition(-data, k - 1)[:k]
+    else:
+        top = np.arange(len(data))
+    # 상위 k개만 정렬
+    order = np.lexsort((indices[top], -data[top]))
+    return [(int(indices[top[i]]), float(data[top[i]])) for i in order]
+
+
+def sparse_top_k(scores, k: int, min_score: float = 0.0) -> List[List[Tuple[int, float]]]:
+    """
+    희소 점수 행렬(질의 x 문서, CSR)의 행별 상위 k개
+
+    0점 문서는 희소 행렬에 저장되지 않으므로 전체 문서 수 크기의
+    dense 배열을 만들지 않고 매칭된 문서들 사이에서만 선택
+
+    Returns:
+        질의별 [(문서 인덱스, 점수), ...] 점수 내림차순
+    """
+    scores = scores.tocsr()
+    results = []
+    for row in range(scores.shape[0]):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        results.append(_top_k(scores.data[start:end], scores.indices[start:end], k, min_score))
+    return results
+
+
+class TfidfRetriever:
+    """TF-IDF 행렬 + 벡터라이저를 묶은 희소 top-k 검색기"""
+
+    def __init__(self, vectorizer, matrix):
+        """
+        Args:
+            vectorizer: 학습된 TfidfVectorizer
+            matrix: 문서 TF-IDF 행렬 (fit_transform 결과)
+        """
+        self.vectorizer = vectorizer
+        # 행 L2 정규화 → 내적 = 코사인 유사도, 전치 행렬은 CSC 변환 비용 없이 재사용
+        self.matrix = normalize(sparse.csr_matrix(matrix, dtype=np.float32), norm='l2', copy=False)
+        self._matrix_t = self.matrix.T.tocsr()
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def transform(self, queries: List[str]):
+        """질의 문자열 목록 → L2 정규화 CSR 질의 행렬"""
+        query_matrix = self.vectorizer.transform(queries)
+        return normalize(sparse.csr_matrix(query_matrix, dtype=np.float32), norm='l2', copy=False)
+
+    def search_vectors_raw(self, query_matrix):
+        """질의 x 문서 희소 점수 행렬 (코사인 유사도)"""
+        return query_matrix @ self._matrix_t
+
+    def search_vectors(self, query_matrix, k: int = 2, min_score: float = 0.0) -> List[List[Tuple[int, float]]]:
+        """이미 벡터화된 질의 행렬로 검색"""
+        return sparse_top_k(self.search_vectors_raw(query_matrix), k, min_score)
+
+    def search_batch(self, queries: List[str], k: int = 2, min_score: float = 0.0) -> List[List[Tuple[int, float]]]:
+        """여러 질의를 한 번의 희소 행렬곱으로 검색"""
+        return self.search_vectors(self.transform(queries), k, min_score)
+
+    def search(self, query: str, k: int = 2, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """단일 질의 검색"""
+        return self.search_batch([query], k, min_score)[0]
+
+
+class MultiPersonaTfidfIndex:
+    """
+    여러 페르소나 문서를 하나의 어휘/행렬로 묶은 TF-IDF 인덱스
+
+    모든 문서 행에 페르소나 ID 열(persona_ids)을 두어, 질의는 한 번만
+    벡터화/행렬곱하고 결과를 페르소나별로 걸러 상위 k개를 뽑음.
+    행렬은 scipy.sparse .npz, 어휘/IDF/페르소나 정보는 JSON으로 저장
+    """
+
+    def __init__(self, index_dir: str, name: str, max_features: int = 5000):
+        """
+        Args:
+            index_dir: 인덱스 저장 디렉터리
+            name: 파일 이름 접두어 (예: 'customer_tfidf')
+            max_features: 공유 어휘 크기
+        """
+        self.index_dir = index_dir
+        self.name = name
+        self.max_features = max_features
+
+        self.vectorizer = None
+        self.retriever = None
+        self.persona_names = []
+        self._persona_index = {}
+        self.persona_ids = None  # 행별 페르소나 번호
+        self.local_ids = None    # 행별 페르소나 내부 문서 인덱스
+
+    @property
+    def matrix_path(self) -> str:
+        return os.path.join(self.index_dir, f"{self.name}.npz")
+
+    @property
+    def vocab_path(self) -> str:
+        return os.path.join(self.index_dir, f"{self.name}_vocab.json")
+
+    def build(self, texts_by_persona: Dict[str, List[str]]):
+        """공유 벡터라이저 학습 + 결합 행렬 생성"""
+        self.persona_names = list(texts_by_persona.keys())
+        self._persona_index = {name: pid for pid, name in enumerate(self.persona_names)}
+        texts, persona_ids, local_ids = [], [], []
+        for pid, persona in enumerate(self.persona_names):
+            for local_id, text in enumerate(texts_by_persona[persona]):
+                texts.append(text)
+                persona_ids.append(pid)
+                local_ids.append(local_id)
+
+        self.vectorizer = TfidfVectorizer(
+            max_features=self.max_features,
+            stop_words=None,  # 한국어는 불용어 제거하지 않음
+            ngram_range=(1, 2)
+        )
+        matrix = self.vectorizer.fit_transform(texts)
+        self.retriever = TfidfRetriever(self.vectorizer, matrix)
+        self.persona_ids = np.asarray(persona_ids, dtype=np.int32)
+        self.local_ids = np.asarray(local_ids, dtype=np.int32)
+
+    def save(self, source_signature: List):
+        """행렬(.npz) + 어휘 파일 저장"""
+        os.makedirs(self.index_dir, exist_ok=True)
+        sparse.save_npz(self.matrix_path, self.retriever.matrix)
+        np.savez(
+            os.path.join(self.index_dir, f"{self.name}_rows.npz"),
+            persona_ids=self.persona_ids, local_ids=self.local_ids
+        )
+        meta = {
+            'version': INDEX_VERSION,
+            'source_signature': source_signature,
+            'max_features': self.max_features,
+            'persona_names': self.persona_names,
+            'vocabulary': {term: int(i) for term, i in self.vectorizer.vocabulary_.items()},
+            'idf': self.vectorizer.idf_.tolist()
+        }
+        with open(self.vocab_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    def load(self, source_signature: List) -> bool:
+        """저장된 인덱스가 현재 원본과 일치하면 재학습 없이 로드"""
+        if not (os.path.exists(self.matrix_path) and os.path.exists(self.vocab_path)):
+            return False
+
+        try:
+            with open(self.vocab_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if (meta.get('version') != INDEX_VERSION
+                    or meta.get('max_features') != self.max_features
+                    or meta.get('source_signature') != source_signature):
+                return False
+
+            vectorizer = TfidfVectorizer(
+                stop_words=None,
+                ngram_range=(1, 2),
+                vocabulary=meta['vocabulary']
+            )
+            vectorizer.idf_ = np.asarray(meta['idf'])
+            rows = np.load(os.path.join(self.index_dir, f"{self.name}_rows.npz"))
+
+            self.vectorizer = vectorizer
+            self.retriever = TfidfRetriever(vectorizer, sparse.load_npz(self.matrix_path))
+            self.persona_names = meta['persona_names']
+            self._persona_index = {name: pid for pid, name in enumerate(self.persona_names)}
+            self.persona_ids = rows['persona_ids']
+            self.local_ids = rows['local_ids']
+            return True
+        except Exception as e:
+            print(f"Error loading TF-IDF index {self.name}: {e}")
+            return False
+
+    def build_or_load(self, texts_by_persona: Dict[str, List[str]], source_signature: List) -> bool:
+        """
+        저장된 인덱스를 우선 사용하고, 원본이 바뀌었으면 재학습 후 저장
+
+        Returns:
+            저장된 인덱스를 로드했으면 True, 새로 학습했으면 False
+        """
+        if self.load(source_signature) and self._matches(texts_by_persona):
+            return True
+        self.build(texts_by_persona)
+        self.save(source_signature)
+        return False
+
+    def _matches(self, texts_by_persona: Dict[str, List[str]]) -> bool:
+        """로드한 인덱스의 페르소나/문서 수가 현재 문서 구성과 같은지 확인"""
+        if self.persona_names != list(texts_by_persona.keys()):
+            return False
+        counts = np.bincount(self.persona_ids, minlength=len(self.persona_names))
+        return all(counts[pid] == len(texts) for pid, texts in enumerate(texts_by_persona.values()))
+
+    def has_persona(self, persona: str) -> bool:
+        return self.retriever is not None and persona in self._persona_index
+
+    def search(self, query: str, personas: Optional[List[str]] = None, k: int = 2,
+               min_score: float = 0.0) -> Dict[str, List[Tuple[int, float]]]:
+        """
+        질의 1회 벡터화 + 1회 희소 행렬곱 후 페르소나별 상위 k개
+
+        Returns:
+            {persona: [(페르소나 내부 문서 인덱스, 점수), ...]}
+        """
+        if personas is None:
+            personas = self.persona_names
+
+        scores = sparse.csr_matrix(self.retriever.search_vectors_raw(self.retriever.transform([query])))
+        data, indices = scores.data, scores.indices
+        row_personas = self.persona_ids[indices]
+
+        results = {}
+        for persona in personas:
+            pid = self._persona_index.get(persona)
+            if pid is None:
+                results[persona] = []
+                continue
+            mask = row_personas == pid
+            top = _top_k(data[mask], indices[mask], k, min_score)
+            results[persona] = [(int(self.local_ids[row]), score) for row, score in top]
+        return results
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+전사본 역색인 (Inverted Index) + BM25 검색
+PersonaChatbotRAG 지식 베이스 구축 시 한 번만 색인하고,
+대화마다 전체 전사본을 다시 스캔하지 않도록 postings 기반으로 점수 계산
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+
+
+def tokenize(text):
+    """소문자 변환 후 단어 토큰 추출 (build_knowledge_base 키워드 추출과 동일 규칙)"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TranscriptIndex:
+    """전사본 역색인: term -> [(doc_id, tf)] postings + 제목 postings"""
+
+    def __init__(self, k1=1.5, b=0.75, title_boost=3.0):
+        self.k1 = k1
+        self.b = b
+        self.title_boost = title_boost
+
+        self.postings = defaultdict(list)       # 본문 term -> [(doc_id, tf), ...]
+        self.title_postings = defaultdict(set)  # 제목 term -> {doc_id, ...}
+        self.doc_lengths = []
+        self.total_length = 0
+
+        # 접두어 확장용 정렬된 어휘 (색인 변경 시 무효화)
+        self._vocab = None
+        self._title_vocab = None
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def add_document(self, tokens, title_tokens=()):
+        """
+        문서 1개 색인
+
+        Args:
+            tokens: 본문 토큰 리스트 (tokenize 결과)
+            title_tokens: 제목 토큰 리스트
+
+        Returns:
+            부여된 doc_id (추가 순서와 동일)
+        """
+        return self.add_document_counts(Counter(tokens), len(tokens), title_tokens)
+
+    def add_document_counts(self, term_counts, length, title_tokens=()):
+        """
+        이미 집계된 term 빈도로 문서 1개 색인 (스냅샷 복원 시 재토큰화 생략)
+
+        Args:
+            term_counts: {term: tf}
+            length: 문서 토큰 수
+            title_tokens: 제목 토큰 리스트
+
+        Returns:
+            부여된 doc_id
+        """
+        doc_id = len(self.doc_lengths)
+
+        for term, tf in term_counts.items():
+            self.postings[term].append((doc_id, tf))
+        for term in set(title_tokens):
+            self.title_postings[term].add(doc_id)
+
+        self.doc_lengths.append(length)
+        self.total_length += length
+
+        self._vocab = None
+        self._title_vocab = None
+        return doc_id
+
+    def _expand(self, term, title=False):
+        """
+        질의 단어를 색인 어휘로 확장 (정확히 일치 + 접두어 일치)
+
+        기존 부분 문자열 매칭에서 '뷰티' 질의가 '뷰티는', '뷰티템'에도
+        걸리던 동작(한국어 조사/접미사)을 정렬된 어휘 + 이진 탐색으로 유지
+        """
+        if title:
+            if self._title_vocab is None:
+                self._title_vocab = sorted(self.title_postings)
+            vocab = self._title_vocab
+        else:
+            if self._vocab is None:
+                self._vocab = sorted(self.postings)
+            vocab = self._vocab
+
+        start = bisect_left(vocab, term)
+        for i in range(start, len(vocab)):
+            if not vocab[i].startswith(term):
+                break
+            yield vocab[i]
+
+    def score(self, query):
+        """질의에 대한 문서별 BM25 점수 (매칭된 문서만)"""
+        num_docs = len(self.doc_lengths)
+        if num_docs == 0:
+            return {}
+
+        avg_length = self.total_length / num_docs or 1.0
+        scores = defaultdict(float)
+        title_hits = set()
+
+        for word in set(tokenize(query)):
+            for term in self._expand(word):
+                postings = self.postings[term]
+                df = len(postings)
+                idf = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+
+                for doc_id, tf in postings:
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+            for term in self._expand(word, title=True):
+                title_hits.update(self.title_postings[term])
+
+        # 제목 매칭은 기존과 같이 문서당 한 번만 가산
+        for doc_id in title_hits:
+            scores[doc_id] += self.title_boost
+
+        return scores
+
+    def search(self, query, top_k=3):
+        """
+        상위 top_k 문서 검색
+
+        Returns:
+            [(doc_id, score), ...] 점수 내림차순, 동점이면 색인 순서
+        """
+        scores = self.score(query)
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -item[0]))
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Video Corpus - youtube_data/*/*.json 컬럼형(Arrow IPC) 압축 저장소
+대시보드/분석 스크립트마다 영상 JSON 수천 개를 매번 json.load 하는 대신,
+한 번 수집(ingest)해 영상 테이블 + 자막 세그먼트 테이블로 저장하고
+필요한 컬럼만 메모리 맵으로 읽음 (세그먼트는 영상별로 필요할 때만 잘라 읽음)
+
+수집: python video_corpus.py [--data-dir youtube_data] [--force] (프로젝트 루트에서)
+원본 JSON의 mtime/size가 바뀐 파일만 다시 파싱하므로 load_corpus()가 매번 호출해도 됨
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow 미설치 시 load_corpus()에서 안내
+    pa = None
+
+# 테이블 레이아웃이 바뀌면 올려서 기존 코퍼스를 자동으로 재구축
+CORPUS_VERSION = 2
+DEFAULT_DATA_DIR = "youtube_data"
+DEFAULT_CORPUS_DIR = "video_corpus"
+
+# 원본 metadata 필드 (문자열로 저장, 수치 컬럼은 *_int로 따로 보관)
+METADATA_FIELDS = (
+    "video_id", "video_url", "title", "description", "published_at", "channel_title",
+    "duration", "view_count", "like_count", "comment_count", "thumbnail_url",
+)
+COUNT_FIELDS = ("view_count", "like_count", "comment_count")
+# 영상 단위 필드 (metadata 밖)
+VIDEO_FIELDS = ("channel_id", "channel_name", "transcript_language", "transcript_type", "full_text", "stt_text")
+
+
+def _schemas():
+    videos = pa.schema(
+        [(field, pa.string()) for field in METADATA_FIELDS]
+        + [("tags", pa.list_(pa.string()))]
+        + [(f"{field}_int", pa.int64()) for field in COUNT_FIELDS]
+        + [(field, pa.string()) for field in VIDEO_FIELDS]
+        + [("source_file", pa.string()), ("segment_offset", pa.int64()), ("segment_count", pa.int32())]
+    )
+    segments = pa.schema([
+        ("video_id", pa.string()),
+        ("start", pa.float64()),
+        ("duration", pa.float64()),
+        ("text", pa.string()),
+    ])
+    return videos, segments
+
+
+def _to_int(value) -> int:
+    try:
+        return int(str(value).replace(',', ''))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _scan(data_dir: str) -> Dict[str, List]:
+    """영상 JSON 서명 {상대경로: [mtime_ns, size]} (channel_info.json 포함)"""
+    files = {}
+    if not os.path.isdir(data_dir):
+        return files
+    for channel_id in sorted(os.listdir(data_dir)):
+        channel_path = os.path.join(data_dir, channel_id)
+        if not os.path.isdir(channel_path):
+            continue
+        for name in sorted(os.listdir(channel_path)):
+            if name.endswith('.json'):
+                stat = os.stat(os.path.join(channel_path, name))
+                files[f"{channel_id}/{name}"] = [stat.st_mtime_ns, stat.st_size]
+    return files
+
+
+def _channel_names(data_dir: str, files: Dict[str, List]) -> Dict[str, str]:
+    names = {}
+    for rel_path in files:
+        channel_id, name = rel_path.split('/', 1)
+        if name == 'channel_info.json':
+            try:
+                with open(os.path.join(data_dir, rel_path), 'r', encoding='utf-8') as f:
+                    names[channel_id] = json.load(f).get('channel_title', channel_id)
+            except Exception:
+                pass
+    return names
+
+
+def _parse_video(data_dir: str, rel_path: str):
+    """영상 JSON 하나 → (영상 행 dict, 세그먼트 컬럼 dict), 읽을 수 없으면 None"""
+    try:
+        with open(os.path.join(data_dir, rel_path), 'r', encoding='utf-8') as f:
+            video = json.load(f)
+    except Exception:
+        return None
+
+    metadata = video.get('metadata') or {}
+    row = {field: None if metadata.get(field) is None else str(metadata.get(field))
+           for field in METADATA_FIELDS}
+    row["tags"] = [str(tag) for tag in metadata.get('tags') or []]
+    for field in COUNT_FIELDS:
+        row[f"{field}_int"] = _to_int(metadata.get(field, 0))
+
+    transcript = video.get('transcript') or []
+    texts = [seg.get('text', '') for seg in transcript]
+    row.update({
+        "channel_id": rel_path.split('/', 1)[0],
+        "transcript_language": video.get('transcript_language'),
+        "transcript_type": video.get('transcript_type'),
+        "full_text": " ".join(texts),
+        "stt_text": video.get('stt_text'),
+        "source_file": rel_path,
+        "segment_count": len(transcript),
+    })
+    segments = {
+        "video_id": [row["video_id"]] * len(transcript),
+        "start": [float(seg.get('start', 0.0)) for seg in transcript],
+        "duration": [float(seg.get('duration', 0.0)) for seg in transcript],
+        "text": texts,
+    }
+    return row, segments
+
+
+def _write_table(table, path: str):
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _read_table(path: str):
+    """Arrow IPC 파일 메모리 맵 (압축 없음 → 복사 없이 필요한 페이지만 읽힘)"""
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+
+def _table_paths(corpus_dir: str, generation: int):
+    """세대별 (영상 테이블, 세그먼트 테이블) 경로
+
+    메모리 맵으로 열려 있는 파일은 Windows에서 교체(os.replace)할 수 없으므로
+    다시 쓸 때마다 새 세대 파일을 만들고 매니페스트가 가리키는 세대를 바꿈
+    """
+    return (os.path.join(corpus_dir, f"videos-{generation}.arrow"),
+            os.path.join(corpus_dir, f"segments-{generation}.arrow"))
+
+
+def _next_generation(corpus_dir: str) -> int:
+    generations = [int(m.group(1)) for path in glob.glob(os.path.join(corpus_dir, "*.arrow"))
+                   if (m := re.search(r"-(\d+)\.arrow$", path))]
+    return max(generations, default=0) + 1
+
+
+def _remove_old_tables(corpus_dir: str, keep: Sequence[str]):
+    """이전 세대 테이블 삭제 (아직 열려 있어 지울 수 없으면 다음 수집 때 다시 시도)"""
+    for path in glob.glob(os.path.join(corpus_dir, "*.arrow")):
+        if os.path.abspath(path) not in {os.path.abspath(k) for k in keep}:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _manifest_path(corpus_dir: str) -> str:
+    return os.path.join(corpus_dir, "manifest.json")
+
+
+def _read_manifest(corpus_dir: str) -> Optional[Dict]:
+    try:
+        with open(_manifest_path(corpus_dir), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != CORPUS_VERSION:
+        return None
+    return manifest
+
+
+def build_corpus(data_dir: str = DEFAULT_DATA_DIR, corpus_dir: str = DEFAULT_CORPUS_DIR,
+                 force: bool = False, verbose: bool = False) -> bool:
+    """
+    youtube_data를 컬럼형 코퍼스로 수집 (바뀐 파일만 다시 파싱)
+
+    Returns:
+        코퍼스를 새로 썼으면 True, 이미 최신이면 False
+    """
+    files = _scan(data_dir)
+    manifest = None if force else _read_manifest(corpus_dir)
+    if manifest is not None and manifest.get('files') == files:
+        return False
+
+    video_files = [p for p in files if not p.endswith('/channel_info.json')]
+    videos_schema, segments_schema = _schemas()
+    video_parts, segment_parts = [], []
+
+    # 서명이 같은 파일은 기존 테이블 행/세그먼트 구간을 그대로 재사용 (파이썬 객체로 풀지 않음)
+    kept = set()
+    if manifest is not None:
+        old_files = manifest.get('files', {})
+        old_videos_path, old_segments_path = _table_paths(corpus_dir, manifest['generation'])
+        old_videos = _read_table(old_videos_path)
+        old_segments = _read_table(old_segments_path)
+        keep_rows = []
+        for index, rel_path in enumerate(old_videos.column("source_file").to_pylist()):
+            if rel_path in files and old_files.get(rel_path) == files[rel_path]:
+                keep_rows.append(index)
+                kept.add(rel_path)
+        if keep_rows:
+            offsets = old_videos.column("segment_offset").to_pylist()
+            counts = old_videos.column("segment_count").to_pylist()
+            video_parts.append(old_videos.take(keep_rows))
+            segment_parts.extend(old_segments.slice(offsets[i], counts[i]) for i in keep_rows)
+
+    rows = []
+    segment_columns = {name: [] for name in segments_schema.names}
+    for rel_path in video_files:
+        if rel_path in kept:
+            continue
+        result = _parse_video(data_dir, rel_path)
+        if result is None:
+            continue
+        row, segments = result
+        row["segment_offset"] = 0
+        rows.append(row)
+        for name in segment_columns:
+            segment_columns[name].extend(segments[name])
+    video_parts.append(pa.Table.from_pylist(rows, schema=videos_schema))
+    segment_parts.append(pa.Table.from_pydict(segment_columns, schema=segments_schema))
+
+    videos = pa.concat_tables(video_parts)
+    segments = pa.concat_tables(segment_parts).combine_chunks()
+
+    # 채널명은 channel_info.json에서 매번 다시 채움 (채널 정보만 바뀐 경우 반영)
+    channel_names = _channel_names(data_dir, files)
+    channel_ids = videos.column("channel_id").to_pylist()
+    videos = videos.set_column(
+        videos.schema.get_field_index("channel_name"), "channel_name",
+        pa.array([channel_names.get(c, c) for c in channel_ids], pa.string()))
+    # 세그먼트 테이블에서 영상별 구간 시작 위치
+    offsets, total = [], 0
+    for count in videos.column("segment_count").to_pylist():
+        offsets.append(total)
+        total += count
+    videos = videos.set_column(
+        videos.schema.get_field_index("segment_offset"), "segment_offset", pa.array(offsets, pa.int64()))
+
+    # 기존 세대 파일은 그대로 두고 (열려 있는 VideoCorpus가 계속 읽음) 새 세대로 기록
+    os.makedirs(corpus_dir, exist_ok=True)
+    generation = _next_generation(corpus_dir)
+    videos_path, segments_path = _table_paths(corpus_dir, generation)
+    _write_table(videos.combine_chunks(), videos_path)
+    _write_table(segments, segments_path)
+    # 매니페스트는 테이블을 다 쓴 뒤 마지막에 (중간에 실패하면 다음 호출에서 다시 수집)
+    tmp_path = _manifest_path(corpus_dir) + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": CORPUS_VERSION, "generation": generation,
+                   "data_dir": os.path.abspath(data_dir), "files": files}, f)
+    os.replace(tmp_path, _manifest_path(corpus_dir))
+    _remove_old_tables(corpus_dir, keep=(videos_path, segments_path))
+
+    if verbose:
+        print(f"코퍼스 저장: 영상 {videos.num_rows}개 (새로 파싱 {len(rows)}개, 재사용 {len(kept)}개), "
+              f"세그먼트 {segments.num_rows}개 → {corpus_dir}")
+    return True
+
+
+class VideoCorpus:
+    """메모리 맵으로 연 영상/세그먼트 테이블"""
+
+    def __init__(self, corpus_dir: str = DEFAULT_CORPUS_DIR):
+        self.corpus_dir = corpus_dir
+        manifest = _read_manifest(corpus_dir)
+        if manifest is None:
+            raise FileNotFoundError(f"코퍼스가 없습니다: {corpus_dir} (python video_corpus.py로 수집)")
+        self.generation = manifest['generation']
+        self.table_paths = _table_paths(corpus_dir, self.generation)
+        self._videos = _read_table(self.table_paths[0])
+        self._segments = _read_table(self.table_paths[1])
+        self._row_by_video_id = None
+
+    def __len__(self):
+        return self._videos.num_rows
+
+    def videos(self, columns: Optional[Sequence[str]] = None):
+        """영상 테이블 (columns만 선택, 나머지 컬럼은 읽지 않음)"""
+        return self._videos.select(list(columns)) if columns else self._videos
+
+    def segments(self, columns: Optional[Sequence[str]] = None):
+        """세그먼트 테이블 (columns만 선택)"""
+        return self._segments.select(list(columns)) if columns else self._segments
+
+    def segments_for(self, video_id: str) -> List[Dict]:
+        """영상 하나의 자막 세그먼트 [{'text', 'start', 'duration'}, ...] (해당 구간만 읽음)"""
+        if self._row_by_video_id is None:
+            ids = self._videos.column("video_id").to_pylist()
+            self._row_by_video_id = {video_id: row for row, video_id in enumerate(ids)}
+        row = self._row_by_video_id.get(video_id)
+        if row is None:
+            return []
+        offset = self._videos.column("segment_offset")[row].as_py()
+        count = self._videos.column("segment_count")[row].as_py()
+        segments = self._segments.slice(offset, count).select(["text", "start", "duration"])
+        return segments.to_pylist()
+
+    def segments_at(self, rows: Sequence[int]) -> List[Dict]:
+        """세그먼트 테이블 행 번호로 세그먼트 조회 (검색 색인 결과 표시용)"""
+        if not rows:
+            return []
+        return self._segments.take(list(rows)).select(["text", "start", "duration"]).to_pylist()
+
+    def records(self, metadata_fields: Iterable[str] = METADATA_FIELDS,
+                fields: Iterable[str] = ("channel_id", "channel_name", "transcript_type", "full_text"),
+                extra_columns: Iterable[str] = ()) -> List[Dict]:
+        """
+        기존 로더와 같은 모양의 영상 dict 리스트 ({'metadata': {...}, 'channel_id', ...})
+
+        Args:
+            metadata_fields: metadata에 넣을 필드 (원본에 없던 필드는 빠짐 → .get 기본값 유지)
+            fields: 최상위 필드
+            extra_columns: 그대로 최상위에 넣을 추가 컬럼 (예: view_count_int)
+        """
+        metadata_fields, fields, extra_columns = list(metadata_fields), list(fields), list(extra_columns)
+        table = self.videos(metadata_fields + fields + extra_columns)
+        columns = {name: table.column(name).to_pylist() for name in table.column_names}
+
+        records = []
+        for i in range(table.num_rows):
+            record = {name: columns[name][i] for name in fields + extra_columns}
+            record['metadata'] = {
+                name: columns[name][i] for name in metadata_fields if columns[name][i] is not None
+            }
+            records.append(record)
+        return records
+
+
+_corpora = {}
+_corpora_lock = threading.Lock()
+
+
+def load_corpus(data_dir: str = DEFAULT_DATA_DIR, corpus_dir: str = DEFAULT_CORPUS_DIR) -> VideoCorpus:
+    """
+    최신 코퍼스 열기 (원본이 바뀌었으면 먼저 증분 수집)
+
+    같은 프로세스에서는 코퍼스가 다시 써지기 전까지 열린 객체를 재사용
+    """
+    if pa is None:
+        raise ImportError("video_corpus에는 pyarrow가 필요합니다: pip install pyarrow")
+    with _corpora_lock:
+        rebuilt = build_corpus(data_dir, corpus_dir)
+        corpus = _corpora.get(corpus_dir)
+        if corpus is None or rebuilt:
+            corpus = VideoCorpus(corpus_dir)
+            _corpora[corpus_dir] = corpus
+        return corpus
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="youtube_data → 컬럼형 영상 코퍼스 수집")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--corpus-dir', default=DEFAULT_CORPUS_DIR)
+    parser.add_argument('--force', action='store_true', help="서명과 관계없이 전체 재수집")
+    args = parser.parse_args()
+
+    if not build_corpus(args.data_dir, args.corpus_dir, force=args.force, verbose=True):
+        print("코퍼스가 이미 최신입니다.")
@@ -0,0 +1,514 @@
+# -*- coding: utf-8 -*-
+"""
+Whisper 전사 서비스 - 모델 크기별로 모델을 한 번만 로드해 공유
+스크래퍼 인스턴스(채널)마다 whisper.load_model을 다시 부르면 로드 시간과 가중치 메모리가 매번 들므로,
+모델을 가진 전사 프로세스 하나를 띄워 두고 작업을 큐로 받음
+
+  get_whisper_service('base', 'cuda').submit(audio_path) -> Future[(작업 시간, (세그먼트, 언어, 타입) 또는 None)]
+
+짧은 클립은 무음 간격을 두고 이어 붙여 Whisper 창(30초) 하나로 전사한 뒤
+각 클립의 시작 위치 기준으로 세그먼트를 다시 나눔 (모델 호출 횟수 감소)
+chunk_seconds를 주면 긴 오디오를 음성 구간(VAD) 청크로 나눠 작업자(workers)들이 나눠 전사하고
+청크 시작 시각만큼 세그먼트를 옮겨 이어 붙임 (audio_chunks)
+whisper/torch는 전사 프로세스에서만 import
+"""
+
+import atexit
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from audio_chunks import read_pcm, stitch_segments, voice_chunks
+
+SAMPLE_RATE = 16000
+WINDOW_SECONDS = 30.0   # Whisper 입력 창 길이
+GAP_SECONDS = 1.0       # 이어 붙인 클립 사이 무음
+
+_CLOSE = None
+
+
+def whisper_segments(result, offset=0.0, length=None):
+    """
+    Whisper 결과 → YouTube 자막 형식 세그먼트
+
+    Args:
+        offset, length: 이어 붙인 오디오에서 이 클립이 차지하는 구간 (초, 세그먼트를 클립 기준 시각으로 변환)
+    """
+    segments = []
+    for segment in result['segments']:
+        start = max(0.0, segment['start'] - offset)
+        end = segment['end'] - offset
+        if length is not None:
+            end = min(end, length)
+        segments.append({
+            'text': segment['text'],
+            'start': start,
+            'duration': max(0.0, end - start)
+        })
+    return segments
+
+
+def load_whisper_model(model_size, device):
+    """전사 프로세스에서 Whisper 모델 로드"""
+    import whisper
+    return whisper.load_model(model_size, device=device)
+
+
+def load_audio(audio_path):
+    """오디오 파일 → 16kHz 모노 float32 배열 (ffmpeg)"""
+    import whisper
+    return whisper.load_audio(audio_path)
+
+
+def _pack(clips, window_seconds):
+    """
+    짧은 클립을 창 길이 안에 들어가도록 묶음 (입력 순서 유지, 긴 클립은 단독)
+
+    Args:
+        clips: [(job_id, audio), ...]
+
+    Returns:
+        [[(job_id, audio), ...], ...]
+    """
+    groups, current, current_seconds = [], [], 0.0
+    for job_id, audio in clips:
+        seconds = len(audio) / SAMPLE_RATE
+        needed = seconds + (GAP_SECONDS if current else 0.0)
+        if current and current_seconds + needed > window_seconds:
+            groups.append(current)
+            current, current_seconds = [], 0.0
+            needed = seconds
+        current.append((job_id, audio))
+        current_seconds += needed
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _transcribe_group(model, group, language, fp16):
+    """
+    클립 묶음 전사
+
+    Returns:
+        {job_id: 세그먼트 리스트}
+    """
+    import numpy as np
+
+    if len(group) == 1:
+        job_id, audio = group[0]
+        result = model.transcribe(audio, language=language, fp16=fp16)
+        return {job_id: whisper_segments(result)}
+
+    gap = np.zeros(int(GAP_SECONDS * SAMPLE_RATE), dtype=np.float32)
+    parts, spans, offset = [], [], 0.0
+    for i, (job_id, audio) in enumerate(group):
+        if i:
+            parts.append(gap)
+            offset += GAP_SECONDS
+        parts.append(audio.astype(np.float32, copy=False))
+        spans.append((job_id, offset, len(audio) / SAMPLE_RATE))
+        offset += len(audio) / SAMPLE_RATE
+
+    result = model.transcribe(np.concatenate(parts), language=language, fp16=fp16)
+
+    # 세그먼트 중간 시각이 속한 클립(뒤 무음 포함)에 배정
+    split = {job_id: [] for job_id, _, _ in spans}
+    for segment in result['segments']:
+        middle = (segment['start'] + segment['end']) / 2
+        for job_id, start, length in reversed(spans):
+            if middle >= start:
+                split[job_id].append(segment)
+                break
+    return {job_id: whisper_segments({'segments': split[job_id]}, start, length)
+            for job_id, start, length in spans}
+
+
+def _serve(worker, model_size, device, language, jobs, results, window_seconds, max_batch, batch_wait,
+           model_loader, audio_loader, num_threads):
+    """전사 프로세스 본체: 모델 로드 후 자기 작업 큐에서 작업을 모아 전사"""
+    if num_threads:
+        # 작업자 여러 개가 CPU 코어를 나눠 쓰도록 torch 스레드 수 제한
+        try:
+            import torch
+            torch.set_num_threads(num_threads)
+        except ImportError:
+            pass
+
+    start = time.perf_counter()
+    try:
+        model = model_loader(model_size, device)
+        results.put(('ready', worker, time.perf_counter() - start, None))
+    except Exception as e:
+        model = None
+        results.put(('ready', worker, time.perf_counter() - start, f"모델 로드 실패: {e}"))
+
+    fp16 = device == "cuda"
+    batch_id = 0
+    while True:
+        job = jobs.get()
+        if job is _CLOSE:
+            break
+
+        # 첫 작업 뒤 잠깐 더 기다려 짧은 클립을 함께 처리
+        batch, closing = [job], False
+        deadline = time.monotonic() + batch_wait
+        while len(batch) < max_batch:
+            try:
+                job = jobs.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if job is _CLOSE:
+                closing = True
+                break
+            batch.append(job)
+
+        clips = []
+        for job_id, audio in batch:
+            if model is None:
+                results.put((job_id, 0.0, None, "모델 로드 실패", None))
+                continue
+            try:
+                # 경로면 읽고, 청크(PCM 배열)는 그대로
+                clips.append((job_id, audio_loader(audio) if isinstance(audio, str) else audio))
+            except Exception as e:
+                results.put((job_id, 0.0, None, f"오디오 읽기 실패: {e}", None))
+
+        for group in _pack(clips, window_seconds):
+            batch_id += 1
+            start = time.perf_counter()
+            try:
+                segments = _transcribe_group(model, group, language, fp16)
+                error = None
+            except Exception as e:
+                segments, error = {}, str(e)
+            elapsed = time.perf_counter() - start
+
+            # 작업 시간은 클립 길이 비율로 나눔
+            total = sum(len(audio) for _, audio in group) or 1
+            for job_id, audio in group:
+                results.put((job_id, elapsed * len(audio) / total, segments.get(job_id), error, (worker, batch_id)))
+
+        if closing:
+            break
+
+    results.put(('closed', worker))
+
+
+class WhisperService:
+    """모델 하나를 가진 전사 프로세스 + 결과를 Future로 돌려주는 수집 스레드"""
+
+    def __init__(self, model_size='base', device='cpu', language='ko', window_seconds=WINDOW_SECONDS,
+                 max_batch=8, batch_wait=0.2, model_loader=load_whisper_model, audio_loader=load_audio,
+                 workers=1, num_threads=None, chunk_seconds=None):
+        """
+        Args:
+            model_size: Whisper 모델 크기
+            device: 'cpu' 또는 'cuda'
+            language: 전사 언어
+            window_seconds: 짧은 클립을 이어 붙일 최대 길이(초)
+            max_batch: 한 번에 모으는 최대 작업 수
+            batch_wait: 첫 작업 뒤 다른 작업을 기다리는 시간(초)
+            model_loader, audio_loader: 전사 프로세스에서 쓸 로더 (피클 가능한 모듈 함수)
+            workers: 전사 프로세스 수 (프로세스마다 모델 하나, CPU 전사를 코어에 나눌 때 2개 이상)
+            num_threads: 작업자당 torch 스레드 수 (기본: torch 기본값)
+            chunk_seconds: 지정하면 오디오를 이 길이 이하 음성 구간 청크로 나눠 병렬 전사
+        """
+        self.model_size = model_size
+        self.device = device
+        self.language = language
+        self.max_batch = max_batch
+        self.workers = max(1, workers)
+        self.chunk_seconds = chunk_seconds
+        self.load_seconds = None
+        self.load_error = None
+        self.stats = {'jobs': 0, 'failed': 0, 'model_calls': 0, 'busy_seconds': 0.0, 'chunks': 0}
+
+        context = multiprocessing.get_context("spawn")  # torch/CUDA는 fork 후 사용이 안전하지 않음
+        self._jobs = [context.Queue() for _ in range(self.workers)]  # 작업자별 큐 (작업자가 죽으면 그 작업만 실패 처리)
+        self._results = context.Queue()
+        self._futures = {}
+        self._batches = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._ready = threading.Event()
+        self._loaded = set()    # 모델 로드를 마친(또는 실패/종료한) 작업자
+        self._owner = {}        # job_id → 작업을 맡긴 작업자
+        self._outstanding = [0] * self.workers  # 작업자별 미완료 작업 수
+        self._exited = {}       # 작업자 → 종료를 처음 확인한 시각
+        self._dead = set()      # 비정상 종료로 처리한 작업자
+        self._stopped = set()   # close()로 정상 종료한 작업자
+        self._closed = False
+        self.error = None   # 전사 프로세스가 비정상 종료되면 사유 (이후 submit은 RuntimeError)
+
+        self._processes = [
+            context.Process(
+                target=_serve, daemon=True,
+                args=(worker, model_size, device, language, self._jobs[worker], self._results, window_seconds,
+                      max_batch, batch_wait, model_loader, audio_loader, num_threads),
+            )
+            for worker in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+        self._splitter = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="stt-split")
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    def _collect(self):
+        open_workers = self.workers
+        last_check = time.monotonic()
+        while True:
+            try:
+                message = self._results.get(timeout=1.0)
+            except queue.Empty:
+                message = None
+            if message is None or time.monotonic() - last_check >= 1.0:
+                last_check = time.monotonic()
+                if not self._check_workers():
+                    return
+                if message is None:
+                    continue
+
+            kind = message[0]
+            if kind == 'ready':
+                _, worker, seconds, error = message
+                self.load_seconds = max(self.load_seconds or 0.0, seconds)
+                if error:
+                    self.load_error = error
+                    print(f"Whisper 서비스 ({self.model_size}, {self.device}): {self.load_error}")
+                self._worker_ready(worker)
+                continue
+            if kind == 'closed':
+                self._stopped.add(message[1])
+                open_workers -= 1
+                if open_workers == 0:
+                    self._fail_pending("전사 서비스가 종료되었습니다")
+                    return
+                continue
+
+            job_id, busy, segments, error, batch_id = message
+            with self._lock:
+                future = self._futures.pop(job_id, None)
+                self._release(job_id)
+                self.stats['jobs'] += 1
+                self.stats['busy_seconds'] += busy
+                if segments is None:
+                    self.stats['failed'] += 1
+                if batch_id is not None:
+                    self._batches.add(batch_id)
+                    self.stats['model_calls'] = len(self._batches)
+            if error:
+                print(f"STT 변환 실패: {error}")
+            if future is not None:
+                future.set_result((busy, (segments, self.language, 'whisper-stt') if segments is not None else None))
+
+    def _worker_ready(self, worker):
+        if worker in self._loaded:
+            return
+        self._loaded.add(worker)
+        if len(self._loaded) == self.workers:
+            self._ready.set()
+
+    def _check_workers(self):
+        """
+        비정상 종료된 작업자에 맡긴 작업만 실패 처리 (남은 작업자는 계속 큐를 처리)
+
+        종료를 처음 본 뒤 1초 유예해 이미 보낸 결과를 먼저 받음
+
+        Returns:
+            살아 있는 작업자가 없어 서비스를 닫았으면 False
+        """
+        now = time.monotonic()
+        for worker, process in enumerate(self._processes):
+            if process.is_alive() or worker in self._stopped or worker in self._dead:
+                continue
+            exited_at = self._exited.setdefault(worker, now)
+            if now - exited_at < 1.0:
+                continue
+            with self._lock:
+                self._dead.add(worker)
+                job_ids = [job_id for job_id, owner in self._owner.items() if owner == worker]
+            self._worker_ready(worker)  # 모델 로드 전에 죽었으면 wait_ready 대기 해제
+            self._fail_jobs(job_ids, f"전사 작업자 #{worker} 종료")
+
+        if len(self._dead) < self.workers - len(self._stopped) or not self._dead:
+            return True
+
+        # 모델 프로세스가 모두 죽으면 (메모리 부족 등) 서비스를 종료 상태로 표시해
+        # get_whisper_service가 새 서비스를 띄우도록 함
+        with self._lock:
+            if not self._closed:
+                self.error = "전사 프로세스가 종료되었습니다"
+            self._closed = True
+        self._fail_pending(self.error or "전사 서비스가 종료되었습니다")
+        return False
+
+    def _fail_jobs(self, job_ids, reason):
+        with self._lock:
+            futures = [self._futures.pop(job_id, None) for job_id in job_ids]
+            for job_id in job_ids:
+                self._release(job_id)
+            futures = [future for future in futures if future is not None]
+            self.stats['jobs'] += len(futures)
+            self.stats['failed'] += len(futures)
+        if futures:
+            print(f"STT 변환 실패: {reason}")
+        for future in futures:
+            future.set_result((0.0, None))
+
+    def _fail_pending(self, reason):
+        with self._lock:
+            futures, self._futures = self._futures, {}
+            self._owner.clear()
+            self._outstanding = [0] * self.workers
+        if futures:
+            print(f"STT 변환 실패: {reason}")
+        for future in futures.values():
+            future.set_result((0.0, None))
+        self._ready.set()
+
+    def _release(self, job_id):
+        """작업 완료/실패 시 작업자 배정 해제 (self._lock 안에서 호출)"""
+        worker = self._owner.pop(job_id, None)
+        if worker is not None:
+            self._outstanding[worker] -= 1
+
+    def _submit_job(self, audio):
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(self.error or "전사 서비스가 종료되었습니다")
+            # 살아 있는 작업자 중 미완료 작업이 가장 적은 작업자에 배정
+            alive = [worker for worker in range(self.workers) if worker not in self._dead]
+            if not alive:
+                raise RuntimeError("전사 프로세스가 종료되었습니다")
+            worker = min(alive, key=lambda w: self._outstanding[w])
+            job_id = next(self._ids)
+            self._futures[job_id] = future
+            self._owner[job_id] = worker
+            self._outstanding[worker] += 1
+        self._jobs[worker].put((job_id, audio))
+        return future
+
+    def _submit_chunked(self, audio_path):
+        """
+        음성 구간 청크별로 작업을 나눠 등록하고, 모두 끝나면 원본 시각 기준으로 이어 붙임
+
+        PCM 읽기와 VAD는 분할 스레드에서 처리 (호출한 쪽은 바로 Future를 받고,
+        읽기 실패도 실패한 전사 결과로 돌려받음)
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(self.error or "전사 서비스가 종료되었습니다")
+        combined = Future()
+        self._splitter.submit(self._split_chunks, audio_path, combined)
+        return combined
+
+    def _split_chunks(self, audio_path, combined):
+        try:
+            audio = read_pcm(audio_path)
+            chunks = voice_chunks(audio, SAMPLE_RATE, max_seconds=self.chunk_seconds)
+            if not chunks:
+                combined.set_result((0.0, ([], self.language, 'whisper-stt')))
+                return
+            parts = [(start / SAMPLE_RATE, self._submit_job(audio[start:end])) for start, end in chunks]
+        except Exception as e:
+            print(f"STT 변환 실패: 오디오 읽기 실패: {e!r}")
+            with self._lock:
+                self.stats['jobs'] += 1
+                self.stats['failed'] += 1
+            combined.set_result((0.0, None))
+            return
+
+        with self._lock:
+            self.stats['chunks'] += len(chunks)
+        remaining = [len(parts)]
+        remaining_lock = threading.Lock()
+
+        def on_done(_):
+            with remaining_lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            results = [(offset, future.result()) for offset, future in parts]
+            busy = sum(part_busy for _, (part_busy, _) in results)
+            if any(result is None for _, (_, result) in results):
+                combined.set_result((busy, None))
+                return
+            segments = stitch_segments([(offset, result[0]) for offset, (_, result) in results])
+            combined.set_result((busy, (segments, self.language, 'whisper-stt')))
+
+        for _, future in parts:
+            future.add_done_callback(on_done)
+
+    def submit(self, audio_path):
+        """
+        전사 작업 등록 (chunk_seconds가 있으면 음성 구간 청크로 나눠 병렬 전사)
+
+        Returns:
+            Future[(작업 시간(초), (세그먼트, 언어, 'whisper-stt') 또는 None)]
+        """
+        if self.chunk_seconds:
+            return self._submit_chunked(audio_path)
+        return self._submit_job(str(audio_path))
+
+    def transcribe(self, audio_path):
+        """전사 (끝날 때까지 대기) → (세그먼트, 언어, 타입), 실패 시 (None, None, None)"""
+        try:
+            _, result = self.submit(audio_path).result()
+        except RuntimeError as e:
+            print(f"STT 변환 실패: {e}")
+            return None, None, None
+        return result or (None, None, None)
+
+    def wait_ready(self, timeout=None):
+        """모델 로드가 끝날 때까지 대기"""
+        return self._ready.wait(timeout)
+
+    def close(self, timeout=30):
+        """남은 작업을 처리한 뒤 전사 프로세스 종료"""
+        self._splitter.shutdown(wait=True)  # 읽는 중인 오디오의 청크까지 등록한 뒤 종료
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for jobs in self._jobs:
+            jobs.put(_CLOSE)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._collector.join(timeout)
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_whisper_service(model_size='base', device='cpu', **options):
+    """
+    모델 크기/디바이스별 공유 전사 서비스 (처음 호출 시 전사 프로세스 시작)
+
+    options는 처음 만들 때만 적용 (WhisperService 인자)
+    """
+    key = (model_size, device)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None or service._closed:
+            service = _services[key] = WhisperService(model_size, device, **options)
+        return service
+
+
+def shutdown_whisper_services():
+    """모든 공유 전사 서비스 종료"""
+    with _services_lock:
+        services = list(_services.values())
+        _services.clear()
+    for service in services:
+        service.close()
+
+
+atexit.register(shutdown_whisper_services)
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+YouTube Data API 클라이언트 - ID 묶음 요청 + 디스크 캐시 + API 키별 쿼터 관리
+영상/채널마다 videos.list / channels.list를 한 번씩 부르면 쿼터(하루 10,000 단위)가 빨리 닳으므로
+  - 한 번에 최대 50개 ID를 묶어 요청 (요청 1회 = 1 단위)
+  - 응답은 항목(ID)별로 SQLite에 캐시, TTL 안에서는 다시 요청하지 않음 (없는 ID도 캐시)
+  - API 키별 사용 단위를 태평양 시간 날짜 기준으로 기록, 예산이 떨어지거나
+    quotaExceeded 응답을 받으면 다음 키로 전환
+
+  client = get_youtube_client(["key1", "key2"])
+  client.videos(["id1", "id2", ...])  -> {video_id: 항목 또는 None}
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+try:
+    from zoneinfo import ZoneInfo
+    _QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+except Exception:
+    _QUOTA_TZ = timezone(timedelta(hours=-8))  # tzdata가 없는 환경 (쿼터는 태평양 시간 자정에 초기화)
+
+API_BASE_URL = "https://www.googleapis.com/youtube/v3"
+DEFAULT_CACHE_PATH = "youtube_api_cache.sqlite3"
+DEFAULT_TTL = 6 * 3600          # 캐시 유효 시간(초)
+DAILY_QUOTA = 10000             # API 키당 하루 기본 쿼터
+MAX_IDS_PER_CALL = 50
+
+# 요청당 쿼터 단위 (목록 조회는 1, 검색은 100)
+QUOTA_COSTS = {'search': 100}
+
+# 이 사유로 실패하면 해당 키를 오늘은 더 쓰지 않고 다음 키로 재시도
+ROTATE_REASONS = {'quotaExceeded', 'dailyLimitExceeded', 'keyInvalid', 'keyExpired', 'accessNotConfigured'}
+
+VIDEO_PARTS = 'snippet,statistics,contentDetails'
+CHANNEL_PARTS = 'snippet,contentDetails,statistics'
+
+
+class YouTubeAPIError(Exception):
+    """YouTube Data API 오류 응답"""
+
+    def __init__(self, message, status=None, reason=None):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+
+class QuotaExhaustedError(YouTubeAPIError):
+    """모든 API 키의 오늘 쿼터 소진"""
+
+
+def quota_day():
+    """쿼터 기준 날짜 (태평양 시간)"""
+    return datetime.now(_QUOTA_TZ).date().isoformat()
+
+
+def _key_id(api_key):
+    """키 원문 대신 저장할 식별자"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+
+
+class YouTubeAPIClient:
+    """묶음 요청 / 항목별 캐시 / 키별 쿼터를 관리하는 YouTube Data API v3 클라이언트 (스레드 안전)"""
+
+    def __init__(self, api_keys, cache_path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL,
+                 daily_budget=DAILY_QUOTA, base_url=API_BASE_URL, timeout=30):
+        """
+        Args:
+            api_keys: API 키 리스트 (앞에서부터 사용, 예산이 떨어지면 다음 키)
+            cache_path: 캐시/쿼터 기록 SQLite 파일
+            ttl: 캐시 유효 시간(초)
+            daily_budget: 키당 하루 사용할 최대 쿼터 단위
+            base_url: API 주소 (테스트용 로컬 서버 지정 가능)
+            timeout: 요청 제한 시간(초)
+        """
+        if isinstance(api_keys, str):
+            api_keys = [api_keys]
+        self.api_keys = [key for key in api_keys if key]
+        if not self.api_keys:
+            raise ValueError("YouTube API 키가 필요합니다")
+        self.ttl = ttl
+        self.daily_budget = daily_budget
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.stats = {'requests': 0, 'cache_hits': 0, 'cache_misses': 0, 'rotations': 0}
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._current = 0
+        self._db = sqlite3.connect(cache_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, fetched_at REAL, payload TEXT)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS quota (key_id TEXT, day TEXT, units INTEGER, "
+                         "PRIMARY KEY (key_id, day))")
+        self._db.commit()
+
+    # ---- 쿼터 ----
+
+    def _used(self, api_key, day):
+        row = self._db.execute("SELECT units FROM quota WHERE key_id = ? AND day = ?",
+                               (_key_id(api_key), day)).fetchone()
+        return row[0] if row else 0
+
+    def _charge(self, api_key, units, exhausted=False):
+        """사용 단위 기록 (exhausted면 오늘 예산 전부 사용으로 표시)"""
+        day = quota_day()
+        with self._lock:
+            if exhausted:
+                units = max(0, self.daily_budget - self._used(api_key, day))
+            self._db.execute(
+                "INSERT INTO quota (key_id, day, units) VALUES (?, ?, ?) "
+                "ON CONFLICT (key_id, day) DO UPDATE SET units = units + excluded.units",
+                (_key_id(api_key), day, units))
+            self._db.commit()
+
+    def _pick_key(self, cost):
+        """예산이 남은 키 (현재 키부터 순서대로), 없으면 None"""
+        day = quota_day()
+        with self._lock:
+            for offset in range(len(self.api_keys)):
+                index = (self._current + offset) % len(self.api_keys)
+                if self._used(self.api_keys[index], day) + cost <= self.daily_budget:
+                    if index != self._current:
+                        self.stats['rotations'] += 1
+                        print(f"🔑 YouTube API 키 전환: #{self._current + 1} → #{index + 1}")
+                        self._current = index
+                    return self.api_keys[index]
+        return None
+
+    def quota_usage(self):
+        """
+        오늘 키별 사용량
+
+        Returns:
+            [{'key': '#1', 'used': 단위, 'budget': 예산}, ...]
+        """
+        day = quota_day()
+        with self._lock:
+            return [{'key': f"#{i + 1}", 'used': self._used(key, day), 'budget': self.daily_budget}
+                    for i, key in enumerate(self.api_keys)]
+
+    # ---- 요청 ----
+
+    def _session(self):
+        # 스레드마다 keep-alive 세션 하나
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def call(self, resource, params):
+        """
+        API 요청 1회 (쿼터 기록, 쿼터 소진/잘못된 키면 다음 키로 재시도)
+
+        Returns:
+            응답 JSON
+        """
+        cost = QUOTA_COSTS.get(resource, 1)
+        while True:
+            api_key = self._pick_key(cost)
+            if api_key is None:
+                raise QuotaExhaustedError("모든 YouTube API 키의 quota가 소진되었습니다", 403, 'quotaExceeded')
+
+            response = self._session().get(f"{self.base_url}/{resource}", params={**params, 'key': api_key},
+                                           timeout=self.timeout)
+            with self._lock:
+                self.stats['requests'] += 1
+            if response.status_code == 200:
+                self._charge(api_key, cost)
+                return response.json()
+
+            try:
+                error = response.json().get('error', {})
+            except ValueError:
+                error = {}
+            reasons = [e.get('reason') for e in error.get('errors', [])]
+            reason = reasons[0] if reasons else None
+            if ROTATE_REASONS.intersection(reasons):
+                print(f"⚠️ YouTube API 키 사용 불가 ({reason}) - 다음 키로 전환합니다")
+                self._charge(api_key, 0, exhausted=True)
+                continue
+
+            self._charge(api_key, cost)
+            raise YouTubeAPIError(f"YouTube API {resource} 오류 ({response.status_code}, {reason}): "
+                                  f"{error.get('message', response.text[:200])}", response.status_code, reason)
+
+    # ---- 캐시 ----
+
+    def _cache_get(self, keys):
+        """TTL 안의 캐시 항목 {key: payload}"""
+        if not keys:
+            return {}
+        found = {}
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, payload FROM cache WHERE fetched_at >= ? AND key IN ({','.join('?' * len(batch))})",
+                    [cutoff, *batch]).fetchall()
+                found.update((key, json.loads(payload)) for key, payload in rows)
+            self.stats['cache_hits'] += len(found)
+            self.stats['cache_misses'] += len(keys) - len(found)
+        return found
+
+    def _cache_put(self, items):
+        now = time.time()
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO cache (key, fetched_at, payload) VALUES (?, ?, ?)",
+                                 [(key, now, json.dumps(payload, ensure_ascii=False)) for key, payload in items.items()])
+            self._db.commit()
+
+    def _cached_call(self, cache_key, resource, params):
+        """캐시된 단건 조회 (응답 첫 항목 또는 None)"""
+        cached = self._cache_get([cache_key])
+        if cache_key in cached:
+            return cached[cache_key]
+        items = self.call(resource, params).get('items') or []
+        item = items[0] if items else None
+        self._cache_put({cache_key: item})
+        return item
+
+    def list_by_ids(self, resource, ids, part):
+        """
+        ID 목록 조회 (캐시에 없는 ID만 50개씩 묶어 요청)
+
+        Returns:
+            {id: 항목 또는 None(없는 ID)} (입력 순서, 중복 제거)
+        """
+        ids = list(dict.fromkeys(i for i in ids if i))
+        keys = {i: f"{resource}:{part}:{i}" for i in ids}
+        cached = self._cache_get(list(keys.values()))
+        results = {i: cached[keys[i]] for i in ids if keys[i] in cached}
+
+        missing = [i for i in ids if keys[i] not in cached]
+        for start in range(0, len(missing), MAX_IDS_PER_CALL):
+            batch = missing[start:start + MAX_IDS_PER_CALL]
+            response = self.call(resource, {'part': part, 'id': ','.join(batch), 'maxResults': MAX_IDS_PER_CALL})
+            found = {item['id']: item for item in response.get('items', [])}
+            fetched = {i: found.get(i) for i in batch}
+            self._cache_put({keys[i]: item for i, item in fetched.items()})
+            results.update(fetched)
+        return {i: results[i] for i in ids}
+
+    def videos(self, video_ids, part=VIDEO_PARTS):
+        """videos.list (50개씩 묶음)"""
+        return self.list_by_ids('videos', video_ids, part)
+
+    def channels(self, channel_ids, part=CHANNEL_PARTS):
+        """channels.list (50개씩 묶음)"""
+        return self.list_by_ids('channels', channel_ids, part)
+
+    def channel_for_handle(self, handle, part=CHANNEL_PARTS):
+        """핸들(@이름) → 채널 항목 (forHandle은 요청당 핸들 하나만 받으므로 캐시로 재요청을 줄임)"""
+        handle = handle.lstrip('@')
+        return self._cached_call(f"channels:{part}:@{handle.lower()}", 'channels',
+                                 {'part': part, 'forHandle': handle})
+
+    def search_channel(self, query):
+        """채널 검색 첫 결과 (100 단위, 캐시)"""
+        return self._cached_call(f"search:channel:{query.lower()}", 'search',
+                                 {'part': 'snippet', 'q': query, 'type': 'channel', 'maxResults': 1})
+
+    def playlist_video_ids(self, playlist_id, max_results):
+        """재생목록 영상 ID (최신 목록이므로 캐시하지 않음, 50개씩 페이지 요청)"""
+        video_ids, page_token = [], None
+        while len(video_ids) < max_results:
+            params = {'part': 'snippet', 'playlistId': playlist_id,
+                      'maxResults': min(MAX_IDS_PER_CALL, max_results - len(video_ids))}
+            if page_token:
+                params['pageToken'] = page_token
+            response = self.call('playlistItems', params)
+            video_ids += [item['snippet']['resourceId']['videoId'] for item in response.get('items', [])]
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+        return video_ids[:max_results]
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_youtube_client(api_keys, **options):
+    """
+    API 키 조합별 공유 클라이언트 (스크래퍼/변환기 인스턴스끼리 캐시와 쿼터 기록 공유)
+
+    options는 처음 만들 때만 적용 (YouTubeAPIClient 인자)
+    """
+    if isinstance(api_keys, str):
+        api_keys = [api_keys]
+    key = tuple(api_keys)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = YouTubeAPIClient(list(api_keys), **options)
+        return client